@@ -3,6 +3,9 @@
 
 We support a filesystem tree based cache and a sqlite based cache.
 See mypy/metastore.py for details.
+
+Module metadata and data files can also be converted between the JSON
+and the binary cache format (see mypy/binarycache.py) while copying.
 """
 
 import sys
@@ -10,13 +13,50 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import argparse
-from mypy.metastore import FilesystemMetadataStore, SqliteMetadataStore
+from typing import Any, Dict, Optional, Union
+
+from mypy.binarycache import encode_binary
+from mypy.build import cache_loads, compute_cache_hash, json_dumps
+from mypy.metastore import FilesystemMetadataStore, MetadataStore, SqliteMetadataStore
+
+
+def encode_entry(obj: Any, format: str) -> Union[str, bytes]:
+    if format == 'binary':
+        return encode_binary(obj)
+    return json_dumps(obj, debug_cache=False)
+
+
+def convert_entry(data: bytes, format: Optional[str]) -> Union[str, bytes]:
+    if format is None:
+        return data
+    return encode_entry(cache_loads(data), format)
+
+
+def convert_meta(data: bytes, format: str,
+                 interface_hash: str, data_mtime: float) -> Union[str, bytes]:
+    """Convert a metadata entry to describe a rewritten data file.
+
+    The interface hash is a hash of the data file contents, so it changes
+    with the format, and the data file mtime must match the rewritten file.
+    """
+    meta = cache_loads(data)
+    meta['interface_hash'] = interface_hash
+    meta['data_mtime'] = data_mtime
+    return encode_entry(meta, format)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument('--to-sqlite', action='store_true', default=False,
-                        help='Convert to a sqlite cache (default: convert from)')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--to-sqlite', action='store_true', default=False,
+                       help='Convert to a sqlite cache (default: convert from)')
+    group.add_argument('--same-store', action='store_true', default=False,
+                       help='Keep the storage kind; only convert the format (see --format)')
+    parser.add_argument('--sqlite', action='store_true', default=False,
+                        help='With --same-store, the cache is a sqlite cache')
+    parser.add_argument('--format', choices=['json', 'binary'], default=None,
+                        help='Convert module meta/data files to the given format '
+                             '(default: keep the format)')
     parser.add_argument('--output_dir', action='store', default=None,
                         help="Output cache location (default: same as input)")
     parser.add_argument('input_dir',
@@ -25,14 +65,41 @@ def main() -> None:
 
     input_dir = args.input_dir
     output_dir = args.output_dir or input_dir
-    if args.to_sqlite:
+    if args.same_store:
+        if args.format is None:
+            parser.error('--same-store requires --format')
+        store = SqliteMetadataStore if args.sqlite else FilesystemMetadataStore
+        input, output = store(input_dir), store(output_dir)  # type: MetadataStore, MetadataStore
+    elif args.to_sqlite:
         input, output = FilesystemMetadataStore(input_dir), SqliteMetadataStore(output_dir)
     else:
         input, output = SqliteMetadataStore(input_dir), FilesystemMetadataStore(output_dir)
 
-    for s in input.list_all():
-        if s.endswith('.json'):
-            assert output.write(s, input.read(s), input.getmtime(s)), "Failed to write cache file!"
+    names = [s for s in input.list_all() if s.endswith('.json')]
+    metas = [s for s in names if s.endswith('.meta.json')]
+    # Interface hashes of converted data files
+    interface_hashes = {}  # type: Dict[str, str]
+    # Write the data files first, since the metadata describes them.
+    for s in names:
+        if s.endswith('.meta.json'):
+            continue
+        data = input.read_bytes(s)
+        if s.endswith('.data.json'):
+            converted = convert_entry(data, args.format)
+            interface_hashes[s] = compute_cache_hash(converted)
+        else:
+            converted = data
+        # Preserve mtimes, since metadata files record the data file mtime.
+        assert output.write(s, converted, input.getmtime(s)), "Failed to write cache file!"
+    for s in metas:
+        data = input.read_bytes(s)
+        data_name = s[:-len('.meta.json')] + '.data.json'
+        if args.format is not None and data_name in interface_hashes:
+            converted = convert_meta(data, args.format, interface_hashes[data_name],
+                                     output.getmtime(data_name))
+        else:
+            converted = data
+        assert output.write(s, converted, input.getmtime(s)), "Failed to write cache file!"
     output.commit()
 
 
@@ -0,0 +1 @@
+"""Benchmarks of mypy itself (run with python -m mypy.bench, see mypy.bench.runner)."""
@@ -0,0 +1,4 @@
+from mypy.bench.runner import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""Run benchmark workloads and compare results.
+
+Usage:
+
+  python -m mypy.bench list
+  python -m mypy.bench run [-n TRIALS] [-o results.json] [WORKLOAD ...]
+  python -m mypy.bench compare old.json new.json [--threshold 1.05]
+
+Each trial runs in a fresh child process. The results file has the
+metrics of every trial and a summary with the median of each metric,
+so results of different commits can be compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing_extensions import Final
+
+from mypy.bench.workloads import Metrics, Workload, create_workloads
+from mypy.memprofile import peak_rss_kib, reachable_memory_kib
+from mypy.version import __version__
+
+# Summary metrics that are compared between results (smaller is better)
+COMPARED_METRICS = ('wall', 'cpu', 'rss_peak_kib', 'reachable_kib', 'node_kib',
+                    'initial', 'update_median')  # type: Final
+
+
+def run_trial(workload: Workload, workdir: str, reachable: bool) -> Metrics:
+    """Run a single trial in this process.
+
+    Besides the metrics returned by the workload, record wall clock time
+    and CPU time (in seconds) and peak memory use (in KiB).
+    """
+    workload.prepare_trial(workdir)
+    t0 = time.time()
+    c0 = time.process_time()
+    metrics = workload.run(workdir)
+    metrics['wall'] = time.time() - t0
+    metrics['cpu'] = time.process_time() - c0
+    metrics['rss_peak_kib'] = peak_rss_kib()
+    if reachable:
+        metrics['reachable_kib'] = reachable_memory_kib()
+    return metrics
+
+
+def run_trial_in_child(name: str, workdir: str, options: argparse.Namespace) -> Metrics:
+    result_file = os.path.join(workdir, 'trial.json')
+    if os.path.exists(result_file):
+        os.remove(result_file)
+    args = [sys.executable, '-m', 'mypy.bench', 'trial', name, workdir, result_file,
+            '--scale', str(options.scale), '--commits', str(options.commits)]
+    if options.repo:
+        args += ['--repo', options.repo]
+    if options.reachable:
+        args.append('--reachable')
+    subprocess.check_call(args)
+    with open(result_file) as f:
+        metrics = json.load(f)  # type: Metrics
+    return metrics
+
+
+def summarize(trials: List[Metrics]) -> Dict[str, float]:
+    """Return the median of each numeric metric over trials."""
+    values = {}  # type: Dict[str, List[float]]
+    for metrics in trials:
+        for key, value in metrics.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values.setdefault(key, []).append(value)
+    return {key: statistics.median(items) for key, items in sorted(values.items())}
+
+
+def run_workloads(workloads: Sequence[Workload], workdir: str,
+                  options: argparse.Namespace) -> Dict[str, Any]:
+    results = {}  # type: Dict[str, Any]
+    for workload in workloads:
+        print('Running {} ({})'.format(workload.name, workload.description))
+        subdir = os.path.join(workdir, workload.name)
+        os.makedirs(subdir, exist_ok=True)
+        workload.setup(subdir)
+        if workload.needs_warmup:
+            run_trial_in_child(workload.name, subdir, options)
+        trials = []
+        for i in range(options.trials):
+            metrics = run_trial_in_child(workload.name, subdir, options)
+            print('  trial {}: {:.3f}s, peak RSS {} KiB'.format(
+                i + 1, metrics['wall'], metrics['rss_peak_kib']))
+            trials.append(metrics)
+        results[workload.name] = {
+            'description': workload.description,
+            'trials': trials,
+            'summary': summarize(trials),
+        }
+    return {
+        'mypy_version': __version__,
+        'python_version': platform.python_version(),
+        'platform': sys.platform,
+        'timestamp': time.time(),
+        'trials': options.trials,
+        'scale': options.scale,
+        'workloads': results,
+    }
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any],
+                    threshold: Optional[float] = None) -> Tuple[List[str], List[str]]:
+    """Compare the summaries of two results.
+
+    Return (report lines, regressions). A metric has regressed if the new
+    value is more than threshold times the old value.
+    """
+    lines = ['{:<24} {:<16} {:>14} {:>14} {:>8}'.format(
+        'workload', 'metric', 'old', 'new', 'ratio')]
+    regressions = []
+    old_workloads = old['workloads']  # type: Dict[str, Any]
+    new_workloads = new['workloads']  # type: Dict[str, Any]
+    for name in sorted(set(old_workloads) & set(new_workloads)):
+        old_summary = old_workloads[name]['summary']
+        new_summary = new_workloads[name]['summary']
+        for metric in COMPARED_METRICS:
+            if metric not in old_summary or metric not in new_summary:
+                continue
+            old_value = old_summary[metric]
+            new_value = new_summary[metric]
+            ratio = new_value / old_value if old_value > 0 else float('inf')
+            lines.append('{:<24} {:<16} {:>14.3f} {:>14.3f} {:>8.3f}'.format(
+                name, metric, old_value, new_value, ratio))
+            if threshold is not None and ratio > threshold:
+                regressions.append('{} {}'.format(name, metric))
+    return lines, regressions
+
+
+def add_workload_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply the sizes of synthetic code bases by this')
+    parser.add_argument('--repo', help='Git repository for the daemon-history workload '
+                        '(default: the mypy checkout, if there is one)')
+    parser.add_argument('--commits', type=int, default=10,
+                        help='Number of commits to replay in the daemon-history workload')
+    parser.add_argument('--reachable', action='store_true',
+                        help='Also measure memory reachable from the gc after each '
+                        'trial (slow)')
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m mypy.bench',
+                                     description='Run mypy benchmarks.')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    subparsers.add_parser('list', help='List the available workloads')
+
+    p = subparsers.add_parser('run', help='Run workloads (default: all)')
+    p.add_argument('workloads', nargs='*', metavar='WORKLOAD')
+    p.add_argument('-n', '--trials', type=int, default=3, help='Number of trials per workload')
+    p.add_argument('-o', '--output', help='Write results as JSON to this file')
+    p.add_argument('--workdir', help='Directory for generated files and caches '
+                   '(default: a temporary directory)')
+    add_workload_arguments(p)
+
+    p = subparsers.add_parser('compare', help='Compare two results files')
+    p.add_argument('old')
+    p.add_argument('new')
+    p.add_argument('--threshold', type=float,
+                   help='Exit with status 1 if a metric is larger than this times '
+                   'the old value')
+
+    # Used internally to run a single trial in a child process
+    p = subparsers.add_parser('trial')
+    p.add_argument('workload')
+    p.add_argument('workdir')
+    p.add_argument('result_file')
+    add_workload_arguments(p)
+
+    options = parser.parse_args(argv)
+
+    if options.command == 'list':
+        for name, workload in create_workloads().items():
+            print('{:<24} {}'.format(name, workload.description))
+    elif options.command == 'compare':
+        with open(options.old) as f:
+            old = json.load(f)
+        with open(options.new) as f:
+            new = json.load(f)
+        lines, regressions = compare_results(old, new, options.threshold)
+        print('\n'.join(lines))
+        if regressions:
+            print('Regressions: {}'.format(', '.join(regressions)))
+            sys.exit(1)
+    elif options.command == 'trial':
+        workload = create_workloads(options.scale, options.repo,
+                                    options.commits)[options.workload]
+        metrics = run_trial(workload, options.workdir, options.reachable)
+        with open(options.result_file, 'w') as f:
+            json.dump(metrics, f)
+    else:
+        all_workloads = create_workloads(options.scale, options.repo, options.commits)
+        names = options.workloads or list(all_workloads)
+        unknown = [name for name in names if name not in all_workloads]
+        if unknown:
+            parser.error('unknown workload(s): {}'.format(', '.join(unknown)))
+        workloads = [all_workloads[name] for name in names]
+        if options.workdir:
+            results = run_workloads(workloads, os.path.abspath(options.workdir), options)
+        else:
+            with tempfile.TemporaryDirectory() as workdir:
+                results = run_workloads(workloads, workdir, options)
+        if options.output:
+            with open(options.output, 'w') as f:
+                json.dump(results, f, indent=1, sort_keys=True)
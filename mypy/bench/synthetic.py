@@ -0,0 +1,179 @@
+"""Generators of synthetic code bases that stress particular parts of mypy.
+
+Each generator takes a size parameter and returns a dictionary from
+module names (all in the same package) to source code. The output is
+deterministic, so that results for different commits are comparable.
+The generated code is expected to type check without errors.
+"""
+
+import os
+
+from typing import Callable, Dict, List
+
+# Module name -> source code
+Modules = Dict[str, str]
+
+
+def deep_class_hierarchy(size: int) -> Modules:
+    """Generate a long chain of generic subclasses spread across modules.
+
+    This stresses MROs, member lookup through many base classes, override
+    checks and mapping instances to supertypes.
+    """
+    per_module = 20
+    modules = {}  # type: Modules
+    num_modules = max(1, size // per_module)
+    for m in range(num_modules):
+        lines = ['from typing import Generic, List, TypeVar', '']
+        if m > 0:
+            lines.insert(1, 'from pkg.hier{} import C{}'.format(m - 1, m * per_module - 1))
+        lines += ["T = TypeVar('T')", '']
+        for i in range(m * per_module, (m + 1) * per_module):
+            if i == 0:
+                lines.append('class C0(Generic[T]):')
+                lines.append('    def __init__(self, item: T) -> None:')
+                lines.append('        self.item = item')
+                lines.append('        self.items = [item]  # type: List[T]')
+            else:
+                lines.append('class C{}(C{}[T]):'.format(i, i - 1))
+            lines.append('    attr{} = {}'.format(i, i))
+            lines.append('    def get(self) -> T:')
+            lines.append('        return self.item')
+            lines.append('    def method{}(self, x: T) -> List[T]:'.format(i))
+            lines.append('        self.items.append(x)')
+            if i > 0:
+                lines.append('        self.method{}(x)'.format(i - 1))
+            lines.append('        return self.items + [self.get()]')
+            lines.append('')
+            lines.append('def use{}(c: C{}[int]) -> int:'.format(i, i))
+            lines.append('    return c.get() + c.attr0 + len(c.method0(c.attr{}))'.format(i))
+            lines.append('')
+            lines.append('')
+        modules['pkg.hier{}'.format(m)] = '\n'.join(lines)
+    return modules
+
+
+def big_unions(size: int) -> Modules:
+    """Generate functions that take and narrow unions with many items.
+
+    This stresses union simplification, isinstance narrowing and joins.
+    """
+    modules = {}  # type: Modules
+    classes = ['class U{}:\n    value = {}\n'.format(i, i) for i in range(size)]
+    modules['pkg.unionclasses'] = '\n\n'.join(classes)
+    names = ['U{}'.format(i) for i in range(size)]
+    lines = ['from typing import List, Union',
+             'from pkg.unionclasses import {}'.format(', '.join(names)),
+             '',
+             'Big = Union[{}]'.format(', '.join(names)),
+             '',
+             '']
+    for i in range(size):
+        lines.append('def narrow{}(x: Big) -> int:'.format(i))
+        lines.append('    if isinstance(x, U{}):'.format(i))
+        lines.append('        return x.value')
+        lines.append('    y = [x, U{}()]'.format(i))
+        lines.append('    z = y[0] if x else y[1]')
+        lines.append('    return z.value')
+        lines.append('')
+        lines.append('')
+    lines.append('def collect(xs: List[Big]) -> List[Union[Big, int, str]]:')
+    lines.append('    result = []  # type: List[Union[Big, int, str]]')
+    lines.append('    for x in xs:')
+    lines.append('        result.append(x)')
+    lines.append('        result.append(x.value)')
+    lines.append('        result.append(str(x))')
+    lines.append('    return result')
+    modules['pkg.unions'] = '\n'.join(lines)
+    return modules
+
+
+def many_overloads(size: int) -> Modules:
+    """Generate overloaded functions with many items and calls to them.
+
+    This stresses overload consistency checks and overload resolution.
+    """
+    variants = 20
+    lines = ['from typing import List, Tuple, Union, overload', '', '']
+    for c in range(variants):
+        lines.append('class A{}:'.format(c))
+        lines.append('    pass')
+        lines.append('')
+        lines.append('')
+    for i in range(size):
+        for c in range(variants):
+            lines.append('@overload')
+            lines.append('def f{}(x: A{}, y: int = ...) -> Tuple[A{}, int]: ...'.format(i, c, c))
+        lines.append('@overload')
+        lines.append('def f{}(x: List[int], y: str) -> str: ...'.format(i))
+        lines.append('def f{}(x: object, y: Union[int, str] = 0) -> object:'.format(i))
+        lines.append('    return x')
+        lines.append('')
+        lines.append('')
+        lines.append('def call{}(a: A{}, b: List[int]) -> int:'.format(i, i % variants))
+        lines.append('    s = f{}(b, "x")'.format(i))
+        lines.append('    t = f{}(a)'.format(i))
+        lines.append('    return len(s) + t[1] + f{}(A{}(), 1)[1]'.format(i, variants - 1))
+        lines.append('')
+        lines.append('')
+    return {'pkg.overloads': '\n'.join(lines)}
+
+
+def literal_dicts(size: int) -> Modules:
+    """Generate huge dictionary and list displays.
+
+    This stresses type inference for large expressions with joins of the
+    item types.
+    """
+    lines = ['from typing import Dict', '']
+    lines.append('table = {')
+    for i in range(size):
+        lines.append("    'key{}': {{'id': {}, 'name': 'n{}', 'tags': ['a', 'b'],"
+                     " 'weight': {}.5, 'extra': None}},".format(i, i, i, i))
+    lines.append('}')
+    lines.append('')
+    lines.append('numbers = [')
+    for i in range(0, size, 10):
+        lines.append('    ' + ', '.join(str(j) for j in range(i, i + 10)) + ',')
+    lines.append(']')
+    lines.append('')
+    lines.append('mixed = {')
+    for i in range(size):
+        value = (str(i), "'s{}'".format(i), '{}.0'.format(i), '[{}]'.format(i))[i % 4]
+        lines.append('    {}: {},'.format(i, value))
+    lines.append('}')
+    lines.append('')
+    lines.append('')
+    lines.append('def lookup(key: str) -> Dict[str, object]:')
+    lines.append('    return table[key]')
+    return {'pkg.literals': '\n'.join(lines)}
+
+
+GENERATORS = {
+    'deep-hierarchy': deep_class_hierarchy,
+    'big-unions': big_unions,
+    'many-overloads': many_overloads,
+    'literal-dicts': literal_dicts,
+}  # type: Dict[str, Callable[[int], Modules]]
+
+
+def write_modules(root: str, modules: Modules) -> List[str]:
+    """Write modules below the directory root and return the paths of the files.
+
+    Packages get empty __init__.py files.
+    """
+    paths = []
+    for module, source in sorted(modules.items()):
+        parts = module.split('.')
+        for i in range(1, len(parts)):
+            package_dir = os.path.join(root, *parts[:i])
+            os.makedirs(package_dir, exist_ok=True)
+            init = os.path.join(package_dir, '__init__.py')
+            if not os.path.exists(init):
+                with open(init, 'w'):
+                    pass
+        path = os.path.join(root, *parts) + '.py'
+        with open(path, 'w') as f:
+            f.write(source + '\n')
+        paths.append(path)
+    return paths
@@ -0,0 +1,222 @@
+"""Benchmark workloads.
+
+A workload is set up once in the parent process (for example, by
+generating source files), and each trial then runs in a fresh child
+process (see mypy.bench.runner), so that the memory peak and the state
+of in-process caches only reflect that trial.
+"""
+
+import os
+import shutil
+import statistics
+import subprocess
+import time
+from abc import ABCMeta, abstractmethod
+
+from typing import Any, Dict, List, Optional
+
+import mypy
+from mypy import build
+from mypy.bench.synthetic import GENERATORS, write_modules
+from mypy.dmypy_server import Server
+from mypy.errors import CompileError
+from mypy.main import process_options
+from mypy.memprofile import node_memory_stats
+
+# Metrics (other than the standard ones recorded by the runner) by name
+Metrics = Dict[str, Any]
+
+# Directory that contains the mypy package (the root of a source checkout)
+MYPY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(mypy.__file__)))
+
+
+class Workload(metaclass=ABCMeta):
+    """Base class of benchmark workloads."""
+
+    name = ''
+    description = ''
+    # Run one untimed trial before the timed trials (to populate caches, for example)
+    needs_warmup = False
+
+    def setup(self, workdir: str) -> None:
+        """Prepare workdir for running trials (called in the parent process)."""
+        pass
+
+    def prepare_trial(self, workdir: str) -> None:
+        """Do untimed work before each trial (called in the child process)."""
+        pass
+
+    @abstractmethod
+    def run(self, workdir: str) -> Metrics:
+        """Run one trial and return any additional metrics."""
+        pass
+
+
+def run_mypy(args: List[str]) -> int:
+    """Type check in-process using command line arguments and return the number of errors."""
+    sources, options = process_options(args)
+    try:
+        result = build.build(sources, options)
+    except CompileError as e:
+        return len(e.messages)
+    return len(result.errors)
+
+
+def remove_dir(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+class SelfCheck(Workload):
+    """Type check mypy itself with the self check configuration."""
+
+    def __init__(self, warm: bool) -> None:
+        self.warm = warm
+        self.needs_warmup = warm
+        self.name = 'self-check-warm' if warm else 'self-check-cold'
+        self.description = 'Type check mypy with {} incremental cache'.format(
+            'a warm' if warm else 'an empty')
+
+    def prepare_trial(self, workdir: str) -> None:
+        os.chdir(MYPY_ROOT)
+        if not self.warm:
+            remove_dir(os.path.join(workdir, 'cache'))
+
+    def run(self, workdir: str) -> Metrics:
+        args = ['--cache-dir', os.path.join(workdir, 'cache'), '-p', 'mypy']
+        config_file = os.path.join(MYPY_ROOT, 'mypy_self_check.ini')
+        if os.path.isfile(config_file):
+            args = ['--config-file', config_file] + args
+        return {'errors': run_mypy(args)}
+
+
+class NodeMemory(Workload):
+    """Measure the memory used by AST nodes after type checking mypy.
+
+    The daemon keeps the ASTs of all modules in memory, so their size
+    matters for long-running processes.
+    """
+
+    name = 'node-memory'
+    description = 'Memory used by AST nodes after type checking mypy'
+
+    def prepare_trial(self, workdir: str) -> None:
+        os.chdir(MYPY_ROOT)
+
+    def run(self, workdir: str) -> Metrics:
+        sources, options = process_options(['--no-incremental', '-p', 'mypy'])
+        options.preserve_asts = True
+        result = build.build(sources, options)
+        nodes, node_kib = node_memory_stats()
+        metrics = {'errors': len(result.errors), 'nodes': nodes,
+                   'node_kib': node_kib}  # type: Metrics
+        return metrics
+
+
+class SyntheticCheck(Workload):
+    """Type check a generated code base from scratch (see mypy.bench.synthetic)."""
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+        self.description = 'Type check synthetic code ({}, size {})'.format(name, size)
+
+    def setup(self, workdir: str) -> None:
+        src = os.path.join(workdir, 'src')
+        remove_dir(src)
+        write_modules(src, GENERATORS[self.name](self.size))
+
+    def prepare_trial(self, workdir: str) -> None:
+        os.chdir(os.path.join(workdir, 'src'))
+        remove_dir(os.path.join(workdir, 'cache'))
+
+    def run(self, workdir: str) -> Metrics:
+        return {'errors': run_mypy(['--cache-dir', os.path.join(workdir, 'cache'), 'pkg'])}
+
+
+def git(repo: str, *args: str) -> str:
+    return subprocess.check_output(['git', '-C', repo] + list(args)).decode('utf-8')
+
+
+class DaemonHistory(Workload):
+    """Replay git history in the mypy daemon (fine-grained incremental mode).
+
+    The daemon checks the oldest of the last N + 1 commits of a repository,
+    and then each following commit is checked out and rechecked. The
+    'updates' metric has the time of each update.
+    """
+
+    name = 'daemon-history'
+
+    def __init__(self, repo: str, commits: int, target: str) -> None:
+        self.repo = os.path.abspath(repo)
+        self.commits = commits
+        self.target = target
+        self.description = 'Replay {} commits of {} in the daemon'.format(commits, self.repo)
+        self.commit_ids = []  # type: List[str]
+
+    def clone(self, workdir: str) -> str:
+        return os.path.join(workdir, 'repo')
+
+    def history(self, workdir: str) -> List[str]:
+        output = git(self.clone(workdir), 'rev-list', '--first-parent', '--reverse',
+                     '-n', str(self.commits + 1), 'HEAD')
+        return output.split()
+
+    def setup(self, workdir: str) -> None:
+        clone = self.clone(workdir)
+        remove_dir(clone)
+        # Trials start from a clean checkout of the current commit of the repository.
+        subprocess.check_call(['git', 'clone', '--quiet', '--shared', self.repo, clone])
+        git(clone, 'checkout', '--quiet', '--detach', git(self.repo, 'rev-parse', 'HEAD').strip())
+
+    def prepare_trial(self, workdir: str) -> None:
+        clone = self.clone(workdir)
+        self.commit_ids = self.history(workdir)
+        git(clone, 'checkout', '--quiet', self.commit_ids[0])
+        os.chdir(clone)
+
+    def run(self, workdir: str) -> Metrics:
+        _, options = process_options([self.target], server_options=True)
+        server = Server(options, os.path.join(workdir, 'dmypy.json'))
+        t0 = time.time()
+        result = server.cmd_check([self.target], is_tty=False, terminal_width=80)
+        initial = time.time() - t0
+        updates = []
+        for commit in self.commit_ids[1:]:
+            git(self.clone(workdir), 'checkout', '--quiet', commit)
+            t0 = time.time()
+            result = server.cmd_check([self.target], is_tty=False, terminal_width=80)
+            updates.append(time.time() - t0)
+        metrics = {'initial': initial, 'updates': updates}  # type: Metrics
+        if updates:
+            metrics['update_median'] = statistics.median(updates)
+            metrics['update_total'] = sum(updates)
+        metrics['final_status'] = result.get('status')
+        return metrics
+
+
+def create_workloads(scale: float = 1.0,
+                     repo: Optional[str] = None,
+                     commits: int = 10) -> Dict[str, Workload]:
+    """Create all workloads by name.
+
+    The sizes of synthetic code bases are multiplied by scale. The daemon
+    history workload replays the history of repo (by default, the mypy
+    checkout that contains this module, if there is one).
+    """
+    workloads = [SelfCheck(warm=False), SelfCheck(warm=True),
+                 NodeMemory()]  # type: List[Workload]
+    base_sizes = {
+        'deep-hierarchy': 400,
+        'big-unions': 200,
+        'many-overloads': 100,
+        'literal-dicts': 5000,
+    }
+    for name in sorted(GENERATORS):
+        workloads.append(SyntheticCheck(name, max(1, int(base_sizes[name] * scale))))
+    if repo is None and os.path.isdir(os.path.join(MYPY_ROOT, '.git')):
+        repo = MYPY_ROOT
+    if repo is not None:
+        workloads.append(DaemonHistory(repo, commits, 'mypy' if repo == MYPY_ROOT else '.'))
+    return {workload.name: workload for workload in workloads}
@@ -0,0 +1,233 @@
+"""Compact binary encoding for cache files.
+
+The JSON-compatible values produced by MypyFile.serialize() (and the
+cache metadata dictionaries) can be stored either as JSON text or in
+the binary format implemented here. The binary format is considerably
+smaller and cheaper to decode, since every distinct string (symbol
+names, fullnames, '.class' tags, dictionary keys) is stored only once
+in a string table and referred to by index afterwards.
+
+Layout of an encoded value:
+
+  * MAGIC (the first byte is never valid in UTF-8 JSON text, so readers
+    can tell the two formats apart without any out-of-band information)
+  * varint: number of strings in the table
+  * for each string: varint byte length followed by UTF-8 bytes
+  * the root value
+
+Each value starts with a one-byte tag. Containers are length prefixed.
+Dictionaries that have a '.class' key (serialized nodes and types) use
+a dedicated record tag that stores the class name index up front.
+
+The encoding is deterministic (dictionary keys are sorted, like
+json.dumps(..., sort_keys=True)), so hashes of the encoded data can be
+used as interface hashes.
+"""
+
+import struct
+
+from typing import Any, Dict, List, Union
+from typing_extensions import Final
+
+MAGIC = b'\xffMYPY\x01'  # type: Final
+
+TAG_NONE = 0  # type: Final
+TAG_FALSE = 1  # type: Final
+TAG_TRUE = 2  # type: Final
+TAG_INT = 3  # type: Final
+TAG_NEG_INT = 4  # type: Final
+TAG_FLOAT = 5  # type: Final
+TAG_STR = 6  # type: Final
+TAG_LIST = 7  # type: Final
+TAG_DICT = 8  # type: Final
+TAG_RECORD = 9  # type: Final
+
+_double = struct.Struct('<d')  # type: Final
+
+
+class BinaryCacheError(ValueError):
+    """The data is not a valid binary cache encoding."""
+
+
+def is_binary_cache_data(data: Union[str, bytes]) -> bool:
+    return isinstance(data, bytes) and data.startswith(MAGIC)
+
+
+class BinaryEncoder:
+    def __init__(self) -> None:
+        self.strings = {}  # type: Dict[str, int]
+        self.buf = bytearray()
+
+    def encode(self, obj: Any) -> bytes:
+        self.write_value(obj)
+        header = bytearray(MAGIC)
+        write_varint(header, len(self.strings))
+        # Dictionaries preserve insertion order, which is the index order.
+        for s in self.strings:
+            b = s.encode('utf-8')
+            write_varint(header, len(b))
+            header += b
+        return bytes(header + self.buf)
+
+    def string_index(self, s: str) -> int:
+        index = self.strings.get(s)
+        if index is None:
+            index = len(self.strings)
+            self.strings[s] = index
+        return index
+
+    def write_value(self, obj: Any) -> None:
+        buf = self.buf
+        if obj is None:
+            buf.append(TAG_NONE)
+        elif obj is True:
+            buf.append(TAG_TRUE)
+        elif obj is False:
+            buf.append(TAG_FALSE)
+        elif isinstance(obj, str):
+            buf.append(TAG_STR)
+            write_varint(buf, self.string_index(obj))
+        elif isinstance(obj, int):
+            if obj >= 0:
+                buf.append(TAG_INT)
+                write_varint(buf, obj)
+            else:
+                buf.append(TAG_NEG_INT)
+                write_varint(buf, -obj)
+        elif isinstance(obj, float):
+            buf.append(TAG_FLOAT)
+            buf += _double.pack(obj)
+        elif isinstance(obj, (list, tuple)):
+            buf.append(TAG_LIST)
+            write_varint(buf, len(obj))
+            for item in obj:
+                self.write_value(item)
+        elif isinstance(obj, dict):
+            items = sorted(obj.items())
+            cls = obj.get('.class')
+            if isinstance(cls, str):
+                buf.append(TAG_RECORD)
+                write_varint(buf, self.string_index(cls))
+                write_varint(buf, len(items) - 1)
+                for key, value in items:
+                    if key != '.class':
+                        write_varint(buf, self.string_index(key))
+                        self.write_value(value)
+            else:
+                buf.append(TAG_DICT)
+                write_varint(buf, len(items))
+                for key, value in items:
+                    if not isinstance(key, str):
+                        # Match json.dumps(), which converts keys to strings.
+                        key = str(key)
+                    write_varint(buf, self.string_index(key))
+                    self.write_value(value)
+        else:
+            raise TypeError('Cannot encode object of type {}'.format(type(obj).__name__))
+
+
+def write_varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7f) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+class BinaryDecoder:
+    def __init__(self, data: bytes) -> None:
+        if not data.startswith(MAGIC):
+            raise BinaryCacheError('Missing binary cache header')
+        self.data = data
+        self.pos = len(MAGIC)
+        self.strings = []  # type: List[str]
+
+    def decode(self) -> Any:
+        n = self.read_varint()
+        data = self.data
+        strings = self.strings
+        for _ in range(n):
+            size = self.read_varint()
+            end = self.pos + size
+            strings.append(data[self.pos:end].decode('utf-8'))
+            self.pos = end
+        result = self.read_value()
+        if self.pos != len(data):
+            raise BinaryCacheError('Trailing data after binary cache value')
+        return result
+
+    def read_varint(self) -> int:
+        data = self.data
+        pos = self.pos
+        result = 0
+        shift = 0
+        while True:
+            try:
+                b = data[pos]
+            except IndexError:
+                raise BinaryCacheError('Truncated binary cache data') from None
+            pos += 1
+            result |= (b & 0x7f) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        self.pos = pos
+        return result
+
+    def read_value(self) -> Any:
+        try:
+            tag = self.data[self.pos]
+        except IndexError:
+            raise BinaryCacheError('Truncated binary cache data') from None
+        self.pos += 1
+        if tag == TAG_STR:
+            return self.strings[self.read_varint()]
+        elif tag == TAG_RECORD:
+            strings = self.strings
+            record = {'.class': strings[self.read_varint()]}  # type: Dict[str, Any]
+            for _ in range(self.read_varint()):
+                key = strings[self.read_varint()]
+                record[key] = self.read_value()
+            return record
+        elif tag == TAG_LIST:
+            return [self.read_value() for _ in range(self.read_varint())]
+        elif tag == TAG_INT:
+            return self.read_varint()
+        elif tag == TAG_NONE:
+            return None
+        elif tag == TAG_TRUE:
+            return True
+        elif tag == TAG_FALSE:
+            return False
+        elif tag == TAG_DICT:
+            strings = self.strings
+            result = {}  # type: Dict[str, Any]
+            for _ in range(self.read_varint()):
+                key = strings[self.read_varint()]
+                result[key] = self.read_value()
+            return result
+        elif tag == TAG_NEG_INT:
+            return -self.read_varint()
+        elif tag == TAG_FLOAT:
+            end = self.pos + 8
+            if end > len(self.data):
+                raise BinaryCacheError('Truncated binary cache data')
+            value = _double.unpack(self.data[self.pos:end])[0]  # type: float
+            self.pos = end
+            return value
+        raise BinaryCacheError('Invalid tag {} in binary cache data'.format(tag))
+
+
+def encode_binary(obj: Any) -> bytes:
+    """Encode a JSON-compatible value using the binary cache format."""
+    return BinaryEncoder().encode(obj)
+
+
+def decode_binary(data: bytes) -> Any:
+    """Decode a value produced by encode_binary().
+
+    Raise BinaryCacheError if the data is corrupted.
+    """
+    try:
+        return BinaryDecoder(data).decode()
+    except (IndexError, UnicodeDecodeError) as err:
+        raise BinaryCacheError(str(err)) from err
@@ -10,30 +10,43 @@ The function build() is the main interface to this module.
 """
 # TODO: More consistent terminology, e.g. path/fnam, module/id, state/file
 
+import concurrent.futures
 import contextlib
 import errno
 import gc
+import io
 import json
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.pool
 import os
 import pathlib
+import pickle
 import re
 import stat
 import sys
 import time
+import traceback
 import types
 
-from typing import (AbstractSet, Any, Dict, Iterable, Iterator, List, Sequence,
+from typing import (AbstractSet, Any, Dict, IO, Iterable, Iterator, List, Sequence,
                     Mapping, NamedTuple, Optional, Set, Tuple, Union, Callable, TextIO)
 from typing_extensions import ClassVar, Final, TYPE_CHECKING
+from multiprocessing.process import BaseProcess
 from mypy_extensions import TypedDict
 
-from mypy.nodes import MypyFile, ImportBase, Import, ImportFrom, ImportAll, SymbolTable
+from mypy.nodes import (
+    MypyFile, ImportBase, Import, ImportFrom, ImportAll, SymbolTable, VAR_NO_INFO,
+    CLASSDEF_NO_INFO, FUNC_NO_INFO
+)
 from mypy.semanal_pass1 import SemanticAnalyzerPreAnalysis
 from mypy.semanal import SemanticAnalyzer
 import mypy.semanal_main
 from mypy.checker import TypeChecker
 from mypy.indirection import TypeIndirectionVisitor
-from mypy.errors import Errors, CompileError, ErrorInfo, report_internal_error
+from mypy.errors import (
+    Errors, CompileError, ErrorInfo, report_internal_error, format_raw_messages
+)
 from mypy.util import (
     DecodeError, decode_python_encoding, is_sub_path, get_mypy_comments, module_prefix,
     read_py_file, hash_digest, is_typeshed_file
@@ -50,13 +63,23 @@ from mypy.nodes import Expression
 from mypy.options import Options
 from mypy.parse import parse
 from mypy.stats import dump_type_stats
-from mypy.types import Type
+from mypy.types import Type, NOT_READY
 from mypy.version import __version__
 from mypy.plugin import Plugin, ChainedPlugin, ReportConfigContext
 from mypy.plugins.default import DefaultPlugin
 from mypy.fscache import FileSystemCache
-from mypy.metastore import MetadataStore, FilesystemMetadataStore, SqliteMetadataStore
-from mypy.typestate import TypeState, reset_global_state
+from mypy.metastore import (
+    MetadataStore, FilesystemMetadataStore, SqliteMetadataStore, BundledMetadataStore,
+    BUNDLE_PREFIX
+)
+from mypy.cachebundle import CacheBundle, find_cache_bundle
+from mypy.binarycache import encode_binary, decode_binary, is_binary_cache_data
+from mypy.typestate import TypeState, PersistentSubtypeCache, reset_global_state
+from mypy.server.depmap import DependencyMap
+from mypy.timing import (
+    TimingReport, TimingEvent, PARSE_PHASE, TYPE_CHECK_PHASE, TYPE_CHECK_DEFERRED_PHASE,
+    FINISH_PASSES_PHASE, WRITE_CACHE_PHASE, LOAD_CACHE_PHASE, SCC_PHASE
+)
 from mypy.renaming import VariableRenameVisitor
 from mypy.config_parser import parse_mypy_comments
 from mypy.freetree import free_tree
@@ -69,6 +92,9 @@ from mypy import errorcodes as codes
 # that it's easy to enable this when running tests.
 DEBUG_FINE_GRAINED = False  # type: Final
 
+# Maximum number of threads used to hash source files whose mtimes have changed
+MAX_HASH_THREADS = 8  # type: Final
+
 # These modules are special and should always come from typeshed.
 CORE_BUILTIN_MODULES = {
     'builtins',
@@ -225,7 +251,10 @@ def _build(sources: List[BuildSource],
                     lambda path: read_py_file(path, cached_read, options.python_version),
                     options.show_absolute_path,
                     options.enabled_error_codes,
-                    options.disabled_error_codes)
+                    options.disabled_error_codes,
+                    options.error_format,
+                    # Fine-grained updates need to know about all previous errors.
+                    options.stream_errors and not options.fine_grained_incremental)
     plugin, snapshot = load_plugins(options, errors, stdout, extra_plugins)
 
     # Add catch-all .gitignore to cache dir if we created it
@@ -256,6 +285,7 @@ def _build(sources: List[BuildSource],
             TypeState.reset_all_subtype_caches()
         return BuildResult(manager, graph)
     finally:
+        flush_meta_updates(manager)
         t0 = time.time()
         manager.metastore.commit()
         manager.add_stats(cache_commit_time=time.time() - t0)
@@ -264,6 +294,12 @@ def _build(sources: List[BuildSource],
                      len(manager.modules),
                      manager.errors.num_messages()))
         manager.dump_stats()
+        if manager.timing_report is not None and options.timing_report:
+            try:
+                manager.timing_report.write(options.timing_report)
+            except OSError as err:
+                print("mypy: can't write timing report {}: {}".format(options.timing_report,
+                                                                      err), file=stderr)
         if reports is not None:
             # Finish the HTML or XML reports even if CompileError was raised.
             reports.finish()
@@ -582,6 +618,10 @@ class BuildManager:
         self.stdout = stdout
         self.stderr = stderr
         self.start_time = time.time()
+        # Times of build phases per module, if requested (see --timing-report)
+        self.timing_report = None  # type: Optional[TimingReport]
+        if options.timing_report:
+            self.timing_report = TimingReport(self.start_time)
         self.data_dir = data_dir
         self.errors = errors
         self.errors.set_ignore_prefix(ignore_prefix)
@@ -597,7 +637,7 @@ class BuildManager:
         # processed. We store this in BuildManager so that we can compute
         # dependencies as we go, which allows us to free ASTs and type information,
         # saving a ton of memory on net.
-        self.fg_deps = {}  # type: Dict[str, Set[str]]
+        self.fg_deps = DependencyMap()
         # Always convert the plugin to a ChainedPlugin so that it can be manipulated if needed
         if not isinstance(plugin, ChainedPlugin):
             plugin = ChainedPlugin(options, [plugin])
@@ -623,7 +663,11 @@ class BuildManager:
                               and not has_reporters)
         self.fscache = fscache
         self.find_module_cache = FindModuleCache(self.search_paths, self.fscache, self.options)
-        self.metastore = create_metastore(options)
+        # Read-only cache data for typeshed, if available (see mypy.cachebundle)
+        self.cache_bundle = None  # type: Optional[CacheBundle]
+        if self.cache_enabled:
+            self.cache_bundle = find_cache_bundle(options, data_dir, version_id)
+        self.metastore = create_metastore(options, self.cache_bundle)
 
         # a mapping from source files to their corresponding shadow files
         # for efficient lookup
@@ -638,6 +682,13 @@ class BuildManager:
         self.plugins_snapshot = plugins_snapshot
         self.old_plugins_snapshot = read_plugins_snapshot(self)
         self.quickstart_state = read_quickstart_file(options, self.stdout)
+        # Cache metadata read by prefetch_source_hashes(), as {id: (path, meta)}
+        self.prefetched_metas = {}  # type: Dict[str, Tuple[str, Optional[CacheMeta]]]
+        # Metadata entries with updated source file mtimes, written by
+        # flush_meta_updates()
+        self.pending_meta_updates = []  # type: List[Tuple[str, Union[str, bytes]]]
+        # Workers that parse files while load_graph() runs, if --jobs is used
+        self.parse_pool = None  # type: Optional[ParsePool]
         # Fine grained targets (module top levels and top level functions) processed by
         # the semantic analyzer, used only for testing. Currently used only by the new
         # semantic analyzer.
@@ -766,13 +817,24 @@ class BuildManager:
         return find_module_simple(id, self) is not None
 
     def parse_file(self, id: str, path: str, source: str, ignore_errors: bool,
-                   options: Options) -> MypyFile:
+                   options: Options, source_hash: Optional[str] = None) -> MypyFile:
         """Parse the source of a file with the given name.
 
+        If the file was already parsed by a worker (see ParsePool), use that
+        tree instead. This requires the hash of the source.
+
         Raise CompileError if there is a parse error.
         """
         t0 = time.time()
-        tree = parse(source, path, id, self.errors, options=options)
+        with self.timed(PARSE_PHASE, id):
+            tree = None
+            if self.parse_pool is not None and source_hash is not None:
+                tree = self.parse_pool.get(path, source_hash)
+            if tree is None:
+                tree = parse(source, path, id, self.errors, options=options)
+            else:
+                self.errors.set_file(path, id)
+                self.add_stats(files_parsed_in_workers=1)
         tree._fullname = id
         self.add_stats(files_parsed=1,
                        modules_parsed=int(not tree.is_stub),
@@ -786,16 +848,16 @@ class BuildManager:
         self.errors.set_file_ignored_lines(path, tree.ignored_lines, ignore_errors)
         return tree
 
-    def load_fine_grained_deps(self, id: str) -> Dict[str, Set[str]]:
+    def load_fine_grained_deps(self, id: str) -> DependencyMap:
         t0 = time.time()
         if id in self.fg_deps_meta:
             # TODO: Assert deps file wasn't changed.
-            deps = json.loads(self.metastore.read(self.fg_deps_meta[id]['path']))
+            deps = DependencyMap.deserialize(
+                json.loads(self.metastore.read(self.fg_deps_meta[id]['path'])))
         else:
-            deps = {}
-        val = {k: set(v) for k, v in deps.items()}
+            deps = DependencyMap()
         self.add_stats(load_fg_deps_time=time.time() - t0)
-        return val
+        return deps
 
     def report_file(self,
                     file: MypyFile,
@@ -842,9 +904,21 @@ class BuildManager:
     def stats_summary(self) -> Mapping[str, object]:
         return self.stats
 
+    @contextlib.contextmanager
+    def timed(self, phase: str, name: str) -> Iterator[None]:
+        """Record the time spent in a phase of processing a module or an SCC.
+
+        This does nothing unless a timing report was requested.
+        """
+        if self.timing_report is None:
+            yield
+        else:
+            with self.timing_report.record(phase, name):
+                yield
+
 
-def deps_to_json(x: Dict[str, Set[str]]) -> str:
-    return json.dumps({k: list(v) for k, v in x.items()})
+def deps_to_json(x: DependencyMap) -> str:
+    return json.dumps(x.serialize())
 
 
 # File for storing metadata about all the fine-grained dependency caches
@@ -857,7 +931,7 @@ DEPS_ROOT_FILE = '@root.deps.json'  # type: Final
 FAKE_ROOT_MODULE = '@root'  # type: Final
 
 
-def write_deps_cache(rdeps: Dict[str, Dict[str, Set[str]]],
+def write_deps_cache(rdeps: Dict[str, DependencyMap],
                      manager: BuildManager, graph: Graph) -> None:
     """Write cache files for fine-grained dependencies.
 
@@ -921,8 +995,8 @@ def write_deps_cache(rdeps: Dict[str, Dict[str, Set[str]]],
                               blocker=True)
 
 
-def invert_deps(deps: Dict[str, Set[str]],
-                graph: Graph) -> Dict[str, Dict[str, Set[str]]]:
+def invert_deps(deps: DependencyMap,
+                graph: Graph) -> Dict[str, DependencyMap]:
     """Splits fine-grained dependencies based on the module of the trigger.
 
     Returns a dictionary from module ids to all dependencies on that
@@ -936,20 +1010,22 @@ def invert_deps(deps: Dict[str, Set[str]],
     # Prepopulate the map for all the modules that have been processed,
     # so that we always generate files for processed modules (even if
     # there aren't any dependencies to them.)
-    rdeps = {id: {} for id, st in graph.items() if st.tree}  # type: Dict[str, Dict[str, Set[str]]]
+    rdeps = {id: DependencyMap() for id, st in graph.items() if st.tree}
     for trigger, targets in deps.items():
         module = module_prefix(graph, trigger_to_target(trigger))
         if not module or not graph[module].tree:
             module = FAKE_ROOT_MODULE
 
-        mod_rdeps = rdeps.setdefault(module, {})
-        mod_rdeps.setdefault(trigger, set()).update(targets)
+        mod_rdeps = rdeps.get(module)
+        if mod_rdeps is None:
+            mod_rdeps = rdeps[module] = DependencyMap()
+        mod_rdeps.add(trigger, targets)
 
     return rdeps
 
 
 def generate_deps_for_cache(manager: BuildManager,
-                            graph: Graph) -> Dict[str, Dict[str, Set[str]]]:
+                            graph: Graph) -> Dict[str, DependencyMap]:
     """Generate fine-grained dependencies into a form suitable for serializing.
 
     This does a couple things:
@@ -962,8 +1038,6 @@ def generate_deps_for_cache(manager: BuildManager,
     associated with the nearest parent module that is in the build, or the
     fake module FAKE_ROOT_MODULE if none are.
     """
-    from mypy.server.deps import merge_dependencies  # Lazy import to speed up startup
-
     # Split the dependencies out into based on the module that is depended on.
     rdeps = invert_deps(manager.fg_deps, graph)
 
@@ -971,8 +1045,7 @@ def generate_deps_for_cache(manager: BuildManager,
     # load the deps for every module we've generated new dependencies
     # to and merge the new deps into them.
     for module, mdeps in rdeps.items():
-        old_deps = manager.load_fine_grained_deps(module)
-        merge_dependencies(old_deps, mdeps)
+        mdeps.merge(manager.load_fine_grained_deps(module))
 
     return rdeps
 
@@ -1002,6 +1075,63 @@ def read_plugins_snapshot(manager: BuildManager) -> Optional[Dict[str, str]]:
     return snapshot
 
 
+SUBTYPE_CACHE_FILE = '@subtype_cache.json'  # type: Final
+
+
+def use_subtype_cache(manager: BuildManager) -> bool:
+    options = manager.options
+    return (options.subtype_cache
+            and manager.cache_enabled
+            and not options.fine_grained_incremental
+            and options.cache_dir != os.devnull)
+
+
+def read_subtype_cache(manager: BuildManager) -> PersistentSubtypeCache:
+    """Read protocol subtype check results stored by the previous run."""
+    data = _load_cache_file(SUBTYPE_CACHE_FILE, manager,
+                            log_success='Subtype cache ',
+                            log_error='Could not load subtype cache: ')
+    if data is not None:
+        try:
+            return PersistentSubtypeCache.deserialize(data)
+        except (KeyError, TypeError, ValueError):
+            manager.log('Could not load subtype cache: invalid format')
+    return PersistentSubtypeCache()
+
+
+def write_subtype_cache(manager: BuildManager, cache: PersistentSubtypeCache) -> None:
+    """Write protocol subtype check results that are still valid."""
+    manager.add_stats(subtype_cache_hits=cache.hits, subtype_cache_misses=cache.misses)
+    data = cache_dumps(cache.serialize(), manager.options)
+    if not manager.metastore.write(SUBTYPE_CACHE_FILE, data):
+        manager.log('Error writing subtype cache')
+
+
+def record_subtype_cache_hashes(graph: Graph, scc: List[str]) -> None:
+    """Register the interface hashes of a processed SCC with the persistent subtype cache.
+
+    The hash registered for each module also covers the dependencies of
+    the SCC, which must have been registered before. Modules with errors
+    aren't cached, so their interface hashes aren't reliable and they
+    (and everything depending on them) don't get a hash.
+    """
+    cache = TypeState.persistent_subtype_cache
+    if cache is None or any(graph[id].transitive_error for id in scc):
+        return
+    deps = {dep for id in scc for dep in graph[id].dependencies if dep in graph}
+    deps.difference_update(scc)
+    dep_hashes = []
+    for dep in sorted(deps):
+        dep_hash = cache.module_hashes.get(dep)
+        if dep_hash is None:
+            return
+        dep_hashes.append(dep_hash)
+    interface_hashes = sorted((id, graph[id].interface_hash) for id in scc)
+    scc_hash = compute_hash(json.dumps([interface_hashes, dep_hashes]))
+    for id in scc:
+        cache.module_hashes[id] = scc_hash
+
+
 def read_quickstart_file(options: Options,
                          stdout: TextIO,
                          ) -> Optional[Dict[str, Tuple[float, int, str]]]:
@@ -1093,6 +1223,35 @@ def _load_json_file(file: str, manager: BuildManager,
         return result
 
 
+def _load_cache_file(file: str, manager: BuildManager,
+                     log_success: str, log_error: str) -> Optional[Dict[str, Any]]:
+    """Like _load_json_file(), but also accept files in the binary cache format."""
+    t0 = time.time()
+    try:
+        data = manager.metastore.read_bytes(file)
+    except IOError:
+        manager.log(log_error + file)
+        return None
+    manager.add_stats(metastore_read_time=time.time() - t0)
+    if manager.verbosity() >= 2 and not is_binary_cache_data(data):
+        manager.trace(log_success + data.decode('utf-8', 'replace').rstrip())
+    try:
+        result = cache_loads(data)
+    except ValueError:
+        manager.errors.set_file(file, None)
+        manager.errors.report(-1, -1,
+                              "Error reading cache file;"
+                              " you likely have a bad cache.\n"
+                              "Try removing the {cache_dir} directory"
+                              " and run mypy again.".format(
+                                  cache_dir=manager.options.cache_dir
+                              ),
+                              blocker=True)
+        return None
+    else:
+        return result
+
+
 def _cache_dir_prefix(options: Options) -> str:
     """Get current cache directory (or file if id is given)."""
     if options.bazel:
@@ -1134,12 +1293,19 @@ def exclude_from_backups(target_dir: str) -> None:
         pass
 
 
-def create_metastore(options: Options) -> MetadataStore:
-    """Create the appropriate metadata store."""
+def create_metastore(options: Options,
+                     cache_bundle: Optional[CacheBundle] = None) -> MetadataStore:
+    """Create the appropriate metadata store.
+
+    If a cache bundle is given, its entries are also available (see
+    BundledMetadataStore).
+    """
     if options.sqlite_cache:
         mds = SqliteMetadataStore(_cache_dir_prefix(options))  # type: MetadataStore
     else:
         mds = FilesystemMetadataStore(_cache_dir_prefix(options))
+    if cache_bundle is not None:
+        mds = BundledMetadataStore(mds, cache_bundle.open_store())
     return mds
 
 
@@ -1182,6 +1348,9 @@ def get_cache_names(id: str, path: str, options: Options) -> Tuple[str, str, Opt
 def find_cache_meta(id: str, path: str, manager: BuildManager) -> Optional[CacheMeta]:
     """Find cache data for a module.
 
+    If the project cache has no usable data for a typeshed module, look
+    for it in the cache bundle (if there is one).
+
     Args:
       id: module ID
       path: module path
@@ -1193,11 +1362,25 @@ def find_cache_meta(id: str, path: str, manager: BuildManager) -> Optional[Cache
     """
     # TODO: May need to take more build options into account
     meta_json, data_json, _ = get_cache_names(id, path, manager.options)
+    m = _find_cache_meta(id, path, meta_json, data_json, manager)
+    bundle = manager.cache_bundle
+    if m is None and bundle is not None and bundle.covers(path):
+        m = _find_cache_meta(id, path, BUNDLE_PREFIX + meta_json, BUNDLE_PREFIX + data_json,
+                             manager)
+        if m is not None:
+            # Paths in bundles are relative to the typeshed directory.
+            m = m._replace(path=bundle.source_path(m.path))
+            manager.add_stats(bundle_metas=1)
+    return m
+
+
+def _find_cache_meta(id: str, path: str, meta_json: str, data_json: str,
+                     manager: BuildManager) -> Optional[CacheMeta]:
     manager.trace('Looking for {} at {}'.format(id, meta_json))
     t0 = time.time()
-    meta = _load_json_file(meta_json, manager,
-                           log_success='Meta {} '.format(id),
-                           log_error='Could not load cache for {}: '.format(id))
+    meta = _load_cache_file(meta_json, manager,
+                            log_success='Meta {} '.format(id),
+                            log_error='Could not load cache for {}: '.format(id))
     t1 = time.time()
     if meta is None:
         return None
@@ -1358,6 +1541,10 @@ def validate_meta(meta: Optional[CacheMeta], id: str, path: Optional[str],
                 manager.log('Metadata abandoned for {}: file {} has different hash'.format(
                     id, path))
                 return None
+        elif meta.data_json.startswith(BUNDLE_PREFIX):
+            # Cache bundles are read-only, so the file will be hashed again next time.
+            manager.log('Metadata fresh (by hash) for {}: file {}'.format(id, path))
+            return meta._replace(mtime=mtime, path=path)
         else:
             t0 = time.time()
             # Optimization: update mtime and path (otherwise, this mismatch will reappear).
@@ -1381,17 +1568,13 @@ def validate_meta(meta: Optional[CacheMeta], id: str, path: Optional[str],
                 'ignore_all': meta.ignore_all,
                 'plugin_data': meta.plugin_data,
             }
-            if manager.options.debug_cache:
-                meta_str = json.dumps(meta_dict, indent=2, sort_keys=True)
-            else:
-                meta_str = json.dumps(meta_dict)
+            meta_str = cache_dumps(meta_dict, manager.options)
             meta_json, _, _ = get_cache_names(id, path, manager.options)
             manager.log('Updating mtime for {}: file {}, meta {}, mtime {}'
                         .format(id, path, meta_json, meta.mtime))
-            t1 = time.time()
-            manager.metastore.write(meta_json, meta_str)  # Ignore errors, just an optimization.
-            manager.add_stats(validate_update_time=time.time() - t1,
-                              validate_munging_time=t1 - t0)
+            # Written in bulk by flush_meta_updates().
+            manager.pending_meta_updates.append((meta_json, meta_str))
+            manager.add_stats(validate_munging_time=time.time() - t0)
             return meta
 
     # It's a match on (id, path, size, hash, mtime).
@@ -1399,6 +1582,220 @@ def validate_meta(meta: Optional[CacheMeta], id: str, path: Optional[str],
     return meta
 
 
+def prefetch_source_hashes(sources: List[BuildSource], manager: BuildManager) -> None:
+    """Read cache metadata of sources and hash modified source files concurrently.
+
+    After a VCS checkout or restoring a cache on CI, the mtimes of most
+    files differ from those recorded in the cache, and validate_meta()
+    would hash them one by one. Here the files are hashed by a thread pool
+    instead, so that validate_meta() finds the hashes in the file system
+    cache. The metadata is kept in manager.prefetched_metas, so that
+    State doesn't need to read it again.
+    """
+    if not manager.cache_enabled or manager.options.bazel:
+        return
+    t0 = time.time()
+    paths = []
+    for bs in sources:
+        if not bs.path or bs.text is not None or bs.module in manager.prefetched_metas:
+            continue
+        meta = find_cache_meta(bs.module, bs.path, manager)
+        manager.prefetched_metas[bs.module] = (bs.path, meta)
+        if meta is None or (manager.quickstart_state and bs.path in manager.quickstart_state):
+            continue
+        try:
+            st = manager.get_stat(bs.path)
+        except OSError:
+            continue
+        # These are the conditions under which validate_meta() hashes a file.
+        if (stat.S_ISREG(st.st_mode)
+                and (st.st_size == meta.size or manager.use_fine_grained_cache())
+                and (int(st.st_mtime) != meta.mtime or bs.path != meta.path)):
+            paths.append(bs.path)
+    if len(paths) > 1:
+        def hash_file(path: str) -> None:
+            try:
+                manager.fscache.hash_digest(path)
+            except OSError:
+                pass  # validate_meta() will report this
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(len(paths), MAX_HASH_THREADS)) as executor:
+            list(executor.map(hash_file, paths))
+    manager.add_stats(prefetch_hash_time=time.time() - t0, prefetch_hashed_files=len(paths))
+
+
+def flush_meta_updates(manager: BuildManager) -> None:
+    """Write metadata entries updated by validate_meta().
+
+    The entries are written at once (in a single transaction with the
+    SQLite store). Errors are ignored, since this is just an optimization.
+    """
+    if manager.pending_meta_updates:
+        t0 = time.time()
+        manager.metastore.write_many(manager.pending_meta_updates)
+        manager.pending_meta_updates = []
+        manager.add_stats(validate_update_time=time.time() - t0)
+
+
+class TreePickler(pickle.Pickler):
+    """Pickler for trees sent back by parse workers (see ParsePool).
+
+    Placeholder TypeInfos can't be pickled, and some code depends on
+    their identity, so they are pickled as references to the objects
+    in shared_tree_objects().
+    """
+
+    def __init__(self, file: IO[bytes]) -> None:
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.shared = {id(obj): i for i, obj in enumerate(shared_tree_objects())}
+
+    def persistent_id(self, obj: object) -> Optional[int]:
+        return self.shared.get(id(obj))
+
+
+class TreeUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid: int) -> object:
+        return shared_tree_objects()[pid]
+
+
+def shared_tree_objects() -> List[object]:
+    import mypy.fastparse  # Avoid import cycle
+    return [VAR_NO_INFO, CLASSDEF_NO_INFO, FUNC_NO_INFO, NOT_READY,
+            mypy.fastparse.MISSING_FALLBACK]
+
+
+# Options of a parse worker process (see ParsePool)
+_parse_worker_options = None  # type: Optional[Options]
+
+
+def init_parse_worker(options: Options) -> None:
+    global _parse_worker_options
+    _parse_worker_options = options
+
+
+def parse_in_worker(id: str, path: str, read_path: str) -> Optional[Tuple[str, bytes]]:
+    """Read and parse a source file in a parse worker process.
+
+    Return the hash of the file contents and the pickled tree, or None if
+    the file must be parsed by the build itself.
+    """
+    options = _parse_worker_options
+    assert options is not None
+    try:
+        with open(read_path, 'rb') as f:
+            data = f.read()
+        source = decode_python_encoding(data, options.python_version)
+        if get_mypy_comments(source):
+            # Inline configuration may affect parsing.
+            return None
+        errors = Errors()
+        tree = parse(source, path, id, errors, options=options.clone_for_module(id))
+        if errors.is_errors():
+            return None
+        buffer = io.BytesIO()
+        TreePickler(buffer).dump(tree)
+        return hash_digest(data), buffer.getvalue()
+    except Exception:
+        return None
+
+
+class ParsePool:
+    """Parse source files in worker processes while the build graph is loaded.
+
+    Parsing (and in particular converting the AST) dominates the time
+    spent in load_graph() when there is no cache. With --jobs, files are
+    submitted to a pool of forked workers as soon as load_graph() knows
+    that they will be parsed: the root sources up front, and the imports
+    of each module as soon as that module has been loaded. A worker reads
+    and parses the file and sends back a pickled tree, which
+    BuildManager.parse_file() uses instead of parsing the file itself.
+
+    Only files without cache metadata, or with a different size than
+    recorded in it, are submitted. Workers give up on files that have
+    inline configuration or any errors, and these are parsed by the build
+    as usual, so that errors are reported exactly like without workers.
+    """
+
+    def __init__(self, manager: BuildManager) -> None:
+        self.manager = manager
+        self.pool = None  # type: Optional[multiprocessing.pool.Pool]
+        self.submitted = set()  # type: Set[str]
+        # Path -> pending result of parse_in_worker()
+        self.results = {}  # type: Dict[str, multiprocessing.pool.ApplyResult[Any]]
+
+    def submit(self, id: str, path: str) -> None:
+        """Start parsing a module, unless it's already submitted or probably fresh."""
+        manager = self.manager
+        if path in self.submitted or not path.endswith(('.py', '.pyi')):
+            return
+        self.submitted.add(path)
+        if manager.cache_enabled:
+            prefetched = manager.prefetched_metas.get(id)
+            if prefetched is not None and prefetched[0] == path:
+                meta = prefetched[1]
+            else:
+                # Keep the metadata for State, like prefetch_source_hashes() does.
+                meta = find_cache_meta(id, path, manager)
+                manager.prefetched_metas[id] = (path, meta)
+            if meta is not None:
+                try:
+                    if manager.get_stat(path).st_size == meta.size:
+                        return
+                except OSError:
+                    return
+        if self.pool is None:
+            # The workers are forked, so anything buffered would be written twice.
+            manager.stdout.flush()
+            manager.stderr.flush()
+            self.pool = multiprocessing.get_context('fork').Pool(
+                manager.options.jobs, init_parse_worker, (manager.options,))
+        self.results[path] = self.pool.apply_async(
+            parse_in_worker, (id, path, manager.maybe_swap_for_shadow_path(path)))
+
+    def submit_imports(self, state: 'State') -> None:
+        """Start parsing the modules that a module that is being loaded imports."""
+        manager = self.manager
+        assert state.ancestors is not None
+        for dep in state.ancestors + state.dependencies:
+            if state.priorities.get(dep) == PRI_INDIRECT:
+                continue
+            path = find_module_simple(dep, manager)
+            if path is None:
+                continue
+            # Skip modules that won't be parsed.
+            options = manager.options.clone_for_module(dep)
+            if effective_follow_imports(dep, path, options) in ('normal', 'silent'):
+                self.submit(dep, path)
+
+    def get(self, path: str, source_hash: str) -> Optional[MypyFile]:
+        """Return the tree parsed by a worker, if the source is still the same."""
+        result = self.results.pop(path, None)
+        if result is None:
+            return None
+        parsed = result.get()  # type: Optional[Tuple[str, bytes]]
+        if parsed is None or parsed[0] != source_hash:
+            return None
+        tree = TreeUnpickler(io.BytesIO(parsed[1])).load()
+        assert isinstance(tree, MypyFile)
+        return tree
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+        self.results.clear()
+
+
+def parse_pool_supported(manager: BuildManager) -> bool:
+    options = manager.options
+    return (options.jobs > 1
+            and 'fork' in multiprocessing.get_all_start_methods()
+            # Python 2 files are parsed by fastparse2, which isn't supported.
+            and options.python_version[0] >= 3
+            and not options.fine_grained_incremental)
+
+
 def compute_hash(text: str) -> str:
     # We use a crypto hash instead of the builtin hash(...) function
     # because the output of hash(...)  can differ between runs due to
@@ -1415,6 +1812,34 @@ def json_dumps(obj: Any, debug_cache: bool) -> str:
         return json.dumps(obj, sort_keys=True)
 
 
+def cache_dumps(obj: Any, options: Options) -> Union[str, bytes]:
+    """Serialize cache metadata or data using the configured cache format.
+
+    --debug-cache takes precedence over --binary-cache, since its only
+    purpose is to produce human-readable cache files.
+    """
+    if options.binary_cache and not options.debug_cache:
+        return encode_binary(obj)
+    return json_dumps(obj, options.debug_cache)
+
+
+def cache_loads(data: bytes) -> Any:
+    """Deserialize cache metadata or data stored in either cache format.
+
+    Raise ValueError if the data is corrupted.
+    """
+    if is_binary_cache_data(data):
+        return decode_binary(data)
+    # json.loads() only accepts bytes in Python 3.6 and later.
+    return json.loads(data.decode('utf-8'))
+
+
+def compute_cache_hash(data: Union[str, bytes]) -> str:
+    if isinstance(data, bytes):
+        return hash_digest(data)
+    return compute_hash(data)
+
+
 def write_cache(id: str, path: str, tree: MypyFile,
                 dependencies: List[str], suppressed: List[str],
                 dep_prios: List[int], dep_lines: List[int],
@@ -1460,8 +1885,8 @@ def write_cache(id: str, path: str, tree: MypyFile,
 
     # Serialize data and analyze interface
     data = tree.serialize()
-    data_str = json_dumps(data, manager.options.debug_cache)
-    interface_hash = compute_hash(data_str)
+    data_str = cache_dumps(data, manager.options)
+    interface_hash = compute_cache_hash(data_str)
 
     plugin_data = manager.plugin.report_config_data(ReportConfigContext(id, path, is_check=False))
 
@@ -1531,7 +1956,7 @@ def write_cache(id: str, path: str, tree: MypyFile,
             }
 
     # Write meta cache file
-    meta_str = json_dumps(meta, manager.options.debug_cache)
+    meta_str = cache_dumps(meta, manager.options)
     if not metastore.write(meta_json, meta_str):
         # Most likely the error is the replace() call
         # (see https://github.com/python/mypy/issues/3215).
@@ -1825,7 +2250,11 @@ class State:
             source = ''
         self.source = source
         if path and source is None and self.manager.cache_enabled:
-            self.meta = find_cache_meta(self.id, path, manager)
+            prefetched = manager.prefetched_metas.pop(self.id, None)
+            if prefetched is not None and prefetched[0] == path:
+                self.meta = prefetched[1]
+            else:
+                self.meta = find_cache_meta(self.id, path, manager)
             # TODO: Get mtime if not cached.
             if self.meta is not None:
                 self.interface_hash = self.meta.interface_hash
@@ -1950,19 +2379,24 @@ class State:
         if check_blockers:
             self.check_blockers()
 
-    def load_fine_grained_deps(self) -> Dict[str, Set[str]]:
+    def load_fine_grained_deps(self) -> DependencyMap:
         return self.manager.load_fine_grained_deps(self.id)
 
     def load_tree(self, temporary: bool = False) -> None:
         assert self.meta is not None, "Internal error: this method must be called only" \
                                       " for cached modules"
         t0 = time.time()
-        raw = self.manager.metastore.read(self.meta.data_json)
+        raw = self.manager.metastore.read_bytes(self.meta.data_json)
         t1 = time.time()
-        data = json.loads(raw)
+        data = cache_loads(raw)
         t2 = time.time()
         # TODO: Assert data file wasn't changed.
+        # Only share deserialized instances within this module.
+        TypeState.reset_deserialized_instances()
         self.tree = MypyFile.deserialize(data)
+        if self.meta.data_json.startswith(BUNDLE_PREFIX):
+            # The path was recorded where the bundle was created.
+            self.tree.path = self.xpath
         t3 = time.time()
         self.manager.add_stats(data_read_time=t1 - t0,
                                data_json_load_time=t2 - t1,
@@ -1975,8 +2409,13 @@ class State:
         assert self.tree is not None, "Internal error: method must be called on parsed file only"
         # We need to set allow_missing when doing a fine grained cache
         # load because we need to gracefully handle missing modules.
+        # Outside fine-grained mode symbols are fixed up lazily, as they
+        # are first accessed, since most of them are never used.
+        fine_grained = (self.options.use_fine_grained_cache
+                        or self.options.fine_grained_incremental)
         fixup_module(self.tree, self.manager.modules,
-                     self.options.use_fine_grained_cache)
+                     self.options.use_fine_grained_cache,
+                     lazy=not fine_grained)
 
     # Methods for processing modules from source code.
 
@@ -2008,16 +2447,18 @@ class State:
                     # other systems, but os.strerror(ioerr.errno) does not, so we use that.
                     # (We want the error messages to be platform-independent so that the
                     # tests have predictable output.)
-                    raise CompileError([
+                    raise CompileError(format_raw_messages([
                         "mypy: can't read file '{}': {}".format(
                             self.path, os.strerror(ioerr.errno))],
+                        manager.options.error_format),
                         module_with_blocker=self.id) from ioerr
                 except (UnicodeDecodeError, DecodeError) as decodeerr:
                     if self.path.endswith('.pyd'):
                         err = "mypy: stubgen does not support .pyd files: '{}'".format(self.path)
                     else:
                         err = "mypy: can't decode file '{}': {}".format(self.path, str(decodeerr))
-                    raise CompileError([err], module_with_blocker=self.id) from decodeerr
+                    raise CompileError(format_raw_messages([err], manager.options.error_format),
+                                       module_with_blocker=self.id) from decodeerr
             else:
                 assert source is not None
                 self.source_hash = compute_hash(source)
@@ -2025,7 +2466,7 @@ class State:
             self.parse_inline_configuration(source)
             self.tree = manager.parse_file(self.id, self.xpath, source,
                                            self.ignore_all or self.options.ignore_errors,
-                                           self.options)
+                                           self.options, self.source_hash)
 
         modules[self.id] = self.tree
 
@@ -2127,7 +2568,7 @@ class State:
     def type_check_first_pass(self) -> None:
         if self.options.semantic_analysis_only:
             return
-        with self.wrap_context():
+        with self.wrap_context(), self.manager.timed(TYPE_CHECK_PHASE, self.id):
             self.type_checker().check_first_pass()
 
     def type_checker(self) -> TypeChecker:
@@ -2144,7 +2585,7 @@ class State:
     def type_check_second_pass(self) -> bool:
         if self.options.semantic_analysis_only:
             return False
-        with self.wrap_context():
+        with self.wrap_context(), self.manager.timed(TYPE_CHECK_DEFERRED_PHASE, self.id):
             return self.type_checker().check_second_pass()
 
     def finish_passes(self) -> None:
@@ -2152,7 +2593,7 @@ class State:
         manager = self.manager
         if self.options.semantic_analysis_only:
             return
-        with self.wrap_context():
+        with self.wrap_context(), manager.timed(FINISH_PASSES_PHASE, self.id):
             # Some tests (and tools) want to look at the set of all types.
             options = manager.options
             if options.export_types:
@@ -2214,11 +2655,10 @@ class State:
                                 python_version=self.options.python_version,
                                 options=self.manager.options)
 
-    def update_fine_grained_deps(self, deps: Dict[str, Set[str]]) -> None:
+    def update_fine_grained_deps(self, deps: DependencyMap) -> None:
         options = self.manager.options
         if options.cache_fine_grained or options.fine_grained_incremental:
-            from mypy.server.deps import merge_dependencies  # Lazy import to speed up startup
-            merge_dependencies(self.compute_fine_grained_deps(), deps)
+            deps.update(self.compute_fine_grained_deps())
             TypeState.update_protocol_deps(deps)
 
     def valid_references(self) -> Set[str]:
@@ -2249,11 +2689,12 @@ class State:
         assert self.source_hash is not None
         assert len(set(self.dependencies)) == len(self.dependencies), (
             "Duplicates in dependencies list for {} ({})".format(self.id, self.dependencies))
-        new_interface_hash, self.meta = write_cache(
-            self.id, self.path, self.tree,
-            list(self.dependencies), list(self.suppressed),
-            dep_prios, dep_lines, self.interface_hash, self.source_hash, self.ignore_all,
-            self.manager)
+        with self.manager.timed(WRITE_CACHE_PHASE, self.id):
+            new_interface_hash, self.meta = write_cache(
+                self.id, self.path, self.tree,
+                list(self.dependencies), list(self.suppressed),
+                dep_prios, dep_lines, self.interface_hash, self.source_hash, self.ignore_all,
+                self.manager)
         if new_interface_hash == self.interface_hash:
             self.manager.log("Cached module {} has same interface".format(self.id))
         else:
@@ -2319,6 +2760,25 @@ class State:
 # Module import and diagnostic glue
 
 
+def effective_follow_imports(id: str, path: str, options: Options,
+                             root_source: bool = False) -> str:
+    """Return the follow_imports setting for a module found at path.
+
+    Only modules with the 'normal' or 'silent' setting are parsed. The
+    settings of other modules are further adjusted by find_module_and_diagnose().
+    """
+    # For non-stubs, look at options.follow_imports:
+    # - normal (default) -> fully analyze
+    # - silent -> analyze but silence errors
+    # - skip -> don't analyze, make the type Any
+    if (root_source  # Honor top-level modules
+            or (not path.endswith('.py')  # Stubs are always normal
+                and not options.follow_imports_for_stubs)  # except when they aren't
+            or id in mypy.semanal_main.core_modules):  # core is always normal
+        return 'normal'
+    return options.follow_imports
+
+
 def find_module_and_diagnose(manager: BuildManager,
                              id: str,
                              options: Options,
@@ -2360,16 +2820,7 @@ def find_module_and_diagnose(manager: BuildManager,
         file_id = '__builtin__'
     result = find_module_with_reason(file_id, manager)
     if isinstance(result, str):
-        # For non-stubs, look at options.follow_imports:
-        # - normal (default) -> fully analyze
-        # - silent -> analyze but silence errors
-        # - skip -> don't analyze, make the type Any
-        follow_imports = options.follow_imports
-        if (root_source  # Honor top-level modules
-                or (not result.endswith('.py')  # Stubs are always normal
-                    and not options.follow_imports_for_stubs)  # except when they aren't
-                or id in mypy.semanal_main.core_modules):  # core is always normal
-            follow_imports = 'normal'
+        follow_imports = effective_follow_imports(id, result, options, root_source)
         if skip_diagnose:
             pass
         elif follow_imports == 'silent':
@@ -2395,10 +2846,10 @@ def find_module_and_diagnose(manager: BuildManager,
                 and not is_typeshed_file(result)
                 and not options.use_builtins_fixtures
                 and not options.custom_typeshed_dir):
-            raise CompileError([
+            raise CompileError(format_raw_messages([
                 'mypy: "%s" shadows library module "%s"' % (os.path.relpath(result), id),
                 'note: A user-defined top-level module with name "%s" is not supported' % id
-            ])
+            ], options.error_format))
         return (result, follow_imports)
     else:
         # Could not find a module.  Typically the reason is a
@@ -2414,7 +2865,8 @@ def find_module_and_diagnose(manager: BuildManager,
             # If we can't find a root source it's always fatal.
             # TODO: This might hide non-fatal errors from
             # root sources processed earlier.
-            raise CompileError(["mypy: can't find module '%s'" % id])
+            raise CompileError(format_raw_messages(["mypy: can't find module '%s'" % id],
+                                                   options.error_format))
         else:
             raise ModuleNotFound
 
@@ -2635,7 +3087,14 @@ def dispatch(sources: List[BuildSource],
     # don't want to do a real incremental reprocess of the
     # graph---we'll handle it all later.
     if not manager.use_fine_grained_cache():
-        process_graph(graph, manager)
+        subtype_cache = read_subtype_cache(manager) if use_subtype_cache(manager) else None
+        TypeState.persistent_subtype_cache = subtype_cache
+        try:
+            process_graph(graph, manager)
+        finally:
+            TypeState.persistent_subtype_cache = None
+        if subtype_cache is not None:
+            write_subtype_cache(manager, subtype_cache)
         # Update plugins snapshot.
         write_plugins_snapshot(manager)
         manager.old_plugins_snapshot = manager.plugins_snapshot
@@ -2645,6 +3104,7 @@ def dispatch(sources: List[BuildSource],
             # Since these are a global property of the program, they are calculated after we
             # processed the whole graph.
             TypeState.add_all_protocol_deps(manager.fg_deps)
+            manager.fg_deps.compact()
             if not manager.options.fine_grained_incremental:
                 rdeps = generate_deps_for_cache(manager, graph)
                 write_deps_cache(rdeps, manager, graph)
@@ -2729,7 +3189,27 @@ def load_graph(sources: List[BuildSource], manager: BuildManager,
     As this may need to parse files, this can raise CompileError in case
     there are syntax errors.
     """
-
+    prefetch_source_hashes(sources, manager)
+    if parse_pool_supported(manager):
+        manager.parse_pool = ParsePool(manager)
+        for bs in sources:
+            if bs.path and bs.text is None:
+                manager.parse_pool.submit(bs.module or '__main__', bs.path)
+    try:
+        return _load_graph(sources, manager, old_graph, new_modules)
+    finally:
+        if manager.parse_pool is not None:
+            manager.parse_pool.close()
+            manager.parse_pool = None
+        manager.prefetched_metas.clear()
+        # This must happen before any module is processed, since processing
+        # may write new metadata for a module.
+        flush_meta_updates(manager)
+
+
+def _load_graph(sources: List[BuildSource], manager: BuildManager,
+                old_graph: Optional[Graph],
+                new_modules: Optional[List[State]]) -> Graph:
     graph = old_graph if old_graph is not None else {}  # type: Graph
 
     # The deque is used to implement breadth-first traversal.
@@ -2764,6 +3244,8 @@ def load_graph(sources: List[BuildSource], manager: BuildManager,
         graph[st.id] = st
         new.append(st)
         entry_points.add(bs.module)
+        if manager.parse_pool is not None:
+            manager.parse_pool.submit_imports(st)
 
     # Note: Running this each time could be slow in the daemon. If it's a problem, we
     # can do more work to maintain this incrementally.
@@ -2830,6 +3312,8 @@ def load_graph(sources: List[BuildSource], manager: BuildManager,
                     assert newst.id not in graph, newst.id
                     graph[newst.id] = newst
                     new.append(newst)
+                    if manager.parse_pool is not None:
+                        manager.parse_pool.submit_imports(newst)
             if dep in graph and dep in st.suppressed_set:
                 # Previously suppressed file is now visible
                 st.add_dependency(dep)
@@ -2843,99 +3327,26 @@ def process_graph(graph: Graph, manager: BuildManager) -> None:
     manager.log("Found %d SCCs; largest has %d nodes" %
                 (len(sccs), max(len(scc) for scc in sccs)))
 
+    if manager.options.jobs > 1:
+        reason = parallel_unsupported_reason(manager)
+        if reason is None:
+            process_graph_parallel(graph, sccs, manager)
+            return
+        manager.log("Not type checking in parallel: {}".format(reason))
+
     fresh_scc_queue = []  # type: List[List[str]]
 
     # We're processing SCCs from leaves (those without further
     # dependencies) to roots (those from which everything else can be
     # reached).
     for ascc in sccs:
-        # Order the SCC's nodes using a heuristic.
-        # Note that ascc is a set, and scc is a list.
-        scc = order_ascc(graph, ascc)
-        # If builtins is in the list, move it last.  (This is a bit of
-        # a hack, but it's necessary because the builtins module is
-        # part of a small cycle involving at least {builtins, abc,
-        # typing}.  Of these, builtins must be processed last or else
-        # some builtin objects will be incompletely processed.)
-        if 'builtins' in ascc:
-            scc.remove('builtins')
-            scc.append('builtins')
-        if manager.options.verbosity >= 2:
-            for id in scc:
-                manager.trace("Priorities for %s:" % id,
-                              " ".join("%s:%d" % (x, graph[id].priorities[x])
-                                       for x in graph[id].dependencies
-                                       if x in ascc and x in graph[id].priorities))
-        # Because the SCCs are presented in topological sort order, we
-        # don't need to look at dependencies recursively for staleness
-        # -- the immediate dependencies are sufficient.
-        stale_scc = {id for id in scc if not graph[id].is_fresh()}
-        fresh = not stale_scc
-        deps = set()
-        for id in scc:
-            deps.update(graph[id].dependencies)
-        deps -= ascc
-        stale_deps = {id for id in deps if id in graph and not graph[id].is_interface_fresh()}
-        fresh = fresh and not stale_deps
-        undeps = set()
-        if fresh:
-            # Check if any dependencies that were suppressed according
-            # to the cache have been added back in this run.
-            # NOTE: Newly suppressed dependencies are handled by is_fresh().
-            for id in scc:
-                undeps.update(graph[id].suppressed)
-            undeps &= graph.keys()
-            if undeps:
-                fresh = False
-        if fresh:
-            # All cache files are fresh.  Check that no dependency's
-            # cache file is newer than any scc node's cache file.
-            oldest_in_scc = min(graph[id].xmeta.data_mtime for id in scc)
-            viable = {id for id in stale_deps if graph[id].meta is not None}
-            newest_in_deps = 0 if not viable else max(graph[dep].xmeta.data_mtime
-                                                      for dep in viable)
-            if manager.options.verbosity >= 3:  # Dump all mtimes for extreme debugging.
-                all_ids = sorted(ascc | viable, key=lambda id: graph[id].xmeta.data_mtime)
-                for id in all_ids:
-                    if id in scc:
-                        if graph[id].xmeta.data_mtime < newest_in_deps:
-                            key = "*id:"
-                        else:
-                            key = "id:"
-                    else:
-                        if graph[id].xmeta.data_mtime > oldest_in_scc:
-                            key = "+dep:"
-                        else:
-                            key = "dep:"
-                    manager.trace(" %5s %.0f %s" % (key, graph[id].xmeta.data_mtime, id))
-            # If equal, give the benefit of the doubt, due to 1-sec time granularity
-            # (on some platforms).
-            if oldest_in_scc < newest_in_deps:
-                fresh = False
-                fresh_msg = "out of date by %.0f seconds" % (newest_in_deps - oldest_in_scc)
-            else:
-                fresh_msg = "fresh"
-        elif undeps:
-            fresh_msg = "stale due to changed suppression (%s)" % " ".join(sorted(undeps))
-        elif stale_scc:
-            fresh_msg = "inherently stale"
-            if stale_scc != ascc:
-                fresh_msg += " (%s)" % " ".join(sorted(stale_scc))
-            if stale_deps:
-                fresh_msg += " with stale deps (%s)" % " ".join(sorted(stale_deps))
-        else:
-            fresh_msg = "stale due to deps (%s)" % " ".join(sorted(stale_deps))
-
-        # Initialize transitive_error for all SCC members from union
-        # of transitive_error of dependencies.
-        if any(graph[dep].transitive_error for dep in deps if dep in graph):
-            for id in scc:
-                graph[id].transitive_error = True
-
+        scc = prepare_scc(graph, ascc, manager)
+        fresh, fresh_msg = check_scc_freshness(graph, ascc, scc, manager)
         scc_str = " ".join(scc)
         if fresh:
             manager.trace("Queuing %s SCC (%s)" % (fresh_msg, scc_str))
             fresh_scc_queue.append(scc)
+            record_subtype_cache_hashes(graph, scc)
         else:
             if len(fresh_scc_queue) > 0:
                 manager.log("Processing {} queued fresh SCCs".format(len(fresh_scc_queue)))
@@ -2956,12 +3367,9 @@ def process_graph(graph: Graph, manager: BuildManager) -> None:
                 for prev_scc in fresh_scc_queue:
                     process_fresh_modules(graph, prev_scc, manager)
                 fresh_scc_queue = []
-            size = len(scc)
-            if size == 1:
-                manager.log("Processing SCC singleton (%s) as %s" % (scc_str, fresh_msg))
-            else:
-                manager.log("Processing SCC of size %d (%s) as %s" % (size, scc_str, fresh_msg))
-            process_stale_scc(graph, scc, manager)
+            log_processing_scc(scc, fresh_msg, manager)
+            with manager.timed(SCC_PHASE, ' '.join(scc)):
+                process_stale_scc(graph, scc, manager)
 
     sccs_left = len(fresh_scc_queue)
     nodes_left = sum(len(scc) for scc in fresh_scc_queue)
@@ -2974,6 +3382,532 @@ def process_graph(graph: Graph, manager: BuildManager) -> None:
         manager.log("No fresh SCCs left in queue")
 
 
+def prepare_scc(graph: Graph, ascc: AbstractSet[str], manager: BuildManager) -> List[str]:
+    """Order the SCC's nodes using a heuristic.
+
+    Note that ascc is a set, and the result is a list.
+    """
+    scc = order_ascc(graph, ascc)
+    # If builtins is in the list, move it last.  (This is a bit of
+    # a hack, but it's necessary because the builtins module is
+    # part of a small cycle involving at least {builtins, abc,
+    # typing}.  Of these, builtins must be processed last or else
+    # some builtin objects will be incompletely processed.)
+    if 'builtins' in ascc:
+        scc.remove('builtins')
+        scc.append('builtins')
+    if manager.options.verbosity >= 2:
+        for id in scc:
+            manager.trace("Priorities for %s:" % id,
+                          " ".join("%s:%d" % (x, graph[id].priorities[x])
+                                   for x in graph[id].dependencies
+                                   if x in ascc and x in graph[id].priorities))
+    return scc
+
+
+def check_scc_freshness(graph: Graph, ascc: AbstractSet[str], scc: List[str],
+                        manager: BuildManager) -> Tuple[bool, str]:
+    """Decide whether an SCC can be loaded from the cache.
+
+    All dependencies of the SCC must have been processed already.
+    Return a tuple (fresh, description of the reason for logging).
+    """
+    # Because the SCCs are presented in topological sort order, we
+    # don't need to look at dependencies recursively for staleness
+    # -- the immediate dependencies are sufficient.
+    stale_scc = {id for id in scc if not graph[id].is_fresh()}
+    fresh = not stale_scc
+    deps = set()
+    for id in scc:
+        deps.update(graph[id].dependencies)
+    deps -= ascc
+    stale_deps = {id for id in deps if id in graph and not graph[id].is_interface_fresh()}
+    fresh = fresh and not stale_deps
+    undeps = set()
+    if fresh:
+        # Check if any dependencies that were suppressed according
+        # to the cache have been added back in this run.
+        # NOTE: Newly suppressed dependencies are handled by is_fresh().
+        for id in scc:
+            undeps.update(graph[id].suppressed)
+        undeps &= graph.keys()
+        if undeps:
+            fresh = False
+    if fresh:
+        # All cache files are fresh.  Check that no dependency's
+        # cache file is newer than any scc node's cache file.
+        oldest_in_scc = min(graph[id].xmeta.data_mtime for id in scc)
+        viable = {id for id in stale_deps if graph[id].meta is not None}
+        newest_in_deps = 0 if not viable else max(graph[dep].xmeta.data_mtime
+                                                  for dep in viable)
+        if manager.options.verbosity >= 3:  # Dump all mtimes for extreme debugging.
+            all_ids = sorted(ascc | viable, key=lambda id: graph[id].xmeta.data_mtime)
+            for id in all_ids:
+                if id in scc:
+                    if graph[id].xmeta.data_mtime < newest_in_deps:
+                        key = "*id:"
+                    else:
+                        key = "id:"
+                else:
+                    if graph[id].xmeta.data_mtime > oldest_in_scc:
+                        key = "+dep:"
+                    else:
+                        key = "dep:"
+                manager.trace(" %5s %.0f %s" % (key, graph[id].xmeta.data_mtime, id))
+        # If equal, give the benefit of the doubt, due to 1-sec time granularity
+        # (on some platforms).
+        if oldest_in_scc < newest_in_deps:
+            fresh = False
+            fresh_msg = "out of date by %.0f seconds" % (newest_in_deps - oldest_in_scc)
+        else:
+            fresh_msg = "fresh"
+    elif undeps:
+        fresh_msg = "stale due to changed suppression (%s)" % " ".join(sorted(undeps))
+    elif stale_scc:
+        fresh_msg = "inherently stale"
+        if stale_scc != ascc:
+            fresh_msg += " (%s)" % " ".join(sorted(stale_scc))
+        if stale_deps:
+            fresh_msg += " with stale deps (%s)" % " ".join(sorted(stale_deps))
+    else:
+        fresh_msg = "stale due to deps (%s)" % " ".join(sorted(stale_deps))
+
+    # Initialize transitive_error for all SCC members from union
+    # of transitive_error of dependencies.
+    if any(graph[dep].transitive_error for dep in deps if dep in graph):
+        for id in scc:
+            graph[id].transitive_error = True
+
+    return fresh, fresh_msg
+
+
+def log_processing_scc(scc: List[str], fresh_msg: str, manager: BuildManager) -> None:
+    scc_str = " ".join(scc)
+    size = len(scc)
+    if size == 1:
+        manager.log("Processing SCC singleton (%s) as %s" % (scc_str, fresh_msg))
+    else:
+        manager.log("Processing SCC of size %d (%s) as %s" % (size, scc_str, fresh_msg))
+
+
+def parallel_unsupported_reason(manager: BuildManager) -> Optional[str]:
+    """Return why --jobs can't be used for this build, or None if it can.
+
+    Workers hand their results back through the cache, and everything
+    that needs the in-memory trees of all modules is unsupported.
+    """
+    options = manager.options
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return "platform doesn't support fork()"
+    if options.cache_dir == os.devnull:
+        return "cache writing is disabled"
+    if options.fine_grained_incremental or options.cache_fine_grained:
+        return "fine-grained incremental mode"
+    if options.preserve_asts or options.export_types:
+        return "trees or types must be preserved"
+    if manager.reports is not None:
+        return "reports were requested"
+    if options.dump_type_stats or options.dump_inference_stats:
+        return "stats dumps were requested"
+    return None
+
+
+class SccResult:
+    """Result of processing a stale SCC in a worker process (see process_graph_parallel)."""
+
+    def __init__(self, messages: List[List[str]],
+                 metas: Optional[Dict[str, CacheMeta]] = None,
+                 interface_hashes: Optional[Dict[str, str]] = None,
+                 timing_events: Optional[List[TimingEvent]] = None,
+                 blocker: Optional[Tuple[List[str], bool, Optional[str]]] = None) -> None:
+        # Error messages in the order the serial build would have flushed them
+        self.messages = messages
+        # Metadata of the cache files written for the modules, or None if
+        # the modules had errors and thus weren't written to the cache
+        self.metas = metas
+        self.interface_hashes = interface_hashes or {}
+        # Events recorded by the worker for --timing-report
+        self.timing_events = timing_events or []
+        # Arguments of the CompileError raised for a blocking error, if any
+        # (CompileError itself can't be pickled)
+        self.blocker = blocker
+
+
+# Metadata and interface hashes of the modules of an SCC processed during the
+# build, or None if the SCC had errors and thus wasn't written to the cache
+SccMetas = Optional[Dict[str, Tuple[CacheMeta, str]]]
+
+
+def scc_metas(graph: Graph, scc: List[str]) -> SccMetas:
+    states = [graph[id] for id in scc]
+    if any(st.meta is None for st in states):
+        return None
+    return {st.id: (st.xmeta, st.interface_hash) for st in states}
+
+
+class SccWorker:
+    """A worker process of process_graph_parallel(), as seen by the coordinator."""
+
+    def __init__(self, proc: BaseProcess,
+                 conn: 'multiprocessing.connection.Connection',
+                 synced: int) -> None:
+        self.proc = proc
+        self.conn = conn
+        # Number of entries of the list of processed SCCs the worker knows about
+        self.synced = synced
+        # SCCs whose results from this worker were used, and are thus in its memory
+        self.own = set()  # type: Set[int]
+
+
+def scc_worker_main(graph: Graph, sccs: List[List[str]], scc_deps: List[Set[int]],
+                    loaded: List[bool], manager: BuildManager,
+                    conn: 'multiprocessing.connection.Connection') -> None:
+    """Entry point of a forked worker that type checks stale SCCs.
+
+    The worker receives the index of an SCC to process together with the
+    metadata of the SCCs processed since it last heard about them, and
+    sends back an SccResult. A None task tells it to exit.
+    """
+    messages = []  # type: List[List[str]]
+
+    def collect_errors(new_messages: List[str], is_serious: bool) -> None:
+        messages.append(new_messages)
+
+    status = 0
+    try:
+        manager.flush_errors = collect_errors
+        # Database connections can't be shared with the parent process.
+        manager.metastore = create_metastore(manager.options, manager.cache_bundle)
+        while True:
+            task = conn.recv()  # type: Optional[Tuple[int, List[Tuple[int, SccMetas]]]]
+            if task is None:
+                break
+            i, updates = task
+            for j, metas in updates:
+                for id in sccs[j]:
+                    st = graph[id]
+                    if metas is None:
+                        st.meta = None
+                    else:
+                        st.meta, st.interface_hash = metas[id]
+                    # Drop the tree parsed while loading the graph, so that
+                    # the module gets loaded from the cache if it's needed.
+                    st.tree = None
+                    manager.modules.pop(id, None)
+                # Nothing that depends on an SCC with errors is sent to workers.
+                loaded[j] = metas is None
+            del messages[:]
+            conn.send(process_scc_in_worker(graph, sccs, scc_deps, loaded, i, messages, manager))
+    except SystemExit as err:
+        # Internal errors have already been reported by report_internal_error().
+        status = err.code if isinstance(err.code, int) and err.code else 1
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    try:
+        conn.close()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        # Skip atexit handlers inherited from the parent. A non-zero exit
+        # status tells the coordinator that the worker failed.
+        os._exit(status)
+
+
+def process_scc_in_worker(graph: Graph, sccs: List[List[str]], scc_deps: List[Set[int]],
+                          loaded: List[bool], i: int, messages: List[List[str]],
+                          manager: BuildManager) -> Optional[SccResult]:
+    """Type check a single stale SCC in a worker process.
+
+    Dependencies that aren't in memory yet are loaded from the cache first.
+    Return None if the result can't be used, in which case the coordinator
+    will redo the work.
+    """
+    scc = sccs[i]
+    deps = set()  # type: Set[int]
+    pending = [i]
+    while pending:
+        for dep in scc_deps[pending.pop()]:
+            if dep not in deps:
+                deps.add(dep)
+                pending.append(dep)
+    if manager.timing_report is not None:
+        # Only send back the events recorded for this SCC.
+        manager.timing_report = TimingReport(manager.timing_report.start_time)
+    try:
+        # SCCs are topologically sorted, so dependencies are loaded first.
+        for j in sorted(deps):
+            if not loaded[j]:
+                process_fresh_modules(graph, sccs[j], manager)
+                loaded[j] = True
+        with manager.timed(SCC_PHASE, ' '.join(scc)):
+            process_stale_scc(graph, scc, manager)
+    except CompileError as err:
+        # The coordinator raises this again once the SCCs before this one are done.
+        return SccResult(list(messages),
+                         blocker=(err.messages, err.use_stdout, err.module_with_blocker))
+    manager.metastore.commit()
+    loaded[i] = True
+    states = [graph[id] for id in scc]
+    timing_events = manager.timing_report.events if manager.timing_report else None
+    if all(st.transitive_error for st in states):
+        return SccResult(list(messages), timing_events=timing_events)
+    elif all(st.meta is not None for st in states):
+        return SccResult(list(messages),
+                         metas={st.id: st.xmeta for st in states},
+                         interface_hashes={st.id: st.interface_hash for st in states},
+                         timing_events=timing_events)
+    return None
+
+
+def process_graph_parallel(graph: Graph, sccs: List[AbstractSet[str]],
+                           manager: BuildManager) -> None:
+    """Process stale SCCs that don't depend on each other in worker processes.
+
+    An SCC is ready once all SCCs it depends on have been processed.
+    Freshness of ready SCCs is decided exactly like in process_graph().
+    Stale ready SCCs are type checked by a pool of up to --jobs forked
+    workers. Workers write the results to the cache, and the coordinator
+    and the other workers load them from there when they are needed by
+    later SCCs.
+
+    SCCs with errors aren't cached. If other SCCs depend on such an SCC,
+    the coordinator processes it again itself, like a serial build would.
+    Error messages are flushed in the same order as by a serial build.
+
+    Ready SCCs are scheduled in the order of a serial build. If processing
+    an SCC fails (due to a blocking error, for example), all earlier SCCs
+    are still processed and their errors flushed before the exception is
+    raised again, so that the outcome doesn't depend on scheduling.
+    """
+    jobs = manager.options.jobs
+    ctx = multiprocessing.get_context('fork')
+    sccs_list = [prepare_scc(graph, ascc, manager) for ascc in sccs]
+    count = len(sccs_list)
+    index = {id: i for i, scc in enumerate(sccs_list) for id in scc}
+    scc_deps = []  # type: List[Set[int]]
+    for i, scc in enumerate(sccs_list):
+        deps = {index[dep] for id in scc for dep in graph[id].dependencies if dep in index}
+        deps.discard(i)
+        scc_deps.append(deps)
+    has_dependents = [False] * count
+    for deps in scc_deps:
+        for d in deps:
+            has_dependents[d] = True
+
+    done = [False] * count
+    # Is the SCC available in memory (parsed and analyzed, or loaded from the cache)?
+    loaded = [False] * count
+    started = [False] * count
+    # Result of check_scc_freshness() for SCCs whose dependencies are done
+    freshness = {}  # type: Dict[int, Tuple[bool, str]]
+    messages = {}  # type: Dict[int, List[List[str]]]
+    next_flush = 0
+    # SCCs processed during this build, in the order they were done. Workers
+    # are sent the entries they haven't seen yet together with their next task.
+    processed = []  # type: List[Tuple[int, SccMetas]]
+    idle = []  # type: List[SccWorker]
+    busy = {}  # type: Dict[multiprocessing.connection.Connection, Tuple[int, SccWorker]]
+    # The first SCC (in serial build order) that failed, and the exception to raise
+    failure = None  # type: Optional[Tuple[int, BaseException]]
+    sccs_in_workers = sccs_redone = 0
+
+    def limit() -> int:
+        """Return the index of the first SCC that mustn't be processed."""
+        return failure[0] if failure is not None else count
+
+    def fail(i: int, err: BaseException) -> None:
+        nonlocal failure
+        # There is nothing to load for the SCC.
+        done[i] = loaded[i] = True
+        if failure is None or i < failure[0]:
+            failure = (i, err)
+
+    def flush_ready() -> None:
+        nonlocal next_flush
+        # Messages of a failed SCC are flushed, but not those of later SCCs.
+        stop = failure[0] + 1 if failure is not None else count
+        while next_flush < stop and next_flush in messages:
+            for new_messages in messages.pop(next_flush):
+                manager.flush_errors(new_messages, False)
+            next_flush += 1
+
+    def load_done_sccs() -> None:
+        # SCCs are topologically sorted, so dependencies are loaded first.
+        for i in range(count):
+            if done[i] and not loaded[i]:
+                process_fresh_modules(graph, sccs_list[i], manager)
+                loaded[i] = True
+
+    def process_locally(i: int) -> None:
+        scc = sccs_list[i]
+        load_done_sccs()
+        collected = []  # type: List[List[str]]
+        flush_errors = manager.flush_errors
+
+        def collect_errors(new_messages: List[str], is_serious: bool) -> None:
+            collected.append(new_messages)
+
+        manager.flush_errors = collect_errors
+        try:
+            with manager.timed(SCC_PHASE, ' '.join(scc)):
+                process_stale_scc(graph, scc, manager)
+        except (Exception, SystemExit) as err:
+            messages[i] = collected
+            fail(i, err)
+            return
+        finally:
+            manager.flush_errors = flush_errors
+            # Cache writes of workers would wait for an open SQLite transaction.
+            manager.metastore.commit()
+        messages[i] = collected
+        done[i] = loaded[i] = True
+        processed.append((i, scc_metas(graph, scc)))
+
+    def apply_result(i: int, result: SccResult) -> None:
+        metas = result.metas
+        for id in sccs_list[i]:
+            st = graph[id]
+            if metas is None:
+                # Like State.write_cache() for modules with errors. Nothing
+                # depends on these, so the tree won't be needed.
+                st.transitive_error = True
+                st.meta = None
+                st.mark_interface_stale(on_errors=True)
+            else:
+                st.meta = metas[id]
+                new_interface_hash = result.interface_hashes[id]
+                if new_interface_hash != st.interface_hash:
+                    st.mark_interface_stale()
+                    st.interface_hash = new_interface_hash
+                # The tree in memory was only parsed. Drop it, so that it gets
+                # loaded from the cache if it's needed later.
+                st.tree = None
+                manager.modules.pop(id, None)
+            st.mark_as_rechecked()
+        messages[i] = result.messages
+        done[i] = True
+        processed.append((i, scc_metas(graph, sccs_list[i])))
+        if manager.timing_report is not None:
+            manager.timing_report.add_events(result.timing_events)
+        record_subtype_cache_hashes(graph, sccs_list[i])
+        if metas is None:
+            # There is nothing to load.
+            loaded[i] = True
+
+    def start_worker() -> SccWorker:
+        # The worker's cache writes would wait for an open SQLite transaction.
+        manager.metastore.commit()
+        conn, child_conn = ctx.Pipe()
+        proc = ctx.Process(target=scc_worker_main,
+                           args=(graph, sccs_list, scc_deps, loaded, manager, child_conn))
+        # Don't let the worker inherit buffered output.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        proc.start()
+        child_conn.close()
+        # The worker starts out with the state of the coordinator.
+        return SccWorker(proc, conn, len(processed))
+
+    def dispatch(i: int, worker: SccWorker) -> None:
+        updates = [(j, metas) for j, metas in processed[worker.synced:]
+                   if j not in worker.own]
+        worker.synced = len(processed)
+        worker.conn.send((i, updates))
+        busy[worker.conn] = (i, worker)
+
+    def worker_failure(worker: SccWorker, scc_str: str) -> BaseException:
+        exitcode = worker.proc.exitcode
+        assert exitcode is not None
+        if exitcode > 0:
+            # The worker has reported the error itself.
+            return SystemExit(exitcode)
+        elif exitcode < 0:
+            return RuntimeError("Worker processing SCC (%s) was killed by signal %d"
+                                % (scc_str, -exitcode))
+        return RuntimeError("Worker processing SCC (%s) exited unexpectedly" % scc_str)
+
+    try:
+        while not all(done[:limit()]):
+            progress = True
+            while progress:
+                progress = False
+                for i in range(next_flush, count):
+                    if i >= limit():
+                        break
+                    if started[i] or not all(done[d] for d in scc_deps[i]):
+                        continue
+                    scc = sccs_list[i]
+                    if i not in freshness:
+                        freshness[i] = check_scc_freshness(graph, sccs[i], scc, manager)
+                    fresh, fresh_msg = freshness[i]
+                    if fresh:
+                        manager.trace("Fresh SCC (%s)" % " ".join(scc))
+                        started[i] = done[i] = True
+                        record_subtype_cache_hashes(graph, scc)
+                        messages[i] = []
+                        progress = True
+                    elif any(graph[id].transitive_error for id in scc):
+                        # Modules with errors aren't cached, so a worker can't help.
+                        log_processing_scc(scc, fresh_msg, manager)
+                        started[i] = True
+                        process_locally(i)
+                        progress = True
+                    elif idle or len(busy) < jobs:
+                        log_processing_scc(scc, fresh_msg + " in a worker", manager)
+                        started[i] = True
+                        dispatch(i, idle.pop() if idle else start_worker())
+                    # Otherwise the SCC waits for a free worker, while later SCCs
+                    # that don't need one can still be processed.
+            flush_ready()
+            if all(done[:limit()]):
+                break
+            # SCCs are topologically sorted, so something is always ready.
+            assert busy, "No SCC could be scheduled"
+            for conn in multiprocessing.connection.wait(list(busy)):
+                assert isinstance(conn, multiprocessing.connection.Connection)
+                i, worker = busy.pop(conn)
+                scc_str = " ".join(sccs_list[i])
+                try:
+                    result = conn.recv()  # type: Optional[SccResult]
+                except EOFError:
+                    conn.close()
+                    worker.proc.join()
+                    if i < limit():
+                        fail(i, worker_failure(worker, scc_str))
+                    continue
+                idle.append(worker)
+                if i >= limit():
+                    # A serial build would have stopped before this SCC.
+                    continue
+                if result is not None and result.blocker is not None:
+                    messages[i] = result.messages
+                    fail(i, CompileError(*result.blocker))
+                elif result is None or (result.metas is None and has_dependents[i]):
+                    manager.log("Processing SCC (%s) again without a worker" % scc_str)
+                    sccs_redone += 1
+                    process_locally(i)
+                else:
+                    apply_result(i, result)
+                    worker.own.add(i)
+                    sccs_in_workers += 1
+            flush_ready()
+        manager.add_stats(sccs_in_workers=sccs_in_workers, sccs_redone=sccs_redone)
+        if failure is not None:
+            flush_ready()
+            raise failure[1]
+    finally:
+        for worker in idle:
+            with contextlib.suppress(OSError):
+                worker.conn.send(None)
+        for _, worker in busy.values():
+            worker.proc.terminate()
+        for worker in idle + [worker for _, worker in busy.values()]:
+            worker.conn.close()
+            worker.proc.join()
+        flush_ready()
+
+
 def order_ascc(graph: Graph, ascc: AbstractSet[str], pri_max: int = PRI_ALL) -> List[str]:
     """Come up with the ideal processing order within an SCC.
 
@@ -3029,10 +3963,12 @@ def process_fresh_modules(graph: Graph, modules: List[str], manager: BuildManage
     """
     t0 = time.time()
     for id in modules:
-        graph[id].load_tree()
+        with manager.timed(LOAD_CACHE_PHASE, id):
+            graph[id].load_tree()
     t1 = time.time()
     for id in modules:
-        graph[id].fix_cross_refs()
+        with manager.timed(LOAD_CACHE_PHASE, id):
+            graph[id].fix_cross_refs()
     t2 = time.time()
     manager.add_stats(process_fresh_time=t2 - t0, load_tree_time=t1 - t0)
 
@@ -3080,6 +4016,7 @@ def process_stale_scc(graph: Graph, scc: List[str], manager: BuildManager) -> No
         manager.flush_errors(manager.errors.file_messages(graph[id].xpath), False)
         graph[id].write_cache()
         graph[id].mark_as_rechecked()
+    record_subtype_cache_hashes(graph, scc)
 
 
 def sorted_components(graph: Graph,
@@ -0,0 +1,197 @@
+"""Prebuilt, read-only cache bundles for typeshed.
+
+Checking a program from scratch starts by processing builtins, typing
+and the other stubs in typeshed that the program uses, which takes a
+while. A cache bundle holds cache data for all the typeshed stubs of
+the standard library, so that this can be skipped even when the
+project cache directory is empty, such as in a fresh CI container.
+
+A bundle is specific to a mypy version, a target Python version and a
+platform. It's a directory (named by bundle_key()) that contains an
+SQLite cache database and a manifest, below the directory given by
+--cache-bundle-dir (by default, the directory of the mypy installation).
+Source file paths in the bundle are relative to the typeshed directory,
+so a bundle can be copied to another machine.
+
+Bundle entries are checked against the source files and the options
+just like normal cache entries, but they are never modified. If an
+entry can't be used (for example, because the options affecting the
+cache are different), mypy silently falls back to the project cache.
+
+Create a bundle with:
+
+  python -m mypy.cachebundle [--output-dir DIR] [mypy options]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from typing import Any, Dict, List, Optional
+from typing_extensions import Final
+
+from mypy.errors import CompileError
+from mypy.metastore import MetadataStore, SqliteMetadataStore, SQLITE_DB_FILE
+from mypy.modulefinder import BuildSource, default_lib_path, get_typeshed_dir
+from mypy.options import Options
+from mypy.util import is_sub_path
+from mypy.version import __version__
+
+# Default location of bundles, relative to the mypy data directory
+DEFAULT_BUNDLE_DIR = 'cache_bundles'  # type: Final
+MANIFEST_FILE = 'manifest.json'  # type: Final
+
+
+def bundle_key(version_id: str, options: Options) -> str:
+    """Return the name of the bundle directory for a mypy version and options."""
+    return '{}-py{}.{}-{}'.format(version_id, options.python_version[0],
+                                  options.python_version[1], options.platform)
+
+
+def bundle_dir_for(options: Options, data_dir: str) -> str:
+    return options.cache_bundle_dir or os.path.join(data_dir, DEFAULT_BUNDLE_DIR)
+
+
+class CacheBundle:
+    """A cache bundle found for the current build."""
+
+    def __init__(self, path: str, typeshed_dir: str) -> None:
+        self.path = path
+        self.typeshed_dir = os.path.abspath(typeshed_dir)
+
+    def covers(self, path: str) -> bool:
+        """Can the bundle have cache data for the module at path?"""
+        return is_sub_path(os.path.abspath(path), self.typeshed_dir)
+
+    def source_path(self, relative_path: str) -> str:
+        """Return the absolute path of a source file recorded in the bundle."""
+        return os.path.join(self.typeshed_dir, relative_path)
+
+    def open_store(self) -> MetadataStore:
+        return SqliteMetadataStore(self.path, read_only=True)
+
+
+def find_cache_bundle(options: Options, data_dir: str,
+                      version_id: str) -> Optional[CacheBundle]:
+    """Find a cache bundle usable with the given options, if there is one."""
+    if (options.bazel or options.cache_map or options.cache_fine_grained
+            or options.use_fine_grained_cache):
+        # Bundles don't support these.
+        return None
+    path = os.path.join(bundle_dir_for(options, data_dir), bundle_key(version_id, options))
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(manifest, dict)
+            or manifest.get('version_id') != version_id
+            or manifest.get('python_version') != list(options.python_version)
+            or manifest.get('platform') != options.platform
+            or not os.path.isfile(os.path.join(path, SQLITE_DB_FILE))):
+        return None
+    return CacheBundle(path, get_typeshed_dir(data_dir, options.custom_typeshed_dir))
+
+
+def stdlib_sources(options: Options, data_dir: str) -> List[BuildSource]:
+    """Return build sources for all standard library stubs in typeshed."""
+    sources = {}  # type: Dict[str, BuildSource]
+    lib_path = default_lib_path(data_dir, options.python_version, options.custom_typeshed_dir)
+    typeshed_dir = get_typeshed_dir(data_dir, options.custom_typeshed_dir)
+    for stubdir in lib_path:
+        if not is_sub_path(stubdir, os.path.join(typeshed_dir, 'stdlib')):
+            continue
+        for root, dirs, files in os.walk(stubdir):
+            dirs.sort()
+            for name in sorted(files):
+                if not name.endswith('.pyi'):
+                    continue
+                path = os.path.join(root, name)
+                parts = path[len(stubdir) + 1:-len('.pyi')].split(os.sep)
+                if parts[-1] == '__init__':
+                    parts.pop()
+                module = '.'.join(parts)
+                # Let mypy find the module, so that it's processed like an
+                # imported typeshed module (errors are ignored, for example).
+                if module not in sources:
+                    sources[module] = BuildSource(None, module, None)
+    return [sources[module] for module in sorted(sources)]
+
+
+def create_cache_bundle(output_dir: str, options: Options,
+                        data_dir: Optional[str] = None) -> str:
+    """Type check the typeshed stdlib stubs and write a bundle below output_dir.
+
+    Return the path of the bundle directory. Raise CompileError if the
+    stubs can't be processed.
+    """
+    from mypy import build  # Avoid an import cycle
+
+    data_dir = data_dir or build.default_data_dir()
+    bundle = CacheBundle(os.path.join(output_dir, bundle_key(__version__, options)),
+                         get_typeshed_dir(data_dir, options.custom_typeshed_dir))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        options.incremental = True
+        options.cache_dir = cache_dir
+        options.sqlite_cache = False
+        result = build.build(stdlib_sources(options, data_dir), options)
+        store = build.create_metastore(options)
+        if os.path.isdir(bundle.path):
+            shutil.rmtree(bundle.path)
+        target = SqliteMetadataStore(bundle.path)
+        count = 0
+        for id, state in sorted(result.graph.items()):
+            if not state.path or not bundle.covers(state.path):
+                continue
+            meta_json, data_json, _ = build.get_cache_names(id, state.path, options)
+            try:
+                meta = build.cache_loads(store.read_bytes(meta_json))  # type: Dict[str, Any]
+            except OSError:
+                continue  # No cache data was written
+            meta['path'] = os.path.relpath(os.path.abspath(state.path), bundle.typeshed_dir)
+            # The cache mtimes are used for validation, so they must be preserved.
+            target.write(meta_json, build.cache_dumps(meta, options), store.getmtime(meta_json))
+            target.write(data_json, store.read_bytes(data_json), store.getmtime(data_json))
+            count += 1
+        target.commit()
+    manifest = {
+        'version_id': __version__,
+        'python_version': list(options.python_version),
+        'platform': options.platform,
+        'options': options.clone_for_module('builtins').select_options_affecting_cache(),
+        'modules': count,
+    }
+    with open(os.path.join(bundle.path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return bundle.path
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    from mypy.build import default_data_dir
+    from mypy.main import process_options
+
+    parser = argparse.ArgumentParser(
+        prog='python -m mypy.cachebundle',
+        description='Create a cache bundle for the typeshed standard library stubs. '
+                    'Other arguments are passed to mypy; the bundle is only used '
+                    'with matching options.')
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help='Write the bundle below DIR (default: {} in the mypy '
+                             'installation directory)'.format(DEFAULT_BUNDLE_DIR))
+    known, mypy_args = parser.parse_known_args(args)
+    _, options = process_options(mypy_args, require_targets=False)
+    output_dir = known.output_dir or bundle_dir_for(options, default_data_dir())
+    try:
+        path = create_cache_bundle(output_dir, options)
+    except CompileError as e:
+        for line in e.messages:
+            print(line, file=sys.stderr)
+        sys.exit(2)
+    print('Wrote cache bundle to {}'.format(path))
+
+
+if __name__ == '__main__':
+    main()
@@ -39,6 +39,8 @@ from mypy import nodes
 import mypy.checker
 from mypy import types
 from mypy.sametypes import is_same_type
+from mypy.typestate import TypeState
+from mypy import state
 from mypy.erasetype import replace_meta_vars, erase_type, remove_instance_last_known_values
 from mypy.maptype import map_instance_to_supertype
 from mypy.messages import MessageBuilder
@@ -168,6 +170,9 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         # TODO: refactor this to use a pattern similar to one in
         # multiassign_from_union, or maybe even combine the two?
         self.type_overrides = {}  # type: Dict[Expression, Type]
+        # Results of argument count checks of overload items by the argument kinds and
+        # names of the call and the item (see plausible_overload_call_targets).
+        self.overload_arg_counts = {}  # type: Dict[Tuple[object, ...], bool]
         self.strfrm_checker = StringFormatterChecker(self, self.chk, self.msg)
 
     def visit_name_expr(self, e: NameExpr) -> Type:
@@ -1530,6 +1535,19 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         plausible_targets = self.plausible_overload_call_targets(arg_types, arg_kinds,
                                                                  arg_names, callee)
 
+        # If an earlier call with the same argument types matched an item, only the
+        # target for that item needs to be checked.
+        cache_key = self.overload_call_cache_key(callee, args, arg_types, arg_kinds,
+                                                 arg_names, callable_name, object_type)
+        if cache_key is not None:
+            index = TypeState.overload_call_item(cache_key)
+            if index is not None:
+                cached_result = self.infer_overload_return_type(
+                    plausible_targets[index:index + 1], args, arg_types, arg_kinds, arg_names,
+                    callable_name, object_type, context, arg_messages)
+                if cached_result is not None:
+                    return cached_result
+
         # Step 2: If the arguments contain a union, we try performing union math first,
         #         instead of picking the first matching overload.
         #         This is because picking the first overload often ends up being too greedy:
@@ -1566,7 +1584,8 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         # Step 3: We try checking each branch one-by-one.
         inferred_result = self.infer_overload_return_type(plausible_targets, args, arg_types,
                                                           arg_kinds, arg_names, callable_name,
-                                                          object_type, context, arg_messages)
+                                                          object_type, context, arg_messages,
+                                                          cache_key=cache_key)
         # If any of checks succeed, stop early.
         if inferred_result is not None and unioned_result is not None:
             # Both unioned and direct checks succeeded, choose the more precise type.
@@ -1654,13 +1673,24 @@ class ExpressionChecker(ExpressionVisitor[Type]):
             if kind == ARG_STAR2 and not has_shape(typ):
                 args_have_kw_arg = True
 
+        # Without star arguments, the argument count check only depends on the kinds
+        # and names of the arguments, so results can be reused for calls of the same shape.
+        call_shape = None  # type: Optional[Tuple[object, ...]]
+        if ARG_STAR not in arg_kinds and ARG_STAR2 not in arg_kinds:
+            call_shape = (tuple(arg_kinds), tuple(arg_names or ()),
+                          self.chk.in_checked_function())
+
         for typ in overload.items():
-            formal_to_actual = map_actuals_to_formals(arg_kinds, arg_names,
-                                                      typ.arg_kinds, typ.arg_names,
-                                                      lambda i: arg_types[i])
+            if call_shape is not None:
+                key = (call_shape, tuple(typ.arg_kinds), tuple(typ.arg_names))
+                count_ok = self.overload_arg_counts.get(key)
+                if count_ok is None:
+                    count_ok = self.overload_arg_count_ok(typ, arg_types, arg_kinds, arg_names)
+                    self.overload_arg_counts[key] = count_ok
+            else:
+                count_ok = self.overload_arg_count_ok(typ, arg_types, arg_kinds, arg_names)
 
-            if self.check_argument_count(typ, arg_types, arg_kinds, arg_names,
-                                         formal_to_actual, None, None):
+            if count_ok:
                 if args_have_var_arg and typ.is_var_arg:
                     star_matches.append(typ)
                 elif args_have_kw_arg and typ.is_kw_arg:
@@ -1670,6 +1700,55 @@ class ExpressionChecker(ExpressionVisitor[Type]):
 
         return star_matches + matches
 
+    def overload_arg_count_ok(self,
+                              typ: CallableType,
+                              arg_types: List[Type],
+                              arg_kinds: List[int],
+                              arg_names: Optional[Sequence[Optional[str]]]) -> bool:
+        formal_to_actual = map_actuals_to_formals(arg_kinds, arg_names,
+                                                  typ.arg_kinds, typ.arg_names,
+                                                  lambda i: arg_types[i])
+        return self.check_argument_count(typ, arg_types, arg_kinds, arg_names,
+                                         formal_to_actual, None, None)
+
+    def overload_call_cache_key(self,
+                                callee: Overloaded,
+                                args: List[Expression],
+                                arg_types: List[Type],
+                                arg_kinds: List[int],
+                                arg_names: Optional[Sequence[Optional[str]]],
+                                callable_name: Optional[str],
+                                object_type: Optional[Type]) -> Optional[Tuple[object, ...]]:
+        """Return a key for caching the overload item matched by a call, if possible.
+
+        The first matching item only depends on the argument types if the types
+        of the argument expressions don't depend on the type context, and if
+        neither the items nor the argument types involve type variables, literal
+        types or Any types. Calls with union arguments use union math and
+        calls with star arguments are never cached. Return None if the call
+        can't be cached.
+        """
+        if ARG_STAR in arg_kinds or ARG_STAR2 in arg_kinds:
+            return None
+        if not all(isinstance(arg, CONTEXT_FREE_EXPRESSIONS) for arg in args):
+            return None
+        if any(isinstance(get_proper_type(typ), UnionType) or has_uncacheable_component(typ)
+               for typ in arg_types):
+            return None
+        for item in callee.items():
+            if item.variables or any(has_uncacheable_component(typ) for typ in item.arg_types):
+                return None
+        if not (callable_name
+                and ((object_type is None and self.plugin.get_function_hook(callable_name))
+                     or (object_type is not None
+                         and self.plugin.get_method_hook(callable_name)))):
+            # Only plugins can look at the literal values of arguments, since the items
+            # have no literal types.
+            arg_types = [remove_instance_last_known_values(typ) for typ in arg_types]
+        return (callee, tuple(arg_types), tuple(arg_kinds), tuple(arg_names or ()),
+                callable_name, object_type, self.chk.in_checked_function(),
+                state.strict_optional, self.chk.options)
+
     def infer_overload_return_type(self,
                                    plausible_targets: List[CallableType],
                                    args: List[Expression],
@@ -1680,6 +1759,7 @@ class ExpressionChecker(ExpressionVisitor[Type]):
                                    object_type: Optional[Type],
                                    context: Context,
                                    arg_messages: Optional[MessageBuilder] = None,
+                                   cache_key: Optional[Tuple[object, ...]] = None,
                                    ) -> Optional[Tuple[Type, Type]]:
         """Attempts to find the first matching callable from the given list.
 
@@ -1688,6 +1768,8 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         If multiple targets match due to ambiguous Any parameters, returns (AnyType, AnyType).
         If no targets match, returns None.
 
+        If cache_key is given, the index of the first match is recorded for the key.
+
         Assumes all of the given targets have argument counts compatible with the caller.
         """
 
@@ -1697,7 +1779,7 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         inferred_types = []  # type: List[Type]
         args_contain_any = any(map(has_any_type, arg_types))
 
-        for typ in plausible_targets:
+        for index, typ in enumerate(plausible_targets):
             overload_messages = self.msg.clean_copy()
             prev_messages = self.msg
             assert self.msg is self.chk.msg
@@ -1725,6 +1807,8 @@ class ExpressionChecker(ExpressionVisitor[Type]):
                 # Return early if possible; otherwise record info so we can
                 # check for ambiguity due to 'Any' below.
                 if not args_contain_any:
+                    if cache_key is not None:
+                        TypeState.record_overload_call_item(cache_key, index)
                     return ret_type, infer_type
                 matches.append(typ)
                 return_types.append(ret_type)
@@ -3245,7 +3329,7 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         if not isinstance(vt, Instance):
             return None
         # TODO: update tests instead?
-        vt.erased = True
+        vt = vt.copy_modified(erased=True)
         return self.chk.named_generic_type(container_fullname, [vt])
 
     def check_lst_expr(self, items: List[Expression], fullname: str,
@@ -3374,8 +3458,8 @@ class ExpressionChecker(ExpressionVisitor[Type]):
         if stargs and (stargs[0] != kt or stargs[1] != vt):
             return None
         # TODO: update tests instead?
-        kt.erased = True
-        vt.erased = True
+        kt = kt.copy_modified(erased=True)
+        vt = vt.copy_modified(erased=True)
         return self.chk.named_generic_type('builtins.dict', [kt, vt])
 
     def visit_dict_expr(self, e: DictExpr) -> Type:
@@ -4272,6 +4356,43 @@ class HasTypeVarQuery(types.TypeQuery[bool]):
         return True
 
 
+# Expressions whose types don't depend on the type context
+CONTEXT_FREE_EXPRESSIONS = (NameExpr, MemberExpr, IntExpr, StrExpr, BytesExpr,
+                            UnicodeExpr, FloatExpr, ComplexExpr)  # type: Final
+
+
+def has_uncacheable_component(t: Type) -> bool:
+    """Does t prevent caching the overload item matched by a call?"""
+    return t.accept(HasUncacheableComponentsQuery())
+
+
+class HasUncacheableComponentsQuery(types.TypeQuery[bool]):
+    """Visitor for querying whether a type prevents caching overload call items."""
+    def __init__(self) -> None:
+        super().__init__(any)
+
+    def visit_any(self, t: AnyType) -> bool:
+        return t.type_of_any != TypeOfAny.special_form
+
+    def visit_type_var(self, t: TypeVarType) -> bool:
+        return True
+
+    def visit_literal_type(self, t: LiteralType) -> bool:
+        return True
+
+    def visit_uninhabited_type(self, t: UninhabitedType) -> bool:
+        return True
+
+    def visit_erased_type(self, t: ErasedType) -> bool:
+        return True
+
+    def visit_partial_type(self, t: PartialType) -> bool:
+        return True
+
+    def visit_callable_type(self, t: CallableType) -> bool:
+        return bool(t.variables) or super().visit_callable_type(t)
+
+
 def has_erased_component(t: Optional[Type]) -> bool:
     return t is not None and t.accept(HasErasedComponentsQuery())
 
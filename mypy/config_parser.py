@@ -86,6 +86,7 @@ config_types = {
     'files': split_and_match_files,
     'quickstart_file': expand_path,
     'junit_xml': expand_path,
+    'timing_report': expand_path,
     # These two are for backwards compatibility
     'silent_imports': bool,
     'almost_silent': bool,
@@ -98,6 +99,7 @@ config_types = {
     'enable_error_code': lambda s: [p.strip() for p in s.split(',')],
     'package_root': lambda s: [p.strip() for p in s.split(',')],
     'cache_dir': expand_path,
+    'cache_bundle_dir': expand_path,
     'python_executable': expand_path,
     'strict': bool,
 }  # type: Final
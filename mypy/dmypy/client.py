@@ -98,6 +98,18 @@ p.add_argument('--update', metavar='FILE', nargs='*',
 p.add_argument('--remove', metavar='FILE', nargs='*',
                help="Files to remove from the run")
 
+snapshot_parser = p = subparsers.add_parser('snapshot',
+    help="Save the daemon state to a directory for a later restore (requires daemon)")
+p.add_argument('directory', metavar='DIR', help="Directory to save the snapshot in")
+
+restore_parser = p = subparsers.add_parser('restore', formatter_class=AugmentedHelpFormatter,
+    help="Restore the daemon state from a snapshot and recheck changed files "
+         "(requires a daemon that hasn't checked anything)")
+p.add_argument('-v', '--verbose', action='store_true', help="Print detailed status")
+p.add_argument('--junit-xml', help="Write junit.xml to the given file")
+p.add_argument('--perf-stats-file', help='write performance information to the given file')
+p.add_argument('directory', metavar='DIR', help="Directory containing the snapshot")
+
 suggest_parser = p = subparsers.add_parser('suggest',
     help="Suggest a signature or show call sites for a specific function")
 p.add_argument('function', metavar='FUNCTION', type=str,
@@ -362,6 +374,40 @@ def do_recheck(args: argparse.Namespace) -> None:
     check_output(response, args.verbose, args.junit_xml, args.perf_stats_file)
 
 
+@action(snapshot_parser)
+def do_snapshot(args: argparse.Namespace) -> None:
+    """Ask the daemon to save its state to a directory.
+
+    The daemon must not have blocking errors. The state can be restored
+    by a daemon started with the same flags (see do_restore()).
+    """
+    response = request(args.status_file, 'snapshot', directory=os.path.abspath(args.directory))
+    if 'error' in response:
+        fail(response['error'])
+    print("Snapshot written to {}".format(args.directory))
+
+
+@action(restore_parser)
+def do_restore(args: argparse.Namespace) -> None:
+    """Ask the daemon to restore its state from a snapshot.
+
+    This replaces the initial check; files that have changed since the
+    snapshot was taken are checked again. The output is like that of a
+    check command.
+
+    The daemon must not have checked any files yet, and it must have been
+    started with the same flags as the daemon that took the snapshot:
+
+      dmypy start -- --strict
+      dmypy restore DIR
+    """
+    t0 = time.time()
+    response = request(args.status_file, 'restore', directory=os.path.abspath(args.directory))
+    t1 = time.time()
+    response['roundtrip_time'] = t1 - t0
+    check_output(response, args.verbose, args.junit_xml, args.perf_stats_file)
+
+
 @action(suggest_parser)
 def do_suggest(args: argparse.Namespace) -> None:
     """Ask the daemon for a suggested signature.
@@ -24,9 +24,11 @@ import mypy.errors
 import mypy.main
 from mypy.find_sources import create_source_list, InvalidSourceList
 from mypy.server.update import FineGrainedBuildManager, refresh_suppressed_submodules
+from mypy.dmypy_snapshot import ServerSnapshot, SnapshotError, read_snapshot, write_snapshot
 from mypy.dmypy_util import receive
 from mypy.ipc import IPCServer
 from mypy.fscache import FileSystemCache
+from mypy.fsevents import create_event_source, EventSourceError, INOTIFY_BACKEND
 from mypy.fswatcher import FileSystemWatcher, FileData
 from mypy.modulefinder import BuildSource, compute_search_paths, FindModuleCache, SearchPaths
 from mypy.options import Options
@@ -143,6 +145,8 @@ def process_start_options(flags: List[str], allow_sources: bool) -> Options:
         sys.exit("dmypy: start/restart should not disable incremental mode")
     if options.follow_imports not in ('skip', 'error', 'normal'):
         sys.exit("dmypy: follow-imports=silent not supported")
+    if options.file_events == INOTIFY_BACKEND and not sys.platform.startswith('linux'):
+        sys.exit("dmypy: --file-events=inotify is only supported on Linux")
     return options
 
 
@@ -257,7 +261,7 @@ class Server:
         if method is None:
             return {'error': "Unrecognized command '%s'" % command}
         else:
-            if command not in {'check', 'recheck', 'run'}:
+            if command not in {'check', 'recheck', 'run', 'restore'}:
                 # Only the above commands use some error formatting.
                 del data['is_tty']
                 del data['terminal_width']
@@ -269,6 +273,9 @@ class Server:
         """Return daemon status."""
         res = {}  # type: Dict[str, object]
         res.update(get_meminfo())
+        if hasattr(self, 'fswatcher'):
+            res['fswatcher_backend'] = self.fswatcher.backend
+            res['fswatcher_queued_events'] = self.fswatcher.queued_events()
         if fswatcher_dump_file:
             data = self.fswatcher.dump_file_data() if hasattr(self, 'fswatcher') else {}
             # Using .dumps and then writing was noticeably faster than using dump
@@ -401,14 +408,29 @@ class Server:
         return self.options.follow_imports == 'normal'
 
     def initialize_fine_grained(self, sources: List[BuildSource],
-                                is_tty: bool, terminal_width: int) -> Dict[str, Any]:
-        self.fswatcher = FileSystemWatcher(self.fscache)
+                                is_tty: bool, terminal_width: int,
+                                snapshot: Optional[ServerSnapshot] = None) -> Dict[str, Any]:
+        """Run the initial build.
+
+        If a snapshot is given, load the build from it instead of checking
+        everything from scratch.
+        """
+        try:
+            event_source = create_event_source(self.options.file_events)
+        except EventSourceError as e:
+            return {'out': '', 'err': 'dmypy: --file-events={}: {}\n'.format(
+                self.options.file_events, e), 'status': 2}
+        old_fswatcher = getattr(self, 'fswatcher', None)  # type: Optional[FileSystemWatcher]
+        if old_fswatcher is not None:
+            old_fswatcher.close()
+        self.fswatcher = FileSystemWatcher(self.fscache, event_source)
         t0 = time.time()
         self.update_sources(sources)
         t1 = time.time()
         try:
             result = mypy.build.build(sources=sources,
-                                      options=self.options,
+                                      options=(snapshot.build_options(self.options)
+                                               if snapshot else self.options),
                                       fscache=self.fscache)
         except mypy.errors.CompileError as e:
             output = ''.join(s + '\n' for s in e.messages)
@@ -431,15 +453,21 @@ class Server:
         # Run a fine-grained update starting from the cached data
         if result.used_cache:
             t2 = time.time()
-            # Pull times and hashes out of the saved_cache and stick them into
-            # the fswatcher, so we pick up the changes.
-            for state in self.fine_grained_manager.graph.values():
-                meta = state.meta
-                if meta is None: continue
-                assert state.path is not None
-                self.fswatcher.set_file_data(
-                    state.path,
-                    FileData(st_mtime=float(meta.mtime), st_size=meta.size, hash=meta.hash))
+            if snapshot:
+                # The snapshot has the errors and the file data from when it was taken.
+                snapshot.restore_errors(self.fine_grained_manager)
+                for path, data in snapshot.file_data.items():
+                    self.fswatcher.set_file_data(path, data)
+            else:
+                # Pull times and hashes out of the saved_cache and stick them into
+                # the fswatcher, so we pick up the changes.
+                for state in self.fine_grained_manager.graph.values():
+                    meta = state.meta
+                    if meta is None: continue
+                    assert state.path is not None
+                    self.fswatcher.set_file_data(
+                        state.path,
+                        FileData(st_mtime=float(meta.mtime), st_size=meta.size, hash=meta.hash))
 
             changed, removed = self.find_changed(sources)
 
@@ -523,8 +551,6 @@ class Server:
         """Like fine_grained_increment, but follow imports."""
         t0 = time.time()
 
-        # TODO: Support file events
-
         assert self.fine_grained_manager is not None
         fine_grained_manager = self.fine_grained_manager
         graph = fine_grained_manager.graph
@@ -800,6 +826,33 @@ class Server:
 
         return changed, removed
 
+    def cmd_snapshot(self, directory: str) -> Dict[str, object]:
+        """Write a snapshot of the daemon state to a directory."""
+        if not self.fine_grained_manager:
+            return {'error': "Command 'snapshot' is only valid after a 'check' command"}
+        try:
+            count = write_snapshot(directory, self.fine_grained_manager, self.previous_sources,
+                                   self.fswatcher.dump_file_data(), self.options_snapshot)
+        except SnapshotError as err:
+            return {'error': str(err)}
+        finally:
+            self.fscache.flush()
+        return {'modules': count}
+
+    def cmd_restore(self, directory: str,
+                    is_tty: bool, terminal_width: int) -> Dict[str, object]:
+        """Restore the daemon state from a snapshot and check the files again."""
+        if self.fine_grained_manager:
+            return {'error': "Command 'restore' is only valid before any files are checked"}
+        try:
+            snapshot = read_snapshot(directory, self.options_snapshot)
+        except SnapshotError as err:
+            return {'error': str(err)}
+        res = self.initialize_fine_grained(snapshot.sources, is_tty, terminal_width, snapshot)
+        self.fscache.flush()
+        self.update_stats(res)
+        return res
+
     def cmd_suggest(self,
                     function: str,
                     callsites: bool,
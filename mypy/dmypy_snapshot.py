@@ -0,0 +1,189 @@
+"""Snapshots of the daemon state for quick restarts.
+
+A snapshot directory contains an SQLite fine-grained incremental cache
+written from the in-memory state of the daemon (rather than from a
+regular mypy run), together with a small JSON state file that records
+everything else needed to continue where the daemon left off: the
+sources, the file data collected by the file system watcher, and the
+errors reported by the last check.
+
+A daemon started with the same flags can restore a snapshot with
+'dmypy restore'. This loads the cache like --use-fine-grained-cache
+does, and files that changed since the snapshot was taken are
+processed as a normal fine-grained increment. The snapshot directory
+must remain available while the restored daemon is running, since
+fine-grained dependencies are loaded from it lazily.
+"""
+
+import json
+import os
+
+from typing import Any, Dict, List, Tuple
+from typing_extensions import Final
+
+import mypy.build
+from mypy.fswatcher import FileData
+from mypy.modulefinder import BuildSource
+from mypy.options import Options
+from mypy.server.update import FineGrainedBuildManager, ensure_deps_loaded
+from mypy.util import hash_digest
+from mypy.version import __version__
+
+STATE_FILE = 'state.json'  # type: Final
+
+
+class SnapshotError(Exception):
+    """A snapshot can't be written or restored."""
+
+
+class ServerSnapshot:
+    """Daemon state read from a snapshot directory (see read_snapshot())."""
+
+    def __init__(self,
+                 directory: str,
+                 sources: List[BuildSource],
+                 file_data: Dict[str, FileData],
+                 messages: List[str],
+                 targets_with_errors: List[str]) -> None:
+        self.directory = directory
+        self.sources = sources
+        self.file_data = file_data
+        self.messages = messages
+        self.targets_with_errors = targets_with_errors
+
+    def build_options(self, options: Options) -> Options:
+        """Return options that load the cache from the snapshot."""
+        return snapshot_cache_options(options, self.directory).apply_changes(
+            {'use_fine_grained_cache': True})
+
+    def restore_errors(self, fine_grained_manager: FineGrainedBuildManager) -> None:
+        """Make the errors from the snapshot the result of the previous check.
+
+        The targets with errors are reprocessed by the next update that has
+        any changes, as usual.
+        """
+        fine_grained_manager.previous_messages = self.messages[:]
+        fine_grained_manager.previous_targets_with_errors = set(self.targets_with_errors)
+
+
+def options_digest(options_snapshot: object) -> str:
+    """Return a digest of an options snapshot (see Options.snapshot())."""
+    def default(o: object) -> object:
+        if isinstance(o, (set, frozenset)):
+            return sorted(str(item) for item in o)
+        return str(o)
+
+    data = json.dumps(options_snapshot, sort_keys=True, default=default)
+    return hash_digest(data.encode('utf-8'))
+
+
+def snapshot_cache_options(options: Options, directory: str) -> Options:
+    return options.apply_changes({'cache_dir': directory,
+                                  'sqlite_cache': True,
+                                  'cache_fine_grained': True})
+
+
+def write_snapshot(directory: str,
+                   fine_grained_manager: FineGrainedBuildManager,
+                   sources: List[BuildSource],
+                   file_data: Dict[str, Tuple[float, int, str]],
+                   options_snapshot: object) -> int:
+    """Write a snapshot of the daemon state to a directory.
+
+    Return the number of modules written. Raise SnapshotError if the
+    state can't be saved.
+    """
+    if fine_grained_manager.blocking_error or fine_grained_manager.stale:
+        raise SnapshotError("Can't take a snapshot while there are blocking errors")
+    manager = fine_grained_manager.manager
+    graph = fine_grained_manager.graph
+    deps = fine_grained_manager.deps
+    # The dependencies of modules loaded from a cache are only read when needed.
+    for id in graph:
+        ensure_deps_loaded(id, deps, graph)
+
+    # An incomplete snapshot must not be restored, so remove the state file first.
+    # Cache entries of an earlier snapshot are overwritten below, and entries of
+    # modules that are no longer in the build are never used.
+    state_file = os.path.join(directory, STATE_FILE)
+    if os.path.exists(state_file):
+        os.remove(state_file)
+
+    options = snapshot_cache_options(manager.options, directory)
+    saved = manager.options, manager.metastore, manager.fg_deps_meta, manager.errors
+    manager.options = options
+    manager.metastore = mypy.build.create_metastore(options)
+    manager.fg_deps_meta = {}
+    # Keep errors reported while writing the cache separate from the errors of the build.
+    manager.errors = manager.errors.copy()
+    count = 0
+    try:
+        for id, state in graph.items():
+            if not state.path:
+                continue
+            if state.tree:
+                source_hash = state.source_hash or (state.meta.hash if state.meta else None)
+                assert source_hash is not None, "Module must be either parsed or cached"
+                _, meta = mypy.build.write_cache(
+                    id, state.path, state.tree, list(state.dependencies),
+                    list(state.suppressed), state.dependency_priorities(),
+                    state.dependency_lines(), '', source_hash, state.ignore_all, manager)
+                if meta is None:
+                    raise SnapshotError("Error writing cache data for {}".format(id))
+            elif state.meta:
+                # Modules loaded from a cache are only deserialized when needed,
+                # so copy their cache data. The mtimes are used for validation.
+                old_store = saved[1]
+                for name in mypy.build.get_cache_names(id, state.path, options)[:2]:
+                    try:
+                        written = manager.metastore.write(name, old_store.read_bytes(name),
+                                                          old_store.getmtime(name))
+                    except OSError:
+                        written = False
+                    if not written:
+                        raise SnapshotError("Error copying cache data for {}".format(id))
+            else:
+                continue
+            count += 1
+        mypy.build.write_deps_cache(mypy.build.invert_deps(deps, graph), manager, graph)
+        mypy.build.write_plugins_snapshot(manager)
+        if manager.errors.is_blockers():
+            raise SnapshotError("Error writing fine-grained dependencies")
+        manager.metastore.commit()
+    finally:
+        manager.options, manager.metastore, manager.fg_deps_meta, manager.errors = saved
+
+    state_data = {
+        'version_id': __version__,
+        'options': options_digest(options_snapshot),
+        'sources': [[s.path, s.module, s.base_dir] for s in sources],
+        'file_data': file_data,
+        'messages': fine_grained_manager.previous_messages,
+        'targets_with_errors': sorted(fine_grained_manager.previous_targets_with_errors),
+    }
+    with open(state_file, 'w') as f:
+        json.dump(state_data, f)
+    return count
+
+
+def read_snapshot(directory: str, options_snapshot: object) -> ServerSnapshot:
+    """Read the state file of a snapshot and check that it can be used.
+
+    Raise SnapshotError if the snapshot is missing or was taken with a
+    different mypy version or different options.
+    """
+    try:
+        with open(os.path.join(directory, STATE_FILE)) as f:
+            data = json.load(f)  # type: Dict[str, Any]
+    except (OSError, ValueError) as err:
+        raise SnapshotError("Can't read snapshot in {}: {}".format(directory, err)) from err
+    if data.get('version_id') != __version__:
+        raise SnapshotError("Snapshot was taken with a different mypy version")
+    if data.get('options') != options_digest(options_snapshot):
+        raise SnapshotError("Snapshot was taken with different options")
+    return ServerSnapshot(
+        directory,
+        [BuildSource(path, module, None, base_dir) for path, module, base_dir in data['sources']],
+        {path: FileData(*values) for path, values in data['file_data'].items()},
+        data['messages'],
+        data['targets_with_errors'])
@@ -1,3 +1,4 @@
+import json
 import os.path
 import sys
 import traceback
@@ -121,6 +122,9 @@ class Errors:
     # Files that we have reported the errors for
     flushed_files = None  # type: Set[str]
 
+    # Number of messages forgotten after flushing (only with stream_errors)
+    num_flushed_messages = 0
+
     # Current error context: nested import context/stack, as a list of (path, line) pairs.
     import_ctx = None  # type: List[Tuple[str, int]]
 
@@ -152,6 +156,14 @@ class Errors:
     # Set to True to show absolute file paths in error messages.
     show_absolute_path = False  # type: bool
 
+    # Format of messages: 'text' or 'json' (one JSON object per message).
+    error_format = 'text'  # type: str
+
+    # Set to True to forget errors once they have been returned from
+    # file_messages(), so that memory use doesn't grow with the number of
+    # errors. Only counts are kept for flushed files.
+    stream_errors = False  # type: bool
+
     # State for keeping track of the current fine-grained incremental mode target.
     # (See mypy.server.update for more about targets.)
     # Current module id.
@@ -166,7 +178,9 @@ class Errors:
                  read_source: Optional[Callable[[str], Optional[List[str]]]] = None,
                  show_absolute_path: bool = False,
                  enabled_error_codes: Optional[Set[ErrorCode]] = None,
-                 disabled_error_codes: Optional[Set[ErrorCode]] = None) -> None:
+                 disabled_error_codes: Optional[Set[ErrorCode]] = None,
+                 error_format: str = 'text',
+                 stream_errors: bool = False) -> None:
         self.show_error_context = show_error_context
         self.show_column_numbers = show_column_numbers
         self.show_error_codes = show_error_codes
@@ -176,11 +190,14 @@ class Errors:
         self.read_source = read_source
         self.enabled_error_codes = enabled_error_codes or set()
         self.disabled_error_codes = disabled_error_codes or set()
+        self.error_format = error_format
+        self.stream_errors = stream_errors
         self.initialize()
 
     def initialize(self) -> None:
         self.error_info_map = OrderedDict()
         self.flushed_files = set()
+        self.num_flushed_messages = 0
         self.import_ctx = []
         self.function_or_member = [None]
         self.ignored_lines = OrderedDict()
@@ -201,7 +218,9 @@ class Errors:
                      self.read_source,
                      self.show_absolute_path,
                      self.enabled_error_codes,
-                     self.disabled_error_codes)
+                     self.disabled_error_codes,
+                     self.error_format,
+                     self.stream_errors)
         new.file = self.file
         new.import_ctx = self.import_ctx[:]
         new.function_or_member = self.function_or_member[:]
@@ -210,7 +229,8 @@ class Errors:
         return new
 
     def total_errors(self) -> int:
-        return sum(len(errs) for errs in self.error_info_map.values())
+        return (sum(len(errs) for errs in self.error_info_map.values())
+                + self.num_flushed_messages)
 
     def set_ignore_prefix(self, prefix: str) -> None:
         """Set path prefix that will be removed from all paths."""
@@ -402,7 +422,7 @@ class Errors:
 
     def num_messages(self) -> int:
         """Return the number of generated messages."""
-        return sum(len(x) for x in self.error_info_map.values())
+        return sum(len(x) for x in self.error_info_map.values()) + self.num_flushed_messages
 
     def is_errors(self) -> bool:
         """Are there any generated errors?"""
@@ -450,6 +470,8 @@ class Errors:
         a = []  # type: List[str]
         errors = self.render_messages(self.sort_messages(error_info))
         errors = self.remove_duplicates(errors)
+        if self.error_format == 'json':
+            return [format_json(error) for error in errors]
         for file, line, column, severity, message, code in errors:
             s = ''
             if file is not None:
@@ -488,16 +510,22 @@ class Errors:
     def file_messages(self, path: str) -> List[str]:
         """Return a string list of new error messages from a given file.
 
-        Use a form suitable for displaying to the user.
+        Use a form suitable for displaying to the user. With stream_errors,
+        the errors are forgotten afterwards.
         """
         if path not in self.error_info_map:
             return []
         self.flushed_files.add(path)
         source_lines = None
-        if self.pretty:
+        if self.pretty and self.error_format == 'text':
             assert self.read_source
             source_lines = self.read_source(path)
-        return self.format_messages(self.error_info_map[path], source_lines)
+        msgs = self.format_messages(self.error_info_map[path], source_lines)
+        if self.stream_errors:
+            # Keep the (empty) entry so that is_errors() etc. still work.
+            self.num_flushed_messages += len(self.error_info_map[path])
+            self.error_info_map[path] = []
+        return msgs
 
     def new_messages(self) -> List[str]:
         """Return a string list of new error messages.
@@ -677,6 +705,39 @@ class CompileError(Exception):
         self.module_with_blocker = module_with_blocker
 
 
+def format_json(error: ErrorTuple) -> str:
+    """Return an error message as a single-line JSON object."""
+    file, line, column, severity, message, code = error
+    return json.dumps({
+        'file': file,
+        'line': line if line >= 0 else None,
+        'column': column + 1 if file is not None and line >= 0 and column >= 0 else None,
+        'severity': severity,
+        'message': message,
+        'code': code.code if code and severity != 'note' else None,
+    })
+
+
+def format_raw_messages(messages: List[str], error_format: str,
+                        severity: str = 'error') -> List[str]:
+    """Format messages that don't refer to a location in a file.
+
+    These are messages such as "mypy: can't read file ..." that are
+    reported without going through an Errors object. A "note: " prefix
+    marks a note; other messages get the given severity. They are
+    returned as is unless error_format is 'json'.
+    """
+    if error_format != 'json':
+        return messages
+    result = []
+    for message in messages:
+        if message.startswith('note: '):
+            result.append(format_json((None, -1, -1, 'note', message[len('note: '):], None)))
+        else:
+            result.append(format_json((None, -1, -1, severity, message, None)))
+    return result
+
+
 def remove_path_prefix(path: str, prefix: Optional[str]) -> str:
     """If path starts with prefix, return copy of path with the prefix removed.
     Otherwise, return path. If path is None, return None.
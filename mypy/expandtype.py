@@ -83,6 +83,10 @@ class ExpandTypeVisitor(TypeVisitor[Type]):
 
     def visit_instance(self, t: Instance) -> Type:
         args = self.expand_types(t.args)
+        if (not t.erased and t.last_known_value is None
+                and all(new is old for new, old in zip(args, t.args))):
+            # No type variables were substituted; the copy would be the same.
+            return t
         return Instance(t.type, args, t.line, t.column)
 
     def visit_type_var(self, t: TypeVarType) -> Type:
@@ -20,9 +20,14 @@ from mypy.lookup import lookup_fully_qualified
 # N.B: we do a allow_missing fixup when fixing up a fine-grained
 # incremental cache load (since there may be cross-refs into deleted
 # modules)
+#
+# If lazy is True, symbol table entries are only fixed up when they are
+# first accessed (see SymbolTableNode.node). This is only safe if the
+# referenced modules don't change in the meantime, so it's not used in
+# fine-grained incremental mode.
 def fixup_module(tree: MypyFile, modules: Dict[str, MypyFile],
-                 allow_missing: bool) -> None:
-    node_fixer = NodeFixer(modules, allow_missing)
+                 allow_missing: bool, lazy: bool = False) -> None:
+    node_fixer = NodeFixer(modules, allow_missing, lazy)
     node_fixer.visit_symbol_table(tree.names, tree.fullname)
 
 
@@ -30,9 +35,11 @@ def fixup_module(tree: MypyFile, modules: Dict[str, MypyFile],
 class NodeFixer(NodeVisitor[None]):
     current_info = None  # type: Optional[TypeInfo]
 
-    def __init__(self, modules: Dict[str, MypyFile], allow_missing: bool) -> None:
+    def __init__(self, modules: Dict[str, MypyFile], allow_missing: bool,
+                 lazy: bool = False) -> None:
         self.modules = modules
         self.allow_missing = allow_missing
+        self.lazy = lazy
         self.type_fixer = TypeFixer(self.modules, allow_missing)
 
     # NOTE: This method isn't (yet) part of the NodeVisitor API.
@@ -66,32 +73,42 @@ class NodeFixer(NodeVisitor[None]):
 
     # NOTE: This method *definitely* isn't part of the NodeVisitor API.
     def visit_symbol_table(self, symtab: SymbolTable, table_fullname: str) -> None:
+        if self.lazy:
+            fixup = DeferredFixup(self, table_fullname).fixup
+            for value in symtab.values():
+                value.defer_fixup(fixup)
+            return
         # Copy the items because we may mutate symtab.
         for key, value in list(symtab.items()):
-            cross_ref = value.cross_ref
-            if cross_ref is not None:  # Fix up cross-reference.
-                value.cross_ref = None
-                if cross_ref in self.modules:
-                    value.node = self.modules[cross_ref]
-                else:
-                    stnode = lookup_qualified_stnode(self.modules, cross_ref,
-                                                     self.allow_missing)
-                    if stnode is not None:
-                        assert stnode.node is not None, (table_fullname + "." + key, cross_ref)
-                        value.node = stnode.node
-                    elif not self.allow_missing:
-                        assert False, "Could not find cross-ref %s" % (cross_ref,)
-                    else:
-                        # We have a missing crossref in allow missing mode, need to put something
-                        value.node = missing_info(self.modules)
+            self.visit_symbol_table_node(key, value, table_fullname)
+
+    # NOTE: This method isn't part of the NodeVisitor API either.
+    def visit_symbol_table_node(self, key: str, value: SymbolTableNode,
+                                table_fullname: str) -> None:
+        cross_ref = value.cross_ref
+        if cross_ref is not None:  # Fix up cross-reference.
+            value.cross_ref = None
+            if cross_ref in self.modules:
+                value.node = self.modules[cross_ref]
             else:
-                if isinstance(value.node, TypeInfo):
-                    # TypeInfo has no accept().  TODO: Add it?
-                    self.visit_type_info(value.node)
-                elif value.node is not None:
-                    value.node.accept(self)
+                stnode = lookup_qualified_stnode(self.modules, cross_ref,
+                                                 self.allow_missing)
+                if stnode is not None:
+                    assert stnode.node is not None, (table_fullname + "." + key, cross_ref)
+                    value.node = stnode.node
+                elif not self.allow_missing:
+                    assert False, "Could not find cross-ref %s" % (cross_ref,)
                 else:
-                    assert False, 'Unexpected empty node %r: %s' % (key, value)
+                    # We have a missing crossref in allow missing mode, need to put something
+                    value.node = missing_info(self.modules)
+        else:
+            if isinstance(value.node, TypeInfo):
+                # TypeInfo has no accept().  TODO: Add it?
+                self.visit_type_info(value.node)
+            elif value.node is not None:
+                value.node.accept(self)
+            else:
+                assert False, 'Unexpected empty node %r: %s' % (key, value)
 
     def visit_func_def(self, func: FuncDef) -> None:
         if self.current_info is not None:
@@ -140,6 +157,29 @@ class NodeFixer(NodeVisitor[None]):
         a.target.accept(self.type_fixer)
 
 
+class DeferredFixup:
+    """Fix up entries of a symbol table when they are first accessed.
+
+    A single instance is shared by all entries of a table. It remembers
+    the enclosing class, since NodeFixer uses it to set the 'info'
+    attribute of class members.
+    """
+
+    def __init__(self, fixer: NodeFixer, table_fullname: str) -> None:
+        self.fixer = fixer
+        self.info = fixer.current_info
+        self.table_fullname = table_fullname
+
+    def fixup(self, stnode: SymbolTableNode) -> None:
+        fixer = self.fixer
+        save_info = fixer.current_info
+        try:
+            fixer.current_info = self.info
+            fixer.visit_symbol_table_node('<lazy>', stnode, self.table_fullname)
+        finally:
+            fixer.current_info = save_info
+
+
 class TypeFixer(TypeVisitor[None]):
     def __init__(self, modules: Dict[str, MypyFile], allow_missing: bool) -> None:
         self.modules = modules
@@ -0,0 +1,246 @@
+"""Sources of file system change events for FileSystemWatcher.
+
+By default the watcher finds changed files by stat()ing every watched
+file (the 'poll' backend). With an event source, only files that have
+been reported by the operating system as potentially changed are
+examined, which is much faster for large numbers of files.
+
+The inotify backend (Linux only) watches the directories that contain
+watched files, since editors often replace files instead of writing to
+them, and the watches of replaced files would be lost. If the kernel
+event queue overflows, or a watched directory is moved or deleted,
+the watcher falls back to checking all files once and re-establishes
+the watches.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+from abc import ABCMeta, abstractmethod
+
+from typing import Dict, Iterable, Optional, Set
+from typing_extensions import Final
+
+POLL_BACKEND = 'poll'  # type: Final
+INOTIFY_BACKEND = 'inotify'  # type: Final
+AUTO_BACKEND = 'auto'  # type: Final
+BACKENDS = [POLL_BACKEND, INOTIFY_BACKEND, AUTO_BACKEND]  # type: Final
+
+
+class EventSourceError(Exception):
+    """Exception indicating that a requested event source can't be used."""
+
+
+class FileEventSource(metaclass=ABCMeta):
+    """Report paths that may have changed since the previous call to read_changes().
+
+    If overflowed is set after calling read_changes(), some events were
+    lost and the caller must check all paths.
+    """
+
+    name = 'unknown'
+
+    def __init__(self) -> None:
+        self.overflowed = False
+
+    @abstractmethod
+    def watch(self, paths: Iterable[str]) -> Set[str]:
+        """Start watching paths.
+
+        Return the paths that can't be watched (these must be polled).
+        """
+        pass
+
+    @abstractmethod
+    def unwatch(self, paths: Iterable[str]) -> None:
+        pass
+
+    @abstractmethod
+    def queued(self) -> int:
+        """Return the number of paths with events waiting to be processed."""
+        pass
+
+    @abstractmethod
+    def read_changes(self) -> Set[str]:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+# Constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002  # type: Final
+IN_ATTRIB = 0x00000004  # type: Final
+IN_CLOSE_WRITE = 0x00000008  # type: Final
+IN_MOVED_FROM = 0x00000040  # type: Final
+IN_MOVED_TO = 0x00000080  # type: Final
+IN_CREATE = 0x00000100  # type: Final
+IN_DELETE = 0x00000200  # type: Final
+IN_DELETE_SELF = 0x00000400  # type: Final
+IN_MOVE_SELF = 0x00000800  # type: Final
+IN_Q_OVERFLOW = 0x00004000  # type: Final
+IN_IGNORED = 0x00008000  # type: Final
+IN_ONLYDIR = 0x01000000  # type: Final
+IN_NONBLOCK = 0o4000  # type: Final
+IN_CLOEXEC = 0o2000000  # type: Final
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+              | IN_ONLYDIR)  # type: Final
+# Events after which the watch of a directory is no longer valid
+LOST_WATCH_MASK = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED  # type: Final
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_event_header = struct.Struct('iIII')  # type: Final
+
+
+class InotifyEventSource(FileEventSource):
+    """Event source based on the Linux inotify API (used through ctypes)."""
+
+    name = INOTIFY_BACKEND
+
+    def __init__(self) -> None:
+        super().__init__()
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        for func in (self.libc.inotify_init1, self.libc.inotify_add_watch,
+                     self.libc.inotify_rm_watch):
+            func.restype = ctypes.c_int
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # Watched file names by directory
+        self.dirs = {}  # type: Dict[str, Set[str]]
+        self.wd_to_dir = {}  # type: Dict[int, str]
+        self.dir_to_wd = {}  # type: Dict[str, int]
+        # Directories whose watches were lost (they were moved or deleted)
+        self.lost_dirs = set()  # type: Set[str]
+        self.buffer = b''
+        self.pending = set()  # type: Set[str]
+
+    def watch(self, paths: Iterable[str]) -> Set[str]:
+        unwatched = set()
+        for path in paths:
+            dirname, basename = os.path.split(os.path.abspath(path))
+            if (dirname not in self.dir_to_wd and dirname not in self.lost_dirs
+                    and not self._add_watch(dirname)):
+                unwatched.add(path)
+                continue
+            self.dirs.setdefault(dirname, set()).add(basename)
+        return unwatched
+
+    def _add_watch(self, dirname: str) -> bool:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirname), WATCH_MASK)
+        if wd < 0:
+            # Typically the directory doesn't exist or the watch limit was reached
+            # (see /proc/sys/fs/inotify/max_user_watches).
+            return False
+        self.wd_to_dir[wd] = dirname
+        self.dir_to_wd[dirname] = wd
+        return True
+
+    def unwatch(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            dirname, basename = os.path.split(os.path.abspath(path))
+            names = self.dirs.get(dirname)
+            if names is None:
+                continue
+            names.discard(basename)
+            if not names:
+                del self.dirs[dirname]
+                self.lost_dirs.discard(dirname)
+                wd = self.dir_to_wd.pop(dirname, None)
+                if wd is not None:
+                    del self.wd_to_dir[wd]
+                    self.libc.inotify_rm_watch(self.fd, wd)
+
+    def _drain(self) -> None:
+        """Read all available events from the kernel into self.pending."""
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            except OSError as err:
+                if err.errno == errno.EINTR:
+                    continue
+                raise
+            if not data:
+                break
+            self._parse(self.buffer + data)
+
+    def _parse(self, data: bytes) -> None:
+        pos = 0
+        while pos + _event_header.size <= len(data):
+            wd, mask, _, length = _event_header.unpack_from(data, pos)
+            end = pos + _event_header.size + length
+            if end > len(data):
+                break
+            name = os.fsdecode(data[pos + _event_header.size:end].rstrip(b'\0'))
+            pos = end
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            dirname = self.wd_to_dir.get(wd)
+            if dirname is None:
+                continue
+            if mask & LOST_WATCH_MASK:
+                # Changes to files in the directory would go unreported.
+                self.overflowed = True
+                del self.wd_to_dir[wd]
+                if self.dir_to_wd.get(dirname) == wd:
+                    del self.dir_to_wd[dirname]
+                    self.lost_dirs.add(dirname)
+                continue
+            if name in self.dirs.get(dirname, ()):
+                self.pending.add(os.path.join(dirname, name))
+        self.buffer = data[pos:]
+
+    def queued(self) -> int:
+        self._drain()
+        return len(self.pending)
+
+    def read_changes(self) -> Set[str]:
+        self._drain()
+        changes = self.pending
+        self.pending = set()
+        for dirname in list(self.lost_dirs):
+            if self._add_watch(dirname):
+                self.lost_dirs.remove(dirname)
+        if self.lost_dirs:
+            # Until the directories can be watched again (if they are
+            # recreated), all files need to be checked.
+            self.overflowed = True
+        return changes
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_event_source(backend: str) -> Optional[FileEventSource]:
+    """Create an event source for a backend name.
+
+    Return None if files should be polled (stat()ed), either because that
+    was requested or because no event source is available for the 'auto'
+    backend. Raise EventSourceError if an explicitly requested event source
+    isn't available.
+    """
+    if backend == POLL_BACKEND:
+        return None
+    assert backend in (INOTIFY_BACKEND, AUTO_BACKEND), backend
+    if not sys.platform.startswith('linux'):
+        if backend == AUTO_BACKEND:
+            return None
+        raise EventSourceError('inotify is only supported on Linux')
+    try:
+        return InotifyEventSource()
+    except (OSError, AttributeError) as err:
+        # AttributeError means that libc has no inotify functions.
+        if backend == AUTO_BACKEND:
+            return None
+        raise EventSourceError('inotify is not available ({})'.format(err)) from err
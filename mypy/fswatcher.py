@@ -1,6 +1,9 @@
 """Watch parts of the file system for changes."""
 
+import os
+
 from mypy.fscache import FileSystemCache
+from mypy.fsevents import FileEventSource, POLL_BACKEND
 from typing import AbstractSet, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 
@@ -17,8 +20,9 @@ class FileSystemWatcher:
     of potentially changed files. If a file has both size and mtime
     unmodified, the file is assumed to be unchanged.
 
-    An important goal of this class is to make it easier to eventually
-    use file system events to detect file changes.
+    If an event source is given, only files with reported events (and
+    files that can't be watched) are stat()ed, except for when events
+    may have been lost.
 
     Note: This class doesn't flush the file system cache. If you don't
     manually flush it, changes won't be seen.
@@ -27,10 +31,28 @@ class FileSystemWatcher:
     # TODO: Watching directories?
     # TODO: Handle non-files
 
-    def __init__(self, fs: FileSystemCache) -> None:
+    def __init__(self, fs: FileSystemCache, events: Optional[FileEventSource] = None) -> None:
         self.fs = fs
         self._paths = set()  # type: Set[str]
         self._file_data = {}  # type: Dict[str, Optional[FileData]]
+        self.events = events
+        # Watched paths by absolute path, which is used by event sources
+        self._abs_paths = {}  # type: Dict[str, Set[str]]
+        # Paths that have never been checked, or can't be watched using events
+        self._unchecked = set()  # type: Set[str]
+        self._unwatched = set()  # type: Set[str]
+
+    @property
+    def backend(self) -> str:
+        return self.events.name if self.events else POLL_BACKEND
+
+    def queued_events(self) -> int:
+        """Return the number of paths with file system events that haven't been processed."""
+        return self.events.queued() if self.events else 0
+
+    def close(self) -> None:
+        if self.events:
+            self.events.close()
 
     def dump_file_data(self) -> Dict[str, Tuple[float, int, str]]:
         return {k: v for k, v in self._file_data.items() if v is not None}
@@ -39,18 +61,39 @@ class FileSystemWatcher:
         self._file_data[path] = data
 
     def add_watched_paths(self, paths: Iterable[str]) -> None:
+        new_paths = []
         for path in paths:
             if path not in self._paths:
                 # By storing None this path will get reported as changed by
                 # find_changed if it exists.
                 self._file_data[path] = None
-        self._paths |= set(paths)
+                new_paths.append(path)
+        self._paths.update(new_paths)
+        if self.events and new_paths:
+            # Start watching before the files are first stat()ed by find_changed,
+            # so that no changes are missed.
+            self._unchecked.update(new_paths)
+            self._unwatched |= self.events.watch(new_paths)
+            for path in new_paths:
+                self._abs_paths.setdefault(os.path.abspath(path), set()).add(path)
 
     def remove_watched_paths(self, paths: Iterable[str]) -> None:
+        removed = []
         for path in paths:
             if path in self._file_data:
                 del self._file_data[path]
-        self._paths -= set(paths)
+            if path in self._paths:
+                removed.append(path)
+        self._paths.difference_update(removed)
+        if self.events and removed:
+            self.events.unwatch(removed)
+            self._unchecked.difference_update(removed)
+            self._unwatched.difference_update(removed)
+            for path in removed:
+                abs_path = os.path.abspath(path)
+                self._abs_paths[abs_path].discard(path)
+                if not self._abs_paths[abs_path]:
+                    del self._abs_paths[abs_path]
 
     def _update(self, path: str) -> None:
         st = self.fs.stat(path)
@@ -86,7 +129,19 @@ class FileSystemWatcher:
 
     def find_changed(self) -> AbstractSet[str]:
         """Return paths that have changes since the last call, in the watched set."""
-        return self._find_changed(self._paths)
+        if self.events is None:
+            return self._find_changed(self._paths)
+        events = self.events.read_changes()
+        if self.events.overflowed:
+            # Some events were lost, so look at everything.
+            self.events.overflowed = False
+            self._unchecked.clear()
+            return self._find_changed(self._paths)
+        candidates = self._unchecked | self._unwatched
+        self._unchecked = set()
+        for abs_path in events:
+            candidates.update(self._abs_paths.get(abs_path, ()))
+        return self._find_changed(candidates)
 
     def update_changed(self,
                        remove: List[str],
@@ -26,6 +26,9 @@ def join_simple(declaration: Optional[Type], s: Type, t: Type) -> ProperType:
     s = get_proper_type(s)
     t = get_proper_type(t)
 
+    if s is t and mypy.typeops.is_own_join_and_meet(s):
+        return s
+
     if (s.can_be_true, s.can_be_false) != (t.can_be_true, t.can_be_false):
         # if types are restricted in different ways, use the more general versions
         s = mypy.typeops.true_or_false(s)
@@ -81,6 +84,9 @@ def join_types(s: Type, t: Type) -> ProperType:
     s = get_proper_type(s)
     t = get_proper_type(t)
 
+    if s is t and mypy.typeops.is_own_join_and_meet(s):
+        return s
+
     if (s.can_be_true, s.can_be_false) != (t.can_be_true, t.can_be_false):
         # if types are restricted in different ways, use the more general versions
         s = mypy.typeops.true_or_false(s)
@@ -20,7 +20,8 @@ from mypy.modulefinder import (
 )
 from mypy.find_sources import create_source_list, InvalidSourceList
 from mypy.fscache import FileSystemCache
-from mypy.errors import CompileError
+from mypy.fsevents import BACKENDS
+from mypy.errors import CompileError, format_raw_messages
 from mypy.errorcodes import error_codes
 from mypy.options import Options, BuildType
 from mypy.config_parser import parse_version, parse_config_file
@@ -68,15 +69,27 @@ def main(script_path: Optional[str],
                                        fscache=fscache)
 
     messages = []
+    # With --stream-errors, messages aren't kept (unless needed for the JUnit XML
+    # report), and only what the error summary needs is counted instead.
+    keep_messages = not options.stream_errors or bool(options.junit_xml)
+    num_messages = 0
+    error_counts = {}  # type: Dict[str, int]
+    json_output = options.error_format == 'json'
     formatter = util.FancyFormatter(stdout, stderr, options.show_error_codes)
 
     def flush_errors(new_messages: List[str], serious: bool) -> None:
-        if options.pretty:
+        nonlocal num_messages
+        if options.pretty and not json_output:
             new_messages = formatter.fit_in_terminal(new_messages)
-        messages.extend(new_messages)
+        if keep_messages:
+            messages.extend(new_messages)
+        else:
+            num_messages += len(new_messages)
+            for file, count in util.count_errors_by_file(new_messages).items():
+                error_counts[file] = error_counts.get(file, 0) + count
         f = stderr if serious else stdout
         for msg in new_messages:
-            if options.color_output:
+            if options.color_output and not json_output:
                 msg = formatter.colorize(msg)
             f.write(msg + '\n')
         f.flush()
@@ -93,23 +106,29 @@ def main(script_path: Optional[str],
         if not e.use_stdout:
             serious = True
     if options.warn_unused_configs and options.unused_configs and not options.incremental:
-        print("Warning: unused section(s) in %s: %s" %
-              (options.config_file,
-               ", ".join("[mypy-%s]" % glob for glob in options.per_module_options.keys()
-                         if glob in options.unused_configs)),
-              file=stderr)
+        msg = "Warning: unused section(s) in %s: %s" % (
+            options.config_file,
+            ", ".join("[mypy-%s]" % glob for glob in options.per_module_options.keys()
+                      if glob in options.unused_configs))
+        for line in format_raw_messages([msg], options.error_format, severity='warning'):
+            print(line, file=stderr)
     maybe_write_junit_xml(time.time() - t0, serious, messages, options)
 
     if MEM_PROFILE:
         from mypy.memprofile import print_memory_profile
         print_memory_profile()
 
+    if keep_messages:
+        num_messages = len(messages)
+        error_counts = util.count_errors_by_file(messages)
+
     code = 0
-    if messages:
+    if num_messages:
         code = 2 if blockers else 1
-    if options.error_summary:
-        if messages:
-            n_errors, n_files = util.count_stats(messages)
+    # The summary would break JSON output.
+    if options.error_summary and not json_output:
+        if num_messages:
+            n_errors, n_files = sum(error_counts.values()), len(error_counts)
             if n_errors:
                 summary = formatter.format_error(
                     n_errors, n_files, len(sources), blockers=blockers,
@@ -648,6 +667,13 @@ def process_options(args: List[str],
     add_invertible_flag('--show-absolute-path', default=False,
                         help="Show absolute paths to files",
                         group=error_group)
+    error_group.add_argument(
+        '--error-format', choices=['text', 'json'], default='text',
+        help="How to format error messages; 'json' writes one JSON object per line "
+             "(default text)")
+    add_invertible_flag('--stream-errors', default=False,
+                        help="Don't keep errors in memory after they have been reported",
+                        group=error_group)
 
     incremental_group = parser.add_argument_group(
         title='Incremental mode',
@@ -669,6 +695,16 @@ def process_options(args: List[str],
     add_invertible_flag('--sqlite-cache', default=False,
                         help="Use a sqlite database to store the cache",
                         group=incremental_group)
+    add_invertible_flag('--binary-cache', default=False,
+                        help="Store module data in a compact binary format instead of JSON",
+                        group=incremental_group)
+    add_invertible_flag('--subtype-cache', default=False,
+                        help="Store results of protocol subtype checks in the cache",
+                        group=incremental_group)
+    incremental_group.add_argument(
+        '--cache-bundle-dir', action='store', metavar='DIR',
+        help="Use a prebuilt cache bundle for typeshed from the given folder "
+             "(defaults to the mypy installation)")
     incremental_group.add_argument(
         '--cache-fine-grained', action='store_true',
         help="Include fine-grained dependency information in the cache for the mypy daemon")
@@ -678,6 +714,11 @@ def process_options(args: List[str],
     incremental_group.add_argument(
         '--skip-cache-mtime-checks', action='store_true',
         help="Skip cache internal consistency checks based on mtime")
+    incremental_group.add_argument(
+        '-j', '--jobs', type=int, metavar='N',
+        help="Parse files and type check independent modules in up to N worker "
+             "processes. Workers exchange type checking results through the cache, "
+             "so it must be writable")
 
     internals_group = parser.add_argument_group(
         title='Advanced options',
@@ -723,6 +764,10 @@ def process_options(args: List[str],
         '--quickstart-file', help=argparse.SUPPRESS)
     other_group.add_argument(
         '--junit-xml', help="Write junit.xml to the given file")
+    other_group.add_argument(
+        '--timing-report', metavar='FILE',
+        help="Write wall clock and CPU times of build phases per module to the given "
+             "file, in Chrome trace event format")
     other_group.add_argument(
         '--find-occurrences', metavar='CLASS.MEMBER',
         dest='special-opts:find_occurrences',
@@ -739,6 +784,11 @@ def process_options(args: List[str],
         other_group.add_argument(
             '--use-fine-grained-cache', action='store_true',
             help="Use the cache in fine-grained incremental mode")
+        other_group.add_argument(
+            '--file-events', choices=BACKENDS,
+            help="How to detect changed files: stat() all files ('poll'), use "
+                 "inotify file system events ('inotify', Linux only) or use events "
+                 "if available ('auto')")
 
     # hidden options
     parser.add_argument(
@@ -924,6 +974,9 @@ def process_options(args: List[str],
 
         process_cache_map(parser, special_opts, options)
 
+    if options.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
     # Let logical_deps imply cache_fine_grained (otherwise the former is useless).
     if options.logical_deps:
         options.cache_fine_grained = True
@@ -1031,6 +1084,7 @@ def maybe_write_junit_xml(td: float, serious: bool, messages: List[str], options
 
 def fail(msg: str, stderr: TextIO, options: Options) -> None:
     """Fail with a serious error."""
-    stderr.write('%s\n' % msg)
+    for line in format_raw_messages([msg], options.error_format):
+        stderr.write('%s\n' % line)
     maybe_write_junit_xml(0.0, serious=True, messages=[msg], options=options)
     sys.exit(2)
@@ -1,8 +1,11 @@
 from typing import Dict, List
 
-from mypy.expandtype import expand_type
+from mypy.expandtype import expand_type, ExpandTypeVisitor
 from mypy.nodes import TypeInfo
-from mypy.types import Type, TypeVarId, Instance, AnyType, TypeOfAny, ProperType
+from mypy.types import (
+    Type, TypeVarId, TypeVarType, Instance, AnyType, TypeOfAny, ProperType
+)
+from mypy.typestate import TypeState
 
 
 def map_instance_to_supertype(instance: Instance,
@@ -21,7 +24,42 @@ def map_instance_to_supertype(instance: Instance,
         # Fast path: `superclass` has no type variables to map to.
         return Instance(superclass, [])
 
-    return map_instance_to_supertypes(instance, superclass)[0]
+    template = supertype_template(instance.type, superclass)
+    t = template.accept(TemplateExpander(instance_to_type_environment(instance)))
+    assert isinstance(t, ProperType)
+    assert isinstance(t, Instance)
+    return t
+
+
+def supertype_template(typ: TypeInfo, superclass: TypeInfo) -> Instance:
+    """Return `superclass` as an instance over the type variables of `typ`.
+
+    Mapping through the chain of bases only depends on the classes, so
+    the result is cached (see TypeState).
+    """
+    template = TypeState.supertype_template(typ, superclass)
+    if template is None:
+        self_type = Instance(typ, [TypeVarType(tv) for tv in typ.defn.type_vars])
+        template = map_instance_to_supertypes(self_type, superclass)[0]
+        TypeState.record_supertype_template(typ, superclass, template)
+    return template
+
+
+class TemplateExpander(ExpandTypeVisitor):
+    """Substitute type variables in a supertype template.
+
+    Instances in the template that were substituted for type variables of
+    the bases are still flagged as such (see Instance.erased), like when
+    the bases are expanded one by one.
+    """
+
+    def visit_instance(self, t: Instance) -> Type:
+        result = super().visit_instance(t)
+        if t.erased:
+            assert isinstance(result, ProperType)
+            assert isinstance(result, Instance)
+            result.erased = True
+        return result
 
 
 def map_instance_to_supertypes(instance: Instance,
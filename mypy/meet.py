@@ -13,7 +13,9 @@ from mypy.types import (
 from mypy.subtypes import is_equivalent, is_subtype, is_callable_compatible, is_proper_subtype
 from mypy.erasetype import erase_type
 from mypy.maptype import map_instance_to_supertype
-from mypy.typeops import tuple_fallback, make_simplified_union, is_recursive_pair
+from mypy.typeops import (
+    tuple_fallback, make_simplified_union, is_recursive_pair, is_own_join_and_meet
+)
 from mypy import state
 
 # TODO Describe this module.
@@ -41,6 +43,8 @@ def meet_types(s: Type, t: Type) -> ProperType:
     s = get_proper_type(s)
     t = get_proper_type(t)
 
+    if s is t and is_own_join_and_meet(s):
+        return s
     if isinstance(s, ErasedType):
         return s
     if isinstance(s, AnyType):
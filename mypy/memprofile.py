@@ -64,12 +64,51 @@ def collect_memory_stats() -> Tuple[Dict[str, int],
     return freqs, memuse
 
 
+def peak_rss_kib() -> int:
+    """Return the peak resident set size of this process in KiB (-1 if not known)."""
+    if sys.platform.startswith('win'):
+        return -1  # TODO: Support this on Windows
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # Reported in bytes instead of KiB
+        maxrss //= 1024
+    return maxrss
+
+
+def reachable_memory_kib(run_gc: bool = True) -> int:
+    """Return the total size of objects reachable from the gc in KiB.
+
+    This is slow, since it looks at every object.
+    """
+    if run_gc:
+        gc.collect()
+    _, memuse = collect_memory_stats()
+    return sum(memuse.values()) // 1024
+
+
+def node_memory_stats(run_gc: bool = True) -> Tuple[int, int]:
+    """Return the number of AST nodes and their total size in KiB.
+
+    The size of a node includes its __dict__ (if it has one), but not
+    other objects referred to by the node.
+    """
+    if run_gc:
+        gc.collect()
+    count = 0
+    size = 0
+    for obj in gc.get_objects():
+        if type(obj) is FakeInfo or not isinstance(obj, Node):
+            continue
+        count += 1
+        size += sys.getsizeof(obj)
+        if hasattr(obj, '__dict__'):
+            size += sys.getsizeof(obj.__dict__)
+    return count, size // 1024
+
+
 def print_memory_profile(run_gc: bool = True) -> None:
-    if not sys.platform.startswith('win'):
-        import resource
-        system_memuse = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
-    else:
-        system_memuse = -1  # TODO: Support this on Windows
+    system_memuse = peak_rss_kib()
     if run_gc:
         gc.collect()
     freqs, memuse = collect_memory_stats()
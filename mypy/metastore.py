@@ -13,8 +13,8 @@ import os
 import time
 
 from abc import abstractmethod
-from typing import List, Iterable, Any, Optional
-from typing_extensions import TYPE_CHECKING
+from typing import List, Iterable, Any, Optional, Tuple, Union
+from typing_extensions import Final, TYPE_CHECKING
 if TYPE_CHECKING:
     # We avoid importing sqlite3 unless we are using it so we can mostly work
     # on semi-broken pythons that are missing it.
@@ -41,15 +41,37 @@ class MetadataStore:
         pass
 
     @abstractmethod
-    def write(self, name: str, data: str, mtime: Optional[float] = None) -> bool:
+    def read_bytes(self, name: str) -> bytes:
+        """Read the raw contents of a metadata entry.
+
+        This is used for entries that may be stored in the binary cache
+        format (see mypy.binarycache). Text entries are returned UTF-8 encoded.
+
+        Raises FileNotFound if the entry does not exist.
+        """
+        pass
+
+    @abstractmethod
+    def write(self, name: str, data: Union[str, bytes], mtime: Optional[float] = None) -> bool:
         """Write a metadata entry.
 
+        The data may be text or, for binary cache entries, bytes.
+
         If mtime is specified, set it as the mtime of the entry. Otherwise,
         the current time is used.
 
         Returns True if the entry is successfully written, False otherwise.
         """
 
+    def write_many(self, entries: List[Tuple[str, Union[str, bytes]]]) -> None:
+        """Write multiple metadata entries (with the current time as mtime).
+
+        Errors are ignored. Stores that support it write all entries in a
+        single transaction.
+        """
+        for name, data in entries:
+            self.write(name, data)
+
     @abstractmethod
     def remove(self, name: str) -> None:
         """Delete a metadata entry"""
@@ -98,7 +120,16 @@ class FilesystemMetadataStore(MetadataStore):
         with open(os.path.join(self.cache_dir_prefix, name), 'r') as f:
             return f.read()
 
-    def write(self, name: str, data: str, mtime: Optional[float] = None) -> bool:
+    def read_bytes(self, name: str) -> bytes:
+        assert os.path.normpath(name) != os.path.abspath(name), "Don't use absolute paths!"
+
+        if not self.cache_dir_prefix:
+            raise FileNotFoundError()
+
+        with open(os.path.join(self.cache_dir_prefix, name), 'rb') as f:
+            return f.read()
+
+    def write(self, name: str, data: Union[str, bytes], mtime: Optional[float] = None) -> bool:
         assert os.path.normpath(name) != os.path.abspath(name), "Don't use absolute paths!"
 
         if not self.cache_dir_prefix:
@@ -108,8 +139,12 @@ class FilesystemMetadataStore(MetadataStore):
         tmp_filename = path + '.' + random_string()
         try:
             os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(tmp_filename, 'w') as f:
-                f.write(data)
+            if isinstance(data, bytes):
+                with open(tmp_filename, 'wb') as bf:
+                    bf.write(data)
+            else:
+                with open(tmp_filename, 'w') as f:
+                    f.write(data)
             os.replace(tmp_filename, path)
             if mtime is not None:
                 os.utime(path, times=(mtime, mtime))
@@ -150,9 +185,18 @@ MIGRATIONS = [
 ]  # type: List[str]
 
 
-def connect_db(db_file: str) -> 'sqlite3.Connection':
+SQLITE_DB_FILE = 'cache.db'  # type: Final
+
+
+def connect_db(db_file: str, read_only: bool = False) -> 'sqlite3.Connection':
     import sqlite3.dbapi2
 
+    if read_only:
+        from urllib.request import pathname2url
+
+        # The schema can't be changed, so there's no need to create it.
+        return sqlite3.dbapi2.connect('file:{}?mode=ro'.format(pathname2url(db_file)),
+                                      uri=True)
     db = sqlite3.dbapi2.connect(db_file)
     db.executescript(SCHEMA)
     for migr in MIGRATIONS:
@@ -164,7 +208,7 @@ def connect_db(db_file: str) -> 'sqlite3.Connection':
 
 
 class SqliteMetadataStore(MetadataStore):
-    def __init__(self, cache_dir_prefix: str) -> None:
+    def __init__(self, cache_dir_prefix: str, read_only: bool = False) -> None:
         # We check startswith instead of equality because the version
         # will have already been appended by the time the cache dir is
         # passed here.
@@ -172,8 +216,9 @@ class SqliteMetadataStore(MetadataStore):
             self.db = None
             return
 
-        os.makedirs(cache_dir_prefix, exist_ok=True)
-        self.db = connect_db(os.path.join(cache_dir_prefix, 'cache.db'))
+        if not read_only:
+            os.makedirs(cache_dir_prefix, exist_ok=True)
+        self.db = connect_db(os.path.join(cache_dir_prefix, SQLITE_DB_FILE), read_only)
 
     def _query(self, name: str, field: str) -> Any:
         # Raises FileNotFound for consistency with the file system version
@@ -191,9 +236,19 @@ class SqliteMetadataStore(MetadataStore):
         return self._query(name, 'mtime')
 
     def read(self, name: str) -> str:
-        return self._query(name, 'data')
-
-    def write(self, name: str, data: str, mtime: Optional[float] = None) -> bool:
+        data = self._query(name, 'data')
+        if isinstance(data, bytes):
+            return data.decode('utf-8')
+        return data
+
+    def read_bytes(self, name: str) -> bytes:
+        # Binary cache entries are stored as BLOBs, JSON entries as TEXT.
+        data = self._query(name, 'data')
+        if isinstance(data, str):
+            return data.encode('utf-8')
+        return data
+
+    def write(self, name: str, data: Union[str, bytes], mtime: Optional[float] = None) -> bool:
         import sqlite3
 
         if not self.db:
@@ -207,6 +262,20 @@ class SqliteMetadataStore(MetadataStore):
             return False
         return True
 
+    def write_many(self, entries: List[Tuple[str, Union[str, bytes]]]) -> None:
+        import sqlite3
+
+        if not self.db or not entries:
+            return
+        mtime = time.time()
+        try:
+            with self.db:
+                self.db.executemany(
+                    'INSERT OR REPLACE INTO files(path, mtime, data) VALUES(?, ?, ?)',
+                    [(name, mtime, data) for name, data in entries])
+        except sqlite3.OperationalError:
+            pass
+
     def remove(self, name: str) -> None:
         if not self.db:
             raise FileNotFoundError()
@@ -221,3 +290,57 @@ class SqliteMetadataStore(MetadataStore):
         if self.db:
             for row in self.db.execute('SELECT path FROM files'):
                 yield row[0]
+
+
+# Prefix of the names of entries in a cache bundle (see BundledMetadataStore)
+BUNDLE_PREFIX = '@bundle/'  # type: Final
+
+
+class BundledMetadataStore(MetadataStore):
+    """A metadata store that also provides the entries of a read-only cache bundle.
+
+    Entries of the bundle (see mypy.cachebundle) are accessed using names
+    that start with BUNDLE_PREFIX and can't be modified. All other
+    entries are in the underlying (writable) store.
+    """
+
+    def __init__(self, store: MetadataStore, bundle: MetadataStore) -> None:
+        self.store = store
+        self.bundle = bundle
+
+    def _route(self, name: str) -> Tuple[MetadataStore, str]:
+        if name.startswith(BUNDLE_PREFIX):
+            return self.bundle, name[len(BUNDLE_PREFIX):]
+        return self.store, name
+
+    def getmtime(self, name: str) -> float:
+        store, name = self._route(name)
+        return store.getmtime(name)
+
+    def read(self, name: str) -> str:
+        store, name = self._route(name)
+        return store.read(name)
+
+    def read_bytes(self, name: str) -> bytes:
+        store, name = self._route(name)
+        return store.read_bytes(name)
+
+    def write(self, name: str, data: Union[str, bytes], mtime: Optional[float] = None) -> bool:
+        if name.startswith(BUNDLE_PREFIX):
+            return False
+        return self.store.write(name, data, mtime)
+
+    def write_many(self, entries: List[Tuple[str, Union[str, bytes]]]) -> None:
+        self.store.write_many([(name, data) for name, data in entries
+                               if not name.startswith(BUNDLE_PREFIX)])
+
+    def remove(self, name: str) -> None:
+        if name.startswith(BUNDLE_PREFIX):
+            raise FileNotFoundError()
+        self.store.remove(name)
+
+    def commit(self) -> None:
+        self.store.commit()
+
+    def list_all(self) -> Iterable[str]:
+        return self.store.list_all()
@@ -438,6 +438,16 @@ def mypy_path() -> List[str]:
     return path_env.split(os.pathsep)
 
 
+def get_typeshed_dir(data_dir: str, custom_typeshed_dir: Optional[str]) -> str:
+    """Return the typeshed directory used for the standard library search paths."""
+    if custom_typeshed_dir:
+        return custom_typeshed_dir
+    auto = os.path.join(data_dir, 'stubs-auto')
+    if os.path.isdir(auto):
+        data_dir = auto
+    return os.path.join(data_dir, "typeshed")
+
+
 def default_lib_path(data_dir: str,
                      pyversion: Tuple[int, int],
                      custom_typeshed_dir: Optional[str]) -> List[str]:
@@ -445,13 +455,7 @@ def default_lib_path(data_dir: str,
     # IDEA: Make this more portable.
     path = []  # type: List[str]
 
-    if custom_typeshed_dir:
-        typeshed_dir = custom_typeshed_dir
-    else:
-        auto = os.path.join(data_dir, 'stubs-auto')
-        if os.path.isdir(auto):
-            data_dir = auto
-        typeshed_dir = os.path.join(data_dir, "typeshed")
+    typeshed_dir = get_typeshed_dir(data_dir, custom_typeshed_dir)
     if pyversion[0] == 3:
         # We allow a module for e.g. version 3.5 to be in 3.4/. The assumption
         # is that a module added with 3.4 will still be present in Python 3.5.
@@ -19,6 +19,7 @@ from mypy.bogus_type import Bogus
 
 class Context:
     """Base type for objects that are valid as error message locations."""
+
     __slots__ = ('line', 'column', 'end_line')
 
     def __init__(self, line: int = -1, column: int = -1) -> None:
@@ -196,7 +197,8 @@ class FakeExpression(Expression):
     We need a dummy expression in one place, and can't instantiate Expression
     because it is a trait and mypyc barfs.
     """
-    pass
+
+    __slots__ = ()
 
 
 # TODO:
@@ -241,33 +243,9 @@ Definition = Tuple[str, 'SymbolTableNode', Optional['TypeInfo']]
 class MypyFile(SymbolNode):
     """The abstract syntax tree of a single source file."""
 
-    # Fully qualified module name
-    _fullname = None  # type: Bogus[str]
-    # Path to the file (empty string if not known)
-    path = ''
-    # Top-level definitions and statements
-    defs = None  # type: List[Statement]
-    # Type alias dependencies as mapping from target to set of alias full names
-    alias_deps = None  # type: DefaultDict[str, Set[str]]
-    # Is there a UTF-8 BOM at the start?
-    is_bom = False
-    names = None  # type: SymbolTable
-    # All import nodes within the file (also ones within functions etc.)
-    imports = None  # type: List[ImportBase]
-    # Lines on which to ignore certain errors when checking.
-    # If the value is empty, ignore all errors; otherwise, the list contains all
-    # error codes to ignore.
-    ignored_lines = None  # type: Dict[int, List[str]]
-    # Is this file represented by a stub file (.pyi)?
-    is_stub = False
-    # Is this loaded from the cache and thus missing the actual body of the file?
-    is_cache_skeleton = False
-    # Does this represent an __init__.pyi stub with a module __getattr__
-    # (i.e. a partial stub package), for such packages we suppress any missing
-    # module errors in addition to missing attribute errors.
-    is_partial_stub_package = False
-    # Plugin-created dependencies
-    plugin_deps = None  # type: Dict[str, Set[str]]
+    __slots__ = ('_fullname', 'path', 'defs', 'alias_deps', 'is_bom', 'names', 'imports',
+                 'ignored_lines', 'is_stub', 'is_cache_skeleton', 'is_partial_stub_package',
+                 'plugin_deps')
 
     def __init__(self,
                  defs: List[Statement],
@@ -275,16 +253,37 @@ class MypyFile(SymbolNode):
                  is_bom: bool = False,
                  ignored_lines: Optional[Dict[int, List[str]]] = None) -> None:
         super().__init__()
+        # Fully qualified module name
+        self._fullname = cast(Bogus[str], None)
+        # Path to the file (empty string if not known)
+        self.path = ''
+        # Top-level definitions and statements
         self.defs = defs
         self.line = 1  # Dummy line number
+        # All import nodes within the file (also ones within functions etc.)
         self.imports = imports
+        # Is there a UTF-8 BOM at the start?
         self.is_bom = is_bom
-        self.alias_deps = defaultdict(set)
-        self.plugin_deps = {}
+        self.names = SymbolTable()
+        # Type alias dependencies as mapping from target to set of alias full names
+        self.alias_deps = defaultdict(set)  # type: DefaultDict[str, Set[str]]
+        # Plugin-created dependencies
+        self.plugin_deps = {}  # type: Dict[str, Set[str]]
+        # Lines on which to ignore certain errors when checking.
+        # If the value is empty, ignore all errors; otherwise, the list contains all
+        # error codes to ignore.
         if ignored_lines:
             self.ignored_lines = ignored_lines
         else:
             self.ignored_lines = {}
+        # Is this file represented by a stub file (.pyi)?
+        self.is_stub = False
+        # Is this loaded from the cache and thus missing the actual body of the file?
+        self.is_cache_skeleton = False
+        # Does this represent an __init__.pyi stub with a module __getattr__
+        # (i.e. a partial stub package), for such packages we suppress any missing
+        # module errors in addition to missing attribute errors.
+        self.is_partial_stub_package = False
 
     def local_definitions(self) -> Iterator[Definition]:
         """Return all definitions within the module (including nested).
@@ -332,31 +331,31 @@ class MypyFile(SymbolNode):
 class ImportBase(Statement):
     """Base class for all import statements."""
 
-    is_unreachable = False  # Set by semanal.SemanticAnalyzerPass1 if inside `if False` etc.
-    is_top_level = False  # Ditto if outside any class or def
-    is_mypy_only = False  # Ditto if inside `if TYPE_CHECKING` or `if MYPY`
-
-    # If an import replaces existing definitions, we construct dummy assignment
-    # statements that assign the imported names to the names in the current scope,
-    # for type checking purposes. Example:
-    #
-    #     x = 1
-    #     from m import x   <-- add assignment representing "x = m.x"
-    assignments = None  # type: List[AssignmentStmt]
+    __slots__ = ('is_unreachable', 'is_top_level', 'is_mypy_only', 'assignments')
 
     def __init__(self) -> None:
         super().__init__()
-        self.assignments = []
+        # Set by semanal.SemanticAnalyzerPass1 if inside `if False` etc.
+        self.is_unreachable = False
+        self.is_top_level = False  # Ditto if outside any class or def
+        self.is_mypy_only = False  # Ditto if inside `if TYPE_CHECKING` or `if MYPY`
+        # If an import replaces existing definitions, we construct dummy assignment
+        # statements that assign the imported names to the names in the current scope,
+        # for type checking purposes. Example:
+        #
+        #     x = 1
+        #     from m import x   <-- add assignment representing "x = m.x"
+        self.assignments = []  # type: List[AssignmentStmt]
 
 
 class Import(ImportBase):
     """import m [as n]"""
 
-    ids = None  # type: List[Tuple[str, Optional[str]]]     # (module id, as id)
+    __slots__ = ('ids',)
 
     def __init__(self, ids: List[Tuple[str, Optional[str]]]) -> None:
         super().__init__()
-        self.ids = ids
+        self.ids = ids  # (module id, as id)
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_import(self)
@@ -365,14 +364,12 @@ class Import(ImportBase):
 class ImportFrom(ImportBase):
     """from m import x [as y], ..."""
 
-    id = None  # type: str
-    relative = None  # type: int
-    names = None  # type: List[Tuple[str, Optional[str]]]  # Tuples (name, as name)
+    __slots__ = ('id', 'relative', 'names')
 
     def __init__(self, id: str, relative: int, names: List[Tuple[str, Optional[str]]]) -> None:
         super().__init__()
         self.id = id
-        self.names = names
+        self.names = names  # Tuples (name, as name)
         self.relative = relative
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
@@ -381,16 +378,15 @@ class ImportFrom(ImportBase):
 
 class ImportAll(ImportBase):
     """from m import *"""
-    id = None  # type: str
-    relative = None  # type: int
-    # NOTE: Only filled and used by old semantic analyzer.
-    imported_names = None  # type: List[str]
+
+    __slots__ = ('id', 'relative', 'imported_names')
 
     def __init__(self, id: str, relative: int) -> None:
         super().__init__()
         self.id = id
         self.relative = relative
-        self.imported_names = []
+        # NOTE: Only filled and used by old semantic analyzer.
+        self.imported_names = []  # type: List[str]
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_import_all(self)
@@ -408,6 +404,8 @@ class ImportedName(SymbolNode):
     can't be visited.
     """
 
+    __slots__ = ('target_fullname',)
+
     def __init__(self, target_fullname: str) -> None:
         super().__init__()
         self.target_fullname = target_fullname
@@ -500,15 +498,13 @@ class OverloadedFuncDef(FuncBase, SymbolNode, Statement):
     Overloaded variants must be consecutive in the source file.
     """
 
-    items = None  # type: List[OverloadPart]
-    unanalyzed_items = None  # type: List[OverloadPart]
-    impl = None  # type: Optional[OverloadPart]
+    __slots__ = ('items', 'unanalyzed_items', 'impl')
 
     def __init__(self, items: List['OverloadPart']) -> None:
         super().__init__()
         self.items = items
         self.unanalyzed_items = items.copy()
-        self.impl = None
+        self.impl = None  # type: Optional[OverloadPart]
         if len(items) > 0:
             self.set_line(items[0].line, items[0].column)
         self.is_final = False
@@ -736,21 +732,17 @@ class Decorator(SymbolNode, Statement):
     A single Decorator object can include any number of function decorators.
     """
 
-    func = None  # type: FuncDef                # Decorated function
-    decorators = None  # type: List[Expression] # Decorators (may be empty)
-    # Some decorators are removed by semanal, keep the original here.
-    original_decorators = None  # type: List[Expression]
-    # TODO: This is mostly used for the type; consider replacing with a 'type' attribute
-    var = None  # type: Var                     # Represents the decorated function obj
-    is_overload = False
+    __slots__ = ('func', 'decorators', 'original_decorators', 'var', 'is_overload')
 
     def __init__(self, func: FuncDef, decorators: List[Expression],
                  var: 'Var') -> None:
         super().__init__()
-        self.func = func
-        self.decorators = decorators
+        self.func = func  # Decorated function
+        self.decorators = decorators  # Decorators (may be empty)
+        # Some decorators are removed by semanal, keep the original here.
         self.original_decorators = decorators.copy()
-        self.var = var
+        # TODO: This is mostly used for the type; consider replacing with a 'type' attribute
+        self.var = var  # Represents the decorated function obj
         self.is_overload = False
 
     @property
@@ -913,20 +905,9 @@ class Var(SymbolNode):
 class ClassDef(Statement):
     """Class definition"""
 
-    name = None  # type: str       # Name of the class without module prefix
-    fullname = None  # type: Bogus[str]   # Fully qualified name of the class
-    defs = None  # type: Block
-    type_vars = None  # type: List[mypy.types.TypeVarDef]
-    # Base class expressions (not semantically analyzed -- can be arbitrary expressions)
-    base_type_exprs = None  # type: List[Expression]
-    # Special base classes like Generic[...] get moved here during semantic analysis
-    removed_base_type_exprs = None  # type: List[Expression]
-    info = None  # type: TypeInfo  # Related TypeInfo
-    metaclass = None  # type: Optional[Expression]
-    decorators = None  # type: List[Expression]
-    keywords = None  # type: OrderedDict[str, Expression]
-    analyzed = None  # type: Optional[Expression]
-    has_incompatible_baseclass = False
+    __slots__ = ('name', 'fullname', 'defs', 'type_vars', 'base_type_exprs',
+                 'removed_base_type_exprs', 'info', 'metaclass', 'decorators', 'keywords',
+                 'analyzed', 'has_incompatible_baseclass')
 
     def __init__(self,
                  name: str,
@@ -936,15 +917,20 @@ class ClassDef(Statement):
                  metaclass: Optional[Expression] = None,
                  keywords: Optional[List[Tuple[str, Expression]]] = None) -> None:
         super().__init__()
-        self.name = name
+        self.name = name  # Name of the class without module prefix
+        self.fullname = cast(Bogus[str], None)  # Fully qualified name of the class
         self.defs = defs
         self.type_vars = type_vars or []
+        # Base class expressions (not semantically analyzed -- can be arbitrary expressions)
         self.base_type_exprs = base_type_exprs or []
-        self.removed_base_type_exprs = []
-        self.info = CLASSDEF_NO_INFO
+        # Special base classes like Generic[...] get moved here during semantic analysis
+        self.removed_base_type_exprs = []  # type: List[Expression]
+        self.info = CLASSDEF_NO_INFO  # Related TypeInfo
         self.metaclass = metaclass
-        self.decorators = []
-        self.keywords = OrderedDict(keywords or [])
+        self.decorators = []  # type: List[Expression]
+        self.keywords = OrderedDict(keywords or [])  # type: OrderedDict[str, Expression]
+        self.analyzed = None  # type: Optional[Expression]
+        self.has_incompatible_baseclass = False
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_class_def(self)
@@ -975,7 +961,7 @@ class ClassDef(Statement):
 class GlobalDecl(Statement):
     """Declaration global x, y, ..."""
 
-    names = None  # type: List[str]
+    __slots__ = ('names',)
 
     def __init__(self, names: List[str]) -> None:
         super().__init__()
@@ -988,7 +974,7 @@ class GlobalDecl(Statement):
 class NonlocalDecl(Statement):
     """Declaration nonlocal x, y, ..."""
 
-    names = None  # type: List[str]
+    __slots__ = ('names',)
 
     def __init__(self, names: List[str]) -> None:
         super().__init__()
@@ -1020,7 +1006,8 @@ class Block(Statement):
 
 class ExpressionStmt(Statement):
     """An expression as a statement, such as print(s)."""
-    expr = None  # type: Expression
+
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Expression) -> None:
         super().__init__()
@@ -1041,33 +1028,30 @@ class AssignmentStmt(Statement):
     An lvalue can be NameExpr, TupleExpr, ListExpr, MemberExpr, or IndexExpr.
     """
 
-    lvalues = None  # type: List[Lvalue]
-    # This is a TempNode if and only if no rvalue (x: t).
-    rvalue = None  # type: Expression
-    # Declared type in a comment, may be None.
-    type = None  # type: Optional[mypy.types.Type]
-    # Original, not semantically analyzed type in annotation (used for reprocessing)
-    unanalyzed_type = None  # type: Optional[mypy.types.Type]
-    # This indicates usage of PEP 526 type annotation syntax in assignment.
-    new_syntax = False  # type: bool
-    # Does this assignment define a type alias?
-    is_alias_def = False
-    # Is this a final definition?
-    # Final attributes can't be re-assigned once set, and can't be overridden
-    # in a subclass. This flag is not set if an attempted declaration was found to
-    # be invalid during semantic analysis. It is still set to `True` if
-    # a final declaration overrides another final declaration (this is checked
-    # during type checking when MROs are known).
-    is_final_def = False
+    __slots__ = ('lvalues', 'rvalue', 'type', 'unanalyzed_type', 'new_syntax', 'is_alias_def',
+                 'is_final_def')
 
     def __init__(self, lvalues: List[Lvalue], rvalue: Expression,
                  type: 'Optional[mypy.types.Type]' = None, new_syntax: bool = False) -> None:
         super().__init__()
         self.lvalues = lvalues
+        # This is a TempNode if and only if no rvalue (x: t).
         self.rvalue = rvalue
+        # Declared type in a comment, may be None.
         self.type = type
+        # Original, not semantically analyzed type in annotation (used for reprocessing)
         self.unanalyzed_type = type
+        # This indicates usage of PEP 526 type annotation syntax in assignment.
         self.new_syntax = new_syntax
+        # Does this assignment define a type alias?
+        self.is_alias_def = False
+        # Is this a final definition?
+        # Final attributes can't be re-assigned once set, and can't be overridden
+        # in a subclass. This flag is not set if an attempted declaration was found to
+        # be invalid during semantic analysis. It is still set to `True` if
+        # a final declaration overrides another final declaration (this is checked
+        # during type checking when MROs are known).
+        self.is_final_def = False
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_assignment_stmt(self)
@@ -1076,9 +1060,7 @@ class AssignmentStmt(Statement):
 class OperatorAssignmentStmt(Statement):
     """Operator assignment statement such as x += 1"""
 
-    op = ''
-    lvalue = None  # type: Lvalue
-    rvalue = None  # type: Expression
+    __slots__ = ('op', 'lvalue', 'rvalue')
 
     def __init__(self, op: str, lvalue: Lvalue, rvalue: Expression) -> None:
         super().__init__()
@@ -1091,9 +1073,7 @@ class OperatorAssignmentStmt(Statement):
 
 
 class WhileStmt(Statement):
-    expr = None  # type: Expression
-    body = None  # type: Block
-    else_body = None  # type: Optional[Block]
+    __slots__ = ('expr', 'body', 'else_body')
 
     def __init__(self, expr: Expression, body: Block, else_body: Optional[Block]) -> None:
         super().__init__()
@@ -1106,21 +1086,8 @@ class WhileStmt(Statement):
 
 
 class ForStmt(Statement):
-    # Index variables
-    index = None  # type: Lvalue
-    # Type given by type comments for index, can be None
-    index_type = None  # type: Optional[mypy.types.Type]
-    # Original, not semantically analyzed type in annotation (used for reprocessing)
-    unanalyzed_index_type = None  # type: Optional[mypy.types.Type]
-    # Inferred iterable item type
-    inferred_item_type = None  # type: Optional[mypy.types.Type]
-    # Inferred iterator type
-    inferred_iterator_type = None  # type: Optional[mypy.types.Type]
-    # Expression to iterate
-    expr = None  # type: Expression
-    body = None  # type: Block
-    else_body = None  # type: Optional[Block]
-    is_async = False  # True if `async for ...` (PEP 492, Python 3.5)
+    __slots__ = ('index', 'index_type', 'unanalyzed_index_type', 'inferred_item_type',
+                 'inferred_iterator_type', 'expr', 'body', 'else_body', 'is_async')
 
     def __init__(self,
                  index: Lvalue,
@@ -1129,19 +1096,28 @@ class ForStmt(Statement):
                  else_body: Optional[Block],
                  index_type: 'Optional[mypy.types.Type]' = None) -> None:
         super().__init__()
+        # Index variables
         self.index = index
+        # Type given by type comments for index, can be None
         self.index_type = index_type
+        # Original, not semantically analyzed type in annotation (used for reprocessing)
         self.unanalyzed_index_type = index_type
+        # Expression to iterate
         self.expr = expr
         self.body = body
         self.else_body = else_body
+        # Inferred iterable item type
+        self.inferred_item_type = None  # type: Optional[mypy.types.Type]
+        # Inferred iterator type
+        self.inferred_iterator_type = None  # type: Optional[mypy.types.Type]
+        self.is_async = False  # True if `async for ...` (PEP 492, Python 3.5)
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_for_stmt(self)
 
 
 class ReturnStmt(Statement):
-    expr = None  # type: Optional[Expression]
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Optional[Expression]) -> None:
         super().__init__()
@@ -1152,8 +1128,7 @@ class ReturnStmt(Statement):
 
 
 class AssertStmt(Statement):
-    expr = None  # type: Expression
-    msg = None  # type: Optional[Expression]
+    __slots__ = ('expr', 'msg')
 
     def __init__(self, expr: Expression, msg: Optional[Expression] = None) -> None:
         super().__init__()
@@ -1165,7 +1140,7 @@ class AssertStmt(Statement):
 
 
 class DelStmt(Statement):
-    expr = None  # type: Lvalue
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Lvalue) -> None:
         super().__init__()
@@ -1176,24 +1151,28 @@ class DelStmt(Statement):
 
 
 class BreakStmt(Statement):
+    __slots__ = ()
+
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_break_stmt(self)
 
 
 class ContinueStmt(Statement):
+    __slots__ = ()
+
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_continue_stmt(self)
 
 
 class PassStmt(Statement):
+    __slots__ = ()
+
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_pass_stmt(self)
 
 
 class IfStmt(Statement):
-    expr = None  # type: List[Expression]
-    body = None  # type: List[Block]
-    else_body = None  # type: Optional[Block]
+    __slots__ = ('expr', 'body', 'else_body')
 
     def __init__(self, expr: List[Expression], body: List[Block],
                  else_body: Optional[Block]) -> None:
@@ -1207,12 +1186,11 @@ class IfStmt(Statement):
 
 
 class RaiseStmt(Statement):
-    # Plain 'raise' is a valid statement.
-    expr = None  # type: Optional[Expression]
-    from_expr = None  # type: Optional[Expression]
+    __slots__ = ('expr', 'from_expr')
 
     def __init__(self, expr: Optional[Expression], from_expr: Optional[Expression]) -> None:
         super().__init__()
+        # Plain 'raise' is a valid statement.
         self.expr = expr
         self.from_expr = from_expr
 
@@ -1221,23 +1199,18 @@ class RaiseStmt(Statement):
 
 
 class TryStmt(Statement):
-    body = None  # type: Block                # Try body
-    # Plain 'except:' also possible
-    types = None  # type: List[Optional[Expression]]    # Except type expressions
-    vars = None  # type: List[Optional[NameExpr]]     # Except variable names
-    handlers = None  # type: List[Block]      # Except bodies
-    else_body = None  # type: Optional[Block]
-    finally_body = None  # type: Optional[Block]
+    __slots__ = ('body', 'types', 'vars', 'handlers', 'else_body', 'finally_body')
 
     def __init__(self, body: Block, vars: List['Optional[NameExpr]'],
                  types: List[Optional[Expression]],
                  handlers: List[Block], else_body: Optional[Block],
                  finally_body: Optional[Block]) -> None:
         super().__init__()
-        self.body = body
-        self.vars = vars
-        self.types = types
-        self.handlers = handlers
+        self.body = body  # Try body
+        self.vars = vars  # Except variable names
+        # Plain 'except:' also possible
+        self.types = types  # Except type expressions
+        self.handlers = handlers  # Except bodies
         self.else_body = else_body
         self.finally_body = finally_body
 
@@ -1246,23 +1219,19 @@ class TryStmt(Statement):
 
 
 class WithStmt(Statement):
-    expr = None  # type: List[Expression]
-    target = None  # type: List[Optional[Lvalue]]
-    # Type given by type comments for target, can be None
-    unanalyzed_type = None  # type: Optional[mypy.types.Type]
-    # Semantically analyzed types from type comment (TypeList type expanded)
-    analyzed_types = None  # type: List[mypy.types.Type]
-    body = None  # type: Block
-    is_async = False  # True if `async with ...` (PEP 492, Python 3.5)
+    __slots__ = ('expr', 'target', 'unanalyzed_type', 'analyzed_types', 'body', 'is_async')
 
     def __init__(self, expr: List[Expression], target: List[Optional[Lvalue]],
                  body: Block, target_type: 'Optional[mypy.types.Type]' = None) -> None:
         super().__init__()
         self.expr = expr
         self.target = target
+        # Type given by type comments for target, can be None
         self.unanalyzed_type = target_type
-        self.analyzed_types = []
+        # Semantically analyzed types from type comment (TypeList type expanded)
+        self.analyzed_types = []  # type: List[mypy.types.Type]
         self.body = body
+        self.is_async = False  # True if `async with ...` (PEP 492, Python 3.5)
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
         return visitor.visit_with_stmt(self)
@@ -1271,10 +1240,7 @@ class WithStmt(Statement):
 class PrintStmt(Statement):
     """Python 2 print statement"""
 
-    args = None  # type: List[Expression]
-    newline = False
-    # The file-like target object (given using >>).
-    target = None  # type: Optional[Expression]
+    __slots__ = ('args', 'newline', 'target')
 
     def __init__(self,
                  args: List[Expression],
@@ -1283,6 +1249,7 @@ class PrintStmt(Statement):
         super().__init__()
         self.args = args
         self.newline = newline
+        # The file-like target object (given using >>).
         self.target = target
 
     def accept(self, visitor: StatementVisitor[T]) -> T:
@@ -1292,9 +1259,7 @@ class PrintStmt(Statement):
 class ExecStmt(Statement):
     """Python 2 exec statement"""
 
-    expr = None  # type: Expression
-    globals = None  # type: Optional[Expression]
-    locals = None  # type: Optional[Expression]
+    __slots__ = ('expr', 'globals', 'locals')
 
     def __init__(self, expr: Expression,
                  globals: Optional[Expression],
@@ -1314,7 +1279,7 @@ class ExecStmt(Statement):
 class IntExpr(Expression):
     """Integer literal"""
 
-    value = 0
+    __slots__ = ('value',)
 
     def __init__(self, value: int) -> None:
         super().__init__()
@@ -1338,25 +1303,23 @@ class IntExpr(Expression):
 class StrExpr(Expression):
     """String literal"""
 
-    value = ''
-
-    # Keeps track of whether this string originated from Python 2 source code vs
-    # Python 3 source code. We need to keep track of this information so we can
-    # correctly handle types that have "nested strings". For example, consider this
-    # type alias, where we have a forward reference to a literal type:
-    #
-    #     Alias = List["Literal['foo']"]
-    #
-    # When parsing this, we need to know whether the outer string and alias came from
-    # Python 2 code vs Python 3 code so we can determine whether the inner `Literal['foo']`
-    # is meant to be `Literal[u'foo']` or `Literal[b'foo']`.
-    #
-    # This field keeps track of that information.
-    from_python_3 = True
+    __slots__ = ('value', 'from_python_3')
 
     def __init__(self, value: str, from_python_3: bool = False) -> None:
         super().__init__()
         self.value = value
+        # Keeps track of whether this string originated from Python 2 source code vs
+        # Python 3 source code. We need to keep track of this information so we can
+        # correctly handle types that have "nested strings". For example, consider this
+        # type alias, where we have a forward reference to a literal type:
+        #
+        #     Alias = List["Literal['foo']"]
+        #
+        # When parsing this, we need to know whether the outer string and alias came from
+        # Python 2 code vs Python 3 code so we can determine whether the inner `Literal['foo']`
+        # is meant to be `Literal[u'foo']` or `Literal[b'foo']`.
+        #
+        # This field keeps track of that information.
         self.from_python_3 = from_python_3
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
@@ -1366,19 +1329,19 @@ class StrExpr(Expression):
 class BytesExpr(Expression):
     """Bytes literal"""
 
-    # Note: we deliberately do NOT use bytes here because it ends up
-    # unnecessarily complicating a lot of the result logic. For example,
-    # we'd have to worry about converting the bytes into a format we can
-    # easily serialize/deserialize to and from JSON, would have to worry
-    # about turning the bytes into a human-readable representation in
-    # error messages...
-    #
-    # It's more convenient to just store the human-readable representation
-    # from the very start.
-    value = ''
+    __slots__ = ('value',)
 
     def __init__(self, value: str) -> None:
         super().__init__()
+        # Note: we deliberately do NOT use bytes here because it ends up
+        # unnecessarily complicating a lot of the result logic. For example,
+        # we'd have to worry about converting the bytes into a format we can
+        # easily serialize/deserialize to and from JSON, would have to worry
+        # about turning the bytes into a human-readable representation in
+        # error messages...
+        #
+        # It's more convenient to just store the human-readable representation
+        # from the very start.
         self.value = value
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
@@ -1388,7 +1351,7 @@ class BytesExpr(Expression):
 class UnicodeExpr(Expression):
     """Unicode literal (Python 2.x)"""
 
-    value = ''
+    __slots__ = ('value',)
 
     def __init__(self, value: str) -> None:
         super().__init__()
@@ -1401,7 +1364,7 @@ class UnicodeExpr(Expression):
 class FloatExpr(Expression):
     """Float literal"""
 
-    value = 0.0
+    __slots__ = ('value',)
 
     def __init__(self, value: float) -> None:
         super().__init__()
@@ -1414,6 +1377,8 @@ class FloatExpr(Expression):
 class ComplexExpr(Expression):
     """Complex literal"""
 
+    __slots__ = ('value',)
+
     def __init__(self, value: complex) -> None:
         super().__init__()
         self.value = value
@@ -1425,6 +1390,8 @@ class ComplexExpr(Expression):
 class EllipsisExpr(Expression):
     """Ellipsis (...)"""
 
+    __slots__ = ()
+
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_ellipsis(self)
 
@@ -1432,7 +1399,7 @@ class EllipsisExpr(Expression):
 class StarExpr(Expression):
     """Star expression"""
 
-    expr = None  # type: Expression
+    __slots__ = ('expr', 'valid')
 
     def __init__(self, expr: Expression) -> None:
         super().__init__()
@@ -1556,7 +1523,7 @@ class CallExpr(Expression):
 
 
 class YieldFromExpr(Expression):
-    expr = None  # type: Expression
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Expression) -> None:
         super().__init__()
@@ -1567,7 +1534,7 @@ class YieldFromExpr(Expression):
 
 
 class YieldExpr(Expression):
-    expr = None  # type: Optional[Expression]
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Optional[Expression]) -> None:
         super().__init__()
@@ -1583,19 +1550,17 @@ class IndexExpr(Expression):
     Also wraps type application such as List[int] as a special form.
     """
 
-    base = None  # type: Expression
-    index = None  # type: Expression
-    # Inferred __getitem__ method type
-    method_type = None  # type: Optional[mypy.types.Type]
-    # If not None, this is actually semantically a type application
-    # Class[type, ...] or a type alias initializer.
-    analyzed = None  # type: Union[TypeApplication, TypeAliasExpr, None]
+    __slots__ = ('base', 'index', 'method_type', 'analyzed')
 
     def __init__(self, base: Expression, index: Expression) -> None:
         super().__init__()
         self.base = base
         self.index = index
-        self.analyzed = None
+        # If not None, this is actually semantically a type application
+        # Class[type, ...] or a type alias initializer.
+        self.analyzed = None  # type: Union[TypeApplication, TypeAliasExpr, None]
+        # Inferred __getitem__ method type
+        self.method_type = None  # type: Optional[mypy.types.Type]
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_index_expr(self)
@@ -1604,15 +1569,14 @@ class IndexExpr(Expression):
 class UnaryExpr(Expression):
     """Unary operation"""
 
-    op = ''
-    expr = None  # type: Expression
-    # Inferred operator method type
-    method_type = None  # type: Optional[mypy.types.Type]
+    __slots__ = ('op', 'expr', 'method_type')
 
     def __init__(self, op: str, expr: Expression) -> None:
         super().__init__()
         self.op = op
         self.expr = expr
+        # Inferred operator method type
+        self.method_type = None  # type: Optional[mypy.types.Type]
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_unary_expr(self)
@@ -1620,6 +1584,9 @@ class UnaryExpr(Expression):
 
 class AssignmentExpr(Expression):
     """Assignment expressions in Python 3.8+, like "a := 2"."""
+
+    __slots__ = ('target', 'value')
+
     def __init__(self, target: Expression, value: Expression) -> None:
         super().__init__()
         self.target = target
@@ -1727,21 +1694,19 @@ class OpExpr(Expression):
     """Binary operation (other than . or [] or comparison operators,
     which have specific nodes)."""
 
-    op = ''
-    left = None  # type: Expression
-    right = None  # type: Expression
-    # Inferred type for the operator method type (when relevant).
-    method_type = None  # type: Optional[mypy.types.Type]
-    # Is the right side going to be evaluated every time?
-    right_always = False
-    # Is the right side unreachable?
-    right_unreachable = False
+    __slots__ = ('op', 'left', 'right', 'method_type', 'right_always', 'right_unreachable')
 
     def __init__(self, op: str, left: Expression, right: Expression) -> None:
         super().__init__()
         self.op = op
         self.left = left
         self.right = right
+        # Inferred type for the operator method type (when relevant).
+        self.method_type = None  # type: Optional[mypy.types.Type]
+        # Is the right side going to be evaluated every time?
+        self.right_always = False
+        # Is the right side unreachable?
+        self.right_unreachable = False
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_op_expr(self)
@@ -1750,16 +1715,14 @@ class OpExpr(Expression):
 class ComparisonExpr(Expression):
     """Comparison expression (e.g. a < b > c < d)."""
 
-    operators = None  # type: List[str]
-    operands = None  # type: List[Expression]
-    # Inferred type for the operator methods (when relevant; None for 'is').
-    method_types = None  # type: List[Optional[mypy.types.Type]]
+    __slots__ = ('operators', 'operands', 'method_types')
 
     def __init__(self, operators: List[str], operands: List[Expression]) -> None:
         super().__init__()
         self.operators = operators
         self.operands = operands
-        self.method_types = []
+        # Inferred type for the operator methods (when relevant; None for 'is').
+        self.method_types = []  # type: List[Optional[mypy.types.Type]]
 
     def pairwise(self) -> Iterator[Tuple[str, Expression, Expression]]:
         """If this comparison expr is "a < b is c == d", yields the sequence
@@ -1778,9 +1741,7 @@ class SliceExpr(Expression):
     This is only valid as index in index expressions.
     """
 
-    begin_index = None  # type: Optional[Expression]
-    end_index = None  # type: Optional[Expression]
-    stride = None  # type: Optional[Expression]
+    __slots__ = ('begin_index', 'end_index', 'stride')
 
     def __init__(self, begin_index: Optional[Expression],
                  end_index: Optional[Expression],
@@ -1797,8 +1758,7 @@ class SliceExpr(Expression):
 class CastExpr(Expression):
     """Cast expression cast(type, expr)."""
 
-    expr = None  # type: Expression
-    type = None  # type: mypy.types.Type
+    __slots__ = ('expr', 'type')
 
     def __init__(self, expr: Expression, typ: 'mypy.types.Type') -> None:
         super().__init__()
@@ -1812,9 +1772,7 @@ class CastExpr(Expression):
 class RevealExpr(Expression):
     """Reveal type expression reveal_type(expr) or reveal_locals() expression."""
 
-    expr = None  # type: Optional[Expression]
-    kind = 0  # type: int
-    local_nodes = None  # type: Optional[List[Var]]
+    __slots__ = ('expr', 'kind', 'local_nodes')
 
     def __init__(
             self, kind: int,
@@ -1832,14 +1790,14 @@ class RevealExpr(Expression):
 class SuperExpr(Expression):
     """Expression super().name"""
 
-    name = ''
-    info = None  # type: Optional[TypeInfo]  # Type that contains this super expression
-    call = None  # type: CallExpr  # The expression super(...)
+    __slots__ = ('name', 'info', 'call')
 
     def __init__(self, name: str, call: CallExpr) -> None:
         super().__init__()
         self.name = name
-        self.call = call
+        self.call = call  # The expression super(...)
+        # Type that contains this super expression
+        self.info = None  # type: Optional[TypeInfo]
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_super_expr(self)
@@ -1848,6 +1806,8 @@ class SuperExpr(Expression):
 class LambdaExpr(FuncItem, Expression):
     """Lambda expression"""
 
+    __slots__ = ()
+
     @property
     def name(self) -> str:
         return '<lambda>'
@@ -1869,7 +1829,7 @@ class LambdaExpr(FuncItem, Expression):
 class ListExpr(Expression):
     """List literal expression [...]."""
 
-    items = None  # type: List[Expression]
+    __slots__ = ('items',)
 
     def __init__(self, items: List[Expression]) -> None:
         super().__init__()
@@ -1882,7 +1842,7 @@ class ListExpr(Expression):
 class DictExpr(Expression):
     """Dictionary literal expression {key: value, ...}."""
 
-    items = None  # type: List[Tuple[Optional[Expression], Expression]]
+    __slots__ = ('items',)
 
     def __init__(self, items: List[Tuple[Optional[Expression], Expression]]) -> None:
         super().__init__()
@@ -1897,7 +1857,7 @@ class TupleExpr(Expression):
 
     Also lvalue sequences (..., ...) and [..., ...]"""
 
-    items = None  # type: List[Expression]
+    __slots__ = ('items',)
 
     def __init__(self, items: List[Expression]) -> None:
         super().__init__()
@@ -1910,7 +1870,7 @@ class TupleExpr(Expression):
 class SetExpr(Expression):
     """Set literal expression {value, ...}."""
 
-    items = None  # type: List[Expression]
+    __slots__ = ('items',)
 
     def __init__(self, items: List[Expression]) -> None:
         super().__init__()
@@ -1923,11 +1883,7 @@ class SetExpr(Expression):
 class GeneratorExpr(Expression):
     """Generator expression ... for ... in ... [ for ...  in ... ] [ if ... ]."""
 
-    left_expr = None  # type: Expression
-    sequences = None  # type: List[Expression]
-    condlists = None  # type: List[List[Expression]]
-    is_async = None  # type: List[bool]
-    indices = None  # type: List[Lvalue]
+    __slots__ = ('left_expr', 'sequences', 'condlists', 'is_async', 'indices')
 
     def __init__(self, left_expr: Expression, indices: List[Lvalue],
                  sequences: List[Expression], condlists: List[List[Expression]],
@@ -1946,7 +1902,7 @@ class GeneratorExpr(Expression):
 class ListComprehension(Expression):
     """List comprehension (e.g. [x + 1 for x in a])"""
 
-    generator = None  # type: GeneratorExpr
+    __slots__ = ('generator',)
 
     def __init__(self, generator: GeneratorExpr) -> None:
         super().__init__()
@@ -1959,7 +1915,7 @@ class ListComprehension(Expression):
 class SetComprehension(Expression):
     """Set comprehension (e.g. {x + 1 for x in a})"""
 
-    generator = None  # type: GeneratorExpr
+    __slots__ = ('generator',)
 
     def __init__(self, generator: GeneratorExpr) -> None:
         super().__init__()
@@ -1972,12 +1928,7 @@ class SetComprehension(Expression):
 class DictionaryComprehension(Expression):
     """Dictionary comprehension (e.g. {k: v for k, v in a}"""
 
-    key = None  # type: Expression
-    value = None  # type: Expression
-    sequences = None  # type: List[Expression]
-    condlists = None  # type: List[List[Expression]]
-    is_async = None  # type: List[bool]
-    indices = None  # type: List[Lvalue]
+    __slots__ = ('key', 'value', 'sequences', 'condlists', 'is_async', 'indices')
 
     def __init__(self, key: Expression, value: Expression, indices: List[Lvalue],
                  sequences: List[Expression], condlists: List[List[Expression]],
@@ -1997,9 +1948,7 @@ class DictionaryComprehension(Expression):
 class ConditionalExpr(Expression):
     """Conditional expression (e.g. x if y else z)"""
 
-    cond = None  # type: Expression
-    if_expr = None  # type: Expression
-    else_expr = None  # type: Expression
+    __slots__ = ('cond', 'if_expr', 'else_expr')
 
     def __init__(self, cond: Expression, if_expr: Expression, else_expr: Expression) -> None:
         super().__init__()
@@ -2014,7 +1963,7 @@ class ConditionalExpr(Expression):
 class BackquoteExpr(Expression):
     """Python 2 expression `...`."""
 
-    expr = None  # type: Expression
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Expression) -> None:
         super().__init__()
@@ -2027,8 +1976,7 @@ class BackquoteExpr(Expression):
 class TypeApplication(Expression):
     """Type application expr[type, ...]"""
 
-    expr = None  # type: Expression
-    types = None  # type: List[mypy.types.Type]
+    __slots__ = ('expr', 'types')
 
     def __init__(self, expr: Expression, types: List['mypy.types.Type']) -> None:
         super().__init__()
@@ -2055,16 +2003,8 @@ CONTRAVARIANT = 2  # type: Final[int]
 
 class TypeVarLikeExpr(SymbolNode, Expression):
     """Base class for TypeVarExpr and ParamSpecExpr."""
-    _name = ''
-    _fullname = ''
-    # Upper bound: only subtypes of upper_bound are valid as values. By default
-    # this is 'object', meaning no restriction.
-    upper_bound = None  # type: mypy.types.Type
-    # Variance of the type variable. Invariant is the default.
-    # TypeVar(..., covariant=True) defines a covariant type variable.
-    # TypeVar(..., contravariant=True) defines a contravariant type
-    # variable.
-    variance = INVARIANT
+
+    __slots__ = ('_name', '_fullname', 'upper_bound', 'variance')
 
     def __init__(
         self, name: str, fullname: str, upper_bound: 'mypy.types.Type', variance: int = INVARIANT
@@ -2072,7 +2012,13 @@ class TypeVarLikeExpr(SymbolNode, Expression):
         super().__init__()
         self._name = name
         self._fullname = fullname
+        # Upper bound: only subtypes of upper_bound are valid as values. By default
+        # this is 'object', meaning no restriction.
         self.upper_bound = upper_bound
+        # Variance of the type variable. Invariant is the default.
+        # TypeVar(..., covariant=True) defines a covariant type variable.
+        # TypeVar(..., contravariant=True) defines a contravariant type
+        # variable.
         self.variance = variance
 
     @property
@@ -2095,15 +2041,15 @@ class TypeVarExpr(TypeVarLikeExpr):
      1. a generic class that uses the type variable as a type argument or
      2. a generic function that refers to the type variable in its signature.
     """
-    # Value restriction: only types in the list are valid as values. If the
-    # list is empty, there is no restriction.
-    values = None  # type: List[mypy.types.Type]
+    __slots__ = ('values',)
 
     def __init__(self, name: str, fullname: str,
                  values: List['mypy.types.Type'],
                  upper_bound: 'mypy.types.Type',
                  variance: int = INVARIANT) -> None:
         super().__init__(name, fullname, upper_bound, variance)
+        # Value restriction: only types in the list are valid as values. If the
+        # list is empty, there is no restriction.
         self.values = values
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
@@ -2129,6 +2075,8 @@ class TypeVarExpr(TypeVarLikeExpr):
 
 
 class ParamSpecExpr(TypeVarLikeExpr):
+    __slots__ = ()
+
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_paramspec_expr(self)
 
@@ -2155,22 +2103,20 @@ class ParamSpecExpr(TypeVarLikeExpr):
 class TypeAliasExpr(Expression):
     """Type alias expression (rvalue)."""
 
-    # The target type.
-    type = None  # type: mypy.types.Type
-    # Names of unbound type variables used to define the alias
-    tvars = None  # type: List[str]
-    # Whether this alias was defined in bare form. Used to distinguish
-    # between
-    #     A = List
-    # and
-    #     A = List[Any]
-    no_args = False  # type: bool
+    __slots__ = ('type', 'tvars', 'no_args', 'node')
 
     def __init__(self, node: 'TypeAlias') -> None:
         super().__init__()
-        self.type = node.target
-        self.tvars = node.alias_tvars
-        self.no_args = node.no_args
+        # The target type.
+        self.type = node.target  # type: mypy.types.Type
+        # Names of unbound type variables used to define the alias
+        self.tvars = node.alias_tvars  # type: List[str]
+        # Whether this alias was defined in bare form. Used to distinguish
+        # between
+        #     A = List
+        # and
+        #     A = List[Any]
+        self.no_args = node.no_args  # type: bool
         self.node = node
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
@@ -2180,15 +2126,14 @@ class TypeAliasExpr(Expression):
 class NamedTupleExpr(Expression):
     """Named tuple expression namedtuple(...) or NamedTuple(...)."""
 
-    # The class representation of this named tuple (its tuple_type attribute contains
-    # the tuple item types)
-    info = None  # type: TypeInfo
-    is_typed = False  # whether this class was created with typing.NamedTuple
+    __slots__ = ('info', 'is_typed')
 
     def __init__(self, info: 'TypeInfo', is_typed: bool = False) -> None:
         super().__init__()
+        # The class representation of this named tuple (its tuple_type attribute contains
+        # the tuple item types)
         self.info = info
-        self.is_typed = is_typed
+        self.is_typed = is_typed  # whether this class was created with typing.NamedTuple
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_namedtuple_expr(self)
@@ -2197,11 +2142,11 @@ class NamedTupleExpr(Expression):
 class TypedDictExpr(Expression):
     """Typed dict expression TypedDict(...)."""
 
-    # The class representation of this typed dict
-    info = None  # type: TypeInfo
+    __slots__ = ('info',)
 
     def __init__(self, info: 'TypeInfo') -> None:
         super().__init__()
+        # The class representation of this typed dict
         self.info = info
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
@@ -2211,16 +2156,14 @@ class TypedDictExpr(Expression):
 class EnumCallExpr(Expression):
     """Named tuple expression Enum('name', 'val1 val2 ...')."""
 
-    # The class representation of this enumerated type
-    info = None  # type: TypeInfo
-    # The item names (for debugging)
-    items = None  # type: List[str]
-    values = None  # type: List[Optional[Expression]]
+    __slots__ = ('info', 'items', 'values')
 
     def __init__(self, info: 'TypeInfo', items: List[str],
                  values: List[Optional[Expression]]) -> None:
         super().__init__()
+        # The class representation of this enumerated type
         self.info = info
+        # The item names (for debugging)
         self.items = items
         self.values = values
 
@@ -2231,7 +2174,7 @@ class EnumCallExpr(Expression):
 class PromoteExpr(Expression):
     """Ducktype class decorator expression _promote(...)."""
 
-    type = None  # type: mypy.types.Type
+    __slots__ = ('type',)
 
     def __init__(self, type: 'mypy.types.Type') -> None:
         super().__init__()
@@ -2243,19 +2186,19 @@ class PromoteExpr(Expression):
 
 class NewTypeExpr(Expression):
     """NewType expression NewType(...)."""
-    name = None  # type: str
-    # The base type (the second argument to NewType)
-    old_type = None  # type: Optional[mypy.types.Type]
-    # The synthesized class representing the new type (inherits old_type)
-    info = None  # type: Optional[TypeInfo]
+
+    __slots__ = ('name', 'old_type', 'info')
 
     def __init__(self, name: str, old_type: 'Optional[mypy.types.Type]', line: int,
                  column: int) -> None:
         super().__init__()
         self.name = name
+        # The base type (the second argument to NewType)
         self.old_type = old_type
         self.line = line
         self.column = column
+        # The synthesized class representing the new type (inherits old_type)
+        self.info = None  # type: Optional[TypeInfo]
 
     def accept(self, visitor: ExpressionVisitor[T]) -> T:
         return visitor.visit_newtype_expr(self)
@@ -2264,7 +2207,7 @@ class NewTypeExpr(Expression):
 class AwaitExpr(Expression):
     """Await expression (await ...)."""
 
-    expr = None  # type: Expression
+    __slots__ = ('expr',)
 
     def __init__(self, expr: Expression) -> None:
         super().__init__()
@@ -2285,10 +2228,7 @@ class TempNode(Expression):
     some fixed type.
     """
 
-    type = None  # type: mypy.types.Type
-    # Is this TempNode used to indicate absence of a right hand side in an annotated assignment?
-    # (e.g. for 'x: int' the rvalue is TempNode(AnyType(TypeOfAny.special_form), no_rhs=True))
-    no_rhs = False  # type: bool
+    __slots__ = ('type', 'no_rhs')
 
     def __init__(self,
                  typ: 'mypy.types.Type',
@@ -2298,6 +2238,9 @@ class TempNode(Expression):
         """Construct a dummy node; optionally borrow line/column from context object."""
         super().__init__()
         self.type = typ
+        # Is this TempNode used to indicate absence of a right hand side in an annotated
+        # assignment? (e.g. for 'x: int' the rvalue is
+        # TempNode(AnyType(TypeOfAny.special_form), no_rhs=True))
         self.no_rhs = no_rhs
         if context is not None:
             self.line = context.line
@@ -2323,111 +2266,14 @@ class TypeInfo(SymbolNode):
     the appropriate number of arguments.
     """
 
-    _fullname = None  # type: Bogus[str]          # Fully qualified name
-    # Fully qualified name for the module this type was defined in. This
-    # information is also in the fullname, but is harder to extract in the
-    # case of nested class definitions.
-    module_name = None  # type: str
-    defn = None  # type: ClassDef          # Corresponding ClassDef
-    # Method Resolution Order: the order of looking up attributes. The first
-    # value always to refers to this class.
-    mro = None  # type: List[TypeInfo]
-    # Used to stash the names of the mro classes temporarily between
-    # deserialization and fixup. See deserialize() for why.
-    _mro_refs = None  # type: Optional[List[str]]
-    bad_mro = False  # Could not construct full MRO
-
-    declared_metaclass = None  # type: Optional[mypy.types.Instance]
-    metaclass_type = None  # type: Optional[mypy.types.Instance]
-
-    names = None  # type: SymbolTable      # Names defined directly in this type
-    is_abstract = False                    # Does the class have any abstract attributes?
-    is_protocol = False                    # Is this a protocol class?
-    runtime_protocol = False               # Does this protocol support isinstance checks?
-    abstract_attributes = None  # type: List[str]
-
-    # The attributes 'assuming' and 'assuming_proper' represent structural subtype matrices.
-    #
-    # In languages with structural subtyping, one can keep a global subtype matrix like this:
-    #   . A B C .
-    #   A 1 0 0
-    #   B 1 1 1
-    #   C 1 0 1
-    #   .
-    # where 1 indicates that the type in corresponding row is a subtype of the type
-    # in corresponding column. This matrix typically starts filled with all 1's and
-    # a typechecker tries to "disprove" every subtyping relation using atomic (or nominal) types.
-    # However, we don't want to keep this huge global state. Instead, we keep the subtype
-    # information in the form of list of pairs (subtype, supertype) shared by all 'Instance's
-    # with given supertype's TypeInfo. When we enter a subtype check we push a pair in this list
-    # thus assuming that we started with 1 in corresponding matrix element. Such algorithm allows
-    # to treat recursive and mutually recursive protocols and other kinds of complex situations.
-    #
-    # If concurrent/parallel type checking will be added in future,
-    # then there should be one matrix per thread/process to avoid false negatives
-    # during the type checking phase.
-    assuming = None  # type: List[Tuple[mypy.types.Instance, mypy.types.Instance]]
-    assuming_proper = None  # type: List[Tuple[mypy.types.Instance, mypy.types.Instance]]
-    # Ditto for temporary 'inferring' stack of recursive constraint inference.
-    # It contains Instance's of protocol types that appeared as an argument to
-    # constraints.infer_constraints(). We need 'inferring' to avoid infinite recursion for
-    # recursive and mutually recursive protocols.
-    #
-    # We make 'assuming' and 'inferring' attributes here instead of passing they as kwargs,
-    # since this would require to pass them in many dozens of calls. In particular,
-    # there is a dependency infer_constraint -> is_subtype -> is_callable_subtype ->
-    # -> infer_constraints.
-    inferring = None  # type: List[mypy.types.Instance]
-    # 'inferring' and 'assuming' can't be made sets, since we need to use
-    # is_same_type to correctly treat unions.
-
-    # Classes inheriting from Enum shadow their true members with a __getattr__, so we
-    # have to treat them as a special case.
-    is_enum = False
-    # If true, any unknown attributes should have type 'Any' instead
-    # of generating a type error.  This would be true if there is a
-    # base class with type 'Any', but other use cases may be
-    # possible. This is similar to having __getattr__ that returns Any
-    # (and __setattr__), but without the __getattr__ method.
-    fallback_to_any = False
-
-    # Information related to type annotations.
-
-    # Generic type variable names (full names)
-    type_vars = None  # type: List[str]
-
-    # Direct base classes.
-    bases = None  # type: List[mypy.types.Instance]
-
-    # Another type which this type will be treated as a subtype of,
-    # even though it's not a subclass in Python.  The non-standard
-    # `@_promote` decorator introduces this, and there are also
-    # several builtin examples, in particular `int` -> `float`.
-    _promote = None  # type: Optional[mypy.types.Type]
-
-    # Representation of a Tuple[...] base class, if the class has any
-    # (e.g., for named tuples). If this is not None, the actual Type
-    # object used for this class is not an Instance but a TupleType;
-    # the corresponding Instance is set as the fallback type of the
-    # tuple type.
-    tuple_type = None  # type: Optional[mypy.types.TupleType]
-
-    # Is this a named tuple type?
-    is_named_tuple = False
-
-    # If this class is defined by the TypedDict type constructor,
-    # then this is not None.
-    typeddict_type = None  # type: Optional[mypy.types.TypedDictType]
-
-    # Is this a newtype type?
-    is_newtype = False
-
-    # Is this a synthesized intersection type?
-    is_intersection = False
-
-    # This is a dictionary that will be serialized and un-serialized as is.
-    # It is useful for plugins to add their data to save in the cache.
-    metadata = None  # type: Dict[str, JsonDict]
+    __slots__ = (
+        '_fullname', 'module_name', 'defn', 'mro', '_mro_refs', 'bad_mro', 'is_final',
+        'declared_metaclass', 'metaclass_type', 'names', 'is_abstract',
+        'is_protocol', 'runtime_protocol', 'abstract_attributes',
+        'assuming', 'assuming_proper', 'inferring', 'is_enum', 'fallback_to_any',
+        'type_vars', 'bases', '_promote', 'tuple_type', 'is_named_tuple',
+        'typeddict_type', 'is_newtype', 'is_intersection', 'metadata',
+    )
 
     FLAGS = [
         'is_abstract', 'is_enum', 'fallback_to_any', 'is_named_tuple',
@@ -2438,21 +2284,112 @@ class TypeInfo(SymbolNode):
     def __init__(self, names: 'SymbolTable', defn: ClassDef, module_name: str) -> None:
         """Initialize a TypeInfo."""
         super().__init__()
-        self.names = names
-        self.defn = defn
+        self._fullname = defn.fullname  # Fully qualified name
+        self.names = names  # Names defined directly in this type
+        self.defn = defn  # Corresponding ClassDef
+        # Fully qualified name for the module this type was defined in. This
+        # information is also in the fullname, but is harder to extract in the
+        # case of nested class definitions.
         self.module_name = module_name
-        self.type_vars = []
-        self.bases = []
-        self.mro = []
-        self._fullname = defn.fullname
-        self.is_abstract = False
-        self.abstract_attributes = []
-        self.assuming = []
-        self.assuming_proper = []
-        self.inferring = []
-        self.add_type_vars()
-        self.metadata = {}
+        # Generic type variable names (full names)
+        self.type_vars = []  # type: List[str]
+        # Direct base classes.
+        self.bases = []  # type: List[mypy.types.Instance]
+        # Method Resolution Order: the order of looking up attributes. The first
+        # value always to refers to this class.
+        self.mro = []  # type: List[TypeInfo]
+        # Used to stash the names of the mro classes temporarily between
+        # deserialization and fixup. See deserialize() for why.
+        self._mro_refs = None  # type: Optional[List[str]]
+        self.bad_mro = False  # Could not construct full MRO
+        self.declared_metaclass = None  # type: Optional[mypy.types.Instance]
+        self.metaclass_type = None  # type: Optional[mypy.types.Instance]
+        self.is_abstract = False  # Does the class have any abstract attributes?
+        self.is_protocol = False  # Is this a protocol class?
+        self.runtime_protocol = False  # Does this protocol support isinstance checks?
+        self.abstract_attributes = []  # type: List[str]
+
+        # The attributes 'assuming' and 'assuming_proper' represent structural subtype
+        # matrices.
+        #
+        # In languages with structural subtyping, one can keep a global subtype matrix like
+        # this:
+        #   . A B C .
+        #   A 1 0 0
+        #   B 1 1 1
+        #   C 1 0 1
+        #   .
+        # where 1 indicates that the type in corresponding row is a subtype of the type
+        # in corresponding column. This matrix typically starts filled with all 1's and
+        # a typechecker tries to "disprove" every subtyping relation using atomic (or
+        # nominal) types. However, we don't want to keep this huge global state. Instead,
+        # we keep the subtype information in the form of list of pairs (subtype, supertype)
+        # shared by all 'Instance's with given supertype's TypeInfo. When we enter a subtype
+        # check we push a pair in this list thus assuming that we started with 1 in
+        # corresponding matrix element. Such algorithm allows to treat recursive and
+        # mutually recursive protocols and other kinds of complex situations.
+        #
+        # If concurrent/parallel type checking will be added in future,
+        # then there should be one matrix per thread/process to avoid false negatives
+        # during the type checking phase.
+        self.assuming = []  # type: List[Tuple[mypy.types.Instance, mypy.types.Instance]]
+        self.assuming_proper = []  # type: List[Tuple[mypy.types.Instance, mypy.types.Instance]]
+        # Ditto for temporary 'inferring' stack of recursive constraint inference.
+        # It contains Instance's of protocol types that appeared as an argument to
+        # constraints.infer_constraints(). We need 'inferring' to avoid infinite recursion for
+        # recursive and mutually recursive protocols.
+        #
+        # We make 'assuming' and 'inferring' attributes here instead of passing they as kwargs,
+        # since this would require to pass them in many dozens of calls. In particular,
+        # there is a dependency infer_constraint -> is_subtype -> is_callable_subtype ->
+        # -> infer_constraints.
+        self.inferring = []  # type: List[mypy.types.Instance]
+        # 'inferring' and 'assuming' can't be made sets, since we need to use
+        # is_same_type to correctly treat unions.
+
+        # Classes inheriting from Enum shadow their true members with a __getattr__, so we
+        # have to treat them as a special case.
+        self.is_enum = False
+        # If true, any unknown attributes should have type 'Any' instead
+        # of generating a type error.  This would be true if there is a
+        # base class with type 'Any', but other use cases may be
+        # possible. This is similar to having __getattr__ that returns Any
+        # (and __setattr__), but without the __getattr__ method.
+        self.fallback_to_any = False
+
+        # Information related to type annotations.
+
+        # Another type which this type will be treated as a subtype of,
+        # even though it's not a subclass in Python.  The non-standard
+        # `@_promote` decorator introduces this, and there are also
+        # several builtin examples, in particular `int` -> `float`.
+        self._promote = None  # type: Optional[mypy.types.Type]
+
+        # Representation of a Tuple[...] base class, if the class has any
+        # (e.g., for named tuples). If this is not None, the actual Type
+        # object used for this class is not an Instance but a TupleType;
+        # the corresponding Instance is set as the fallback type of the
+        # tuple type.
+        self.tuple_type = None  # type: Optional[mypy.types.TupleType]
+
+        # Is this a named tuple type?
+        self.is_named_tuple = False
+
+        # If this class is defined by the TypedDict type constructor,
+        # then this is not None.
+        self.typeddict_type = None  # type: Optional[mypy.types.TypedDictType]
+
+        # Is this a newtype type?
+        self.is_newtype = False
+
+        # Is this a synthesized intersection type?
+        self.is_intersection = False
+
+        # This is a dictionary that will be serialized and un-serialized as is.
+        # It is useful for plugins to add their data to save in the cache.
+        self.metadata = {}  # type: Dict[str, JsonDict]
         self.is_final = False
+        self.add_type_vars()
 
     def add_type_vars(self) -> None:
         if self.defn.type_vars:
@@ -2692,6 +2629,9 @@ class FakeInfo(TypeInfo):
     # TypeInfo defines a __bool__ method that returns False for FakeInfo
     # so that it can be conveniently tested against in the same way that it
     # would be if things were properly optional.
+
+    __slots__ = ('msg',)
+
     def __init__(self, msg: str) -> None:
         self.msg = msg
 
@@ -2900,6 +2840,8 @@ class PlaceholderNode(SymbolNode):
     something that can support general recursive types.
     """
 
+    __slots__ = ('_fullname', 'node', 'becomes_typeinfo')
+
     def __init__(self, fullname: str, node: Node, line: int, *,
                  becomes_typeinfo: bool = False) -> None:
         self._fullname = fullname
@@ -2978,18 +2920,25 @@ class SymbolTableNode:
             TODO: Refactor build.py to make dependency tracking more transparent
             and/or refactor look-up functions to not require parent patching.
 
+    Nodes loaded from the cache are materialized lazily: deserialize()
+    only records the serialized node, and fixup.py may attach a deferred
+    fixup callback. Both are processed the first time 'node' is accessed,
+    so symbols that are never looked up are never deserialized.
+
     NOTE: No other attributes should be added to this class unless they
     are shared by all node kinds.
     """
 
     __slots__ = ('kind',
-                 'node',
+                 '_node',
                  'module_public',
                  'module_hidden',
                  'cross_ref',
                  'implicit',
                  'plugin_generated',
                  'no_serialize',
+                 '_serialized',
+                 '_deferred_fixup',
                  )
 
     def __init__(self,
@@ -3002,13 +2951,43 @@ class SymbolTableNode:
                  plugin_generated: bool = False,
                  no_serialize: bool = False) -> None:
         self.kind = kind
-        self.node = node
+        self._node = node
         self.module_public = module_public
         self.implicit = implicit
         self.module_hidden = module_hidden
         self.cross_ref = None  # type: Optional[str]
         self.plugin_generated = plugin_generated
         self.no_serialize = no_serialize
+        # Serialized node that hasn't been deserialized yet
+        self._serialized = None  # type: Optional[JsonDict]
+        # Fixup to run when the node is first accessed (see fixup.DeferredFixup)
+        self._deferred_fixup = None  # type: Optional[Callable[[SymbolTableNode], None]]
+
+    @property
+    def node(self) -> Optional[SymbolNode]:
+        if self._serialized is not None or self._deferred_fixup is not None:
+            self.materialize()
+        return self._node
+
+    @node.setter
+    def node(self, node: Optional[SymbolNode]) -> None:
+        self._node = node
+        self._serialized = None
+
+    def materialize(self) -> None:
+        """Deserialize and fix up a lazily loaded node."""
+        data = self._serialized
+        if data is not None:
+            self._serialized = None
+            self._node = SymbolNode.deserialize(data)
+        fixup = self._deferred_fixup
+        if fixup is not None:
+            # Clear first, since fixing up can refer back to this node.
+            self._deferred_fixup = None
+            fixup(self)
+
+    def defer_fixup(self, fixup: Callable[['SymbolTableNode'], None]) -> None:
+        self._deferred_fixup = fixup
 
     @property
     def fullname(self) -> Optional[str]:
@@ -3089,8 +3068,9 @@ class SymbolTableNode:
             stnode.cross_ref = data['cross_ref']
         else:
             assert 'node' in data, data
-            node = SymbolNode.deserialize(data['node'])
-            stnode = SymbolTableNode(kind, node)
+            # The node will be deserialized when it's first accessed.
+            stnode = SymbolTableNode(kind, None)
+            stnode._serialized = data['node']
         if 'module_hidden' in data:
             stnode.module_hidden = data['module_hidden']
         if 'module_public' in data:
@@ -3108,6 +3088,8 @@ class SymbolTable(Dict[str, SymbolTableNode]):
     This is used for module, class and function namespaces.
     """
 
+    __slots__ = ()
+
     def __str__(self) -> str:
         a = []  # type: List[str]
         for key, value in self.items():
@@ -154,6 +154,10 @@ class Options:
         # Use nicer output (when possible).
         self.color_output = True
         self.error_summary = True
+        # Format of error messages: 'text' or 'json' (one JSON object per line)
+        self.error_format = 'text'
+        # Forget errors once they have been reported, to bound memory use
+        self.stream_errors = False
 
         # Files in which to allow strict-Optional related errors
         # TODO: Kill this in favor of show_none_errors
@@ -214,11 +218,19 @@ class Options:
 
         # Write junit.xml to given file
         self.junit_xml = None  # type: Optional[str]
+        # Write per-module timings of build phases to given file (see mypy.timing)
+        self.timing_report = None  # type: Optional[str]
 
         # Caching and incremental checking options
         self.incremental = True
         self.cache_dir = defaults.CACHE_DIR
         self.sqlite_cache = False
+        # Write cache files using the binary format from mypy.binarycache
+        self.binary_cache = False
+        # Keep results of protocol subtype checks in the cache across runs
+        self.subtype_cache = False
+        # Look for prebuilt typeshed cache bundles here (see mypy.cachebundle)
+        self.cache_bundle_dir = None  # type: Optional[str]
         self.debug_cache = False
         self.skip_version_check = False
         self.skip_cache_mtime_checks = False
@@ -227,6 +239,10 @@ class Options:
         self.cache_fine_grained = False
         # Read cache files in fine-grained incremental mode (cache must include dependencies)
         self.use_fine_grained_cache = False
+        # How the daemon detects changed files: 'poll', 'inotify' or 'auto'
+        self.file_events = 'poll'
+        # Number of worker processes used to type check independent SCCs in parallel
+        self.jobs = 1
 
         # Tune certain behaviors when being used as a front-end to mypyc. Set per-module
         # in modules being compiled. Not in the config file or command line.
@@ -10,6 +10,8 @@ from mypy.typeops import tuple_fallback, make_simplified_union
 
 def is_same_type(left: Type, right: Type) -> bool:
     """Is 'left' the same type as 'right'?"""
+    if left is right:
+        return True
     left = get_proper_type(left)
     right = get_proper_type(right)
 
@@ -45,6 +45,10 @@ from mypy.semanal_infer import infer_decorator_signature_if_simple
 from mypy.checker import FineGrainedDeferredNode
 from mypy.server.aststrip import SavedAttributes
 from mypy.util import is_typeshed_file
+from mypy.timing import (
+    SEMANAL_TOP_LEVEL_PHASE, SEMANAL_FUNCTIONS_PHASE, SEMANAL_TYPE_ARGS_PHASE,
+    SEMANAL_CLASS_PROPERTIES_PHASE
+)
 import mypy.build
 
 if TYPE_CHECKING:
@@ -196,11 +200,12 @@ def process_top_levels(graph: 'Graph', scc: List[str], patches: Patches) -> None
             next_id = worklist.pop()
             state = graph[next_id]
             assert state.tree is not None
-            deferred, incomplete, progress = semantic_analyze_target(next_id, state,
-                                                                     state.tree,
-                                                                     None,
-                                                                     final_iteration,
-                                                                     patches)
+            with state.manager.timed(SEMANAL_TOP_LEVEL_PHASE, next_id):
+                deferred, incomplete, progress = semantic_analyze_target(next_id, state,
+                                                                         state.tree,
+                                                                         None,
+                                                                         final_iteration,
+                                                                         patches)
             all_deferred += deferred
             any_progress = any_progress or progress
             if not incomplete:
@@ -228,15 +233,16 @@ def process_functions(graph: 'Graph', scc: List[str], patches: Patches) -> None:
         # name as the second sort key to get a repeatable sort order on
         # Python 3.5, which doesn't preserve dictionary order.
         targets = sorted(get_all_leaf_targets(tree), key=lambda x: (x[1].line, x[0]))
-        for target, node, active_type in targets:
-            assert isinstance(node, (FuncDef, OverloadedFuncDef, Decorator))
-            process_top_level_function(analyzer,
-                                       graph[module],
-                                       module,
-                                       target,
-                                       node,
-                                       active_type,
-                                       patches)
+        with graph[module].manager.timed(SEMANAL_FUNCTIONS_PHASE, module):
+            for target, node, active_type in targets:
+                assert isinstance(node, (FuncDef, OverloadedFuncDef, Decorator))
+                process_top_level_function(analyzer,
+                                           graph[module],
+                                           module,
+                                           target,
+                                           node,
+                                           active_type,
+                                           patches)
 
 
 def process_top_level_function(analyzer: 'SemanticAnalyzer',
@@ -355,7 +361,7 @@ def check_type_arguments(graph: 'Graph', scc: List[str], errors: Errors) -> None
         analyzer = TypeArgumentAnalyzer(errors,
                                         state.options,
                                         is_typeshed_file(state.path or ''))
-        with state.wrap_context():
+        with state.wrap_context(), state.manager.timed(SEMANAL_TYPE_ARGS_PHASE, module):
             with strict_optional_set(state.options.strict_optional):
                 state.tree.accept(analyzer)
 
@@ -386,14 +392,15 @@ def calculate_class_properties(graph: 'Graph', scc: List[str], errors: Errors) -
     for module in scc:
         tree = graph[module].tree
         assert tree
-        for _, node, _ in tree.local_definitions():
-            if isinstance(node.node, TypeInfo):
-                saved = (module, node.node, None)  # module, class, function
-                with errors.scope.saved_scope(saved) if errors.scope else nothing():
-                    calculate_class_abstract_status(node.node, tree.is_stub, errors)
-                    check_protocol_status(node.node, errors)
-                    calculate_class_vars(node.node)
-                    add_type_promotion(node.node, tree.names, graph[module].options)
+        with graph[module].manager.timed(SEMANAL_CLASS_PROPERTIES_PHASE, module):
+            for _, node, _ in tree.local_definitions():
+                if isinstance(node.node, TypeInfo):
+                    saved = (module, node.node, None)  # module, class, function
+                    with errors.scope.saved_scope(saved) if errors.scope else nothing():
+                        calculate_class_abstract_status(node.node, tree.is_stub, errors)
+                        check_protocol_status(node.node, errors)
+                        calculate_class_vars(node.node)
+                        add_type_promotion(node.node, tree.names, graph[module].options)
 
 
 def check_blockers(graph: 'Graph', scc: List[str]) -> None:
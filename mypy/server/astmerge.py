@@ -94,6 +94,40 @@ def merge_asts(old: MypyFile, old_symbols: SymbolTable,
     replace_nodes_in_symbol_table(new_symbols, replacement_map)
 
 
+def merge_symbol_tables(file: MypyFile,
+                        old_tables: Dict[str, SymbolTable],
+                        new_tables: Dict[str, SymbolTable]) -> None:
+    """Preserve the identities of nodes after some targets of a module were reprocessed.
+
+    Reprocessing targets in fine-grained incremental mode keeps the AST of the module,
+    but some nodes may be recreated, such as NamedTuples defined using assignment
+    statements. The symbol tables of the module and of the classes in it are given
+    by full name (see mypy.server.update.find_symbol_tables_recursive).
+
+    This is equivalent to calling merge_asts() for each pair of symbol tables, but
+    the AST is only traversed once, and not at all if no nodes were recreated.
+    """
+    replacements = {}  # type: Dict[SymbolNode, SymbolNode]
+    for name, old_symbols in old_tables.items():
+        if name not in new_tables:
+            continue
+        table_replacements = replacement_map_from_symbol_table(
+            old_symbols, new_tables[name], prefix=file.fullname)
+        for new, old in table_replacements.items():
+            if new is not old:
+                replacements[new] = old
+            elif isinstance(old, TypeInfo):
+                # Like in NodeReplaceVisitor.fixup_and_reset_typeinfo(), since the
+                # class may have been changed in place.
+                TypeState.reset_all_subtype_caches_for(old)
+    if not replacements:
+        return
+    replace_nodes_in_ast(file, replacements)
+    for name in old_tables:
+        if name in new_tables:
+            replace_nodes_in_symbol_table(new_tables[name], replacements)
+
+
 def replacement_map_from_symbol_table(
         old: SymbolTable, new: SymbolTable, prefix: str) -> Dict[SymbolNode, SymbolNode]:
     """Create a new-to-old object identity map by comparing two symbol table revisions.
@@ -0,0 +1,147 @@
+"""Compact storage for fine-grained dependency maps.
+
+A fine-grained dependency map (see mypy.server.deps) maps triggers to the
+targets that need to be reprocessed when the trigger fires. The map of a
+large program has millions of entries, and it's kept in memory by the
+daemon, so we don't store it as a dictionary of sets of strings.
+Instead, the names of all triggers and targets are kept once in a string
+table, and the targets of each trigger are stored as a sorted array of
+integer ids into that table.
+
+The same encoding is used in the fine-grained dependency cache files, so
+that they can be loaded without creating a set for each trigger.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Set, Tuple
+
+from mypy.nodes import JsonDict
+
+
+class DependencyMap:
+    """Map from triggers to targets, with names stored in a string table.
+
+    Added targets are first collected in sets and merged into the sorted
+    arrays when the targets of a trigger are needed, or when compact() is
+    called. Dependencies are never removed.
+    """
+
+    def __init__(self) -> None:
+        # String table of trigger and target names. The index of names is
+        # only built when needed, since maps loaded from the cache are
+        # usually just merged into another map.
+        self._names = []  # type: List[str]
+        self._ids = {}  # type: Dict[str, int]
+        # Trigger id -> sorted array of target ids
+        self._targets = {}  # type: Dict[int, array[int]]
+        # Trigger id -> target ids that haven't been merged into _targets yet
+        self._pending = {}  # type: Dict[int, Set[int]]
+
+    def _index(self) -> Dict[str, int]:
+        if len(self._ids) < len(self._names):
+            self._ids = {name: id for id, name in enumerate(self._names)}
+        return self._ids
+
+    def _id(self, name: str) -> int:
+        ids = self._index()
+        id = ids.get(name)
+        if id is None:
+            id = len(self._names)
+            self._names.append(name)
+            ids[name] = id
+        return id
+
+    def add(self, trigger: str, targets: Iterable[str]) -> None:
+        """Add dependencies of targets on a trigger."""
+        self._add_ids(self._id(trigger), [self._id(target) for target in targets])
+
+    def update(self, deps: Mapping[str, Iterable[str]]) -> None:
+        """Add dependencies from a dictionary that maps triggers to targets."""
+        for trigger, targets in deps.items():
+            self.add(trigger, targets)
+
+    def merge(self, other: 'DependencyMap') -> None:
+        """Add all dependencies from another map."""
+        other.compact()
+        # Translate the ids of the other map once instead of looking up each name.
+        index = self._index()
+        names = self._names
+        ids = []
+        for name in other._names:
+            id = index.setdefault(name, len(names))
+            if id == len(names):
+                names.append(name)
+            ids.append(id)
+        for tid, targets in other._targets.items():
+            tid = ids[tid]
+            new = [ids[target] for target in targets]
+            if tid in self._targets:
+                self._add_ids(tid, new)
+            else:
+                # Usually the triggers in the maps being merged are different.
+                new.sort()
+                self._targets[tid] = array('i', new)
+
+    def _add_ids(self, tid: int, targets: Iterable[int]) -> None:
+        pending = self._pending.get(tid)
+        if pending is None:
+            if tid not in self._targets:
+                self._targets[tid] = array('i')
+            pending = self._pending[tid] = set()
+        pending.update(targets)
+
+    def _flush(self, tid: int) -> 'array[int]':
+        targets = self._targets[tid]
+        pending = self._pending.pop(tid, None)
+        if pending:
+            pending.update(targets)
+            targets = self._targets[tid] = array('i', sorted(pending))
+        return targets
+
+    def compact(self) -> None:
+        """Merge all added dependencies into the sorted arrays."""
+        for tid in list(self._pending):
+            self._flush(tid)
+
+    def targets(self, trigger: str) -> List[str]:
+        """Return the targets that depend on a trigger."""
+        tid = self._index().get(trigger)
+        if tid is None or tid not in self._targets:
+            return []
+        names = self._names
+        return [names[target] for target in self._flush(tid)]
+
+    def items(self) -> Iterator[Tuple[str, List[str]]]:
+        self.compact()
+        names = self._names
+        for tid, targets in self._targets.items():
+            yield names[tid], [names[target] for target in targets]
+
+    def __contains__(self, trigger: str) -> bool:
+        tid = self._index().get(trigger)
+        return tid is not None and tid in self._targets
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def to_dict(self) -> Dict[str, Set[str]]:
+        return {trigger: set(targets) for trigger, targets in self.items()}
+
+    def serialize(self) -> JsonDict:
+        """Serialize the map using the same encoding as in memory.
+
+        Each dependency is a list with the id of the trigger followed by the
+        ids of the targets.
+        """
+        self.compact()
+        return {'names': self._names,
+                'deps': [[tid] + targets.tolist() for tid, targets in self._targets.items()]}
+
+    @classmethod
+    def deserialize(cls, data: JsonDict) -> 'DependencyMap':
+        deps = cls()
+        deps._names = data['names']
+        for row in data['deps']:
+            targets = array('i', row)
+            deps._targets[targets.pop(0)] = targets
+        return deps
@@ -140,9 +140,10 @@ from mypy.server.astdiff import (
 from mypy.semanal_main import (
     semantic_analysis_for_scc, semantic_analysis_for_targets, core_modules
 )
-from mypy.server.astmerge import merge_asts
+from mypy.server.astmerge import merge_asts, merge_symbol_tables
 from mypy.server.aststrip import strip_target, SavedAttributes
-from mypy.server.deps import get_dependencies_of_target, merge_dependencies
+from mypy.server.depmap import DependencyMap
+from mypy.server.deps import get_dependencies_of_target
 from mypy.server.target import trigger_to_target
 from mypy.server.trigger import make_trigger, WILDCARD_TAG
 from mypy.util import module_prefix, split_target
@@ -169,7 +170,7 @@ class FineGrainedBuildManager:
         self.previous_modules = get_module_to_path_map(self.graph)
         self.deps = manager.fg_deps
         # Merge in any root dependencies that may not have been loaded
-        merge_dependencies(manager.load_fine_grained_deps(FAKE_ROOT_MODULE), self.deps)
+        self.deps.merge(manager.load_fine_grained_deps(FAKE_ROOT_MODULE))
         self.previous_targets_with_errors = manager.errors.targets()
         self.previous_messages = result.errors[:]
         # Module, if any, that had blocking errors in the last run as (id, path) tuple.
@@ -221,6 +222,8 @@ class FineGrainedBuildManager:
 
         # Reset find_module's caches for the new build.
         self.manager.find_module_cache.clear()
+        # Shared instances may refer to TypeInfos replaced by the update.
+        TypeState.reset_shared_instances()
 
         self.triggered = []
         self.updated_modules = []
@@ -270,6 +273,7 @@ class FineGrainedBuildManager:
                     break
 
         self.previous_messages = messages[:]
+        self.deps.compact()
         return messages
 
     def trigger(self, target: str) -> List[str]:
@@ -436,7 +440,7 @@ def find_unloaded_deps(manager: BuildManager, graph: Dict[str, State],
 
 
 def ensure_deps_loaded(module: str,
-                       deps: Dict[str, Set[str]], graph: Dict[str, State]) -> None:
+                       deps: DependencyMap, graph: Dict[str, State]) -> None:
     """Ensure that the dependencies on a module are loaded.
 
     Dependencies are loaded into the 'deps' dictionary.
@@ -451,7 +455,7 @@ def ensure_deps_loaded(module: str,
     for i in range(len(parts)):
         base = '.'.join(parts[:i + 1])
         if base in graph and not graph[base].fine_grained_deps_loaded:
-            merge_dependencies(graph[base].load_fine_grained_deps(), deps)
+            deps.merge(graph[base].load_fine_grained_deps())
             graph[base].fine_grained_deps_loaded = True
 
 
@@ -466,10 +470,10 @@ def ensure_trees_loaded(manager: BuildManager, graph: Dict[str, State],
         process_fresh_modules(graph, to_process, manager)
 
 
-def fix_fg_dependencies(manager: BuildManager, deps: Dict[str, Set[str]]) -> None:
+def fix_fg_dependencies(manager: BuildManager, deps: DependencyMap) -> None:
     """Populate the dependencies with stuff that build may have missed"""
     # This means the root module and typestate
-    merge_dependencies(manager.load_fine_grained_deps(FAKE_ROOT_MODULE), deps)
+    deps.merge(manager.load_fine_grained_deps(FAKE_ROOT_MODULE))
     # TypeState.add_all_protocol_deps(deps)
 
 
@@ -764,7 +768,7 @@ def replace_modules_with_new_variants(
 def propagate_changes_using_dependencies(
         manager: BuildManager,
         graph: Dict[str, State],
-        deps: Dict[str, Set[str]],
+        deps: DependencyMap,
         triggered: Set[str],
         up_to_date_modules: Set[str],
         targets_with_errors: Set[str],
@@ -797,6 +801,12 @@ def propagate_changes_using_dependencies(
         for target in targets_with_errors:
             id = module_prefix(graph, target)
             if id is not None and id not in up_to_date_modules:
+                if id not in manager.modules or manager.modules[id].is_cache_skeleton:
+                    # Errors restored from a daemon snapshot can refer to modules
+                    # that were loaded from the cache (or not at all). Process these
+                    # fully, like other unloaded modules.
+                    remaining_modules.append((id, graph[id].xpath))
+                    continue
                 if id not in todo:
                     todo[id] = set()
                 manager.log_fine_grained('process target with error: %s' % target)
@@ -828,7 +838,7 @@ def find_targets_recursive(
         manager: BuildManager,
         graph: Graph,
         triggers: Set[str],
-        deps: Dict[str, Set[str]],
+        deps: DependencyMap,
         up_to_date_modules: Set[str]) -> Tuple[Dict[str, Set[FineGrainedDeferredNode]],
                                                Set[str], Set[TypeInfo]]:
     """Find names of all targets that need to reprocessed, given some triggers.
@@ -856,7 +866,7 @@ def find_targets_recursive(
                 if module_id:
                     ensure_deps_loaded(module_id, deps, graph)
 
-                worklist |= deps.get(target, set()) - processed
+                worklist.update(dep for dep in deps.targets(target) if dep not in processed)
             else:
                 module_id = module_prefix(graph, target)
                 if module_id is None:
@@ -888,7 +898,7 @@ def reprocess_nodes(manager: BuildManager,
                     graph: Dict[str, State],
                     module_id: str,
                     nodeset: Set[FineGrainedDeferredNode],
-                    deps: Dict[str, Set[str]],
+                    deps: DependencyMap,
                     processed_targets: List[str]) -> Set[str]:
     """Reprocess a set of nodes within a single module.
 
@@ -940,9 +950,7 @@ def reprocess_nodes(manager: BuildManager,
     # the same, but other nodes may have been recreated with different identities, such as
     # NamedTuples defined using assignment statements.
     new_symbols = find_symbol_tables_recursive(file_node.fullname, file_node.names)
-    for name in old_symbols:
-        if name in new_symbols:
-            merge_asts(file_node, old_symbols[name], file_node, new_symbols[name])
+    merge_symbol_tables(file_node, old_symbols, new_symbols)
 
     # Type check.
     checker = graph[module_id].type_checker()
@@ -999,7 +1007,7 @@ def find_symbol_tables_recursive(prefix: str, symbols: SymbolTable) -> Dict[str,
 def update_deps(module_id: str,
                 nodes: List[FineGrainedDeferredNode],
                 graph: Dict[str, State],
-                deps: Dict[str, Set[str]],
+                deps: DependencyMap,
                 options: Options) -> None:
     for deferred in nodes:
         node = deferred.node
@@ -1008,8 +1016,7 @@ def update_deps(module_id: str,
         assert tree is not None, "Tree must be processed at this stage"
         new_deps = get_dependencies_of_target(module_id, tree, node, type_map,
                                               options.python_version)
-        for trigger, targets in new_deps.items():
-            deps.setdefault(trigger, set()).update(targets)
+        deps.update(new_deps)
     # Merge also the newly added protocol deps (if any).
     TypeState.update_protocol_deps(deps)
 
@@ -1135,7 +1142,7 @@ else:
 def refresh_suppressed_submodules(
         module: str,
         path: Optional[str],
-        deps: Dict[str, Set[str]],
+        deps: DependencyMap,
         graph: Graph,
         fscache: FileSystemCache,
         refresh_file: Callable[[str, str], List[str]]) -> Optional[List[str]]:
@@ -1174,7 +1181,7 @@ def refresh_suppressed_submodules(
         ensure_deps_loaded(module, deps, graph)
 
         if trigger in deps:
-            for dep in deps[trigger]:
+            for dep in deps.targets(trigger):
                 # We can ignore <...> deps since a submodule can't trigger any.
                 state = graph.get(dep)
                 if not state:
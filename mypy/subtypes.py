@@ -63,6 +63,10 @@ def is_subtype(left: Type, right: Type,
     between the type arguments (e.g., A and B), taking the variance of the
     type var into account.
     """
+    if left is right:
+        # Every type is a subtype of itself. This is common, since many simple
+        # types are shared (see TypeState.deserialized_instance).
+        return True
     if TypeState.is_assumed_subtype(left, right):
         return True
     if (isinstance(left, TypeAliasType) and isinstance(right, TypeAliasType) and
@@ -518,10 +522,39 @@ def is_protocol_implementation(left: Instance, right: Instance,
     this results in A being a subtype of P without infinite recursion.
     On every false result, we pop the assumption, thus avoiding an infinite recursion
     as well.
+
+    If the persistent subtype cache is enabled (--subtype-cache), results of
+    outermost checks are looked up in and recorded to it.
     """
     assert right.type.is_protocol
     # We need to record this check to generate protocol fine-grained dependencies.
     TypeState.record_protocol_subtype_check(left.type, right.type)
+    persistent = TypeState.persistent_subtype_cache
+    if persistent is None:
+        return check_protocol_implementation(left, right, proper_subtype)
+    key = None
+    if persistent.depth == 0:
+        key = TypeState.persistent_cache_key(left, right, proper_subtype)
+    if key is not None:
+        cached = persistent.lookup(key)
+        if cached is not None:
+            if cached:
+                TypeState.record_subtype_cache_entry(
+                    protocol_subtype_kind(right, proper_subtype), left, right)
+            return cached
+    persistent.depth += 1
+    try:
+        result = check_protocol_implementation(left, right, proper_subtype)
+    finally:
+        persistent.depth -= 1
+    if key is not None:
+        persistent.record(key, result, TypeState.type_modules(left, right))
+    return result
+
+
+def check_protocol_implementation(left: Instance, right: Instance,
+                                  proper_subtype: bool) -> bool:
+    """Check whether 'left' implements the protocol 'right' (without the persistent cache)."""
     assuming = right.type.assuming_proper if proper_subtype else right.type.assuming
     for (l, r) in reversed(assuming):
         if (mypy.sametypes.is_same_type(l, left)
@@ -573,14 +606,19 @@ def is_protocol_implementation(left: Instance, right: Instance,
             if IS_CLASS_OR_STATIC in superflags and IS_CLASS_OR_STATIC not in subflags:
                 return False
 
+    TypeState.record_subtype_cache_entry(protocol_subtype_kind(right, proper_subtype),
+                                         left, right)
+    return True
+
+
+def protocol_subtype_kind(right: Instance, proper_subtype: bool) -> SubtypeKind:
+    """Return the subtype cache kind used for results of protocol checks against 'right'."""
     if not proper_subtype:
         # Nominal check currently ignores arg names, but __call__ is special for protocols
         ignore_names = right.type.protocol_members != ['__call__']
-        subtype_kind = SubtypeVisitor.build_subtype_kind(ignore_pos_arg_names=ignore_names)
+        return SubtypeVisitor.build_subtype_kind(ignore_pos_arg_names=ignore_names)
     else:
-        subtype_kind = ProperSubtypeVisitor.build_subtype_kind()
-    TypeState.record_subtype_cache_entry(subtype_kind, left, right)
-    return True
+        return ProperSubtypeVisitor.build_subtype_kind()
 
 
 def find_member(name: str,
@@ -1142,6 +1180,8 @@ def is_proper_subtype(left: Type, right: Type, *,
     (this is useful for runtime isinstance() checks). If keep_erased_types is True,
     do not consider ErasedType a subtype of all types (used by type inference against unions).
     """
+    if left is right and not erase_instances and not keep_erased_types:
+        return True
     if TypeState.is_assumed_proper_subtype(left, right):
         return True
     if (isinstance(left, TypeAliasType) and isinstance(right, TypeAliasType) and
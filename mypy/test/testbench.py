@@ -0,0 +1,121 @@
+"""Test cases for the benchmark harness (mypy.bench)."""
+
+import argparse
+import os
+import tempfile
+from unittest import mock
+
+from typing import Any, Dict, List
+
+from mypy import nodes
+from mypy.bench.runner import compare_results, run_trial, run_workloads, summarize
+from mypy.bench.synthetic import GENERATORS, write_modules
+from mypy.bench.workloads import Metrics, Workload, create_workloads
+from mypy.memprofile import node_memory_stats
+from mypy.options import Options
+from mypy.parse import parse
+from mypy.test.helpers import Suite, assert_equal
+
+
+class SyntheticCodeSuite(Suite):
+    def test_generated_code_parses(self) -> None:
+        for name, generate in GENERATORS.items():
+            modules = generate(10)
+            assert_equal(generate(10), modules)
+            for module, source in modules.items():
+                # Raises ParseError on syntax errors
+                parse(source, module + '.py', module, None, Options())
+
+    def test_write_modules(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = write_modules(tmpdir, {'pkg.sub.a': 'x = 1', 'pkg.b': 'y = 1'})
+            assert_equal(paths, [os.path.join(tmpdir, 'pkg', 'b.py'),
+                                 os.path.join(tmpdir, 'pkg', 'sub', 'a.py')])
+            assert os.path.isfile(os.path.join(tmpdir, 'pkg', '__init__.py'))
+            assert os.path.isfile(os.path.join(tmpdir, 'pkg', 'sub', '__init__.py'))
+
+
+class ResultsSuite(Suite):
+    def test_summarize(self) -> None:
+        trials = [{'wall': 3.0, 'rss_peak_kib': 100, 'updates': [1.0], 'ok': True},
+                  {'wall': 1.0, 'rss_peak_kib': 300},
+                  {'wall': 2.0, 'rss_peak_kib': 200}]  # type: List[Dict[str, Any]]
+        assert_equal(summarize(trials), {'rss_peak_kib': 200, 'wall': 2.0})
+
+    def test_compare_results(self) -> None:
+        old = {'workloads': {'a': {'summary': {'wall': 2.0, 'errors': 0, 'rss_peak_kib': 100}},
+                             'b': {'summary': {'wall': 1.0}}}}
+        new = {'workloads': {'a': {'summary': {'wall': 1.0, 'errors': 0, 'rss_peak_kib': 120}},
+                             'c': {'summary': {'wall': 1.0}}}}
+        lines, regressions = compare_results(old, new, threshold=1.1)
+        assert_equal(len(lines), 3)
+        assert lines[1].split() == ['a', 'wall', '2.000', '1.000', '0.500'], lines[1]
+        assert_equal(regressions, ['a rss_peak_kib'])
+        assert_equal(compare_results(old, new)[1], [])
+
+
+class CountingWorkload(Workload):
+    name = 'counting'
+    description = 'Count prepared trials'
+
+    def __init__(self) -> None:
+        self.prepared = 0
+
+    def prepare_trial(self, workdir: str) -> None:
+        self.prepared += 1
+
+    def run(self, workdir: str) -> Metrics:
+        return {'errors': 0, 'prepared': self.prepared}
+
+
+class WorkloadsSuite(Suite):
+    def test_create_workloads(self) -> None:
+        workloads = create_workloads(repo=None)
+        assert 'self-check-cold' in workloads
+        for name, workload in workloads.items():
+            assert_equal(workload.name, name)
+
+    def test_run_trial(self) -> None:
+        workload = CountingWorkload()
+        metrics = run_trial(workload, '.', reachable=False)
+        assert_equal(metrics['prepared'], 1)
+        assert_equal(metrics['errors'], 0)
+        assert metrics['wall'] >= 0
+        assert metrics['rss_peak_kib'] > 0
+        assert 'reachable_kib' not in metrics
+
+    def test_run_workloads(self) -> None:
+        workload = CountingWorkload()
+        options = argparse.Namespace(trials=3, scale=1.0)
+        walls = iter([3.0, 1.0, 2.0])
+
+        def run_trial_in_child(name: str, workdir: str, options: argparse.Namespace) -> Metrics:
+            assert_equal(name, 'counting')
+            metrics = run_trial(workload, workdir, reachable=False)
+            metrics['wall'] = next(walls)
+            return metrics
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch('mypy.bench.runner.run_trial_in_child', run_trial_in_child):
+                with mock.patch('builtins.print'):
+                    results = run_workloads([workload], tmpdir, options)
+            assert os.path.isdir(os.path.join(tmpdir, 'counting'))
+        assert_equal(results['trials'], 3)
+        result = results['workloads']['counting']
+        assert_equal([trial['prepared'] for trial in result['trials']], [1, 2, 3])
+        assert_equal(result['summary']['wall'], 2.0)
+        assert_equal(result['summary']['prepared'], 2)
+
+
+class MemoryStatsSuite(Suite):
+    def test_node_memory_stats(self) -> None:
+        before, _ = node_memory_stats()
+        exprs = [nodes.NameExpr('x') for _ in range(1000)]
+        after, kib = node_memory_stats()
+        assert after - before >= len(exprs)
+        assert kib > 0
+
+    def test_nodes_have_no_dict(self) -> None:
+        for name, obj in vars(nodes).items():
+            if isinstance(obj, type) and issubclass(obj, nodes.Context):
+                assert '__dict__' not in dir(obj), name
@@ -0,0 +1,123 @@
+"""Test cases for the binary cache format."""
+
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from mypy.binarycache import (
+    encode_binary, decode_binary, is_binary_cache_data, BinaryCacheError, MAGIC
+)
+from mypy.build import BuildSource, build, cache_loads, compute_cache_hash
+from mypy.errors import CompileError
+from mypy.options import Options
+from mypy.test.config import PREFIX
+from mypy.test.helpers import Suite, assert_equal
+
+
+class BinaryCacheSuite(Suite):
+    def assert_round_trip(self, obj: object) -> None:
+        data = encode_binary(obj)
+        assert is_binary_cache_data(data)
+        assert_equal(decode_binary(data), obj)
+
+    def test_scalars(self) -> None:
+        for obj in [None, True, False, 0, 1, 127, 128, 300, 2 ** 70, -1, -2 ** 40,
+                    1.5, -0.25, '', 'x', 'builtins.int', 'unicode λ']:
+            self.assert_round_trip(obj)
+
+    def test_containers(self) -> None:
+        self.assert_round_trip([])
+        self.assert_round_trip({})
+        self.assert_round_trip([1, 'a', [None, {'b': [True]}]])
+        self.assert_round_trip({'names': {'x': {'.class': 'SymbolTableNode', 'kind': 'Gdef'}}})
+
+    def test_records(self) -> None:
+        obj = {'.class': 'Instance', 'type_ref': 'builtins.int', 'args': []}
+        self.assert_round_trip(obj)
+        self.assert_round_trip([obj, obj, {'.class': 'AnyType', 'type_of_any': 7}])
+
+    def test_strings_interned(self) -> None:
+        many = [{'.class': 'Instance', 'type_ref': 'builtins.int', 'args': []}] * 100
+        data = encode_binary(many)
+        assert data.count(b'builtins.int') == 1
+        assert len(data) < len(json.dumps(many)) // 5
+
+    def test_deterministic(self) -> None:
+        assert_equal(encode_binary({'b': 1, 'a': 2}), encode_binary({'a': 2, 'b': 1}))
+
+    def test_tuples_encoded_as_lists(self) -> None:
+        assert_equal(decode_binary(encode_binary((1, 2))), [1, 2])
+
+    def test_not_binary(self) -> None:
+        assert not is_binary_cache_data(b'{"a": 1}')
+        assert not is_binary_cache_data('{"a": 1}')
+
+    def test_corrupted(self) -> None:
+        data = encode_binary({'a': [1, 2, 3]})
+        for bad in [data[:-1], data + b'\x00', MAGIC + b'\x00\x7f', b'{}']:
+            with self.assertRaises(BinaryCacheError):
+                decode_binary(bad)
+
+
+class CacheFileSuite(Suite):
+    def test_cache_loads(self) -> None:
+        obj = {'a': [1, 'x']}
+        assert_equal(cache_loads(json.dumps(obj).encode('utf-8')), obj)
+        assert_equal(cache_loads(encode_binary(obj)), obj)
+
+    def test_cache_loads_corrupted(self) -> None:
+        for bad in [b'{"a": [1', b'\xff\xfe', encode_binary({'a': [1]})[:-1]]:
+            with self.assertRaises(ValueError):
+                cache_loads(bad)
+
+    def test_truncated_cache_file(self) -> None:
+        for binary in [False, True]:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, 'a.py')
+                with open(path, 'w') as f:
+                    f.write('x = 1\n')
+                options = Options()
+                options.cache_dir = os.path.join(tmpdir, '.mypy_cache')
+                options.binary_cache = binary
+                options.use_builtins_fixtures = True
+                sources = [BuildSource(path, 'a', None)]
+                lib_path = os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub')
+                build(sources, options, alt_lib_path=lib_path)
+                meta_files = glob.glob(os.path.join(options.cache_dir, '*', 'a.meta.json'))
+                assert_equal(len(meta_files), 1)
+                with open(meta_files[0], 'rb') as f:
+                    data = f.read()
+                with open(meta_files[0], 'wb') as f:
+                    f.write(data[:len(data) // 2])
+                with self.assertRaises(CompileError) as cm:
+                    build(sources, options, alt_lib_path=lib_path)
+                assert 'you likely have a bad cache' in '\n'.join(cm.exception.messages)
+
+    def test_convert_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'a.py')
+            with open(path, 'w') as f:
+                f.write('x = 1\n')
+            options = Options()
+            options.cache_dir = os.path.join(tmpdir, '.mypy_cache')
+            options.use_builtins_fixtures = True
+            sources = [BuildSource(path, 'a', None)]
+            lib_path = os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub')
+            build(sources, options, alt_lib_path=lib_path)
+            [cache_dir] = glob.glob(os.path.join(options.cache_dir, '[0-9]*'))
+            subprocess.check_call([sys.executable, os.path.join(PREFIX, 'misc', 'convert-cache.py'),
+                                   '--same-store', '--format', 'binary', cache_dir])
+            with open(os.path.join(cache_dir, 'a.data.json'), 'rb') as f:
+                data = f.read()
+            with open(os.path.join(cache_dir, 'a.meta.json'), 'rb') as f:
+                meta = cache_loads(f.read())
+            assert is_binary_cache_data(data)
+            assert_equal(meta['interface_hash'], compute_cache_hash(data))
+            assert_equal(meta['data_mtime'],
+                         int(os.path.getmtime(os.path.join(cache_dir, 'a.data.json'))))
+            # The converted cache is still valid.
+            result = build(sources, options, alt_lib_path=lib_path)
+            assert_equal(result.manager.rechecked_modules, set())
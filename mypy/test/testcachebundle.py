@@ -0,0 +1,78 @@
+"""Test cases for typeshed cache bundles (mypy.cachebundle)."""
+
+import os
+import shutil
+import tempfile
+
+from mypy import build
+from mypy.cachebundle import create_cache_bundle, find_cache_bundle, stdlib_sources
+from mypy.modulefinder import BuildSource
+from mypy.options import Options
+from mypy.test.config import test_data_prefix
+from mypy.test.helpers import Suite, assert_equal
+from mypy.version import __version__
+
+# Stubs from lib-stub that make up the typeshed used in the tests
+STUBS = ['builtins', 'typing', 'abc', 'types', 'collections']
+
+
+class CacheBundleSuite(Suite):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+        typeshed_dir = os.path.join(self.tmpdir, 'typeshed')
+        stubdir = os.path.join(typeshed_dir, 'stdlib', '3')
+        os.makedirs(stubdir)
+        for module in STUBS:
+            shutil.copy(os.path.join(test_data_prefix, 'lib-stub', module + '.pyi'), stubdir)
+        self.main = os.path.join(self.tmpdir, 'main.py')
+        with open(self.main, 'w') as f:
+            f.write('import collections\nimport types\n')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def options(self, cache: str) -> Options:
+        options = Options()
+        options.custom_typeshed_dir = os.path.join(self.tmpdir, 'typeshed')
+        options.cache_bundle_dir = os.path.join(self.tmpdir, 'bundles')
+        options.cache_dir = os.path.join(self.tmpdir, cache)
+        return options
+
+    def check(self, options: Options) -> build.BuildResult:
+        return build.build([BuildSource(self.main, 'main', None)], options)
+
+    def test_stdlib_sources(self) -> None:
+        modules = [source.module for source in stdlib_sources(self.options('cache'),
+                                                              self.tmpdir)]
+        assert_equal(modules, sorted(STUBS))
+
+    def test_bundle_used_with_empty_cache(self) -> None:
+        options = self.options('bundle-cache')
+        assert find_cache_bundle(options, self.tmpdir, __version__) is None
+        create_cache_bundle(options.cache_bundle_dir or '', options, self.tmpdir)
+        assert find_cache_bundle(self.options('cache'), self.tmpdir, __version__)
+
+        result = self.check(self.options('cache'))
+        assert_equal(result.errors, [])
+        assert result.manager.stats['bundle_metas'] > 0
+        assert all(result.graph[module].is_fresh() for module in ('builtins', 'collections'))
+        assert not result.graph['main'].is_fresh()
+        # Nothing was written to the project cache for the bundled modules.
+        result = self.check(self.options('cache'))
+        assert result.manager.stats['bundle_metas'] > 0
+        assert result.graph['main'].is_fresh()
+
+    def test_fall_back_if_options_differ(self) -> None:
+        options = self.options('bundle-cache')
+        create_cache_bundle(options.cache_bundle_dir or '', options, self.tmpdir)
+
+        options = self.options('cache')
+        options.disallow_any_generics = True
+        result = self.check(options)
+        assert_equal(result.errors, [])
+        assert 'bundle_metas' not in result.manager.stats
+        assert not result.graph['builtins'].is_fresh()
+        # The bundle isn't found for another platform.
+        options = self.options('cache')
+        options.platform = 'other'
+        assert find_cache_bundle(options, self.tmpdir, __version__) is None
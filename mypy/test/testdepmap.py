@@ -0,0 +1,40 @@
+"""Test cases for fine-grained dependency maps (mypy.server.depmap)."""
+
+import json
+
+from mypy.server.depmap import DependencyMap
+from mypy.test.helpers import Suite, assert_equal
+
+
+class DependencyMapSuite(Suite):
+    def test_add_and_lookup(self) -> None:
+        deps = DependencyMap()
+        deps.add('<a.f>', ['b', 'c.g'])
+        deps.update({'<a.f>': {'b', 'd'}, '<a>': {'b'}})
+        assert_equal(sorted(deps.targets('<a.f>')), ['b', 'c.g', 'd'])
+        assert_equal(deps.targets('<a.x>'), [])
+        assert_equal(deps.targets('b'), [])
+        assert '<a>' in deps
+        assert 'b' not in deps
+        assert_equal(len(deps), 2)
+        assert_equal(deps.to_dict(), {'<a.f>': {'b', 'c.g', 'd'}, '<a>': {'b'}})
+
+    def test_merge(self) -> None:
+        deps = DependencyMap()
+        deps.update({'<a.f>': {'b'}, '<b>': {'c'}})
+        other = DependencyMap()
+        other.update({'<a.f>': {'c', 'b'}, '<c>': {'a', 'b'}})
+        deps.merge(other)
+        assert_equal(deps.to_dict(), {'<a.f>': {'b', 'c'}, '<b>': {'c'}, '<c>': {'a', 'b'}})
+
+    def test_serialize(self) -> None:
+        deps = DependencyMap()
+        deps.update({'<a.f>': {'b', 'c'}, '<b>': {'c'}, '<c>': set()})
+        data = json.loads(json.dumps(deps.serialize()))
+        assert_equal(sorted(data['names']), ['<a.f>', '<b>', '<c>', 'b', 'c'])
+        loaded = DependencyMap.deserialize(data)
+        assert_equal(loaded.to_dict(), deps.to_dict())
+        other = DependencyMap()
+        other.add('<x>', ['y'])
+        other.merge(loaded)
+        assert_equal(other.to_dict(), dict(deps.to_dict(), **{'<x>': {'y'}}))
@@ -0,0 +1,76 @@
+"""Test cases for lazy fixup of deserialized symbol tables."""
+
+import os
+
+from mypy import build
+from mypy.fixup import fixup_module
+from mypy.modulefinder import BuildSource
+from mypy.nodes import MypyFile, TypeInfo, FuncDef, Var
+from mypy.options import Options
+from mypy.test.config import PREFIX
+from mypy.test.helpers import Suite, assert_equal
+from mypy.types import CallableType, Instance, get_proper_type
+
+
+SOURCE = """
+class A:
+    x = 1
+    def f(self) -> int: pass
+class B(A): pass
+def g(b: B) -> A: pass
+unused = B()
+"""
+
+
+class LazyFixupSuite(Suite):
+    def load_module(self) -> MypyFile:
+        options = Options()
+        options.show_traceback = True
+        options.incremental = False
+        options.use_builtins_fixtures = True
+        result = build.build(sources=[BuildSource('m', 'm', SOURCE)],
+                             options=options,
+                             alt_lib_path=os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub'))
+        assert_equal(result.errors, [])
+        modules = dict(result.files)
+        tree = MypyFile.deserialize(modules['m'].serialize())
+        modules['m'] = tree
+        fixup_module(tree, modules, allow_missing=False, lazy=True)
+        return tree
+
+    def test_symbols_materialized_on_access(self) -> None:
+        tree = self.load_module()
+        names = tree.names
+        assert names['g']._serialized is not None
+        assert names['unused']._serialized is not None
+        func = names['g'].node
+        assert isinstance(func, FuncDef)
+        assert names['unused']._serialized is not None
+
+        # Looking up B fixes up its base classes and MRO, which in turn
+        # materializes A, but its members are only loaded when accessed.
+        info = names['B'].node
+        assert isinstance(info, TypeInfo)
+        base = names['A'].node
+        assert isinstance(base, TypeInfo)
+        assert_equal(info.mro, [info, base, info.mro[-1]])
+        assert base.names['f']._serialized is not None
+        method = base.get_method('f')
+        assert isinstance(method, FuncDef)
+        assert method.info is base
+        attr = base.names['x'].node
+        assert isinstance(attr, Var)
+        assert attr.info is base
+
+    def test_types_fixed_up(self) -> None:
+        tree = self.load_module()
+        func = tree.names['g'].node
+        assert isinstance(func, FuncDef)
+        assert isinstance(func.type, CallableType)
+        ret = get_proper_type(func.type.ret_type)
+        assert isinstance(ret, Instance)
+        assert ret.type is tree.names['A'].node
+
+    def test_same_node_returned(self) -> None:
+        tree = self.load_module()
+        assert tree.names['A'].node is tree.names['A'].node
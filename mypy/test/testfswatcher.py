@@ -0,0 +1,197 @@
+"""Test cases for detecting file changes with FileSystemWatcher and event sources."""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from typing import Iterable, Set
+
+from mypy.fscache import FileSystemCache
+from mypy.fsevents import (
+    FileEventSource, InotifyEventSource, EventSourceError, create_event_source
+)
+from mypy.fswatcher import FileSystemWatcher
+from mypy.test.helpers import Suite, assert_equal
+
+
+class FakeEventSource(FileEventSource):
+    name = 'fake'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.watched = set()  # type: Set[str]
+        self.unwatchable = set()  # type: Set[str]
+        self.events = set()  # type: Set[str]
+
+    def watch(self, paths: Iterable[str]) -> Set[str]:
+        path_set = set(paths)
+        self.watched |= path_set - self.unwatchable
+        return path_set & self.unwatchable
+
+    def unwatch(self, paths: Iterable[str]) -> None:
+        self.watched -= set(paths)
+
+    def queued(self) -> int:
+        return len(self.events)
+
+    def read_changes(self) -> Set[str]:
+        events = self.events
+        self.events = set()
+        return {os.path.abspath(path) for path in events}
+
+
+class FileSystemWatcherSuite(Suite):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.fs = FileSystemCache()
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def write(self, name: str, contents: str) -> str:
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, 'w') as f:
+            f.write(contents)
+        self.fs.flush()
+        return path
+
+    def test_changes_without_events_are_ignored(self) -> None:
+        a = self.write('a.py', 'x = 1\n')
+        b = self.write('b.py', 'y = 1\n')
+        events = FakeEventSource()
+        watcher = FileSystemWatcher(self.fs, events)
+        watcher.add_watched_paths([a, b])
+        assert_equal(events.watched, {a, b})
+        assert_equal(watcher.find_changed(), {a, b})
+        self.write('a.py', 'x = 22\n')
+        self.write('b.py', 'y = 22\n')
+        # Only a has an event, so b isn't looked at
+        events.events.add(a)
+        assert_equal(watcher.queued_events(), 1)
+        assert_equal(watcher.find_changed(), {a})
+        assert_equal(watcher.find_changed(), set())
+
+    def test_overflow_checks_all_files(self) -> None:
+        a = self.write('a.py', 'x = 1\n')
+        b = self.write('b.py', 'y = 1\n')
+        events = FakeEventSource()
+        watcher = FileSystemWatcher(self.fs, events)
+        watcher.add_watched_paths([a, b])
+        watcher.find_changed()
+        self.write('b.py', 'y = 22\n')
+        events.overflowed = True
+        assert_equal(watcher.find_changed(), {b})
+        assert not events.overflowed
+
+    def test_unwatchable_paths_are_polled(self) -> None:
+        a = self.write('a.py', 'x = 1\n')
+        b = self.write('b.py', 'y = 1\n')
+        events = FakeEventSource()
+        events.unwatchable.add(b)
+        watcher = FileSystemWatcher(self.fs, events)
+        watcher.add_watched_paths([a, b])
+        watcher.find_changed()
+        self.write('b.py', 'y = 22\n')
+        assert_equal(watcher.find_changed(), {b})
+        watcher.remove_watched_paths([b])
+        assert_equal(watcher.find_changed(), set())
+
+    def test_event_without_change(self) -> None:
+        a = self.write('a.py', 'x = 1\n')
+        events = FakeEventSource()
+        watcher = FileSystemWatcher(self.fs, events)
+        watcher.add_watched_paths([a])
+        watcher.find_changed()
+        events.events.add(a)
+        assert_equal(watcher.find_changed(), set())
+
+    def test_poll_backend(self) -> None:
+        watcher = FileSystemWatcher(self.fs, create_event_source('poll'))
+        assert_equal(watcher.backend, 'poll')
+        assert_equal(watcher.queued_events(), 0)
+
+    def test_fallback_to_polling(self) -> None:
+        a = self.write('a.py', 'x = 1\n')
+        with mock.patch('mypy.fsevents.InotifyEventSource', side_effect=OSError('no inotify')):
+            events = create_event_source('auto')
+        assert events is None
+        watcher = FileSystemWatcher(self.fs, events)
+        assert_equal(watcher.backend, 'poll')
+        watcher.add_watched_paths([a])
+        assert_equal(watcher.find_changed(), {a})
+        self.write('a.py', 'x = 22\n')
+        assert_equal(watcher.find_changed(), {a})
+        assert_equal(watcher.find_changed(), set())
+
+    def test_unavailable_inotify(self) -> None:
+        with mock.patch('mypy.fsevents.InotifyEventSource', side_effect=OSError('no inotify')):
+            with mock.patch('sys.platform', 'linux'):
+                assert create_event_source('auto') is None
+                with self.assertRaises(EventSourceError):
+                    create_event_source('inotify')
+            with mock.patch('sys.platform', 'win32'):
+                assert create_event_source('auto') is None
+                with self.assertRaises(EventSourceError):
+                    create_event_source('inotify')
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), 'inotify is only available on Linux')
+class InotifyEventSourceSuite(Suite):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.events = InotifyEventSource()
+
+    def tearDown(self) -> None:
+        self.events.close()
+        self.tempdir.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(os.path.realpath(self.tempdir.name), name)
+
+    def write(self, path: str, contents: str) -> None:
+        with open(path, 'w') as f:
+            f.write(contents)
+
+    def wait_for_events(self, count: int) -> None:
+        # Events are delivered asynchronously
+        deadline = time.time() + 5
+        while self.events.queued() < count and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_modify_and_replace(self) -> None:
+        a = self.path('a.py')
+        b = self.path('b.py')
+        other = self.path('other.py')
+        self.write(a, 'x = 1\n')
+        self.write(b, 'x = 1\n')
+        assert_equal(self.events.watch([a, b]), set())
+        self.write(a, 'x = 2\n')
+        # Replace b by renaming another file over it, like many editors do
+        self.write(other, 'x = 2\n')
+        os.replace(other, b)
+        self.wait_for_events(2)
+        assert_equal(self.events.read_changes(), {a, b})
+        assert not self.events.overflowed
+        assert_equal(self.events.read_changes(), set())
+
+    def test_unwatched_directory(self) -> None:
+        missing = self.path(os.path.join('missing', 'a.py'))
+        assert_equal(self.events.watch([missing]), {missing})
+
+    def test_deleted_directory_causes_overflow(self) -> None:
+        subdir = self.path('sub')
+        os.mkdir(subdir)
+        a = os.path.join(subdir, 'a.py')
+        self.write(a, 'x = 1\n')
+        self.events.watch([a])
+        os.remove(a)
+        os.rmdir(subdir)
+        deadline = time.time() + 5
+        while not self.events.overflowed and time.time() < deadline:
+            self.events.queued()
+            time.sleep(0.01)
+        self.events.read_changes()
+        assert self.events.overflowed
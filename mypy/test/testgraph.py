@@ -1,11 +1,15 @@
 """Test cases for graph processing code in build.py."""
 
+import os
 import sys
+import tempfile
 from typing import AbstractSet, Dict, Set, List
 
+from mypy import build
+from mypy.test.config import PREFIX
 from mypy.test.helpers import assert_equal, Suite
 from mypy.build import BuildManager, State, BuildSourceSet
-from mypy.modulefinder import SearchPaths
+from mypy.modulefinder import BuildSource, SearchPaths
 from mypy.build import topsort, strongly_connected_components, sorted_components, order_ascc
 from mypy.version import __version__
 from mypy.options import Options
@@ -83,3 +87,88 @@ class GraphSuite(Suite):
         ascc = res[0]
         scc = order_ascc(graph, ascc)
         assert_equal(scc, ['d', 'c', 'b', 'a'])
+
+    def test_parallel_sqlite_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # The coordinator processes a again while a worker is still busy with
+            # the larger module c, and the chain c <- d <- e is processed after that.
+            big = ''.join('def f{0}(x: int) -> int:\n    return x + {0}\n'.format(i)
+                          for i in range(200))
+            modules = [('main', 'import a, b, e\n'), ('a', "x: int = ''\n"),
+                       ('b', 'import a\n'), ('c', big), ('d', 'import c\n'),
+                       ('e', 'import d\n')]
+            for module, text in modules:
+                with open(os.path.join(tmpdir, module + '.py'), 'w') as f:
+                    f.write(text)
+            sources = [BuildSource(os.path.join(tmpdir, module + '.py'), module, None)
+                       for module, _ in modules]
+            options = Options()
+            options.use_builtins_fixtures = True
+            options.jobs = 2
+            options.sqlite_cache = True
+            options.cache_dir = os.path.join(tmpdir, 'cache')
+            lib_path = os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub')
+            result = build.build(sources=sources, options=options, alt_lib_path=lib_path)
+            assert_equal(len(result.errors), 1)
+            # Only a is processed again, since b depends on it and it has an error.
+            # The workers neither wait for nor miss the cache writes of the coordinator.
+            assert_equal(result.manager.stats['sccs_redone'], 1)
+            assert_equal(result.manager.stats['sccs_in_workers'], 4)
+
+    def test_prefetch_source_hashes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sources = []
+            for module, text in [('a', 'import b\n'), ('b', 'x = 1\n')]:
+                path = os.path.join(tmpdir, module + '.py')
+                with open(path, 'w') as f:
+                    f.write(text)
+                sources.append(BuildSource(path, module, None))
+            options = Options()
+            options.use_builtins_fixtures = True
+            options.sqlite_cache = True
+            options.cache_dir = os.path.join(tmpdir, 'cache')
+            lib_path = os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub')
+
+            def run() -> build.BuildResult:
+                return build.build(sources=sources, options=options, alt_lib_path=lib_path)
+
+            run()
+            # Simulate a fresh checkout: contents are the same, but mtimes differ
+            for source in sources:
+                assert source.path
+                st = os.stat(source.path)
+                os.utime(source.path, (st.st_atime, st.st_mtime + 10))
+            result = run()
+            assert_equal(result.manager.stats['prefetch_hashed_files'], 2)
+            assert all(result.graph[module].is_fresh() for module in ('a', 'b'))
+            # The mtimes in the cache were updated
+            result = run()
+            assert_equal(result.manager.stats['prefetch_hashed_files'], 0)
+            assert all(result.graph[module].is_fresh() for module in ('a', 'b'))
+
+    def test_parse_pool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for module, text in [('a', 'import b\nimport c\n'), ('b', 'import d\n'),
+                                 ('c', 'x = 1\n'), ('d', 'y = 1\n')]:
+                with open(os.path.join(tmpdir, module + '.py'), 'w') as f:
+                    f.write(text)
+            sources = [BuildSource(os.path.join(tmpdir, 'a.py'), 'a', None)]
+            lib_path = os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub')
+
+            def run(follow_b: str) -> build.BuildResult:
+                options = Options()
+                options.use_builtins_fixtures = True
+                options.incremental = False
+                options.jobs = 2
+                options.mypy_path = [tmpdir]
+                options.per_module_options['b'] = {'follow_imports': follow_b}
+                return build.build(sources=sources, options=options, alt_lib_path=lib_path)
+
+            result = run('normal')
+            assert_equal(result.errors, [])
+            # The four modules and builtins
+            assert_equal(result.manager.stats['files_parsed_in_workers'], 5)
+            # Modules that aren't followed aren't parsed at all
+            result = run('skip')
+            assert 'b' not in result.graph and 'd' not in result.graph
+            assert_equal(result.manager.stats['files_parsed_in_workers'], 3)
@@ -0,0 +1,54 @@
+"""Test cases for the build timing report (--timing-report)."""
+
+import json
+import os
+import tempfile
+
+from mypy import build
+from mypy.modulefinder import BuildSource
+from mypy.options import Options
+from mypy.test.config import PREFIX
+from mypy.test.helpers import Suite, assert_equal
+from mypy.timing import (
+    TimingReport, PARSE_PHASE, SEMANAL_TOP_LEVEL_PHASE, SEMANAL_FUNCTIONS_PHASE,
+    TYPE_CHECK_PHASE, SCC_PHASE
+)
+
+
+class TimingReportSuite(Suite):
+    def test_module_summary_adds_up_events(self) -> None:
+        report = TimingReport(start_time=10.0)
+        report.add_events([(PARSE_PHASE, 'a', 10.5, 0.25, 0.25, 1),
+                           (TYPE_CHECK_PHASE, 'a', 11.0, 1.0, 0.5, 1),
+                           (TYPE_CHECK_PHASE, 'a', 12.0, 0.5, 0.5, 1),
+                           (SCC_PHASE, 'a', 10.5, 2.0, 1.25, 1)])
+        assert_equal(report.module_summary(),
+                     {'a': {PARSE_PHASE: {'wall': 0.25, 'cpu': 0.25},
+                            TYPE_CHECK_PHASE: {'wall': 1.5, 'cpu': 1.0}}})
+        events = report.to_json()['traceEvents']
+        assert_equal(len(events), 4)
+        assert_equal(events[1]['ts'], 1000000)
+        assert_equal(events[1]['dur'], 1000000)
+        assert_equal(events[1]['cat'], TYPE_CHECK_PHASE)
+        assert_equal(events[1]['args'], {'module': 'a', 'cpu_ms': 500.0})
+
+    def test_build_writes_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'timing.json')
+            options = Options()
+            options.incremental = False
+            options.use_builtins_fixtures = True
+            options.timing_report = path
+            result = build.build(sources=[BuildSource('m', 'm', 'def f() -> None: pass\n')],
+                                 options=options,
+                                 alt_lib_path=os.path.join(PREFIX, 'test-data', 'unit',
+                                                           'lib-stub'))
+            assert_equal(result.errors, [])
+            with open(path) as f:
+                data = json.load(f)
+        phases = data['modules']['m']
+        for phase in (PARSE_PHASE, SEMANAL_TOP_LEVEL_PHASE, SEMANAL_FUNCTIONS_PHASE,
+                      TYPE_CHECK_PHASE):
+            assert phase in phases, phase
+        assert any(event['cat'] == SCC_PHASE and event['args']['module'] == 'm'
+                   for event in data['traceEvents'])
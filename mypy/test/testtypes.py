@@ -1,11 +1,18 @@
 """Test cases for mypy types and type operations."""
 
+import os
 from typing import List, Tuple
+from unittest import mock
 
+import mypy.typeops
+from mypy.build import BuildSource, build
+from mypy.options import Options
+from mypy.test.config import PREFIX
 from mypy.test.helpers import Suite, assert_equal, assert_true, assert_false, assert_type, skip
 from mypy.erasetype import erase_type
 from mypy.expandtype import expand_type
 from mypy.join import join_types, join_simple
+from mypy.maptype import map_instance_to_supertype
 from mypy.meet import meet_types, narrow_declared_type
 from mypy.sametypes import is_same_type
 from mypy.indirection import TypeIndirectionVisitor
@@ -14,11 +21,14 @@ from mypy.types import (
     Overloaded, TypeType, UnionType, UninhabitedType, TypeVarId, TypeOfAny,
     LiteralType, get_proper_type
 )
-from mypy.nodes import ARG_POS, ARG_OPT, ARG_STAR, ARG_STAR2, CONTRAVARIANT, INVARIANT, COVARIANT
+from mypy.nodes import (
+    ARG_POS, ARG_OPT, ARG_STAR, ARG_STAR2, CONTRAVARIANT, INVARIANT, COVARIANT, FuncDef, Var
+)
 from mypy.subtypes import is_subtype, is_more_precise, is_proper_subtype
 from mypy.test.typefixture import TypeFixture, InterfaceTypeFixture
 from mypy.state import strict_optional_set
-from mypy.typeops import true_only, false_only
+from mypy.typeops import true_only, false_only, make_simplified_union
+from mypy.typestate import TypeState
 
 
 class TypesSuite(Suite):
@@ -126,6 +136,41 @@ class TypesSuite(Suite):
         modules = A.accept(visitor)
         assert modules == {'__main__', 'builtins'}
 
+    def test_shared_deserialized_instances(self) -> None:
+        i = Instance.deserialize('builtins.int')
+        assert Instance.deserialize('builtins.int') is i
+        TypeState.reset_all_subtype_caches()
+        assert Instance.deserialize('builtins.int') is not i
+
+    def test_deserialized_instances_shared_within_module(self) -> None:
+        i = Instance.deserialize('builtins.int')
+        TypeState.reset_deserialized_instances()
+        assert Instance.deserialize('builtins.int') is not i
+        i = Instance.deserialize('builtins.int')
+        TypeState.reset_shared_instances()
+        assert Instance.deserialize('builtins.int') is not i
+
+    def test_analyzed_instances_not_shared(self) -> None:
+        # Types in annotations record where they appear, so that errors about
+        # them are reported at the right place.
+        options = Options()
+        options.use_builtins_fixtures = True
+        options.incremental = False
+        source = 'x: int = 1\ndef f(a: int,  b: int = None) -> int: pass\n'
+        lib_path = os.path.join(PREFIX, 'test-data', 'unit', 'lib-stub')
+        result = build([BuildSource('main', '__main__', source)], options,
+                       alt_lib_path=lib_path)
+        assert_equal(result.errors, [])
+        x = result.files['__main__'].names['x'].node
+        f = result.files['__main__'].names['f'].node
+        assert isinstance(x, Var) and isinstance(f, FuncDef)
+        assert isinstance(x.type, Instance) and isinstance(f.type, CallableType)
+        a, b = f.type.arg_types
+        assert isinstance(b, UnionType)
+        positions = [(t.line, t.column) for t in [x.type, a, b, b.items[0], f.type.ret_type]]
+        assert_equal(positions, [(1, 3), (2, 9), (2, 18), (2, 18), (2, 33)])
+        assert x.type is not a and a is not b.items[0]
+
 
 class TypeOpsSuite(Suite):
     def setUp(self) -> None:
@@ -156,6 +201,13 @@ class TypeOpsSuite(Suite):
     def test_expand_basic_generic_types(self) -> None:
         self.assert_expand(self.fx.gt, [(self.fx.t.id, self.fx.a)], self.fx.ga)
 
+    def test_expand_without_type_vars_returns_same_type(self) -> None:
+        fx = self.fx
+        env = {fx.t.id: fx.a}
+        for t in (fx.a, fx.ga, Instance(fx.gi, [fx.ga])):
+            assert expand_type(t, env) is t
+        assert expand_type(Instance(fx.gi, [fx.t]), env) == fx.ga
+
     # IDEA: Add test cases for
     #   tuple types
     #   callable types
@@ -175,6 +227,20 @@ class TypeOpsSuite(Suite):
         # Remove erased tags (asterisks).
         assert_equal(str(exp).replace('*', ''), str(result))
 
+    # map_instance_to_supertype
+
+    def test_map_instance_to_supertype(self) -> None:
+        fx = self.fx
+        assert_equal(map_instance_to_supertype(fx.gsab, fx.gi), fx.gb)
+        assert_equal(map_instance_to_supertype(fx.gsba, fx.gi), fx.ga)
+        assert_equal(map_instance_to_supertype(fx.gsab, fx.oi), fx.o)
+        assert_equal(str(map_instance_to_supertype(fx.gsab, fx.hi)), 'H[Any, Any]')
+        # The mapping through the bases is cached per class until the caches are reset.
+        assert_equal(str(TypeState.supertype_template(fx.gsi, fx.gi)), 'G[S`2]')
+        TypeState.reset_all_subtype_caches_for(fx.gsi)
+        assert TypeState.supertype_template(fx.gsi, fx.gi) is None
+        assert_equal(map_instance_to_supertype(fx.gsab, fx.gi), fx.gb)
+
     # erase_type
 
     def test_trivial_erase(self) -> None:
@@ -451,6 +517,47 @@ class TypeOpsSuite(Suite):
             assert_true(fo.items[0].can_be_false)
             assert_true(fo.items[1] is tup_type)
 
+    def test_simplified_union(self) -> None:
+        fx = self.fx
+        self.assert_simplified_union([fx.a, fx.b], fx.a)
+        self.assert_simplified_union([fx.b, fx.a, fx.b], fx.a)
+        self.assert_simplified_union([fx.a, fx.d], UnionType([fx.a, fx.d]))
+        self.assert_simplified_union([fx.ga, fx.gb, fx.gsab], UnionType([fx.ga, fx.gb]))
+        self.assert_simplified_union([fx.anyt, fx.a], UnionType([fx.anyt, fx.a]))
+
+    def test_simplified_large_union(self) -> None:
+        fx = self.fx
+        literals = [LiteralType(i, fx.d) for i in range(10)]  # type: List[Type]
+        self.assert_simplified_union(literals + literals, UnionType(literals))
+        self.assert_simplified_union(literals + [fx.d], fx.d)
+        self.assert_simplified_union(literals + [fx.gsab, fx.uninhabited, fx.o], fx.o)
+        self.assert_simplified_union(literals + [fx.ga, fx.gb, fx.gsab, fx.b, fx.a],
+                                     UnionType(literals + [fx.ga, fx.gb, fx.a]))
+        # Items of other kinds are compared with all items.
+        tup = self.tuple(fx.a)
+        self.assert_simplified_union(literals + [self.tuple(fx.b), tup, fx.anyt],
+                                     UnionType(literals + [tup, fx.anyt]))
+        # The results are memoized by the identities of the items.
+        items = literals + [fx.c, fx.b]
+        first = make_simplified_union(items)
+        with mock.patch('mypy.typeops._simplify_union_items',
+                        wraps=mypy.typeops._simplify_union_items) as simplify:
+            second = make_simplified_union(list(items))
+            assert_equal(simplify.call_count, 0)
+            assert isinstance(first, UnionType) and isinstance(second, UnionType)
+            assert all(x is y for x, y in zip(first.items, second.items))
+            # Equal items that aren't the same objects aren't found in the memo.
+            third = make_simplified_union(literals + [Instance(fx.c.type, []), fx.b])
+            assert_equal(simplify.call_count, 1)
+            assert_equal(third, first)
+            # Neither are different items.
+            make_simplified_union(literals + [fx.c, fx.a])
+            assert_equal(simplify.call_count, 2)
+
+    def assert_simplified_union(self, original: List[Type], union: Type) -> None:
+        assert_equal(make_simplified_union(original), union)
+        assert_equal(make_simplified_union(list(reversed(original))), union)
+
     # Helpers
 
     def tuple(self, *a: Type) -> TupleType:
@@ -483,6 +590,16 @@ class JoinSuite(Suite):
         for simple in self.fx.a, self.fx.o, self.fx.b:
             self.assert_join(simple, simple, simple)
 
+    def test_join_with_same_type(self) -> None:
+        assert join_types(self.fx.a, self.fx.a) is self.fx.a
+        assert meet_types(self.fx.a, self.fx.a) is self.fx.a
+        # The last known value isn't kept, even if both types are the same object.
+        lit = LiteralType(1, self.fx.a)
+        a = self.fx.a.copy_modified(last_known_value=lit)
+        for result in join_types(a, a), meet_types(a, a):
+            assert isinstance(result, Instance)
+            assert_equal(result.last_known_value, None)
+
     def test_class_subtyping(self) -> None:
         self.assert_join(self.fx.a, self.fx.o, self.fx.o)
         self.assert_join(self.fx.b, self.fx.o, self.fx.o)
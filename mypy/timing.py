@@ -0,0 +1,98 @@
+"""Per-module, per-phase timing of builds (see --timing-report).
+
+The report is written in the Chrome trace event format, so it can be
+viewed in chrome://tracing or https://ui.perfetto.dev. Besides the
+trace events, the report has a 'modules' section with total wall clock
+and CPU times per module and phase, which is easier to process with
+scripts.
+"""
+
+import contextlib
+import json
+import os
+import time
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from typing_extensions import Final
+
+# Phases of processing a module. SCC_PHASE covers all phases for all modules of
+# an SCC processed from source.
+PARSE_PHASE = 'parse'  # type: Final
+SEMANAL_TOP_LEVEL_PHASE = 'semanal top levels'  # type: Final
+SEMANAL_FUNCTIONS_PHASE = 'semanal functions'  # type: Final
+SEMANAL_TYPE_ARGS_PHASE = 'semanal type arguments'  # type: Final
+SEMANAL_CLASS_PROPERTIES_PHASE = 'semanal class properties'  # type: Final
+TYPE_CHECK_PHASE = 'type check'  # type: Final
+TYPE_CHECK_DEFERRED_PHASE = 'type check deferred'  # type: Final
+FINISH_PASSES_PHASE = 'finish passes'  # type: Final
+WRITE_CACHE_PHASE = 'write cache'  # type: Final
+LOAD_CACHE_PHASE = 'load cache'  # type: Final
+SCC_PHASE = 'SCC'  # type: Final
+
+# (phase, name of module or SCC, start time, wall clock time, CPU time, process id)
+TimingEvent = Tuple[str, str, float, float, float, int]
+
+
+class TimingReport:
+    """Collect wall clock and CPU times of build phases."""
+
+    def __init__(self, start_time: Optional[float] = None) -> None:
+        self.start_time = time.time() if start_time is None else start_time
+        self.events = []  # type: List[TimingEvent]
+
+    @contextlib.contextmanager
+    def record(self, phase: str, name: str) -> Iterator[None]:
+        """Record the time spent in the body of the with statement.
+
+        Times spent in the same phase for the same module are added up
+        in the summary, so this can be used for each iteration of a loop
+        that processes the module multiple times.
+        """
+        t0 = time.time()
+        c0 = time.process_time()
+        try:
+            yield
+        finally:
+            self.events.append((phase, name, t0, time.time() - t0,
+                                time.process_time() - c0, os.getpid()))
+
+    def add_events(self, events: List[TimingEvent]) -> None:
+        """Add events recorded by another process (such as a --jobs worker)."""
+        self.events.extend(events)
+
+    def module_summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return total times as {module: {phase: {'wall': seconds, 'cpu': seconds}}}."""
+        summary = {}  # type: Dict[str, Dict[str, Dict[str, float]]]
+        for phase, name, _, wall, cpu, _ in self.events:
+            if phase == SCC_PHASE:
+                continue
+            times = summary.setdefault(name, {}).setdefault(phase, {'wall': 0.0, 'cpu': 0.0})
+            times['wall'] += wall
+            times['cpu'] += cpu
+        return summary
+
+    def to_json(self) -> Dict[str, Any]:
+        trace_events = []
+        for phase, name, start, wall, cpu, pid in self.events:
+            trace_events.append({
+                'name': '{} {}'.format(phase, name),
+                'cat': phase,
+                'ph': 'X',
+                'ts': round((start - self.start_time) * 1e6),
+                'dur': round(wall * 1e6),
+                'pid': pid,
+                'tid': pid,
+                'args': {'module': name, 'cpu_ms': round(cpu * 1000, 3)},
+            })
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+            'modules': self.module_summary(),
+        }
+
+    def write(self, path: str) -> None:
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, indent=1, sort_keys=True)
@@ -5,8 +5,8 @@ NOTE: These must not be accessed from mypy.nodes or mypy.types to avoid import
       since these may assume that MROs are ready.
 """
 
-from typing import cast, Optional, List, Sequence, Set, Iterable, TypeVar
-from typing_extensions import Type as TypingType
+from typing import cast, Dict, Optional, List, Sequence, Set, Iterable, TypeVar
+from typing_extensions import Final, Type as TypingType
 import sys
 
 from mypy.types import (
@@ -24,9 +24,14 @@ from mypy.expandtype import expand_type_by_instance, expand_type
 from mypy.sharedparse import argument_elide_name
 
 from mypy.typevars import fill_typevars
+from mypy.typestate import TypeState
 
 from mypy import state
 
+# Unions with at least this many items are simplified by only comparing items
+# that can be related (see make_simplified_union), and the results are memoized.
+BUCKETED_UNION_SIZE = 8  # type: Final
+
 
 def is_recursive_pair(s: Type, t: Type) -> bool:
     """Is this a pair of recursive type aliases?"""
@@ -343,41 +348,127 @@ def make_simplified_union(items: Sequence[Type],
                 all_items.append(typ)
         items = all_items
 
+    if len(items) < BUCKETED_UNION_SIZE:
+        simplified_set = _simplify_union_items(items, None, keep_erased)
+    else:
+        original = tuple(items)
+        key = (keep_erased, state.strict_optional) + tuple(id(item) for item in original)
+        cached = TypeState.simplified_union(key)
+        if cached is None:
+            simplified_set = _simplify_union_items(items, _union_subtype_candidates(items),
+                                                   keep_erased)
+            TypeState.record_simplified_union(key, original, simplified_set)
+        else:
+            simplified_set = list(cached)
+    return UnionType.make_union(simplified_set, line, column)
+
+
+def _simplify_union_items(items: List[ProperType],
+                          candidates: Optional[List[List[int]]],
+                          keep_erased: bool) -> List[ProperType]:
+    """Remove union items that are proper subtypes of other items.
+
+    If candidates is given, only the items at the indices in candidates[i]
+    can be proper subtypes of items[i]. Otherwise, all pairs are compared.
+    """
     from mypy.subtypes import is_proper_subtype
 
     removed = set()  # type: Set[int]
+    everything = range(len(items))
+    for i, ti in enumerate(items):
+        if i in removed: continue
+        # Keep track of the truishness info for deleted subtypes which can be relevant
+        cbt = cbf = False
+        for j in (everything if candidates is None else candidates[i]):
+            tj = items[j]
+            if (j in removed
+                    and (ti.can_be_true or not tj.can_be_true)
+                    and (ti.can_be_false or not tj.can_be_false)):
+                # Already removed, and it can't affect the truthiness of ti.
+                continue
+            if i != j and is_proper_subtype(tj, ti, keep_erased_types=keep_erased):
+                # We found a redundant item in the union.
+                removed.add(j)
+                cbt = cbt or tj.can_be_true
+                cbf = cbf or tj.can_be_false
+        # if deleted subtypes had more general truthiness, use that
+        if not ti.can_be_true and cbt:
+            items[i] = true_or_false(ti)
+        elif not ti.can_be_false and cbf:
+            items[i] = true_or_false(ti)
+
+    return [items[i] for i in everything if i not in removed]
+
+
+def _union_subtype_candidates(items: List[ProperType]) -> List[List[int]]:
+    """Find the union items that can be proper subtypes of each item.
+
+    An instance or a literal type can only be a proper subtype of an instance
+    of a class in its MRO (or in the MRO of a type it's promoted to), or of
+    an equal literal type, unless the other item is a protocol. It's never a
+    proper subtype of an uninhabited type. Other kinds of items are compared
+    with all items. Return the candidate indices for each item; this avoids
+    comparing all pairs of items in large unions.
+    """
+    # Indices of instances and literals by the TypeInfos of their possible supertypes
+    by_supertype = {}  # type: Dict[TypeInfo, List[int]]
+    # Indices of literals by value
+    by_literal = {}  # type: Dict[LiteralType, List[int]]
+    # Indices of other items, which are compared with all items
+    others = []  # type: List[int]
+    supertype_infos = {}  # type: Dict[TypeInfo, Optional[Set[TypeInfo]]]
+    for j, tj in enumerate(items):
+        infos = None  # type: Optional[Set[TypeInfo]]
+        if isinstance(tj, LiteralType):
+            by_literal.setdefault(tj, []).append(j)
+            infos = _possible_supertype_infos(tj.fallback.type, supertype_infos)
+        elif isinstance(tj, Instance):
+            infos = _possible_supertype_infos(tj.type, supertype_infos)
+        if infos is None:
+            others.append(j)
+        else:
+            for info in infos:
+                by_supertype.setdefault(info, []).append(j)
+
+    everything = list(range(len(items)))
+    candidates = []  # type: List[List[int]]
+    for ti in items:
+        if isinstance(ti, LiteralType):
+            candidates.append(by_literal[ti] + others)
+        elif isinstance(ti, UninhabitedType):
+            candidates.append(others)
+        elif isinstance(ti, Instance) and not ti.type.is_protocol:
+            candidates.append(by_supertype.get(ti.type, []) + others)
+        else:
+            candidates.append(everything)
+    return candidates
 
-    # Avoid slow nested for loop for Union of Literal of strings (issue #9169)
-    if all((isinstance(item, LiteralType) and
-            item.fallback.type.fullname == 'builtins.str')
-           for item in items):
-        seen = set()    # type: Set[str]
-        for index, item in enumerate(items):
-            assert isinstance(item, LiteralType)
-            assert isinstance(item.value, str)
-            if item.value in seen:
-                removed.add(index)
-            seen.add(item.value)
 
-    else:
-        for i, ti in enumerate(items):
-            if i in removed: continue
-            # Keep track of the truishness info for deleted subtypes which can be relevant
-            cbt = cbf = False
-            for j, tj in enumerate(items):
-                if i != j and is_proper_subtype(tj, ti, keep_erased_types=keep_erased):
-                    # We found a redundant item in the union.
-                    removed.add(j)
-                    cbt = cbt or tj.can_be_true
-                    cbf = cbf or tj.can_be_false
-            # if deleted subtypes had more general truthiness, use that
-            if not ti.can_be_true and cbt:
-                items[i] = true_or_false(ti)
-            elif not ti.can_be_false and cbf:
-                items[i] = true_or_false(ti)
-
-    simplified_set = [items[i] for i in range(len(items)) if i not in removed]
-    return UnionType.make_union(simplified_set, line, column)
+def _possible_supertype_infos(info: TypeInfo,
+                              cache: Dict[TypeInfo, Optional[Set[TypeInfo]]]
+                              ) -> Optional[Set[TypeInfo]]:
+    """Return the classes of the instances that an instance of info can be a proper
+    subtype of (ignoring protocols), including through type promotions.
+
+    Return None if these can't be determined from the MROs.
+    """
+    if info in cache:
+        return cache[info]
+    cache[info] = None  # In case of cycles through promotions
+    result = set(info.mro)
+    result.add(info)
+    for base in info.mro:
+        if base._promote is None:
+            continue
+        promote = get_proper_type(base._promote)
+        if not isinstance(promote, Instance):
+            return None
+        promoted = _possible_supertype_infos(promote.type, cache)
+        if promoted is None:
+            return None
+        result |= promoted
+    cache[info] = result
+    return result
 
 
 def get_type_special_method_bool_ret_type(t: Type) -> Optional[Type]:
@@ -474,6 +565,20 @@ def true_or_false(t: Type) -> ProperType:
     return new_t
 
 
+def is_own_join_and_meet(t: ProperType) -> bool:
+    """Are the join and the meet of t with itself always t?
+
+    This isn't true for all types, since joins and meets construct new types
+    that drop some details, such as the last known value of an instance.
+    """
+    if (t.can_be_true != t.can_be_true_default()
+            or t.can_be_false != t.can_be_false_default()):
+        return False
+    if isinstance(t, Instance):
+        return not t.args and not t.erased and t.last_known_value is None
+    return isinstance(t, (AnyType, NoneType, UninhabitedType, TypeVarType, LiteralType))
+
+
 def erase_def_to_union_or_bound(tdef: TypeVarLikeDef) -> Type:
     # TODO(shantanu): fix for ParamSpecDef
     assert isinstance(tdef, TypeVarDef)
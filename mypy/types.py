@@ -858,9 +858,8 @@ class Instance(ProperType):
     @classmethod
     def deserialize(cls, data: Union[JsonDict, str]) -> 'Instance':
         if isinstance(data, str):
-            inst = Instance(NOT_READY, [])
-            inst.type_ref = data
-            return inst
+            from mypy.typestate import TypeState  # Avoid import cycle
+            return TypeState.deserialized_instance(data)
         assert data['.class'] == 'Instance'
         args = []  # type: List[Type]
         if 'args' in data:
@@ -3,11 +3,16 @@ A shared state for all TypeInfos that holds global cache and dependency informat
 and potentially other mutable TypeInfo state. This module contains mutable global state.
 """
 
-from typing import Dict, Set, Tuple, Optional, List
+from typing import Dict, Set, Tuple, Optional, List, Iterable, Union
 from typing_extensions import ClassVar, Final
 
-from mypy.nodes import TypeInfo
-from mypy.types import Instance, TypeAliasType, get_proper_type, Type
+from mypy.nodes import TypeInfo, JsonDict
+from mypy.types import (
+    Instance, TypeAliasType, get_proper_type, Type, LiteralType, TupleType, TypedDictType,
+    ProperType, has_type_vars, NOT_READY
+)
+from mypy.type_visitor import TypeQuery
+from mypy.server.depmap import DependencyMap
 from mypy.server.trigger import make_trigger
 from mypy import state
 
@@ -22,6 +27,120 @@ SubtypeKind = Tuple[bool, ...]
 # subtype relationship
 SubtypeCache = Dict[TypeInfo, Dict[SubtypeKind, Set[SubtypeRelationship]]]
 
+# Supertype templates (see mypy.maptype) by supertype TypeInfo and subtype TypeInfo
+SupertypeTemplates = Dict[TypeInfo, Dict[TypeInfo, Instance]]
+
+# Simplified union items (see mypy.typeops.make_simplified_union) by the flags that affect
+# simplification and the ids of the items. The items are kept alive with the result, so that
+# their ids can't be reused.
+SimplifiedUnions = Dict[Tuple[object, ...], Tuple[Tuple[ProperType, ...], List[ProperType]]]
+
+# Limit the memory used by memoized union simplifications
+MAX_SIMPLIFIED_UNIONS = 10000  # type: Final
+
+# Indexes of the items selected in calls to overloaded functions, by a description of the
+# call (see ExpressionChecker.overload_call_cache_key)
+OverloadCallItems = Dict[Tuple[object, ...], int]
+
+# Limit the memory used by cached overload call items
+MAX_OVERLOAD_CALL_ITEMS = 10000  # type: Final
+
+# Limit the memory used by shared instances (see TypeState.deserialized_instance)
+MAX_SIMPLE_INSTANCES = 10000  # type: Final
+
+
+class PersistentSubtypeCache:
+    """Results of protocol subtype checks that are kept across runs.
+
+    Each entry maps a description of a check (the kind of check and the two
+    types) to its result, together with the modules that define the types
+    involved. Every module is paired with a hash of its interface and the
+    interfaces of everything it (transitively) depends on, since a protocol
+    check can look at any type reachable from the members of both types.
+    An entry is only used if none of these hashes changed.
+
+    The build manager registers the hashes of modules as their SCCs are
+    finished. Modules that are being processed have no hash yet, so checks
+    involving them are never looked up; new entries get their hashes when
+    the cache is serialized at the end of the build.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Tuple[bool, Dict[str, str]]]] = None) -> None:
+        # Entries loaded from the previous run
+        self.entries = entries or {}  # type: Dict[str, Tuple[bool, Dict[str, str]]]
+        # Entries recorded during this run, with the modules they depend on
+        self.new_entries = {}  # type: Dict[str, Tuple[bool, List[str]]]
+        # Module id -> hash of the module interface and its dependencies
+        self.module_hashes = {}  # type: Dict[str, str]
+        # Nesting level of protocol checks; only outermost checks are cached,
+        # since nested results may depend on assumptions made by outer ones.
+        self.depth = 0
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: str) -> Optional[bool]:
+        entry = self.entries.get(key)
+        if entry is not None and self.is_valid(entry[1]):
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def record(self, key: str, result: bool, modules: Iterable[str]) -> None:
+        self.new_entries[key] = (result, sorted(modules))
+
+    def is_valid(self, deps: Dict[str, str]) -> bool:
+        module_hashes = self.module_hashes
+        return all(module_hashes.get(module) == h for module, h in deps.items())
+
+    def serialize(self) -> JsonDict:
+        entries = {key: [result, deps] for key, (result, deps) in self.entries.items()
+                   if self.is_valid(deps)}
+        for key, (result, modules) in self.new_entries.items():
+            if all(module in self.module_hashes for module in modules):
+                entries[key] = [result, {module: self.module_hashes[module]
+                                         for module in modules}]
+        return {'entries': entries}
+
+    @classmethod
+    def deserialize(cls, data: JsonDict) -> 'PersistentSubtypeCache':
+        return PersistentSubtypeCache({key: (bool(result), deps)
+                                       for key, (result, deps) in data['entries'].items()})
+
+
+class TypeModulesQuery(TypeQuery[Set[str]]):
+    """Find the modules that define the classes used in a type."""
+
+    def __init__(self) -> None:
+        super().__init__(self.union)
+
+    @staticmethod
+    def union(modules: Iterable[Set[str]]) -> Set[str]:
+        result = set()  # type: Set[str]
+        for item in modules:
+            result.update(item)
+        return result
+
+    def visit_instance(self, t: Instance) -> Set[str]:
+        result = self.query_types(t.args)
+        result.add(t.type.module_name)
+        if t.last_known_value is not None:
+            result.update(self.query_types([t.last_known_value]))
+        return result
+
+    def visit_literal_type(self, t: LiteralType) -> Set[str]:
+        return t.fallback.accept(self)
+
+    def visit_tuple_type(self, t: TupleType) -> Set[str]:
+        result = self.query_types(t.items)
+        result.update(self.query_types([t.partial_fallback]))
+        return result
+
+    def visit_typeddict_type(self, t: TypedDictType) -> Set[str]:
+        result = self.query_types(t.items.values())
+        result.update(self.query_types([t.fallback]))
+        return result
+
 
 class TypeState:
     """This class provides subtype caching to improve performance of subtype checks.
@@ -40,6 +159,32 @@ class TypeState:
     # We need the caches, since subtype checks for structural types are very slow.
     _subtype_caches = {}  # type: Final[SubtypeCache]
 
+    # '_supertype_templates' keeps track of how instances of a class map to instances of
+    # a given superclass. The template for (supertype, subtype) is the supertype as an
+    # instance over the type variables of the subtype, so that mapping an instance to the
+    # supertype only needs a single type variable substitution. The templates depend on
+    # the bases of all classes in the MRO, so they are reset together with subtype caches.
+    _supertype_templates = {}  # type: Final[SupertypeTemplates]
+
+    # Results of simplifying large unions. Subtype checks between the items depend on MROs,
+    # so these are reset when any subtype caches are reset.
+    _simplified_unions = {}  # type: Final[SimplifiedUnions]
+
+    # The overload items matched by calls with given argument types. Whether an item
+    # matches depends on subtype checks, so these are reset with subtype caches as well.
+    _overload_call_items = {}  # type: Final[OverloadCallItems]
+
+    # Shared deserialized argument-less instances, such as 'builtins.int', so that a type
+    # that appears in many places in a cached module only needs to exist once. Besides
+    # saving memory, this lets identity checks in subtype checks, joins and meets succeed
+    # more often. Instances created by the type analyzer aren't shared, since they record
+    # the line and column of the annotation. Deserialized instances have no position,
+    # and callers must never modify them; use copy_modified() instead. They refer to
+    # their TypeInfo by name until they are fixed up, and they are only shared within a
+    # single module (see deserialized_instance()). Fine-grained updates replace TypeInfos,
+    # so these are reset before each update.
+    _deserialized_instances = {}  # type: Final[Dict[str, Instance]]
+
     # This contains protocol dependencies generated after running a full build,
     # or after an update. These dependencies are special because:
     #   * They are a global property of the program; i.e. some dependencies for imported
@@ -84,6 +229,11 @@ class TypeState:
     # Ditto for inference of generic constraints against recursive type aliases.
     _inferring = []  # type: Final[List[TypeAliasType]]
 
+    # Protocol subtype check results stored in the cache directory, if enabled
+    # (see --subtype-cache). This is set by the build manager for the duration
+    # of a build.
+    persistent_subtype_cache = None  # type: ClassVar[Optional[PersistentSubtypeCache]]
+
     # N.B: We do all of the accesses to these properties through
     # TypeState, instead of making these classmethods and accessing
     # via the cls parameter, since mypyc can optimize accesses to
@@ -109,12 +259,29 @@ class TypeState:
     def reset_all_subtype_caches() -> None:
         """Completely reset all known subtype caches."""
         TypeState._subtype_caches.clear()
+        TypeState._supertype_templates.clear()
+        TypeState._simplified_unions.clear()
+        TypeState._overload_call_items.clear()
+        TypeState.reset_shared_instances()
+
+    @staticmethod
+    def reset_shared_instances() -> None:
+        """Stop sharing the instances that have been shared so far."""
+        TypeState._deserialized_instances.clear()
+
+    @staticmethod
+    def reset_deserialized_instances() -> None:
+        TypeState._deserialized_instances.clear()
 
     @staticmethod
     def reset_subtype_caches_for(info: TypeInfo) -> None:
         """Reset subtype caches (if any) for a given supertype TypeInfo."""
         if info in TypeState._subtype_caches:
             TypeState._subtype_caches[info].clear()
+        if info in TypeState._supertype_templates:
+            TypeState._supertype_templates[info].clear()
+        TypeState._simplified_unions.clear()
+        TypeState._overload_call_items.clear()
 
     @staticmethod
     def reset_all_subtype_caches_for(info: TypeInfo) -> None:
@@ -122,6 +289,67 @@ class TypeState:
         for item in info.mro:
             TypeState.reset_subtype_caches_for(item)
 
+    @staticmethod
+    def supertype_template(left: TypeInfo, right: TypeInfo) -> Optional[Instance]:
+        templates = TypeState._supertype_templates.get(right)
+        if templates is None:
+            return None
+        return templates.get(left)
+
+    @staticmethod
+    def record_supertype_template(left: TypeInfo, right: TypeInfo, template: Instance) -> None:
+        TypeState._supertype_templates.setdefault(right, {})[left] = template
+
+    @staticmethod
+    def simplified_union(key: Tuple[object, ...]) -> Optional[List[ProperType]]:
+        if TypeState._assuming_proper:
+            # Subtype checks between recursive type aliases depend on the assumptions.
+            return None
+        cached = TypeState._simplified_unions.get(key)
+        return cached[1] if cached is not None else None
+
+    @staticmethod
+    def record_simplified_union(key: Tuple[object, ...], items: Tuple[ProperType, ...],
+                                simplified: List[ProperType]) -> None:
+        if TypeState._assuming_proper:
+            return
+        if len(TypeState._simplified_unions) >= MAX_SIMPLIFIED_UNIONS:
+            TypeState._simplified_unions.clear()
+        TypeState._simplified_unions[key] = (items, list(simplified))
+
+    @staticmethod
+    def overload_call_item(key: Tuple[object, ...]) -> Optional[int]:
+        if TypeState._assuming or TypeState._assuming_proper:
+            return None
+        return TypeState._overload_call_items.get(key)
+
+    @staticmethod
+    def record_overload_call_item(key: Tuple[object, ...], index: int) -> None:
+        if TypeState._assuming or TypeState._assuming_proper:
+            return
+        if len(TypeState._overload_call_items) >= MAX_OVERLOAD_CALL_ITEMS:
+            TypeState._overload_call_items.clear()
+        TypeState._overload_call_items[key] = index
+
+    @staticmethod
+    def deserialized_instance(type_ref: str) -> Instance:
+        """Return the shared argument-less instance deserialized from type_ref.
+
+        The instance is fixed up (see mypy.fixup) together with the module
+        that refers to it. Sharing is reset before each module is deserialized
+        (see reset_deserialized_instances()), since an instance that has been
+        fixed up can refer to a TypeInfo that is later replaced (or to a
+        placeholder for a missing TypeInfo).
+        """
+        instance = TypeState._deserialized_instances.get(type_ref)
+        if instance is None:
+            if len(TypeState._deserialized_instances) >= MAX_SIMPLE_INSTANCES:
+                TypeState._deserialized_instances.clear()
+            instance = Instance(NOT_READY, [])
+            instance.type_ref = type_ref
+            TypeState._deserialized_instances[type_ref] = instance
+        return instance
+
     @staticmethod
     def is_cached_subtype_check(kind: SubtypeKind, left: Instance, right: Instance) -> bool:
         info = right.type
@@ -139,6 +367,26 @@ class TypeState:
         cache = TypeState._subtype_caches.setdefault(right.type, dict())
         cache.setdefault((state.strict_optional,) + kind, set()).add((left, right))
 
+    @staticmethod
+    def persistent_cache_key(left: Instance, right: Instance,
+                             proper_subtype: bool) -> Optional[str]:
+        """Describe a protocol check for the persistent subtype cache.
+
+        Return None if the result of the check can't be cached. The result
+        depends on type variable bounds, which aren't part of the description.
+        """
+        if TypeState._assuming or TypeState._assuming_proper:
+            return None
+        if has_type_vars(left) or has_type_vars(right):
+            return None
+        return '{}{} {} <: {}'.format(int(proper_subtype), int(state.strict_optional),
+                                      left, right)
+
+    @staticmethod
+    def type_modules(left: Instance, right: Instance) -> Set[str]:
+        """Return the modules that define classes used in left or right."""
+        return TypeModulesQuery().query_types([left, right])
+
     @staticmethod
     def reset_protocol_deps() -> None:
         """Reset dependencies after a full run or before a daemon shutdown."""
@@ -213,7 +461,7 @@ class TypeState:
         return deps
 
     @staticmethod
-    def update_protocol_deps(second_map: Optional[Dict[str, Set[str]]] = None) -> None:
+    def update_protocol_deps(second_map: Optional[DependencyMap] = None) -> None:
         """Update global protocol dependency map.
 
         We update the global map incrementally, using a snapshot only from recently
@@ -226,14 +474,13 @@ class TypeState:
         for trigger, targets in new_deps.items():
             TypeState.proto_deps.setdefault(trigger, set()).update(targets)
         if second_map is not None:
-            for trigger, targets in new_deps.items():
-                second_map.setdefault(trigger, set()).update(targets)
+            second_map.update(new_deps)
         TypeState._rechecked_types.clear()
         TypeState._attempted_protocols.clear()
         TypeState._checked_against_members.clear()
 
     @staticmethod
-    def add_all_protocol_deps(deps: Dict[str, Set[str]]) -> None:
+    def add_all_protocol_deps(deps: Union[Dict[str, Set[str]], DependencyMap]) -> None:
         """Add all known protocol dependencies to deps.
 
         This is used by tests and debug output, and also when collecting
@@ -241,6 +488,9 @@ class TypeState:
         """
         TypeState.update_protocol_deps()  # just in case
         if TypeState.proto_deps is not None:
+            if isinstance(deps, DependencyMap):
+                deps.update(TypeState.proto_deps)
+                return
             for trigger, targets in TypeState.proto_deps.items():
                 deps.setdefault(trigger, set()).update(targets)
 
@@ -253,3 +503,4 @@ def reset_global_state() -> None:
     """
     TypeState.reset_all_subtype_caches()
     TypeState.reset_protocol_deps()
+    TypeState.persistent_subtype_cache = None
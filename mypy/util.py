@@ -393,9 +393,18 @@ def check_python_version(program: str) -> None:
 
 def count_stats(errors: List[str]) -> Tuple[int, int]:
     """Count total number of errors and files in error list."""
-    errors = [e for e in errors if ': error:' in e]
-    files = {e.split(':')[0] for e in errors}
-    return len(errors), len(files)
+    counts = count_errors_by_file(errors)
+    return sum(counts.values()), len(counts)
+
+
+def count_errors_by_file(errors: List[str]) -> Dict[str, int]:
+    """Count the number of errors in each file in error list."""
+    counts = {}  # type: Dict[str, int]
+    for e in errors:
+        if ': error:' in e:
+            file = e.split(':')[0]
+            counts[file] = counts.get(file, 0) + 1
+    return counts
 
 
 def split_words(msg: str) -> List[str]:
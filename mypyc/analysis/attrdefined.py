@@ -0,0 +1,216 @@
+"""Analysis of always defined attributes of native classes.
+
+An attribute is always defined if every instance of a class gets a
+value for it before code other than __init__ can access the instance.
+Reading such an attribute can't fail, and assigning it doesn't need
+to check the old value. Instances created using C.__new__(C) are an
+exception, so the generated C still does a cheap check (see
+mypyc.codegen.emitfunc).
+
+Attributes get values from defaults in the class body (which are
+assigned before __init__ is called) and from __init__. An attribute
+assigned in __init__ is always defined only if it's assigned on all
+paths before self escapes, i.e. before self is passed to a function
+(including a method of self), stored somewhere or returned. It also
+must not be read in __init__ before it's assigned, and it can't be
+deleted by compiled code (including through an object or Any reference).
+Calling a base class __init__ only lets self escape if the base class
+__init__ does so.
+
+An attribute is always defined for a class if it's always defined for
+all its subclasses as well, so all subclasses must be known and compiled
+together. Attributes of classes that allow interpreted subclasses are
+never always defined.
+"""
+
+from typing import Dict, List, Set, Optional
+
+from mypyc.analysis.dataflow import get_cfg
+from mypyc.ir.class_ir import ClassIR
+from mypyc.ir.func_ir import FuncIR
+from mypyc.ir.ops import (
+    BasicBlock, Value, Op, Call, GetAttr, SetAttr, Return, ERR_NEVER
+)
+
+
+def analyze_always_defined_attrs(class_irs: List[ClassIR]) -> None:
+    """Calculate always defined attributes of classes compiled together.
+
+    The results are stored in the class IRs.
+    """
+    classes = set(class_irs)
+    defined = {}  # type: Dict[ClassIR, Set[str]]
+    # Process base classes before derived classes, since the analysis
+    # of __init__ uses the results for base class __init__ methods.
+    for cl in sorted(class_irs, key=lambda c: len(c.mro)):
+        if not can_have_always_defined_attrs(cl):
+            continue
+        analyze_init(cl)
+        defined[cl] = (find_default_attrs(cl) | cl.init_defined_attrs) - find_deleted_attrs(cl)
+
+    for cl in class_irs:
+        subclasses = cl.subclasses()
+        if cl not in defined or subclasses is None:
+            continue
+        attrs = set(cl.attributes) & defined[cl]
+        for sub in subclasses:
+            if sub not in classes or sub not in defined:
+                attrs = set()
+                break
+            attrs &= defined[sub]
+        cl.always_defined_attrs = attrs
+
+
+def can_have_always_defined_attrs(cl: ClassIR) -> bool:
+    return (cl.is_ext_class
+            and not cl.is_trait
+            and not cl.is_augmented
+            and not cl.inherits_python
+            and not cl.allow_interpreted_subclasses
+            and cl.builtin_base is None)
+
+
+def find_default_attrs(cl: ClassIR) -> Set[str]:
+    """Find attributes that are assigned default values when an instance is created."""
+    attrs = set()  # type: Set[str]
+    defaults = cl.get_method('__mypyc_defaults_setup')
+    if defaults is not None:
+        for block in defaults.blocks:
+            for op in block.ops:
+                if isinstance(op, SetAttr):
+                    attrs.add(op.attr)
+    return attrs
+
+
+def find_deleted_attrs(cl: ClassIR) -> Set[str]:
+    attrs = set()  # type: Set[str]
+    for base in cl.mro:
+        attrs |= base.deleted_attrs
+    return attrs
+
+
+def analyze_init(cl: ClassIR) -> None:
+    """Find attributes assigned in __init__ before self escapes.
+
+    Also find whether self can escape from __init__.
+    """
+    init = cl.methods.get('__init__')
+    if init is None:
+        base = cl.real_base()
+        if base is None or base.is_trait:
+            # The default object.__init__ doesn't do anything.
+            cl.init_defined_attrs = set()
+            cl.init_self_leak = False
+        else:
+            cl.init_defined_attrs = set(base.init_defined_attrs)
+            cl.init_self_leak = base.init_self_leak
+        return
+    if not init.blocks:
+        # Only the signature is available.
+        return
+
+    self_reg = next(iter(init.env.regs()))
+    cfg = get_cfg(init.blocks)
+    # Attributes assigned on all paths to the start of each block
+    before = {init.blocks[0]: set()}  # type: Dict[BasicBlock, Set[str]]
+    worklist = [init.blocks[0]]
+    while worklist:
+        block = worklist.pop()
+        defined = set(before[block])
+        for op in block.ops:
+            defined |= init_op_defines(cl, op, self_reg)
+        for succ in cfg.succ[block]:
+            if succ in before:
+                new = before[succ] & defined
+                if new == before[succ]:
+                    continue
+                before[succ] = new
+            else:
+                before[succ] = defined
+            worklist.append(succ)
+
+    # The attributes defined when self escapes or __init__ returns
+    states = []  # type: List[Set[str]]
+    read_undefined = set()  # type: Set[str]
+    escapes = False
+    for block in init.blocks:
+        if block not in before:
+            continue
+        defined = set(before[block])
+        for op in block.ops:
+            if isinstance(op, GetAttr) and op.obj is self_reg and not cl.get_method(op.attr):
+                if op.attr not in defined:
+                    read_undefined.add(op.attr)
+            elif isinstance(op, Return):
+                states.append(defined)
+            else:
+                escaped = init_op_escape_state(cl, op, self_reg, defined)
+                if escaped is not None:
+                    states.append(escaped)
+                    escapes = True
+            defined = defined | init_op_defines(cl, op, self_reg)
+    if states:
+        cl.init_defined_attrs = set.intersection(*states) - read_undefined
+    else:
+        cl.init_defined_attrs = set()
+    cl.init_self_leak = escapes
+
+
+def get_base_init(cl: ClassIR, op: Op, self_reg: Value) -> Optional[ClassIR]:
+    """If op calls a base class __init__ with self, return the base class."""
+    if (isinstance(op, Call) and op.fn.name == '__init__' and op.args
+            and op.args[0] is self_reg and self_reg not in op.args[1:]):
+        for base in cl.mro[1:]:
+            init = base.methods.get('__init__')
+            if init is not None and init.decl is op.fn:
+                return base
+    return None
+
+
+def init_op_defines(cl: ClassIR, op: Op, self_reg: Value) -> Set[str]:
+    if isinstance(op, SetAttr) and op.obj is self_reg and not cl.get_method(op.attr):
+        return {op.attr}
+    base = get_base_init(cl, op, self_reg)
+    if base is not None:
+        return base.init_defined_attrs
+    return set()
+
+
+def init_op_escape_state(cl: ClassIR,
+                         op: Op,
+                         self_reg: Value,
+                         defined: Set[str]) -> Optional[Set[str]]:
+    """If self escapes in an op, return the attributes that are defined at that point."""
+    base = get_base_init(cl, op, self_reg)
+    if base is not None:
+        # Base class attributes are defined before self escapes from the base __init__.
+        return defined | base.init_defined_attrs if base.init_self_leak else None
+    if self_reg not in op.sources():
+        return None
+    if isinstance(op, (GetAttr, SetAttr)) and not cl.get_method(op.attr):
+        if isinstance(op, GetAttr) or op.src is not self_reg:
+            return None
+    return defined
+
+
+def mark_always_defined_attr_ops(fn: FuncIR) -> None:
+    """Mark accesses to always defined attributes so that they skip checks.
+
+    Reads of these attributes can't fail. Assignments outside __init__
+    (and attribute defaults) always replace an existing value.
+    """
+    in_init = fn.class_name is not None and fn.name in ('__init__', '__mypyc_defaults_setup')
+    for block in fn.blocks:
+        for op in block.ops:
+            if isinstance(op, (GetAttr, SetAttr)):
+                cl = op.class_type.class_ir
+                if cl.get_method(op.attr):
+                    # Property
+                    continue
+                _, decl_cl = cl.attr_details(op.attr)
+                if op.attr not in decl_cl.always_defined_attrs:
+                    continue
+                if isinstance(op, GetAttr):
+                    op.error_kind = ERR_NEVER
+                elif not in_init:
+                    op.old_value_defined = True
@@ -1,10 +1,14 @@
 """Data-flow analyses."""
 
 from abc import abstractmethod
+import bisect
 import functools
+import heapq
 
 from typing import Dict, Tuple, List, Set, TypeVar, Iterator, Generic, Optional, Iterable, Union
+from typing_extensions import Final
 
+from mypyc.common import MAX_LITERAL_SHORT_INT
 from mypyc.ir.ops import (
     Value, ControlOp, Op,
     Register,
@@ -12,7 +16,11 @@ from mypyc.ir.ops import (
     Environment, Box, Unbox, Cast, Op, Unreachable, TupleGet, TupleSet, GetAttr, SetAttr,
     LoadStatic, InitStatic, MethodCall, RaiseStandardError, CallC, LoadGlobal,
     Truncate, BinaryIntOp, LoadMem, GetElementPtr, LoadAddress, ComparisonOp, SetMem,
-    int_rprimitive, short_int_rprimitive,
+    AssignMulti, KeepAlive
+)
+from mypyc.ir.rtypes import (
+    RType, is_int_rprimitive, is_short_int_rprimitive, is_int32_rprimitive, is_int64_rprimitive,
+    is_c_py_ssize_t_rprimitive, is_bit_rprimitive, is_bool_rprimitive
 )
 
 
@@ -125,6 +133,63 @@ def cleanup_cfg(blocks: List[BasicBlock]) -> None:
                 changed = True
 
 
+def get_dominators(blocks: List[BasicBlock], cfg: CFG) -> Dict[BasicBlock, Set[BasicBlock]]:
+    """Calculate the dominators of each block reachable from the entry point.
+
+    Block A dominates block B if every path from the entry point to B
+    goes through A. Every block dominates itself.
+    """
+    entry = blocks[0]
+    reachable = {entry}
+    stack = [entry]
+    while stack:
+        block = stack.pop()
+        for succ in cfg.succ[block]:
+            if succ not in reachable:
+                reachable.add(succ)
+                stack.append(succ)
+
+    dominators = {block: reachable for block in blocks if block in reachable}
+    dominators[entry] = {entry}
+    changed = True
+    while changed:
+        changed = False
+        for block in blocks:
+            if block is entry or block not in reachable:
+                continue
+            preds = [dominators[pred] for pred in cfg.pred[block] if pred in reachable]
+            new = set.intersection(*preds) | {block}
+            if new != dominators[block]:
+                dominators[block] = new
+                changed = True
+    return dominators
+
+
+def get_natural_loops(blocks: List[BasicBlock],
+                      cfg: CFG) -> Dict[BasicBlock, Set[BasicBlock]]:
+    """Find natural loops in the CFG.
+
+    Return a map from each loop header to the blocks in the loop. A back
+    edge is an edge to a block that dominates the source of the edge,
+    and the loop of a back edge consists of the header and the blocks
+    that can reach the source of the edge without going through the
+    header. Loops with the same header are merged.
+    """
+    dominators = get_dominators(blocks, cfg)
+    loops = {}  # type: Dict[BasicBlock, Set[BasicBlock]]
+    for block in blocks:
+        for succ in cfg.succ[block]:
+            if succ in dominators.get(block, ()):
+                body = loops.setdefault(succ, {succ})
+                stack = [block]
+                while stack:
+                    item = stack.pop()
+                    if item not in body:
+                        body.add(item)
+                        stack.extend(cfg.pred[item])
+    return loops
+
+
 T = TypeVar('T')
 
 AnalysisDict = Dict[Tuple[BasicBlock, int], Set[T]]
@@ -154,6 +219,10 @@ class BaseAnalysisVisitor(OpVisitor[GenAndKill]):
     def visit_assign(self, op: Assign) -> GenAndKill:
         raise NotImplementedError
 
+    @abstractmethod
+    def visit_assign_multi(self, op: AssignMulti) -> GenAndKill:
+        raise NotImplementedError
+
     @abstractmethod
     def visit_set_mem(self, op: SetMem) -> GenAndKill:
         raise NotImplementedError
@@ -224,6 +293,9 @@ class BaseAnalysisVisitor(OpVisitor[GenAndKill]):
     def visit_load_address(self, op: LoadAddress) -> GenAndKill:
         return self.visit_register_op(op)
 
+    def visit_keep_alive(self, op: KeepAlive) -> GenAndKill:
+        return self.visit_register_op(op)
+
 
 class DefinedVisitor(BaseAnalysisVisitor):
     """Visitor for finding defined registers.
@@ -252,6 +324,9 @@ class DefinedVisitor(BaseAnalysisVisitor):
         else:
             return {op.dest}, set()
 
+    def visit_assign_multi(self, op: AssignMulti) -> GenAndKill:
+        return {op.dest}, set()
+
     def visit_set_mem(self, op: SetMem) -> GenAndKill:
         return set(), set()
 
@@ -315,6 +390,9 @@ class BorrowedArgumentsVisitor(BaseAnalysisVisitor):
             return set(), {op.dest}
         return set(), set()
 
+    def visit_assign_multi(self, op: AssignMulti) -> GenAndKill:
+        return set(), set()
+
     def visit_set_mem(self, op: SetMem) -> GenAndKill:
         return set(), set()
 
@@ -352,6 +430,9 @@ class UndefinedVisitor(BaseAnalysisVisitor):
     def visit_assign(self, op: Assign) -> GenAndKill:
         return set(), {op.dest}
 
+    def visit_assign_multi(self, op: AssignMulti) -> GenAndKill:
+        return set(), {op.dest}
+
     def visit_set_mem(self, op: SetMem) -> GenAndKill:
         return set(), set()
 
@@ -394,6 +475,9 @@ class LivenessVisitor(BaseAnalysisVisitor):
     def visit_assign(self, op: Assign) -> GenAndKill:
         return set(op.sources()), {op.dest}
 
+    def visit_assign_multi(self, op: AssignMulti) -> GenAndKill:
+        return set(op.sources()), {op.dest}
+
     def visit_set_mem(self, op: SetMem) -> GenAndKill:
         return set(op.sources()), set()
 
@@ -413,6 +497,101 @@ def analyze_live_regs(blocks: List[BasicBlock],
                         kind=MAYBE_ANALYSIS)
 
 
+# Ops that don't write to memory visible to other ops (ops not listed here
+# may call arbitrary Python code)
+NON_WRITING_OPS = (
+    Goto, Branch, Return, Unreachable, Assign, AssignMulti, LoadInt, LoadErrorValue,
+    GetAttr, LoadStatic, TupleSet, TupleGet, Cast, Box, Unbox, RaiseStandardError, Truncate,
+    LoadGlobal, BinaryIntOp, ComparisonOp, LoadMem, GetElementPtr, LoadAddress, KeepAlive,
+)  # type: Final
+
+
+class AvailableExprsVisitor(BaseAnalysisVisitor):
+    """Visitor for finding available expressions.
+
+    Only the ops in 'exprs' are tracked. An op is killed when one of its
+    operands gets a new value, and ops in 'memory_exprs' (which read
+    memory) are also killed by ops that may write to memory. Ops in
+    'entry_kills' kill the given expressions before the op itself is
+    evaluated (this is used for error handlers that are reached when an
+    expression fails).
+    """
+
+    def __init__(self,
+                 exprs: Set[Value],
+                 memory_exprs: Set[Value],
+                 entry_kills: Dict[Op, Set[Value]]) -> None:
+        self.memory_exprs = memory_exprs
+        self.entry_kills = entry_kills
+        self.exprs = exprs
+        # Map each value to the tracked expressions that use it as an operand.
+        # Integer constants can be shared, since they never change.
+        self.users = {}  # type: Dict[Value, Set[Value]]
+        for expr in exprs:
+            assert isinstance(expr, Op)
+            for src in expr.sources():
+                if not isinstance(src, LoadInt):
+                    self.users.setdefault(src, set()).add(expr)
+
+    def kill(self, op: Op, values: Iterable[Value]) -> Set[Value]:
+        kill = set(self.entry_kills.get(op, ()))
+        for value in values:
+            kill |= self.users.get(value, set())
+        if not isinstance(op, NON_WRITING_OPS):
+            kill |= self.memory_exprs
+        return kill
+
+    def visit_branch(self, op: Branch) -> GenAndKill:
+        return set(), self.kill(op, [])
+
+    def visit_return(self, op: Return) -> GenAndKill:
+        return set(), set()
+
+    def visit_unreachable(self, op: Unreachable) -> GenAndKill:
+        return set(), set()
+
+    def visit_goto(self, op: Goto) -> GenAndKill:
+        return set(), self.kill(op, [])
+
+    def visit_register_op(self, op: RegisterOp) -> GenAndKill:
+        gen = {op} if op in self.exprs else set()  # type: Set[Value]
+        return gen, self.kill(op, [op])
+
+    def visit_assign(self, op: Assign) -> GenAndKill:
+        return set(), self.kill(op, [op.dest])
+
+    def visit_assign_multi(self, op: AssignMulti) -> GenAndKill:
+        return set(), self.kill(op, [op.dest])
+
+    def visit_set_mem(self, op: SetMem) -> GenAndKill:
+        return set(), self.kill(op, [])
+
+
+def analyze_available_exprs(blocks: List[BasicBlock],
+                            cfg: CFG,
+                            exprs: Set[Value],
+                            memory_exprs: Set[Value],
+                            entry_kills: Dict[Op, Set[Value]]) -> AnalysisResult[Value]:
+    """Calculate available expressions at each CFG location.
+
+    An expression (an op) is available at a location if it has been
+    evaluated along all paths from the initial location, and the value
+    it computed is still valid.
+
+    This must be run after exception handling has been inserted, since
+    an error in the middle of a block is not otherwise visible in the
+    CFG. The caller should use 'entry_kills' to make expressions that
+    failed unavailable in the error handler.
+    """
+    return run_analysis(blocks=blocks,
+                        cfg=cfg,
+                        gen_and_kill=AvailableExprsVisitor(exprs, memory_exprs, entry_kills),
+                        initial=set(),
+                        backward=False,
+                        kind=MUST_ANALYSIS,
+                        universe=set(exprs))
+
+
 # Analysis kinds
 MUST_ANALYSIS = 0
 MAYBE_ANALYSIS = 1
@@ -530,124 +709,596 @@ def run_analysis(blocks: List[BasicBlock],
     return AnalysisResult(op_before, op_after)
 
 #
-# Integer Range Analysis
+# Integer range analysis
 #
 
-
-# Need to use float for infinity support
+# Closed interval of possible values. Bounds are ints, or -inf/inf if unbounded.
 Interval = Tuple[float, float]
 
-# Records ranges for all integer registers at a fixed program point
-LocalAbstractState = Dict[Register, Interval]
+# Known value ranges of integer-valued registers and ops at a program point.
+# Values that aren't included may have any value valid for their type.
+IntRangeState = Dict[Value, Interval]
+
+INF = float('inf')  # type: Final
+TOP = (-INF, INF)  # type: Final
+BIT_RANGE = (0, 1)  # type: Final
+# Values that can be represented as short tagged integers. Use the limit for
+# literals, since it also accounts for mixed 32/64-bit builds.
+SHORT_INT_RANGE = (-MAX_LITERAL_SHORT_INT - 1, MAX_LITERAL_SHORT_INT)  # type: Final
+
+# Comparison ops with a given result negated or with operands swapped
+NEGATED_COMPARISON = {
+    ComparisonOp.EQ: ComparisonOp.NEQ,
+    ComparisonOp.NEQ: ComparisonOp.EQ,
+    ComparisonOp.SLT: ComparisonOp.SGE,
+    ComparisonOp.SGE: ComparisonOp.SLT,
+    ComparisonOp.SGT: ComparisonOp.SLE,
+    ComparisonOp.SLE: ComparisonOp.SGT,
+}  # type: Final
+SWAPPED_COMPARISON = {
+    ComparisonOp.EQ: ComparisonOp.EQ,
+    ComparisonOp.NEQ: ComparisonOp.NEQ,
+    ComparisonOp.SLT: ComparisonOp.SGT,
+    ComparisonOp.SGT: ComparisonOp.SLT,
+    ComparisonOp.SLE: ComparisonOp.SGE,
+    ComparisonOp.SGE: ComparisonOp.SLE,
+}  # type: Final
+
 
-top = (float("-inf"), float("inf"))
+def is_tagged(rtype: RType) -> bool:
+    return is_int_rprimitive(rtype) or is_short_int_rprimitive(rtype)
 
 
-def allTop(registers: List[Register]) -> LocalAbstractState:
-    return dict.fromkeys(registers, top)
+def is_native_int(rtype: RType) -> bool:
+    return (is_int32_rprimitive(rtype) or is_int64_rprimitive(rtype)
+            or is_c_py_ssize_t_rprimitive(rtype))
+
+
+def is_bit_like(rtype: RType) -> bool:
+    return is_bit_rprimitive(rtype) or is_bool_rprimitive(rtype)
+
+
+def default_range(rtype: RType) -> Interval:
+    """Return the range of all values valid for a type.
+
+    Ranges of tagged integers are expressed using the Python int values,
+    not the tagged representation.
+    """
+    if is_short_int_rprimitive(rtype):
+        return SHORT_INT_RANGE
+    elif is_bit_like(rtype):
+        return BIT_RANGE
+    return TOP
+
 
+def join_intervals(i1: Interval, i2: Interval) -> Interval:
+    return (min(i1[0], i2[0]), max(i1[1], i2[1]))
 
-# Combines all LocalAbstractStates at end of each BasicBlock (by label)
-AbstractState = Dict[int, LocalAbstractState]
 
+def meet_intervals(i1: Interval, i2: Interval) -> Optional[Interval]:
+    """Return the intersection of two intervals, or None if it's empty."""
+    lo = max(i1[0], i2[0])
+    hi = min(i1[1], i2[1])
+    if lo > hi:
+        return None
+    return (lo, hi)
 
-def addIntervals(i1: Interval, i2: Interval) -> Interval:
+
+def is_short_interval(i: Interval) -> bool:
+    return SHORT_INT_RANGE[0] <= i[0] and i[1] <= SHORT_INT_RANGE[1]
+
+
+def add_intervals(i1: Interval, i2: Interval) -> Interval:
     return (i1[0] + i2[0], i1[1] + i2[1])
 
-def subIntervals(i1: Interval, i2: Interval) -> Interval:
-    return addIntervals(i1, negateInterval(i2))
 
-def mulIntervals(i1: Interval, i2: Interval) -> Interval:
-    return (min(i1[0]*i2[0], i1[0]*i2[1], i1[1]*i2[0], i1[1]*i2[1]),
-            max(i1[0]*i2[0], i1[0]*i2[1], i1[1]*i2[0], i1[1]*i2[1]))
+def negate_interval(i: Interval) -> Interval:
+    return (-i[1], -i[0])
+
 
-def negateInterval(i1: Interval) -> Interval:
-    return (-i1[1], -i1[0])
+def subtract_intervals(i1: Interval, i2: Interval) -> Interval:
+    return add_intervals(i1, negate_interval(i2))
 
 
-def joinLocalAbstractStates(s1: LocalAbstractState,
-                            s2: LocalAbstractState) -> LocalAbstractState:
-    sNew = {}
+def _multiply(x: float, y: float) -> float:
+    # Unlike float multiplication, 0 * inf is 0 here.
+    if x == 0 or y == 0:
+        return 0
+    return x * y
 
-    regs = list(s1.keys()) + list(s2.keys())
 
-    for reg in regs:
-        if reg in s1.keys() and reg not in s2.keys():
-            sNew[reg] = s1[reg]
-        elif reg in s2.keys() and reg not in s1.keys():
-            sNew[reg] = s2[reg]
-        else:
-            # in both, compute the join
-            (lo1, hi1) = s1[reg]
-            (lo2, hi2) = s2[reg]
-            sNew[reg] = (min(lo1, lo2), max(hi1, hi2))
-
-    return sNew
-
-
-def aEval(s: LocalAbstractState,
-          e: Value) -> Interval:
-    if isinstance(e, LoadInt):
-        if e.type in (int_rprimitive, short_int_rprimitive):
-            return (e.value >> 1, e.value >> 1)
-        return (e.value, e.value)
-    if isinstance(e, Register):
-        return s.get(e, top)
-    if isinstance(e, CallC):
-        if e.function_name == 'CPyTagged_Add':
-            l = aEval(s, e.args[0])
-            r = aEval(s, e.args[1])
-            return addIntervals(l, r)
-        if e.function_name == 'CPyTagged_Multiply':
-            l = aEval(s, e.args[0])
-            r = aEval(s, e.args[1])
-            return mulIntervals(l, r)
-        if e.function_name == 'CPyTagged_Negate':
-            l = aEval(s, e.args[0])
-            return negateInterval(l)
-        if e.function_name == 'CPyTagged_Subtract':
-            l = aEval(s, e.args[0])
-            r = aEval(s, e.args[1])
-            return subIntervals(l, r)
-    return top
-
-
-def aExec(s: LocalAbstractState,
-          op: Op) -> LocalAbstractState:
-    sNew = s
-    if isinstance(op, Assign):
-        sNew[op.dest] = aEval(s, op.src)
-    return sNew
+def multiply_intervals(i1: Interval, i2: Interval) -> Interval:
+    products = [_multiply(x, y) for x in i1 for y in i2]
+    return (min(products), max(products))
 
 
-def analyze_integer_ranges(blocks: List[BasicBlock],
-                           cfg: CFG,
-                           regs: Set[Value]) -> LocalAbstractState:
+def invert_interval(i: Interval) -> Interval:
+    # ~x == -x - 1
+    return (-i[1] - 1, -i[0] - 1)
+
 
-    S: AbstractState = dict.fromkeys(map(lambda b: b.label, blocks), allTop(regs))
+def _floor_divide(x: float, y: float) -> float:
+    # Only used with a positive divisor.
+    if abs(x) == INF:
+        return x
+    if y == INF:
+        return 0 if x >= 0 else -1
+    return x // y
 
-    W: Set[BasicBlock] = set(blocks)
 
-    # TODO: Sound widening to stop non-termination
+def floor_divide_intervals(i1: Interval, i2: Interval) -> Interval:
+    if i2[0] < 1:
+        # The divisor may be zero or negative; don't bother
+        return TOP
+    quotients = [_floor_divide(x, y) for x in i1 for y in i2]
+    return (min(quotients), max(quotients))
 
-    while len(W) > 0:
-        b = W.pop()
 
-        # Combine all predecessor input states
-        Sb: LocalAbstractState = functools.reduce(joinLocalAbstractStates, [S[pred.label]
-            for pred in cfg.pred[b]], allTop(regs))
+def remainder_intervals(i1: Interval, i2: Interval) -> Interval:
+    if i2[0] < 1:
+        return TOP
+    # With a positive divisor, the result has the same sign as the divisor
+    hi = i2[1] - 1
+    if i1[0] >= 0:
+        hi = min(hi, i1[1])
+    return (0, hi)
 
-        # Abstractly execute b over Sb
-        for op in b.ops:
-            Sb = aExec(Sb, op)
 
-        if Sb != S[b.label]:
+def rshift_intervals(i1: Interval, i2: Interval) -> Interval:
+    if i1[0] < 0 or i2[0] < 0:
+        return TOP
+    lo = 0 if i2[1] == INF else int(i1[0]) >> int(i2[1])
+    hi = i1[1] if i1[1] == INF else int(i1[1]) >> int(i2[0])
+    return (lo, hi)
 
-            # Update abstract overall state
-            S[b.label] = Sb
 
-            # Need to re-execute all successors
-            W = W | set(cfg.succ[b])
+def bitwise_and_intervals(i1: Interval, i2: Interval) -> Interval:
+    if i1[0] >= 0 and i2[0] >= 0:
+        return (0, min(i1[1], i2[1]))
+    elif i1[0] >= 0:
+        return (0, i1[1])
+    elif i2[0] >= 0:
+        return (0, i2[1])
+    return TOP
+
+
+def bitwise_or_intervals(i1: Interval, i2: Interval) -> Interval:
+    # Covers both '|' and '^'
+    if i1[0] >= 0 and i2[0] >= 0:
+        hi = max(i1[1], i2[1])
+        if hi == INF:
+            return (0, INF)
+        return (0, (1 << int(hi).bit_length()) - 1)
+    return TOP
+
+
+def compare_intervals(op: int, i1: Interval, i2: Interval) -> Interval:
+    """Return the possible results of a signed comparison as a range of bits."""
+    if op == ComparisonOp.EQ:
+        if meet_intervals(i1, i2) is None:
+            return (0, 0)
+        elif i1[0] == i1[1] == i2[0] == i2[1]:
+            return (1, 1)
+    elif op == ComparisonOp.NEQ:
+        return invert_bit(compare_intervals(ComparisonOp.EQ, i1, i2))
+    elif op == ComparisonOp.SLT:
+        if i1[1] < i2[0]:
+            return (1, 1)
+        elif i1[0] >= i2[1]:
+            return (0, 0)
+    elif op == ComparisonOp.SLE:
+        if i1[1] <= i2[0]:
+            return (1, 1)
+        elif i1[0] > i2[1]:
+            return (0, 0)
+    elif op in (ComparisonOp.SGT, ComparisonOp.SGE):
+        return compare_intervals(SWAPPED_COMPARISON[op], i2, i1)
+    return BIT_RANGE
+
+
+def invert_bit(i: Interval) -> Interval:
+    return (1 - i[1], 1 - i[0])
+
+
+def refine_comparison(op: int, i1: Interval, i2: Interval) -> Optional[Tuple[Interval, Interval]]:
+    """Narrow operand ranges given that a signed comparison is true.
+
+    Return None if the comparison can't be true.
+    """
+    if op == ComparisonOp.EQ:
+        both = meet_intervals(i1, i2)
+        if both is None:
+            return None
+        return both, both
+    elif op == ComparisonOp.NEQ:
+        if i2[0] == i2[1]:
+            i1 = exclude_bound(i1, i2[0])
+        if i1[0] == i1[1]:
+            i2 = exclude_bound(i2, i1[0])
+        if i1[0] > i1[1] or i2[0] > i2[1]:
+            return None
+        return i1, i2
+    elif op in (ComparisonOp.SLT, ComparisonOp.SLE):
+        delta = 1 if op == ComparisonOp.SLT else 0
+        left = meet_intervals(i1, (-INF, i2[1] - delta))
+        right = meet_intervals(i2, (i1[0] + delta, INF))
+        if left is None or right is None:
+            return None
+        return left, right
+    else:
+        swapped = refine_comparison(SWAPPED_COMPARISON[op], i2, i1)
+        if swapped is None:
+            return None
+        return swapped[1], swapped[0]
 
-    # Combine all exit states into single result state
-    return S
+
+def exclude_bound(i: Interval, value: float) -> Interval:
+    if i[0] == value:
+        return (i[0] + 1, i[1])
+    elif i[1] == value:
+        return (i[0], i[1] - 1)
+    return i
+
+
+def join_int_range_states(s1: IntRangeState, s2: IntRangeState) -> IntRangeState:
+    return {value: join_intervals(i, s2[value])
+            for value, i in s1.items() if value in s2}
+
+
+def widen_interval(old: Interval, new: Interval, thresholds: List[float]) -> Interval:
+    """Widen a growing bound to the next threshold to guarantee termination at loops."""
+    lo, hi = new
+    if lo < old[0]:
+        index = bisect.bisect_right(thresholds, lo)
+        lo = thresholds[index - 1] if index > 0 else -INF
+    if hi > old[1]:
+        index = bisect.bisect_left(thresholds, hi)
+        hi = thresholds[index] if index < len(thresholds) else INF
+    return (lo, hi)
+
+
+def is_tag_check(op: BinaryIntOp) -> bool:
+    """Is op 'x & 1', which checks whether a tagged integer x is short?"""
+    return (op.op == BinaryIntOp.AND
+            and is_tagged(op.lhs.type)
+            and isinstance(op.rhs, LoadInt)
+            and op.rhs.value == 1
+            and not is_tagged(op.rhs.type))
+
+
+def is_integer_comparison(op: ComparisonOp) -> bool:
+    """Can the result of a comparison be derived from integer ranges of the operands?
+
+    Tagged integers are compared directly only if they are short, so
+    comparing the tagged representations is equivalent to comparing the
+    integer values.
+    """
+    return (op.op in NEGATED_COMPARISON
+            and ((is_tagged(op.lhs.type) and is_tagged(op.rhs.type))
+                 or (is_native_int(op.lhs.type) and is_native_int(op.rhs.type))
+                 or (is_bit_like(op.lhs.type) and is_bit_like(op.rhs.type))))
+
+
+# Transfer functions of C functions that operate on tagged integers
+TAGGED_BINARY_OPS = {
+    'CPyTagged_Add': add_intervals,
+    'CPyTagged_Subtract': subtract_intervals,
+    'CPyTagged_Multiply': multiply_intervals,
+    'CPyTagged_FloorDivide': floor_divide_intervals,
+    'CPyTagged_Remainder': remainder_intervals,
+    'CPyTagged_And': bitwise_and_intervals,
+    'CPyTagged_Or': bitwise_or_intervals,
+    'CPyTagged_Xor': bitwise_or_intervals,
+    'CPyTagged_Rshift': rshift_intervals,
+}  # type: Final
+TAGGED_UNARY_OPS = {
+    'CPyTagged_Negate': negate_interval,
+    'CPyTagged_Invert': invert_interval,
+}  # type: Final
+# C functions that compare tagged integers, with the equivalent comparison op
+TAGGED_COMPARISONS = {
+    'CPyTagged_IsEq_': ComparisonOp.EQ,
+    'CPyTagged_IsLt_': ComparisonOp.SLT,
+}  # type: Final
+
+
+class IntegerRangeAnalysis:
+    """Forward interval analysis of integer values.
+
+    Track the possible ranges of tagged integers (as Python int values),
+    native integers and bits. Ranges are narrowed on the edges of
+    branches that depend on integer comparisons or short int tag checks.
+    Loop heads use widening with thresholds (integer literals in the
+    function and the short int limits) so that the analysis terminates.
+
+    The results are available for each reachable block through
+    op_states(). Unreachable blocks (including ones that are only
+    reachable through branches that never go in one direction) have no
+    state.
+    """
+
+    def __init__(self,
+                 blocks: List[BasicBlock],
+                 cfg: CFG,
+                 initial: IntRangeState) -> None:
+        self.blocks = blocks
+        self.cfg = cfg
+        self.initial = initial
+        self.before = {}  # type: Dict[BasicBlock, IntRangeState]
+        self.thresholds = self.find_thresholds()
+        self.loop_heads = self.find_loop_heads()
+        self.run()
+
+    def find_thresholds(self) -> List[float]:
+        thresholds = {0, SHORT_INT_RANGE[0], SHORT_INT_RANGE[1]}  # type: Set[float]
+        for block in self.blocks:
+            for op in block.ops:
+                for src in op.sources():
+                    if isinstance(src, LoadInt) and is_tagged(src.type):
+                        value = src.value >> 1
+                        thresholds.update((value - 1, value, value + 1))
+        return sorted(thresholds)
+
+    def find_loop_heads(self) -> Set[BasicBlock]:
+        """Find targets of back edges in a depth-first traversal of the CFG."""
+        heads = set()
+        entry = self.blocks[0]
+        on_stack = {entry}
+        visited = {entry}
+        stack = [(entry, iter(self.cfg.succ[entry]))]
+        while stack:
+            block, succs = stack[-1]
+            for succ in succs:
+                if succ in on_stack:
+                    heads.add(succ)
+                elif succ not in visited:
+                    visited.add(succ)
+                    on_stack.add(succ)
+                    stack.append((succ, iter(self.cfg.succ[succ])))
+                    break
+            else:
+                stack.pop()
+                on_stack.remove(block)
+        return heads
+
+    def run(self) -> None:
+        index = {block: i for i, block in enumerate(self.blocks)}
+        # States on the outgoing edges of each processed block
+        out = {}  # type: Dict[BasicBlock, Dict[BasicBlock, IntRangeState]]
+        # Process blocks roughly in order so that loop bodies are mostly
+        # processed before the code that follows a loop.
+        worklist = [0]
+        workset = {0}
+        while worklist:
+            block = self.blocks[heapq.heappop(worklist)]
+            workset.remove(index[block])
+            incoming = [out[pred][block] for pred in self.cfg.pred[block]
+                        if pred in out and block in out[pred]]
+            if block is self.blocks[0]:
+                incoming.append(self.initial)
+            if not incoming:
+                continue
+            state = functools.reduce(join_int_range_states, incoming)
+            old = self.before.get(block)
+            if old is not None:
+                state = join_int_range_states(old, state)
+                if block in self.loop_heads:
+                    state = {value: widen_interval(old[value], i, self.thresholds)
+                             for value, i in state.items()}
+                if state == old:
+                    continue
+            self.before[block] = state
+            out[block] = self.edge_states(block)
+            for succ in out[block]:
+                if index[succ] not in workset:
+                    heapq.heappush(worklist, index[succ])
+                    workset.add(index[succ])
+
+    def op_states(self, block: BasicBlock) -> Iterator[Tuple[Op, IntRangeState]]:
+        """Iterate over the ops of a reachable block with the state before each op.
+
+        The same state object is updated in place between ops.
+        """
+        state = dict(self.before[block])
+        for op in block.ops:
+            yield op, state
+            self.transfer(state, op)
+
+    def edge_states(self, block: BasicBlock) -> Dict[BasicBlock, IntRangeState]:
+        """Calculate the states on the edges from a block to its feasible successors."""
+        result = {}  # type: Dict[BasicBlock, IntRangeState]
+        error_state = None  # type: Optional[IntRangeState]
+        state = {}  # type: IntRangeState
+        for op, state in self.op_states(block):
+            if block.error_handler:
+                # An error may happen at any op
+                if error_state is None:
+                    error_state = dict(state)
+                else:
+                    error_state = join_int_range_states(error_state, state)
+        term = block.ops[-1]
+        if isinstance(term, Branch):
+            if term.op == Branch.BOOL:
+                true_state = self.refine(dict(state), term.left, (1, 1), term, block)
+                false_state = self.refine(dict(state), term.left, (0, 0), term, block)
+                if term.negated:
+                    true_state, false_state = false_state, true_state
+            else:
+                true_state = false_state = state
+            for target, target_state in (term.true, true_state), (term.false, false_state):
+                if target_state is not None:
+                    if target in result:
+                        target_state = join_int_range_states(result[target], target_state)
+                    result[target] = target_state
+        elif isinstance(term, Goto):
+            result[term.label] = state
+        for succ in self.cfg.succ[block]:
+            if succ not in result and error_state is not None:
+                # Only error handlers remain
+                result[succ] = error_state
+        return result
+
+    def value_range(self, state: IntRangeState, value: Value) -> Interval:
+        if isinstance(value, LoadInt):
+            if is_tagged(value.type):
+                return (value.value >> 1, value.value >> 1)
+            return (value.value, value.value)
+        result = state.get(value)
+        if result is None:
+            return default_range(value.type)
+        return result
+
+    def transfer(self, state: IntRangeState, op: Op) -> None:
+        if isinstance(op, Assign):
+            target = op.dest  # type: Value
+            result = self.value_range(state, op.src)
+        elif isinstance(op, RegisterOp) and not isinstance(op, LoadInt):
+            target = op
+            result = self.evaluate(state, op)
+        else:
+            return
+        default = default_range(target.type)
+        if default == TOP and not (is_tagged(target.type) or is_native_int(target.type)):
+            # Not an integer
+            return
+        narrowed = meet_intervals(result, default)
+        if narrowed is None or narrowed == default:
+            state.pop(target, None)
+        else:
+            state[target] = narrowed
+
+    def evaluate(self, state: IntRangeState, op: RegisterOp) -> Interval:
+        if isinstance(op, CallC):
+            args = [self.value_range(state, arg) for arg in op.args]
+            name = op.function_name
+            if name in TAGGED_BINARY_OPS and len(args) == 2:
+                return TAGGED_BINARY_OPS[name](args[0], args[1])
+            elif name in TAGGED_UNARY_OPS and len(args) == 1:
+                return TAGGED_UNARY_OPS[name](args[0])
+            elif name in TAGGED_COMPARISONS and len(args) == 2:
+                return compare_intervals(TAGGED_COMPARISONS[name], args[0], args[1])
+        elif isinstance(op, BinaryIntOp):
+            left = self.value_range(state, op.lhs)
+            right = self.value_range(state, op.rhs)
+            if is_tag_check(op):
+                return (0, 0) if is_short_interval(left) else BIT_RANGE
+            elif is_tagged(op.type):
+                # Tagged integers can be added and subtracted without untagging
+                if op.op == BinaryIntOp.ADD:
+                    return add_intervals(left, right)
+                elif op.op == BinaryIntOp.SUB:
+                    return subtract_intervals(left, right)
+            elif is_bit_like(op.type):
+                if op.op == BinaryIntOp.AND:
+                    return (min(left[0], right[0]), min(left[1], right[1]))
+                elif op.op == BinaryIntOp.OR:
+                    return (max(left[0], right[0]), max(left[1], right[1]))
+        elif isinstance(op, ComparisonOp):
+            if is_integer_comparison(op):
+                return compare_intervals(op.op,
+                                         self.value_range(state, op.lhs),
+                                         self.value_range(state, op.rhs))
+        return default_range(op.type)
+
+    def refine(self,
+               state: IntRangeState,
+               value: Value,
+               interval: Interval,
+               reader: Op,
+               block: BasicBlock) -> Optional[IntRangeState]:
+        """Narrow state given that value is within interval when read by an op.
+
+        Also narrow the operands of the op that computed the value, if
+        possible. Return None if the value can't be within interval.
+        """
+        narrowed = meet_intervals(self.value_range(state, value), interval)
+        if narrowed is None:
+            return None
+        if isinstance(value, LoadInt):
+            return state
+        if isinstance(value, Register):
+            # Registers may have been assigned after being read, so only
+            # narrow if the register still has the value that was read.
+            if not self.unchanged_after(value, reader, block):
+                return state
+            state[value] = narrowed
+            return state
+        state[value] = narrowed
+        if isinstance(value, ComparisonOp) and is_integer_comparison(value):
+            return self.refine_operands(state, value.op, value.lhs, value.rhs, narrowed,
+                                        value, block)
+        elif (isinstance(value, CallC)
+                and value.function_name in TAGGED_COMPARISONS
+                and len(value.args) == 2):
+            return self.refine_operands(state, TAGGED_COMPARISONS[value.function_name],
+                                        value.args[0], value.args[1], narrowed, value, block)
+        elif isinstance(value, BinaryIntOp):
+            if is_tag_check(value) and narrowed == (0, 0):
+                return self.refine(state, value.lhs, SHORT_INT_RANGE, value, block)
+            elif is_bit_like(value.type) and (
+                    (value.op == BinaryIntOp.AND and narrowed == (1, 1))
+                    or (value.op == BinaryIntOp.OR and narrowed == (0, 0))):
+                result = self.refine(state, value.lhs, narrowed, value, block)
+                if result is None:
+                    return None
+                return self.refine(result, value.rhs, narrowed, value, block)
+        return state
+
+    def refine_operands(self,
+                        state: IntRangeState,
+                        op: int,
+                        lhs: Value,
+                        rhs: Value,
+                        result: Interval,
+                        reader: Op,
+                        block: BasicBlock) -> Optional[IntRangeState]:
+        if result == (0, 0):
+            op = NEGATED_COMPARISON[op]
+        elif result != (1, 1):
+            return state
+        refined = refine_comparison(op, self.value_range(state, lhs),
+                                    self.value_range(state, rhs))
+        if refined is None:
+            return None
+        new_state = self.refine(state, lhs, refined[0], reader, block)
+        if new_state is None:
+            return None
+        return self.refine(new_state, rhs, refined[1], reader, block)
+
+    def unchanged_after(self, reg: Register, reader: Op, block: BasicBlock) -> bool:
+        """Is reg read by an op in block and not assigned between the op and the block end?"""
+        ops = block.ops
+        for i in range(len(ops) - 1, -1, -1):
+            if ops[i] is reader:
+                return True
+            op = ops[i]
+            if isinstance(op, Assign) and op.dest is reg:
+                return False
+        return False
+
+
+def analyze_integer_ranges(blocks: List[BasicBlock],
+                           cfg: CFG,
+                           regs: Iterable[Value]) -> Dict[int, Dict[Register, Interval]]:
+    """Calculate ranges of registers at the end of each reachable block.
+
+    The given registers (such as the arguments) can have any value on entry.
+    The result includes the given registers and all other registers with a
+    known range, keyed by block label.
+    """
+    regs = list(regs)
+    analysis = IntegerRangeAnalysis(blocks, cfg, {})
+    result = {}  # type: Dict[int, Dict[Register, Interval]]
+    for block in blocks:
+        if block not in analysis.before:
+            continue
+        state = dict(analysis.before[block])
+        for op in block.ops:
+            analysis.transfer(state, op)
+        ranges = {reg: state.get(reg, TOP)
+                  for reg in regs if isinstance(reg, Register)}
+        for value, interval in state.items():
+            if isinstance(value, Register):
+                ranges[value] = interval
+        result[block.label] = ranges
+    return result
@@ -1,11 +1,13 @@
 """Utilities for emitting C code."""
 
+import sys
+
 from mypy.ordered_dict import OrderedDict
-from typing import List, Set, Dict, Optional, Callable, Union
+from typing import List, Set, Dict, Optional, Callable, Union, Tuple
 
 from mypyc.common import (
     REG_PREFIX, ATTR_PREFIX, STATIC_PREFIX, TYPE_PREFIX, NATIVE_PREFIX,
-    FAST_ISINSTANCE_MAX_SUBCLASSES,
+    FAST_ISINSTANCE_MAX_SUBCLASSES, use_fastcall, use_vectorcall
 )
 from mypyc.ir.ops import Environment, BasicBlock, Value
 from mypyc.ir.rtypes import (
@@ -60,6 +62,7 @@ class EmitterContext:
                  names: NameGenerator,
                  group_name: Optional[str] = None,
                  group_map: Optional[Dict[str, Optional[str]]] = None,
+                 capi_version: Optional[Tuple[int, int]] = None,
                  ) -> None:
         """Setup shared emitter state.
 
@@ -67,11 +70,14 @@ class EmitterContext:
             names: The name generator to use
             group_map: Map from module names to group name
             group_name: Current group name
+            capi_version: The Python C API version to target (default: the
+                running interpreter's version)
         """
         self.temp_counter = 0
         self.names = names
         self.group_name = group_name
         self.group_map = group_map or {}
+        self.capi_version = capi_version or sys.version_info[:2]
         # Groups that this group depends on
         self.group_deps = set()  # type: Set[str]
 
@@ -99,6 +105,18 @@ class Emitter:
         self.fragments = []  # type: List[str]
         self._indent = 0
 
+    @property
+    def capi_version(self) -> Tuple[int, int]:
+        return self.context.capi_version
+
+    def use_fastcall(self) -> bool:
+        """Can wrapper functions use METH_FASTCALL (Python 3.7+)?"""
+        return use_fastcall(self.capi_version)
+
+    def use_vectorcall(self) -> bool:
+        """Can native classes support vectorcalls (PEP 590, Python 3.8+)?"""
+        return use_vectorcall(self.capi_version)
+
     # Low-level operations
 
     def indent(self) -> None:
@@ -9,7 +9,8 @@ from mypyc.codegen.emit import Emitter, HeaderDeclaration
 from mypyc.codegen.emitfunc import native_function_header
 from mypyc.codegen.emitwrapper import (
     generate_dunder_wrapper, generate_hash_wrapper, generate_richcompare_wrapper,
-    generate_bool_wrapper, generate_get_wrapper,
+    generate_bool_wrapper, generate_get_wrapper, generate_call_wrapper, use_fastcall_wrapper,
+    use_vectorcall_for_class,
 )
 from mypyc.ir.rtypes import RType, RTuple, object_rprimitive
 from mypyc.ir.func_ir import FuncIR, FuncDecl, FUNC_STATICMETHOD, FUNC_CLASSMETHOD
@@ -26,6 +27,13 @@ def wrapper_slot(cl: ClassIR, fn: FuncIR, emitter: Emitter) -> str:
     return '{}{}'.format(PREFIX, fn.cname(emitter.names))
 
 
+def call_slot(cl: ClassIR, fn: FuncIR, emitter: Emitter) -> str:
+    if use_vectorcall_for_class(cl, emitter):
+        # The wrapper of __call__ uses the vectorcall calling convention.
+        return generate_call_wrapper(cl, fn, emitter)
+    return wrapper_slot(cl, fn, emitter)
+
+
 # We maintain a table from dunder function names to struct slots they
 # correspond to and functions that generate a wrapper (if necessary)
 # and return the function name to stick in the slot.
@@ -35,7 +43,7 @@ SlotTable = Mapping[str, Tuple[str, SlotGenerator]]
 
 SLOT_DEFS = {
     '__init__': ('tp_init', lambda c, t, e: generate_init_for_class(c, t, e)),
-    '__call__': ('tp_call', wrapper_slot),
+    '__call__': ('tp_call', call_slot),
     '__str__': ('tp_str', native_slot),
     '__repr__': ('tp_repr', native_slot),
     '__next__': ('tp_iternext', native_slot),
@@ -241,6 +249,16 @@ def generate_class(cl: ClassIR, module: str, emitter: Emitter) -> None:
     flags = ['Py_TPFLAGS_DEFAULT', 'Py_TPFLAGS_HEAPTYPE', 'Py_TPFLAGS_BASETYPE']
     if generate_full:
         flags.append('Py_TPFLAGS_HAVE_GC')
+    if generate_full and use_vectorcall_for_class(cl, emitter):
+        # Calls go directly to the wrapper of __call__ stored in the instance.
+        fields['tp_vectorcall_offset'] = 'offsetof({}, vectorcall)'.format(struct_name)
+        if 'tp_call' not in fields:
+            # Types that support vectorcall must define tp_call, even if
+            # __call__ is inherited.
+            call_fn = cl.get_method('__call__')
+            assert call_fn is not None
+            fields['tp_call'] = generate_call_wrapper(cl, call_fn, emitter)
+        flags.append('_Py_TPFLAGS_HAVE_VECTORCALL')
     fields['tp_flags'] = ' | '.join(flags)
 
     emitter.emit_line("static PyTypeObject {}_template_ = {{".format(emitter.type_struct_name(cl)))
@@ -288,6 +306,11 @@ def generate_object_struct(cl: ClassIR, emitter: Emitter) -> None:
                     if isinstance(rtype, RTuple):
                         emitter.declare_tuple_struct(rtype)
 
+    if not cl.is_trait and use_vectorcall_for_class(cl, emitter):
+        # This goes last, since subclasses need to have the attributes of
+        # their base classes at the same offsets, but each class has its own
+        # tp_vectorcall_offset.
+        lines.append('vectorcallfunc vectorcall;')
     lines.append('}} {};'.format(cl.struct_name(emitter.names)))
     lines.append('')
     emitter.context.declarations[cl.struct_name(emitter.names)] = HeaderDeclaration(
@@ -456,6 +479,12 @@ def generate_setup_for_class(cl: ClassIR,
             emitter.emit_line('self->{} = {};'.format(
                 emitter.attr(attr), emitter.c_undefined_value(rtype)))
 
+    if use_vectorcall_for_class(cl, emitter):
+        call_fn = cl.get_method('__call__')
+        assert call_fn is not None
+        emitter.emit_line('self->vectorcall = (vectorcallfunc){}{}{};'.format(
+            emitter.get_group_prefix(call_fn.decl), PREFIX, call_fn.cname(emitter.names)))
+
     # Initialize attributes to default values, if necessary
     if defaults_fn is not None:
         emitter.emit_lines(
@@ -641,7 +670,10 @@ def generate_methods_table(cl: ClassIR,
             continue
         emitter.emit_line('{{"{}",'.format(fn.name))
         emitter.emit_line(' (PyCFunction){}{},'.format(PREFIX, fn.cname(emitter.names)))
-        flags = ['METH_VARARGS', 'METH_KEYWORDS']
+        if use_fastcall_wrapper(fn, cl, emitter):
+            flags = ['METH_FASTCALL', 'METH_KEYWORDS']
+        else:
+            flags = ['METH_VARARGS', 'METH_KEYWORDS']
         if fn.decl.kind == FUNC_STATICMETHOD:
             flags.append('METH_STATIC')
         elif fn.decl.kind == FUNC_CLASSMETHOD:
@@ -775,6 +807,14 @@ def generate_setter(cl: ClassIR,
         setter_name(cl, attr, emitter.names),
         cl.struct_name(emitter.names)))
     emitter.emit_line('{')
+    if attr in cl.always_defined_attrs:
+        # Native code assumes that the attribute always has a value.
+        emitter.emit_line('if (value == NULL) {')
+        emitter.emit_line(
+            'PyErr_SetString(PyExc_AttributeError, "attribute {} of {} undeletable");'.format(
+                repr(attr), repr(cl.name)))
+        emitter.emit_line('return -1;')
+        emitter.emit_line('}')
     if rtype.is_refcounted:
         attr_expr = 'self->{}'.format(attr_field)
         emitter.emit_undefined_attr_check(rtype, attr_expr, '!=')
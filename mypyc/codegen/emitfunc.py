@@ -12,10 +12,11 @@ from mypyc.ir.ops import (
     LoadStatic, InitStatic, TupleGet, TupleSet, Call, IncRef, DecRef, Box, Cast, Unbox,
     BasicBlock, Value, MethodCall, EmitterInterface, Unreachable, NAMESPACE_STATIC,
     NAMESPACE_TYPE, NAMESPACE_MODULE, RaiseStandardError, CallC, LoadGlobal, Truncate,
-    BinaryIntOp, LoadMem, GetElementPtr, LoadAddress, ComparisonOp, SetMem, Register
+    BinaryIntOp, LoadMem, GetElementPtr, LoadAddress, ComparisonOp, SetMem, Register,
+    AssignMulti, KeepAlive, ERR_NEVER
 )
 from mypyc.ir.rtypes import (
-    RType, RTuple, is_tagged, is_int32_rprimitive, is_int64_rprimitive, RStruct,
+    RType, RTuple, RArray, is_tagged, is_int32_rprimitive, is_int64_rprimitive, RStruct,
     is_pointer_rprimitive
 )
 from mypyc.ir.func_ir import FuncIR, FuncDecl, FUNC_STATICMETHOD, FUNC_CLASSMETHOD
@@ -57,7 +58,8 @@ def generate_native_function(fn: FuncIR,
     declarations = Emitter(emitter.context, fn.env)
     names = generate_names_for_env(fn.env)
     body = Emitter(emitter.context, fn.env, names)
-    visitor = FunctionEmitterVisitor(body, declarations, source_path, module_name, const_int_regs)
+    visitor = FunctionEmitterVisitor(body, declarations, source_path, module_name, const_int_regs,
+                                     fn.ret_type)
 
     declarations.emit_line('{} {{'.format(native_function_header(fn.decl, emitter)))
     body.indent()
@@ -69,6 +71,11 @@ def generate_native_function(fn: FuncIR,
             continue  # skip the arguments
         ctype = emitter.ctype_spaced(r.type)
         init = ''
+        if isinstance(r.type, RArray):
+            # Arrays are initialized using AssignMulti.
+            declarations.emit_line('{ctype}{prefix}{name}[{length}];'.format(
+                ctype=ctype, prefix=REG_PREFIX, name=names[r], length=r.type.length))
+            continue
         if r in fn.env.vars_needing_init:
             init = ' = {}'.format(declarations.c_error_value(r.type))
         if r not in const_int_regs:
@@ -98,7 +105,8 @@ class FunctionEmitterVisitor(OpVisitor[None], EmitterInterface):
                  declarations: Emitter,
                  source_path: str,
                  module_name: str,
-                 const_int_regs: Dict[LoadInt, int]) -> None:
+                 const_int_regs: Dict[LoadInt, int],
+                 ret_type: RType) -> None:
         self.emitter = emitter
         self.names = emitter.names
         self.declarations = declarations
@@ -106,6 +114,7 @@ class FunctionEmitterVisitor(OpVisitor[None], EmitterInterface):
         self.source_path = source_path
         self.module_name = module_name
         self.const_int_regs = const_int_regs
+        self.ret_type = ret_type
 
     def temp_name(self) -> str:
         return self.emitter.temp_name()
@@ -173,6 +182,11 @@ class FunctionEmitterVisitor(OpVisitor[None], EmitterInterface):
         if dest != src:
             self.emit_line('%s = %s;' % (dest, src))
 
+    def visit_assign_multi(self, op: AssignMulti) -> None:
+        dest = self.reg(op.dest)
+        for i, src in enumerate(op.src):
+            self.emit_line('%s[%d] = %s;' % (dest, i, self.reg(src)))
+
     def visit_load_int(self, op: LoadInt) -> None:
         if op in self.const_int_regs:
             return
@@ -247,7 +261,24 @@ class FunctionEmitterVisitor(OpVisitor[None], EmitterInterface):
             # Otherwise, use direct or offset struct access.
             attr_expr = self.get_attr_expr(obj, op, decl_cl)
             self.emitter.emit_line('{} = {};'.format(dest, attr_expr))
-            if attr_rtype.is_refcounted:
+            if op.error_kind == ERR_NEVER:
+                # The attribute is always defined once __init__ has run, but an
+                # instance created through C.__new__(C) can still have it missing.
+                # The op can't fail as far as the IR is concerned (so that it can
+                # be optimized freely), so raise and return from the function
+                # directly in that case. This skips the cleanup of the error
+                # path, which only leaks references in this unusual case.
+                if attr_rtype.is_refcounted:
+                    self.emitter.emit_undefined_attr_check(
+                        attr_rtype, attr_expr, '==', unlikely=True
+                    )
+                    self.emitter.emit_lines(
+                        'PyErr_SetString(PyExc_AttributeError, "attribute {} of {} undefined");'
+                        .format(repr(op.attr), repr(cl.name)),
+                        'return {};'.format(self.c_error_value(self.ret_type)),
+                        '}')
+                    self.emitter.emit_inc_ref(attr_expr, attr_rtype)
+            elif attr_rtype.is_refcounted:
                 self.emitter.emit_undefined_attr_check(
                     attr_rtype, attr_expr, '==', unlikely=True
                 )
@@ -283,9 +314,14 @@ class FunctionEmitterVisitor(OpVisitor[None], EmitterInterface):
             # ...and struct access for normal attributes.
             attr_expr = self.get_attr_expr(obj, op, decl_cl)
             if attr_rtype.is_refcounted:
-                self.emitter.emit_undefined_attr_check(attr_rtype, attr_expr, '!=')
-                self.emitter.emit_dec_ref(attr_expr, attr_rtype)
-                self.emitter.emit_line('}')
+                if op.old_value_defined:
+                    # Use XDECREF in case the instance was created without
+                    # running __init__ (C.__new__(C)).
+                    self.emitter.emit_dec_ref(attr_expr, attr_rtype, is_xdec=True)
+                else:
+                    self.emitter.emit_undefined_attr_check(attr_rtype, attr_expr, '!=')
+                    self.emitter.emit_dec_ref(attr_expr, attr_rtype)
+                    self.emitter.emit_line('}')
             # This steal the reference to src, so we don't need to increment the arg
             self.emitter.emit_lines(
                 '{} = {};'.format(attr_expr, src),
@@ -490,6 +526,10 @@ class FunctionEmitterVisitor(OpVisitor[None], EmitterInterface):
         src = self.reg(op.src) if isinstance(op.src, Register) else op.src
         self.emit_line('%s = (%s)&%s;' % (dest, typ._ctype, src))
 
+    def visit_keep_alive(self, op: KeepAlive) -> None:
+        # This is a no-op.
+        pass
+
     # Helpers
 
     def label(self, label: BasicBlock) -> str:
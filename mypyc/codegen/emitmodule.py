@@ -31,6 +31,8 @@ from mypyc.codegen.emitfunc import generate_native_function, native_function_hea
 from mypyc.codegen.emitclass import generate_class_type_decl, generate_class
 from mypyc.codegen.emitwrapper import (
     generate_wrapper_function, wrapper_function_header,
+    generate_legacy_wrapper_function, legacy_wrapper_function_header,
+    use_fastcall_wrapper,
 )
 from mypyc.ir.ops import LiteralsMap, DeserMaps
 from mypyc.ir.rtypes import RType, RTuple
@@ -42,6 +44,9 @@ from mypyc.transform.uninit import insert_uninit_checks
 from mypyc.transform.refcount import insert_ref_count_opcodes
 from mypyc.transform.exceptions import insert_exception_handling
 from mypyc.transform.optints import optimize_integer_types
+from mypyc.transform.cse import eliminate_common_subexprs
+from mypyc.transform.licm import hoist_loop_invariants
+from mypyc.analysis.attrdefined import analyze_always_defined_attrs, mark_always_defined_attr_ops
 from mypyc.namegen import NameGenerator, exported_name
 from mypyc.errors import Errors
 
@@ -190,6 +195,10 @@ def compile_scc_to_ir(
     Any modules that this SCC depends on must have either compiled or
     loaded from a cache into mapper.
 
+    The generated IR doesn't have exception and refcount handling yet.
+    These are inserted by transform_modules_ir once all SCCs have been
+    compiled.
+
     Arguments:
         scc: The list of MypyFiles to compile
         result: The BuildResult from the mypy front-end
@@ -204,12 +213,22 @@ def compile_scc_to_ir(
         print("Compiling {}".format(", ".join(x.name for x in scc)))
 
     # Generate basic IR, with missing exception and refcount handling.
-    modules = build_ir(
+    return build_ir(
         scc, result.graph, result.types, mapper, compiler_options, errors
     )
-    if errors.num_errors > 0:
-        return modules
 
+
+def transform_modules_ir(modules: ModuleIRs) -> None:
+    """Insert exception and refcount handling and optimize the IR of modules.
+
+    This needs to see all the modules compiled together, since classes
+    can have subclasses in modules that are compiled after them.
+    """
+    # Find attributes that don't need undefined checks.
+    analyze_always_defined_attrs([cl for module in modules.values() for cl in module.classes])
+    for module in modules.values():
+        for fn in module.functions:
+            mark_always_defined_attr_ops(fn)
     # Insert uninit checks.
     for module in modules.values():
         for fn in module.functions:
@@ -218,6 +237,14 @@ def compile_scc_to_ir(
     for module in modules.values():
         for fn in module.functions:
             insert_exception_handling(fn)
+    # Eliminate redundant ops, such as repeated type checks.
+    for module in modules.values():
+        for fn in module.functions:
+            eliminate_common_subexprs(fn)
+    # Move loop-invariant ops out of loops.
+    for module in modules.values():
+        for fn in module.functions:
+            hoist_loop_invariants(fn)
     # Insert refcount handling.
     for module in modules.values():
         for fn in module.functions:
@@ -227,8 +254,6 @@ def compile_scc_to_ir(
         for fn in module.functions:
             optimize_integer_types(fn)
 
-    return modules
-
 
 def compile_modules_to_ir(
     result: BuildResult,
@@ -260,6 +285,9 @@ def compile_modules_to_ir(
             scc_ir = compile_scc_to_ir(trees, result, mapper, compiler_options, errors)
             modules.update(scc_ir)
 
+    if errors.num_errors == 0:
+        transform_modules_ir(modules)
+
     return modules
 
 
@@ -419,13 +447,24 @@ def compile_modules_to_c(
     return modules, [ctext[name] for _, name in groups]
 
 
-def generate_function_declaration(fn: FuncIR, emitter: Emitter) -> None:
+def generate_function_declaration(fn: FuncIR, cl: Optional[ClassIR], emitter: Emitter) -> None:
     emitter.context.declarations[emitter.native_function_name(fn.decl)] = HeaderDeclaration(
         '{};'.format(native_function_header(fn.decl, emitter)),
         needs_export=True)
     if fn.name != TOP_LEVEL_NAME:
+        if use_fastcall_wrapper(fn, cl, emitter):
+            header = wrapper_function_header(fn, emitter.names)
+        else:
+            header = legacy_wrapper_function_header(fn, emitter.names)
         emitter.context.declarations[PREFIX + fn.cname(emitter.names)] = HeaderDeclaration(
-            '{};'.format(wrapper_function_header(fn, emitter.names)))
+            '{};'.format(header),
+            # Subclasses in other groups refer to a vectorcall __call__ wrapper.
+            needs_export=cl is not None and fn.name == '__call__')
+
+
+def method_classes(module: ModuleIR) -> Dict[str, ClassIR]:
+    """Return a map from class names to classes, for looking up the class of a method."""
+    return {cl.name: cl for cl in module.classes}
 
 
 def pointerize(decl: str, name: str) -> str:
@@ -472,7 +511,8 @@ class GroupGenerator:
         self.literals = literals
         self.modules = modules
         self.source_paths = source_paths
-        self.context = EmitterContext(names, group_name, group_map)
+        self.context = EmitterContext(names, group_name, group_map,
+                                      compiler_options.capi_version)
         self.names = names
         # Initializations of globals to simple values that we can't
         # do statically because the windows loader is bad.
@@ -529,13 +569,19 @@ class GroupGenerator:
             # Generate Python extension module definitions and module initialization functions.
             self.generate_module_def(emitter, module_name, module)
 
+            classes = method_classes(module)
             for fn in module.functions:
                 emitter.emit_line()
                 generate_native_function(fn, emitter, self.source_paths[module_name], module_name)
                 if fn.name != TOP_LEVEL_NAME:
                     emitter.emit_line()
-                    generate_wrapper_function(
-                        fn, emitter, self.source_paths[module_name], module_name)
+                    fn_class = classes[fn.class_name] if fn.class_name else None
+                    if use_fastcall_wrapper(fn, fn_class, emitter):
+                        generate_wrapper_function(
+                            fn, emitter, self.source_paths[module_name], module_name)
+                    else:
+                        generate_legacy_wrapper_function(
+                            fn, emitter, self.source_paths[module_name], module_name)
 
             if multi_file:
                 name = ('__native_{}.c'.format(emitter.names.private_name(module_name)))
@@ -565,8 +611,10 @@ class GroupGenerator:
             self.declare_finals(module_name, module.final_names, declarations)
             for cl in module.classes:
                 generate_class_type_decl(cl, emitter, ext_declarations, declarations)
+            classes = method_classes(module)
             for fn in module.functions:
-                generate_function_declaration(fn, declarations)
+                fn_class = classes[fn.class_name] if fn.class_name else None
+                generate_function_declaration(fn, fn_class, declarations)
 
         for lib in sorted(self.context.group_deps):
             elib = exported_name(lib)
@@ -817,6 +865,15 @@ class GroupGenerator:
                     '{} = PyBytes_FromStringAndSize({}, {});'.format(
                         symbol, *encode_bytes_as_c_string(literal))
                 )
+            elif isinstance(literal, tuple):
+                # Only tuples of str literals are supported (used for
+                # the keyword names of vectorcalls). The items are
+                # initialized earlier.
+                items = [emitter.static_name(self.literals[(str, item)], None)
+                         for item in literal]
+                emitter.emit_line(
+                    '{} = PyTuple_Pack({});'.format(symbol, ', '.join([str(len(items))] + items))
+                )
             else:
                 assert False, ('Literals must be integers, floating point numbers, or strings,',
                                'but the provided literal is of type {}'.format(type(literal)))
@@ -842,12 +899,17 @@ class GroupGenerator:
         for fn in module.functions:
             if fn.class_name is not None or fn.name == TOP_LEVEL_NAME:
                 continue
+            if use_fastcall_wrapper(fn, None, emitter):
+                flags = 'METH_FASTCALL | METH_KEYWORDS'
+            else:
+                flags = 'METH_VARARGS | METH_KEYWORDS'
             emitter.emit_line(
-                ('{{"{name}", (PyCFunction){prefix}{cname}, METH_VARARGS | METH_KEYWORDS, '
+                ('{{"{name}", (PyCFunction){prefix}{cname}, {flags}, '
                  'NULL /* docstring */}},').format(
                     name=fn.name,
                     cname=fn.cname(emitter.names),
-                    prefix=PREFIX))
+                    prefix=PREFIX,
+                    flags=flags))
         emitter.emit_line('{NULL, NULL, 0, NULL}')
         emitter.emit_line('};')
         emitter.emit_line()
@@ -15,11 +15,58 @@ from mypyc.namegen import NameGenerator
 
 
 def wrapper_function_header(fn: FuncIR, names: NameGenerator) -> str:
+    """Return the header of a METH_FASTCALL or vectorcall wrapper function.
+
+    The nargs argument is a size_t so that the same function works as a
+    vectorcall function (see generate_class in emitclass).
+    """
+    return ('PyObject *{prefix}{name}('
+            'PyObject *self, PyObject *const *args, size_t nargs, PyObject *kwnames)').format(
+                prefix=PREFIX,
+                name=fn.cname(names))
+
+
+def legacy_wrapper_function_header(fn: FuncIR, names: NameGenerator) -> str:
     return 'PyObject *{prefix}{name}(PyObject *self, PyObject *args, PyObject *kw)'.format(
         prefix=PREFIX,
         name=fn.cname(names))
 
 
+def use_vectorcall_for_class(cl: ClassIR, emitter: Emitter) -> bool:
+    """Can instances of a native class be called using vectorcall?
+
+    This requires __call__ to be defined in a class with a native
+    instance layout, since a pointer to the wrapper of __call__ is stored
+    in each instance.
+    """
+    if not emitter.use_vectorcall():
+        return False
+    method_cls = cl.get_method_and_class('__call__')
+    if method_cls is None:
+        return False
+    defining_cl = method_cls[1]
+    return not defining_cl.is_trait and not defining_cl.builtin_base
+
+
+def use_fastcall_wrapper(fn: FuncIR, cl: Optional[ClassIR], emitter: Emitter) -> bool:
+    """Should the wrapper of a function use the METH_FASTCALL calling convention?
+
+    Args:
+        fn: The function
+        cl: The class that defines the function, if it's a method
+    """
+    if not emitter.use_fastcall():
+        return False
+    if cl is not None:
+        if fn.name == '__init__':
+            # The wrapper is also used for tp_init.
+            return False
+        if fn.name == '__call__':
+            # The wrapper is also used for tp_call, unless vectorcall is used.
+            return use_vectorcall_for_class(cl, emitter)
+    return True
+
+
 def make_format_string(func_name: str, groups: List[List[RuntimeArg]]) -> str:
     # Construct the format string. Each group requires the previous
     # groups delimiters to be present first.
@@ -40,13 +87,40 @@ def generate_wrapper_function(fn: FuncIR,
                               emitter: Emitter,
                               source_path: str,
                               module_name: str) -> None:
-    """Generates a CPython-compatible wrapper function for a native function.
+    """Generates a METH_FASTCALL wrapper function for a native function.
 
     In particular, this handles unboxing the arguments, calling the native function, and
     then boxing the return value.
+
+    Arguments are passed in a C array (together with a tuple of keyword
+    argument names), which avoids creating an argument tuple and a
+    keyword dict for each call. Positional-only calls don't need any
+    allocations.
     """
     emitter.emit_line('{} {{'.format(wrapper_function_header(fn, emitter.names)))
+    generate_wrapper_body(fn, emitter, source_path, module_name, fastcall=True)
+    emitter.emit_line('}')
+
+
+def generate_legacy_wrapper_function(fn: FuncIR,
+                                     emitter: Emitter,
+                                     source_path: str,
+                                     module_name: str) -> None:
+    """Generates a METH_VARARGS | METH_KEYWORDS wrapper function for a native function.
 
+    This is used on Python versions without METH_FASTCALL, and for methods
+    whose wrappers are also used in type slots that take an argument tuple.
+    """
+    emitter.emit_line('{} {{'.format(legacy_wrapper_function_header(fn, emitter.names)))
+    generate_wrapper_body(fn, emitter, source_path, module_name, fastcall=False)
+    emitter.emit_line('}')
+
+
+def generate_wrapper_body(fn: FuncIR,
+                          emitter: Emitter,
+                          source_path: str,
+                          module_name: str,
+                          fastcall: bool) -> None:
     # If we hit an error while processing arguments, then we emit a
     # traceback frame to make it possible to debug where it happened.
     # Unlike traceback frames added for exceptions seen in IR, we do this
@@ -73,6 +147,10 @@ def generate_wrapper_function(fn: FuncIR,
 
     arg_names = ''.join('"{}", '.format(arg.name) for arg in reordered_args)
     emitter.emit_line('static char *kwlist[] = {{{}0}};'.format(arg_names))
+    format_string = make_format_string(fn.name, groups)
+    if fastcall:
+        emitter.emit_line('static CPyArg_Parser parser = {{"{}", kwlist, 0}};'.format(
+            format_string))
     for arg in real_args:
         emitter.emit_line('PyObject *obj_{}{};'.format(
                           arg.name, ' = NULL' if arg.optional else ''))
@@ -86,17 +164,20 @@ def generate_wrapper_function(fn: FuncIR,
         arg_ptrs += ['&obj_{}'.format(groups[ARG_STAR2][0].name) if groups[ARG_STAR2] else 'NULL']
     arg_ptrs += ['&obj_{}'.format(arg.name) for arg in reordered_args]
 
+    if fastcall:
+        parse_call = 'CPyArg_ParseStackAndKeywords(args, nargs, kwnames, &parser{})'.format(
+            ''.join(', ' + n for n in arg_ptrs))
+    else:
+        parse_call = 'CPyArg_ParseTupleAndKeywords(args, kw, "{}", kwlist{})'.format(
+            format_string, ''.join(', ' + n for n in arg_ptrs))
     emitter.emit_lines(
-        'if (!CPyArg_ParseTupleAndKeywords(args, kw, "{}", kwlist{})) {{'.format(
-            make_format_string(fn.name, groups), ''.join(', ' + n for n in arg_ptrs)),
+        'if (!{}) {{'.format(parse_call),
         'return NULL;',
         '}')
     generate_wrapper_core(fn, emitter, groups[ARG_OPT] + groups[ARG_NAMED_OPT],
                           cleanups=cleanups,
                           traceback_code=traceback_code)
 
-    emitter.emit_line('}')
-
 
 def generate_dunder_wrapper(cl: ClassIR, fn: FuncIR, emitter: Emitter) -> str:
     """Generates a wrapper for native __dunder__ methods to be able to fit into the mapping
@@ -169,6 +250,27 @@ def generate_get_wrapper(cl: ClassIR, fn: FuncIR, emitter: Emitter) -> str:
     return name
 
 
+def generate_call_wrapper(cl: ClassIR, fn: FuncIR, emitter: Emitter) -> str:
+    """Generates a tp_call wrapper for native __call__ methods of vectorcall classes.
+
+    Instances are called through the wrapper stored in each instance,
+    which belongs to the most derived __call__. The tp_call of each class
+    still runs the __call__ of that class, since the __call__ slot wrapper
+    of the class uses it.
+    """
+    name = '{}{}{}'.format(DUNDER_PREFIX, fn.name, cl.name_prefix(emitter.names))
+    emitter.emit_line(
+        'static PyObject *{name}(PyObject *self, PyObject *args, PyObject *kw) {{'.format(
+            name=name))
+    emitter.emit_line('return CPy_CallVectorcallWrapper((vectorcallfunc){}{}{}, '
+                      'self, args, kw);'.format(emitter.get_group_prefix(fn.decl),
+                                                PREFIX,
+                                                fn.cname(emitter.names)))
+    emitter.emit_line('}')
+
+    return name
+
+
 def generate_hash_wrapper(cl: ClassIR, fn: FuncIR, emitter: Emitter) -> str:
     """Generates a wrapper for native __hash__ methods."""
     name = '{}{}{}'.format(DUNDER_PREFIX, fn.name, cl.name_prefix(emitter.names))
@@ -1,5 +1,5 @@
 import sys
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import sys
 
 from typing_extensions import Final
@@ -54,6 +54,7 @@ MAX_LITERAL_SHORT_INT = (sys.maxsize >> 1 if not IS_MIXED_32_64_BIT_BUILD
 RUNTIME_C_FILES = [
     'init.c',
     'getargs.c',
+    'getargsfast.c',
     'int_ops.c',
     'list_ops.c',
     'dict_ops.c',
@@ -78,6 +79,16 @@ def shared_lib_name(group_name: str) -> str:
     return '{}__mypyc'.format(group_name)
 
 
+def use_fastcall(capi_version: Tuple[int, int]) -> bool:
+    """Can wrapper functions use METH_FASTCALL (Python 3.7+)?"""
+    return capi_version >= (3, 7)
+
+
+def use_vectorcall(capi_version: Tuple[int, int]) -> bool:
+    """Can we use vectorcalls (PEP 590, Python 3.8+)?"""
+    return capi_version >= (3, 8)
+
+
 def short_name(name: str) -> str:
     if name.startswith('builtins.'):
         return name[9:]
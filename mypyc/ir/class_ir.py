@@ -147,6 +147,18 @@ class ClassIR:
         # None if separate compilation prevents this from working
         self.children = []  # type: Optional[List[ClassIR]]
 
+        # Attributes defined in this class that are always initialized when
+        # an instance is constructed, so that they never need undefined checks
+        # (see mypyc.analysis.attrdefined)
+        self.always_defined_attrs = set()  # type: Set[str]
+        # Attributes that __init__ (including inherited ones) always assigns
+        # before self escapes
+        self.init_defined_attrs = set()  # type: Set[str]
+        # Can self escape from __init__ (for example, by passing it to a function)?
+        self.init_self_leak = True
+        # Attributes declared in this class that are deleted using 'del'
+        self.deleted_attrs = set()  # type: Set[str]
+
     @property
     def fullname(self) -> str:
         return "{}.{}".format(self.module_name, self.name)
@@ -305,6 +317,10 @@ class ClassIR:
             'children': [
                 cir.fullname for cir in self.children
             ] if self.children is not None else None,
+            'always_defined_attrs': sorted(self.always_defined_attrs),
+            'init_defined_attrs': sorted(self.init_defined_attrs),
+            'init_self_leak': self.init_self_leak,
+            'deleted_attrs': sorted(self.deleted_attrs),
         }
 
     @classmethod
@@ -352,6 +368,10 @@ class ClassIR:
         ir.mro = [ctx.classes[s] for s in data['mro']]
         ir.base_mro = [ctx.classes[s] for s in data['base_mro']]
         ir.children = data['children'] and [ctx.classes[s] for s in data['children']]
+        ir.always_defined_attrs = set(data['always_defined_attrs'])
+        ir.init_defined_attrs = set(data['init_defined_attrs'])
+        ir.init_self_leak = data['init_self_leak']
+        ir.deleted_attrs = set(data['deleted_attrs'])
 
         return ir
 
@@ -22,7 +22,7 @@ from mypy_extensions import trait
 from mypy.nodes import SymbolNode
 
 from mypyc.ir.rtypes import (
-    RType, RInstance, RTuple, RVoid, is_bool_rprimitive, is_int_rprimitive,
+    RType, RInstance, RTuple, RArray, RVoid, is_bool_rprimitive, is_int_rprimitive,
     is_short_int_rprimitive, is_none_rprimitive, object_rprimitive, bool_rprimitive,
     short_int_rprimitive, int_rprimitive, void_rtype, pointer_rprimitive, is_pointer_rprimitive,
     bit_rprimitive, is_bit_rprimitive
@@ -563,6 +563,32 @@ class Assign(Op):
         return visitor.visit_assign(self)
 
 
+class AssignMulti(Op):
+    """Assign multiple values to a register with an RArray type (dest = [a, b, ...]).
+
+    This is used to initialize C arrays, such as vectorcall argument
+    arrays. The array only holds borrowed references to the values, so
+    they need to be kept alive (see KeepAlive) for as long as the
+    array is used.
+    """
+
+    error_kind = ERR_NEVER
+
+    def __init__(self, dest: Register, src: List[Value], line: int = -1) -> None:
+        super().__init__(line)
+        assert src
+        assert isinstance(dest.type, RArray)
+        assert dest.type.length == len(src)
+        self.src = src
+        self.dest = dest
+
+    def sources(self) -> List[Value]:
+        return self.src[:]
+
+    def accept(self, visitor: 'OpVisitor[T]') -> T:
+        return visitor.visit_assign_multi(self)
+
+
 class LoadInt(RegisterOp):
     """Load an integer literal."""
 
@@ -646,6 +672,9 @@ class SetAttr(RegisterOp):
         assert isinstance(obj.type, RInstance), 'Attribute access not supported: %s' % obj.type
         self.class_type = obj.type
         self.type = bool_rprimitive
+        # If True, the attribute is known to have a value that must be freed
+        # (see mypyc.analysis.attrdefined)
+        self.old_value_defined = False
 
     def sources(self) -> List[Value]:
         return [self.obj, self.src]
@@ -1199,6 +1228,30 @@ class LoadAddress(RegisterOp):
         return visitor.visit_load_address(self)
 
 
+class KeepAlive(RegisterOp):
+    """keep_alive src, ...
+
+    Make sure that the values are not freed before this op. This is
+    needed when a value is only accessed through a borrowed reference,
+    such as an item of an RArray initialized by AssignMulti. This
+    doesn't generate any code.
+    """
+
+    error_kind = ERR_NEVER
+
+    def __init__(self, src: List[Value]) -> None:
+        super().__init__(-1)
+        assert src
+        self.src = src
+        self.type = void_rtype
+
+    def sources(self) -> List[Value]:
+        return self.src[:]
+
+    def accept(self, visitor: 'OpVisitor[T]') -> T:
+        return visitor.visit_keep_alive(self)
+
+
 @trait
 class OpVisitor(Generic[T]):
     """Generic visitor over ops (uses the visitor design pattern)."""
@@ -1223,6 +1276,10 @@ class OpVisitor(Generic[T]):
     def visit_assign(self, op: Assign) -> T:
         raise NotImplementedError
 
+    @abstractmethod
+    def visit_assign_multi(self, op: AssignMulti) -> T:
+        raise NotImplementedError
+
     @abstractmethod
     def visit_load_int(self, op: LoadInt) -> T:
         raise NotImplementedError
@@ -1321,9 +1378,14 @@ class OpVisitor(Generic[T]):
     def visit_load_address(self, op: LoadAddress) -> T:
         raise NotImplementedError
 
+    @abstractmethod
+    def visit_keep_alive(self, op: KeepAlive) -> T:
+        raise NotImplementedError
+
 
 # TODO: Should this live somewhere else?
-LiteralsMap = Dict[Tuple[Type[object], Union[int, float, str, bytes, complex]], str]
+LiteralsMap = Dict[Tuple[Type[object], Union[int, float, str, bytes, complex, Tuple[str, ...]]],
+                  str]
 
 
 # Import mypyc.primitives.registry that will set up set up global primitives tables.
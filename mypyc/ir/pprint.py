@@ -10,7 +10,8 @@ from mypyc.ir.ops import (
     Goto, Branch, Return, Unreachable, Assign, LoadInt, LoadErrorValue, GetAttr, SetAttr,
     LoadStatic, InitStatic, TupleGet, TupleSet, IncRef, DecRef, Call, MethodCall, Cast, Box, Unbox,
     RaiseStandardError, CallC, Truncate, LoadGlobal, BinaryIntOp, ComparisonOp, LoadMem, SetMem,
-    GetElementPtr, LoadAddress, Register, Value, OpVisitor, BasicBlock, Environment
+    GetElementPtr, LoadAddress, AssignMulti, KeepAlive, Register, Value, OpVisitor, BasicBlock,
+    Environment
 )
 from mypyc.ir.func_ir import FuncIR
 from mypyc.ir.module_ir import ModuleIRs
@@ -58,6 +59,9 @@ class IRPrettyPrintVisitor(OpVisitor[str]):
     def visit_assign(self, op: Assign) -> str:
         return self.format('%r = %r', op.dest, op.src)
 
+    def visit_assign_multi(self, op: AssignMulti) -> str:
+        return self.format('%r = [%s]', op.dest, ', '.join(self.format('%r', v) for v in op.src))
+
     def visit_load_int(self, op: LoadInt) -> str:
         return self.format('%r = %d', op, op.value)
 
@@ -190,6 +194,9 @@ class IRPrettyPrintVisitor(OpVisitor[str]):
         else:
             return self.format("%r = load_address %s", op, op.src)
 
+    def visit_keep_alive(self, op: KeepAlive) -> str:
+        return self.format('keep_alive %s', ', '.join(self.format('%r', v) for v in op.src))
+
     # Helpers
 
     def format(self, fmt: str, *args: Any) -> str:
@@ -123,6 +123,10 @@ class RTypeVisitor(Generic[T]):
     def visit_rstruct(self, typ: 'RStruct') -> T:
         raise NotImplementedError
 
+    @abstractmethod
+    def visit_rarray(self, typ: 'RArray') -> T:
+        raise NotImplementedError
+
     @abstractmethod
     def visit_rvoid(self, typ: 'RVoid') -> T:
         raise NotImplementedError
@@ -405,6 +409,9 @@ class TupleNameVisitor(RTypeVisitor[str]):
         assert False
         return ""
 
+    def visit_rarray(self, t: 'RArray') -> str:
+        assert False, "rarray in tuple?"
+
     def visit_rvoid(self, t: 'RVoid') -> str:
         assert False, "rvoid in tuple?"
 
@@ -584,6 +591,47 @@ class RStruct(RType):
         assert False
 
 
+class RArray(RType):
+    """Fixed-length C array (for example, PyObject *[3]).
+
+    These can only be used as the types of local temporaries that are
+    initialized using a single AssignMulti op, such as the argument
+    arrays of vectorcalls.
+    """
+
+    is_unboxed = False
+    is_refcounted = False
+
+    def __init__(self, item_type: RType, length: int) -> None:
+        self.item_type = item_type
+        self.length = length
+        self.name = '%s[%d]' % (item_type.name, length)
+        self._ctype = item_type._ctype
+
+    def accept(self, visitor: 'RTypeVisitor[T]') -> T:
+        return visitor.visit_rarray(self)
+
+    def __str__(self) -> str:
+        return '%s[%d]' % (self.item_type, self.length)
+
+    def __repr__(self) -> str:
+        return '<RArray %r[%d]>' % (self.item_type, self.length)
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, RArray) and self.item_type == other.item_type
+                and self.length == other.length)
+
+    def __hash__(self) -> int:
+        return hash((self.item_type, self.length))
+
+    def serialize(self) -> JsonDict:
+        assert False
+
+    @classmethod
+    def deserialize(cls, data: JsonDict, ctx: 'DeserMaps') -> 'RArray':
+        assert False
+
+
 class RInstance(RType):
     """Instance of user-defined class (compiled to C extension class).
 
@@ -78,7 +78,7 @@ class IRBuilder:
                  pbv: PreBuildVisitor,
                  visitor: IRVisitor,
                  options: CompilerOptions) -> None:
-        self.builder = LowLevelIRBuilder(current_module, mapper)
+        self.builder = LowLevelIRBuilder(current_module, mapper, options)
         self.builders = [self.builder]
 
         self.current_module = current_module
@@ -869,7 +869,7 @@ class IRBuilder:
     def enter(self, fn_info: Union[FuncInfo, str] = '') -> None:
         if isinstance(fn_info, str):
             fn_info = FuncInfo(name=fn_info)
-        self.builder = LowLevelIRBuilder(self.current_module, self.mapper)
+        self.builder = LowLevelIRBuilder(self.current_module, self.mapper, self.options)
         self.builders.append(self.builder)
         self.fn_info = fn_info
         self.fn_infos.append(self.fn_info)
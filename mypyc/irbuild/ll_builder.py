@@ -22,7 +22,8 @@ from mypyc.ir.ops import (
     LoadStatic, MethodCall, RegisterOp, CallC, Truncate,
     RaiseStandardError, Unreachable, LoadErrorValue, LoadGlobal,
     NAMESPACE_TYPE, NAMESPACE_MODULE, NAMESPACE_STATIC, BinaryIntOp, GetElementPtr,
-    LoadMem, ComparisonOp, LoadAddress, TupleGet, SetMem, ERR_NEVER, ERR_FALSE
+    LoadMem, ComparisonOp, LoadAddress, TupleGet, SetMem, AssignMulti, KeepAlive,
+    ERR_NEVER, ERR_FALSE
 )
 from mypyc.ir.rtypes import (
     RType, RUnion, RInstance, optional_value_type, int_rprimitive, float_rprimitive,
@@ -30,13 +31,14 @@ from mypyc.ir.rtypes import (
     c_pyssize_t_rprimitive, is_short_int_rprimitive, is_tagged, PyVarObject, short_int_rprimitive,
     is_list_rprimitive, is_tuple_rprimitive, is_dict_rprimitive, is_set_rprimitive, PySetObject,
     none_rprimitive, RTuple, is_bool_rprimitive, is_str_rprimitive, c_int_rprimitive,
-    pointer_rprimitive, PyObject, PyListObject, bit_rprimitive, is_bit_rprimitive
+    pointer_rprimitive, PyObject, PyListObject, bit_rprimitive, is_bit_rprimitive,
+    object_pointer_rprimitive, RArray
 )
 from mypyc.ir.func_ir import FuncDecl, FuncSignature
 from mypyc.ir.class_ir import ClassIR, all_concrete_classes
 from mypyc.common import (
     FAST_ISINSTANCE_MAX_SUBCLASSES, MAX_LITERAL_SHORT_INT,
-    STATIC_PREFIX, PLATFORM_SIZE
+    STATIC_PREFIX, PLATFORM_SIZE, use_vectorcall
 )
 from mypyc.primitives.registry import (
     method_call_ops, CFunctionDescription, function_ops,
@@ -50,7 +52,8 @@ from mypyc.primitives.dict_ops import (
     dict_update_in_display_op, dict_new_op, dict_build_op, dict_size_op
 )
 from mypyc.primitives.generic_ops import (
-    py_getattr_op, py_call_op, py_call_with_kwargs_op, py_method_call_op, generic_len_op
+    py_getattr_op, py_call_op, py_call_with_kwargs_op, py_method_call_op,
+    py_vectorcall_op, py_vectorcall_method_op, generic_len_op
 )
 from mypyc.primitives.misc_ops import (
     none_object_op, fast_isinstance_op, bool_op
@@ -63,6 +66,7 @@ from mypyc.rt_subtype import is_runtime_subtype
 from mypyc.subtype import is_subtype
 from mypyc.sametype import is_same_type
 from mypyc.irbuild.mapper import Mapper
+from mypyc.options import CompilerOptions
 
 
 DictEntry = Tuple[Optional[Value], Value]
@@ -73,9 +77,11 @@ class LowLevelIRBuilder:
         self,
         current_module: str,
         mapper: Mapper,
+        options: CompilerOptions,
     ) -> None:
         self.current_module = current_module
         self.mapper = mapper
+        self.options = options
         self.environment = Environment()
         self.blocks = []  # type: List[BasicBlock]
         # Stack of except handler entry blocks
@@ -247,6 +253,12 @@ class LowLevelIRBuilder:
 
         Use py_call_op or py_call_with_kwargs_op for Python function call.
         """
+        if use_vectorcall(self.options.capi_version):
+            # More recent Python versions support faster vectorcalls.
+            result = self._py_vector_call(function, arg_values, line, arg_kinds, arg_names)
+            if result is not None:
+                return result
+
         # If all arguments are positional, we can use py_call_op.
         if (arg_kinds is None) or all(kind == ARG_POS for kind in arg_kinds):
             return self.call_c(py_call_op, [function] + arg_values, line)
@@ -289,6 +301,53 @@ class LowLevelIRBuilder:
         return self.call_c(
             py_call_with_kwargs_op, [function, pos_args_tuple, kw_args_dict], line)
 
+    def _py_vector_call(self,
+                        function: Value,
+                        arg_values: List[Value],
+                        line: int,
+                        arg_kinds: Optional[List[int]] = None,
+                        arg_names: Optional[Sequence[Optional[str]]] = None) -> Optional[Value]:
+        """Call function using the vectorcall API if possible.
+
+        Return the return value if successful. Return None if a non-vectorcall
+        API should be used instead.
+        """
+        # We can do this if all args are positional or named (no *args or **kwargs).
+        if arg_kinds is not None and any(kind not in (ARG_POS, ARG_NAMED)
+                                         for kind in arg_kinds):
+            return None
+        coerced_args = [self.coerce(arg, object_rprimitive, line) for arg in arg_values]
+        value = self.call_c(py_vectorcall_op,
+                            [function,
+                             self._vectorcall_args(coerced_args),
+                             self.add(LoadInt(num_positional_args(arg_kinds, arg_values),
+                                              line, c_pyssize_t_rprimitive)),
+                             self._vectorcall_keywords(arg_names)],
+                            line)
+        if coerced_args:
+            # The argument array only holds borrowed references.
+            self.add(KeepAlive(coerced_args))
+        return value
+
+    def _vectorcall_args(self, args: List[Value]) -> Value:
+        """Store vectorcall arguments in a C array and return a pointer to it."""
+        if not args:
+            return self.add(LoadErrorValue(object_pointer_rprimitive, is_borrowed=True))
+        array = self.alloc_temp(RArray(object_rprimitive, len(args)))
+        self.add(AssignMulti(array, args))
+        return self.add(LoadAddress(object_pointer_rprimitive, array))
+
+    def _vectorcall_keywords(self, arg_names: Optional[Sequence[Optional[str]]]) -> Value:
+        """Return a tuple of keyword argument names (or NULL if there are none).
+
+        The tuple is a static that is only built once.
+        """
+        if arg_names:
+            kw_list = tuple(name for name in arg_names if name is not None)
+            if kw_list:
+                return self.load_static_str_tuple(kw_list)
+        return self.add(LoadErrorValue(object_rprimitive, is_borrowed=True))
+
     def py_method_call(self,
                        obj: Value,
                        method_name: str,
@@ -297,6 +356,13 @@ class LowLevelIRBuilder:
                        arg_kinds: Optional[List[int]],
                        arg_names: Optional[Sequence[Optional[str]]]) -> Value:
         """Call a Python method (non-native and slow)."""
+        if use_vectorcall(self.options.capi_version):
+            # More recent Python versions support faster vectorcalls.
+            result = self._py_vector_method_call(
+                obj, method_name, arg_values, line, arg_kinds, arg_names)
+            if result is not None:
+                return result
+
         if (arg_kinds is None) or all(kind == ARG_POS for kind in arg_kinds):
             method_name_reg = self.load_static_unicode(method_name)
             return self.call_c(py_method_call_op, [obj, method_name_reg] + arg_values, line)
@@ -304,6 +370,35 @@ class LowLevelIRBuilder:
             method = self.py_get_attr(obj, method_name, line)
             return self.py_call(method, arg_values, line, arg_kinds=arg_kinds, arg_names=arg_names)
 
+    def _py_vector_method_call(self,
+                               obj: Value,
+                               method_name: str,
+                               arg_values: List[Value],
+                               line: int,
+                               arg_kinds: Optional[List[int]],
+                               arg_names: Optional[Sequence[Optional[str]]]) -> Optional[Value]:
+        """Call method using the vectorcall API if possible.
+
+        Return the return value if successful. Return None if a non-vectorcall
+        API should be used instead.
+        """
+        if arg_kinds is not None and any(kind not in (ARG_POS, ARG_NAMED)
+                                         for kind in arg_kinds):
+            return None
+        method_name_reg = self.load_static_unicode(method_name)
+        coerced_args = [self.coerce(arg, object_rprimitive, line)
+                        for arg in [obj] + arg_values]
+        value = self.call_c(py_vectorcall_method_op,
+                            [method_name_reg,
+                             self._vectorcall_args(coerced_args),
+                             self.add(LoadInt(num_positional_args(arg_kinds, arg_values) + 1,
+                                              line, c_pyssize_t_rprimitive)),
+                             self._vectorcall_keywords(arg_names)],
+                            line)
+        # The argument array only holds borrowed references.
+        self.add(KeepAlive(coerced_args))
+        return value
+
     def call(self,
              decl: FuncDecl,
              args: Sequence[Value],
@@ -448,7 +543,8 @@ class LowLevelIRBuilder:
         """Load Python None value (type: object_rprimitive)."""
         return self.add(LoadAddress(none_object_op.type, none_object_op.src, line=-1))
 
-    def literal_static_name(self, value: Union[int, float, complex, str, bytes]) -> str:
+    def literal_static_name(self,
+                            value: Union[int, float, complex, str, bytes, Tuple[str, ...]]) -> str:
         return STATIC_PREFIX + self.mapper.literal_static_name(self.current_module, value)
 
     def load_static_int(self, value: int) -> Value:
@@ -483,6 +579,14 @@ class LowLevelIRBuilder:
         identifier = self.literal_static_name(value)
         return self.add(LoadGlobal(str_rprimitive, identifier, ann=value))
 
+    def load_static_str_tuple(self, value: Tuple[str, ...]) -> Value:
+        """Loads a static tuple of str objects into a register.
+
+        This is used for the keyword argument names of vectorcalls.
+        """
+        identifier = self.literal_static_name(value)
+        return self.add(LoadGlobal(object_rprimitive, identifier, ann=value))
+
     def load_static_checked(self, typ: RType, identifier: str, module_name: Optional[str] = None,
                             namespace: str = NAMESPACE_STATIC,
                             line: int = -1,
@@ -1159,3 +1263,9 @@ class LowLevelIRBuilder:
             return self.call_c(dict_build_op, [load_size_op] + items, line)
         else:
             return self.call_c(dict_new_op, [], line)
+
+
+def num_positional_args(arg_kinds: Optional[List[int]], arg_values: List[Value]) -> int:
+    if arg_kinds is None:
+        return len(arg_values)
+    return sum(1 for kind in arg_kinds if kind == ARG_POS)
@@ -1,6 +1,6 @@
 """Maintain a mapping from mypy concepts to IR/compiled concepts."""
 
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Union, Tuple
 from mypy.ordered_dict import OrderedDict
 
 from mypy.nodes import FuncDef, TypeInfo, SymbolNode, ARG_STAR, ARG_STAR2
@@ -145,7 +145,7 @@ class Mapper:
         return FuncSignature(args, ret)
 
     def literal_static_name(self, module: str,
-                            value: Union[int, float, complex, str, bytes]) -> str:
+                            value: Union[int, float, complex, str, bytes, Tuple[str, ...]]) -> str:
         # Literals are shared between modules in a compilation group
         # but not outside the group.
         literals = self.literals[self.group_map.get(module)]
@@ -153,6 +153,11 @@ class Mapper:
         # Include type to distinguish between 1 and 1.0, and so on.
         key = (type(value), value)
         if key not in literals:
+            if isinstance(value, tuple):
+                # Tuple literals are built from the str literals, so
+                # these must be initialized first.
+                for item in value:
+                    self.literal_static_name(module, item)
             if isinstance(value, str):
                 prefix = 'unicode_'
             else:
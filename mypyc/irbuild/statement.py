@@ -20,7 +20,7 @@ from mypyc.ir.ops import (
     AssignmentTargetAttr, AssignmentTargetTuple, RaiseStandardError, LoadErrorValue,
     BasicBlock, TupleGet, Value, Register, Branch, NO_TRACEBACK_LINE_NO
 )
-from mypyc.ir.rtypes import exc_rtuple
+from mypyc.ir.rtypes import RInstance, exc_rtuple
 from mypyc.primitives.generic_ops import py_delattr_op
 from mypyc.primitives.misc_ops import type_op, get_module_dict_op
 from mypyc.primitives.dict_ops import dict_get_item_op
@@ -651,6 +651,16 @@ def transform_del_item(builder: IRBuilder, target: AssignmentTarget, line: int)
             line=line
         )
     elif isinstance(target, AssignmentTargetAttr):
+        if isinstance(target.obj_type, RInstance):
+            # Deleted attributes can't be always defined.
+            _, decl_cl = target.obj_type.class_ir.attr_details(target.attr)
+            decl_cl.deleted_attrs.add(target.attr)
+        else:
+            # The object could be an instance of any native class that has the
+            # attribute, so none of them can have it always defined.
+            for cl in builder.mapper.type_to_ir.values():
+                if target.attr in cl.attributes:
+                    cl.deleted_attrs.add(target.attr)
         key = builder.load_static_unicode(target.attr)
         builder.call_c(py_delattr_op, [target.obj, key], line)
     elif isinstance(target, AssignmentTargetRegister):
@@ -247,6 +247,25 @@ static inline bool CPyTagged_IsLe(CPyTagged left, CPyTagged right) {
     }
 }
 
+// Arithmetic on short ints that is known not to overflow. The integer range
+// analysis (mypyc/transform/optints.py) replaces checked operations with these.
+
+static inline CPyTagged CPyTagged_ShortAdd(CPyTagged left, CPyTagged right) {
+    return left + right;
+}
+
+static inline CPyTagged CPyTagged_ShortSubtract(CPyTagged left, CPyTagged right) {
+    return left - right;
+}
+
+static inline CPyTagged CPyTagged_ShortMultiply(CPyTagged left, CPyTagged right) {
+    return left * CPyTagged_ShortAsSsize_t(right);
+}
+
+static inline CPyTagged CPyTagged_ShortNegate(CPyTagged num) {
+    return -num;
+}
+
 
 // Generic operations (that work with arbitrary types)
 
@@ -301,6 +320,21 @@ static void CPy_LogGetAttr(const char *method, PyObject *obj, PyObject *attr) {
     (CPy_LogGetAttr("log_method", (obj), (attr)),               \
      PyObject_CallMethodObjArgs((obj), (attr), __VA_ARGS__))
 
+#if PY_MAJOR_VERSION >= 3 && PY_MINOR_VERSION >= 8
+// Vectorcalls (PEP 590) take the arguments as a C array, followed by
+// the values of any keyword arguments, and a tuple with the keyword
+// names (or NULL). These are only used when targeting Python 3.8+.
+#if PY_MINOR_VERSION >= 9
+#define CPyObject_Vectorcall PyObject_Vectorcall
+#else
+#define CPyObject_Vectorcall _PyObject_Vectorcall
+#endif
+// Call a method; args[0] is the receiver and the method name is given
+// separately, like PyObject_VectorcallMethod in Python 3.9+.
+PyObject *CPyObject_VectorcallMethod(PyObject *name, PyObject *const *args, size_t nargsf,
+                                     PyObject *kwnames);
+#endif
+
 // This one is a macro for consistency with the above, I guess.
 #define CPyObject_GetAttr(obj, attr)                       \
     (CPy_LogGetAttr("log", (obj), (attr)),                 \
@@ -489,6 +523,29 @@ void CPyDebug_Print(const char *msg);
 void CPy_Init(void);
 int CPyArg_ParseTupleAndKeywords(PyObject *, PyObject *,
                                  const char *, char **, ...);
+int CPyArg_VaParseTupleAndKeywords(PyObject *, PyObject *,
+                                   const char *, char **, va_list);
+
+// Argument parser of a METH_FASTCALL or vectorcall wrapper function.
+// Wrappers define one as a static with only format and keywords
+// initialized; the remaining fields are computed from the format on
+// first use.
+typedef struct CPyArg_Parser {
+    const char *format;
+    char **keywords;
+    int initialized;
+    int has_varargs;  // Accepts *args or **kwargs ('%')
+    int has_required_kws;  // Has required keyword-only arguments ('@')
+    Py_ssize_t min_pos;  // Number of required positional arguments
+    Py_ssize_t max_pos;  // Maximum number of positional arguments
+} CPyArg_Parser;
+
+int CPyArg_ParseStackAndKeywords(PyObject *const *args, size_t nargs, PyObject *kwnames,
+                                 CPyArg_Parser *parser, ...);
+#ifdef PY_VECTORCALL_ARGUMENTS_OFFSET
+PyObject *CPy_CallVectorcallWrapper(vectorcallfunc func, PyObject *self,
+                                    PyObject *args, PyObject *kw);
+#endif
 
 
 #ifdef __cplusplus
@@ -31,6 +31,34 @@ PyObject *CPyObject_GetAttr3(PyObject *v, PyObject *name, PyObject *defl)
     return result;
 }
 
+#if PY_MAJOR_VERSION >= 3 && PY_MINOR_VERSION >= 8
+PyObject *CPyObject_VectorcallMethod(PyObject *name, PyObject *const *args, size_t nargsf,
+                                     PyObject *kwnames)
+{
+    CPy_LogGetAttr("log_method", args[0], name);
+#if PY_MINOR_VERSION >= 9
+    return PyObject_VectorcallMethod(name, args, nargsf, kwnames);
+#else
+    // Look up the method without creating a bound method object if
+    // possible, like the LOAD_METHOD opcode.
+    Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+    PyObject *callable = NULL;
+    PyObject *result;
+    int unbound = _PyObject_GetMethod(args[0], name, &callable);
+    if (callable == NULL) {
+        return NULL;
+    }
+    if (unbound) {
+        result = _PyObject_Vectorcall(callable, args, nargs, kwnames);
+    } else {
+        result = _PyObject_Vectorcall(callable, args + 1, nargs - 1, kwnames);
+    }
+    Py_DECREF(callable);
+    return result;
+#endif
+}
+#endif
+
 PyObject *CPyIter_Next(PyObject *iter)
 {
     return (*iter->ob_type->tp_iternext)(iter);
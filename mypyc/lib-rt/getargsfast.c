@@ -0,0 +1,176 @@
+// Argument parsing for METH_FASTCALL and vectorcall wrapper functions
+//
+// These wrappers get the arguments as a C array followed by the values of
+// any keyword arguments, together with a tuple of keyword argument names
+// (see PEP 590). Calls with only positional arguments, which are by far
+// the most common, are handled directly without allocating anything.
+// Other calls are converted to an argument tuple and a keyword dict,
+// which are then parsed by CPyArg_VaParseTupleAndKeywords (getargs.c).
+// This way the accepted arguments and the error messages are exactly the
+// same as with METH_VARARGS wrappers.
+
+#include <Python.h>
+#include "CPy.h"
+
+// Compute the derived fields of a parser from its format string.
+// See getargs.c for the format.
+static void parser_init(CPyArg_Parser *parser) {
+    const char *format = parser->format;
+    Py_ssize_t count = 0;
+    Py_ssize_t min_pos = -1;
+    Py_ssize_t max_pos = -1;
+
+    parser->has_varargs = 0;
+    parser->has_required_kws = 0;
+    if (*format == '%') {
+        parser->has_varargs = 1;
+        format++;
+    }
+    for (; *format != '\0' && *format != ':' && *format != ';'; format++) {
+        switch (*format) {
+        case 'O':
+            count++;
+            break;
+        case '|':
+            min_pos = count;
+            break;
+        case '@':
+            parser->has_required_kws = 1;
+            // Fall through
+        case '$':
+            if (max_pos < 0) {
+                max_pos = count;
+            }
+            break;
+        }
+    }
+    if (max_pos < 0) {
+        max_pos = count;
+    }
+    parser->max_pos = max_pos;
+    parser->min_pos = min_pos < 0 ? max_pos : min_pos;
+    parser->initialized = 1;
+}
+
+// Parse arguments by building an argument tuple and a keyword dict.
+static int parse_tuple_and_dict(PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames,
+                                CPyArg_Parser *parser, va_list va) {
+    Py_ssize_t nkwargs = kwnames == NULL ? 0 : PyTuple_GET_SIZE(kwnames);
+    PyObject *kwargs = NULL;
+    Py_ssize_t i;
+    int result = 0;
+
+    // The parsed arguments are borrowed from the tuple and the dict, but
+    // the caller keeps references to all of them during the call.
+    PyObject *tuple = PyTuple_New(nargs);
+    if (tuple == NULL) {
+        return 0;
+    }
+    for (i = 0; i < nargs; i++) {
+        Py_INCREF(args[i]);
+        PyTuple_SET_ITEM(tuple, i, args[i]);
+    }
+    if (nkwargs > 0) {
+        kwargs = PyDict_New();
+        if (kwargs == NULL) {
+            goto done;
+        }
+        for (i = 0; i < nkwargs; i++) {
+            if (PyDict_SetItem(kwargs, PyTuple_GET_ITEM(kwnames, i), args[nargs + i]) < 0) {
+                goto done;
+            }
+        }
+    }
+    result = CPyArg_VaParseTupleAndKeywords(tuple, kwargs, parser->format, parser->keywords, va);
+done:
+    Py_DECREF(tuple);
+    Py_XDECREF(kwargs);
+    return result;
+}
+
+// Parse the arguments of a METH_FASTCALL or vectorcall function.
+// Return false (0) for error, else true.
+int CPyArg_ParseStackAndKeywords(PyObject *const *args, size_t nargs, PyObject *kwnames,
+                                 CPyArg_Parser *parser, ...) {
+    va_list va;
+    int result;
+    Py_ssize_t n;
+
+#ifdef PY_VECTORCALL_ARGUMENTS_OFFSET
+    // Vectorcall callers may set this flag in nargs.
+    n = PyVectorcall_NARGS(nargs);
+#else
+    n = (Py_ssize_t)nargs;
+#endif
+    if (!parser->initialized) {
+        parser_init(parser);
+    }
+
+    va_start(va, parser);
+    if ((kwnames == NULL || PyTuple_GET_SIZE(kwnames) == 0)
+            && !parser->has_varargs && !parser->has_required_kws
+            && n >= parser->min_pos && n <= parser->max_pos) {
+        // Fast path: positional arguments only, and the right number of them.
+        // Optional arguments that aren't given are left untouched.
+        Py_ssize_t i;
+        for (i = 0; i < n; i++) {
+            PyObject **p = va_arg(va, PyObject **);
+            *p = args[i];
+        }
+        result = 1;
+    } else {
+        result = parse_tuple_and_dict(args, n, kwnames, parser, va);
+    }
+    va_end(va);
+    return result;
+}
+
+#ifdef PY_VECTORCALL_ARGUMENTS_OFFSET
+// Call a vectorcall wrapper function with an argument tuple and an
+// optional keyword dict. This is used for tp_call of native classes
+// that support vectorcall, so that calls through a class's __call__ slot
+// wrapper (such as Base.__call__(obj)) run that class's __call__ rather
+// than the one stored in the instance.
+PyObject *CPy_CallVectorcallWrapper(vectorcallfunc func, PyObject *self,
+                                    PyObject *args, PyObject *kw) {
+    Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+    Py_ssize_t nkwargs = kw == NULL ? 0 : PyDict_GET_SIZE(kw);
+    PyObject **stack;
+    PyObject *kwnames;
+    PyObject *key, *value;
+    PyObject *result;
+    Py_ssize_t pos = 0;
+    Py_ssize_t i;
+
+    if (nkwargs == 0) {
+        return func(self, &PyTuple_GET_ITEM(args, 0), nargs, NULL);
+    }
+
+    // The values are borrowed from the tuple and the dict, which the
+    // caller keeps alive during the call.
+    stack = PyMem_Malloc((nargs + nkwargs) * sizeof(PyObject *));
+    if (stack == NULL) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+    kwnames = PyTuple_New(nkwargs);
+    if (kwnames == NULL) {
+        PyMem_Free(stack);
+        return NULL;
+    }
+    for (i = 0; i < nargs; i++) {
+        stack[i] = PyTuple_GET_ITEM(args, i);
+    }
+    i = 0;
+    while (PyDict_Next(kw, &pos, &key, &value)) {
+        Py_INCREF(key);
+        PyTuple_SET_ITEM(kwnames, i, key);
+        stack[nargs + i] = value;
+        i++;
+    }
+    result = func(self, stack, nargs, kwnames);
+    Py_DECREF(kwnames);
+    PyMem_Free(stack);
+    return result;
+}
+#endif
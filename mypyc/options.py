@@ -1,11 +1,13 @@
-from typing import Optional
+import sys
+from typing import Optional, Tuple
 
 
 class CompilerOptions:
     def __init__(self, strip_asserts: bool = False, multi_file: bool = False,
                  verbose: bool = False, separate: bool = False,
                  target_dir: Optional[str] = None,
-                 include_runtime_files: Optional[bool] = None) -> None:
+                 include_runtime_files: Optional[bool] = None,
+                 capi_version: Optional[Tuple[int, int]] = None) -> None:
         self.strip_asserts = strip_asserts
         self.multi_file = multi_file
         self.verbose = verbose
@@ -15,3 +17,7 @@ class CompilerOptions:
         self.include_runtime_files = (
             include_runtime_files if include_runtime_files is not None else not multi_file
         )
+        # The target Python C API version. Overriding this is mostly
+        # useful in IR tests, since the generated C code must be compiled
+        # against the same version.
+        self.capi_version = capi_version or sys.version_info[:2]
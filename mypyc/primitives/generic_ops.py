@@ -11,7 +11,8 @@ check that the priorities are configured properly.
 
 from mypyc.ir.ops import ERR_NEVER, ERR_MAGIC
 from mypyc.ir.rtypes import (
-    object_rprimitive, int_rprimitive, bool_rprimitive, c_int_rprimitive, pointer_rprimitive
+    object_rprimitive, int_rprimitive, bool_rprimitive, c_int_rprimitive, pointer_rprimitive,
+    object_pointer_rprimitive, c_pyssize_t_rprimitive
 )
 from mypyc.primitives.registry import (
     binary_op, c_unary_op, method_op, function_op, custom_op, ERR_NEG_INT
@@ -203,6 +204,32 @@ py_call_with_kwargs_op = custom_op(
     c_function_name='PyObject_Call',
     error_kind=ERR_MAGIC)
 
+# Call callable object using positional and/or keyword arguments (Python 3.8+).
+# Arguments are (func, args array, number of positional args, keyword names).
+# The keyword argument values follow the positional ones in the array, and
+# the keyword names are a tuple (or NULL if there are no keyword arguments).
+py_vectorcall_op = custom_op(
+    arg_types=[object_rprimitive,
+               object_pointer_rprimitive,
+               c_pyssize_t_rprimitive,
+               object_rprimitive],
+    return_type=object_rprimitive,
+    c_function_name='CPyObject_Vectorcall',
+    error_kind=ERR_MAGIC)
+
+# Call method using positional and/or keyword arguments (Python 3.8+).
+# Arguments are (method name, args array, number of positional args, keyword names).
+# The first item in the array is the receiver object, and it's included in the
+# number of positional args. Otherwise this is like py_vectorcall_op.
+py_vectorcall_method_op = custom_op(
+    arg_types=[object_rprimitive,
+               object_pointer_rprimitive,
+               c_pyssize_t_rprimitive,
+               object_rprimitive],
+    return_type=object_rprimitive,
+    c_function_name='CPyObject_VectorcallMethod',
+    error_kind=ERR_MAGIC)
+
 # Call method with positional arguments: obj.method(arg1, ...)
 # Arguments are (object, attribute name, arg1, ...).
 py_method_call_op = custom_op(
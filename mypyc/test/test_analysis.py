@@ -2,6 +2,8 @@
 
 import os.path
 
+from typing import Dict
+
 from mypy.test.data import DataDrivenTestCase
 from mypy.test.config import test_temp_dir
 from mypy.errors import CompileError
@@ -62,15 +64,12 @@ class TestAnalysis(MypycDataSuite):
                         # Forward, must
                         analysis_result = dataflow.analyze_borrowed_arguments(fn.blocks, cfg, args)
                     elif name.endswith('_IntegerRanges'):
-                        analysis_result = dataflow.analyze_integer_ranges(fn.blocks, cfg, args)
-                        # TODO: this is hacking because this analysis has a different result format
-                        # it must skip the print part below and do its own
-                        for lab in sorted(analysis_result.keys()):
-                            for (reg, regname) in sorted(map(lambda r: (r, r.name),
-                            analysis_result[lab].keys()), key=lambda x: x[1]):
+                        # This analysis has a different result format, so it's printed here
+                        ranges = dataflow.analyze_integer_ranges(fn.blocks, cfg, args)
+                        for lab in sorted(ranges):
+                            for reg in sorted(ranges[lab], key=lambda r: r.name):
                                 actual.append('%-20s %-20s %s' %
-                                (lab, regname, analysis_result[lab][reg]))
-
+                                              (lab, reg.name, format_interval(ranges[lab][reg])))
                         continue
                     else:
                         assert False, 'No recognized _AnalysisName suffix in test case'
@@ -86,3 +85,10 @@ class TestAnalysis(MypycDataSuite):
                         actual.append('%-8s %-23s %s' % ((key[0].label, key[1]),
                                                          '{%s}' % pre, '{%s}' % post))
             assert_test_output(testcase, actual, 'Invalid source code output')
+
+
+def format_interval(interval: dataflow.Interval) -> str:
+    """Format an integer range without platform-dependent short int limits."""
+    names = {dataflow.SHORT_INT_RANGE[0]: 'MIN_SHORT',
+             dataflow.SHORT_INT_RANGE[1]: 'MAX_SHORT'}  # type: Dict[float, str]
+    return '(%s)' % ', '.join(names.get(bound, str(bound)) for bound in interval)
@@ -0,0 +1,98 @@
+"""Test runner for always defined attribute analysis test cases.
+
+The output lists the always defined attributes of each class, followed by
+the IR of module-level functions (without checks for undefined attributes
+that are always defined).
+
+Modules from "[file other.py]" sections are compiled together with the
+main module, like in a real build.
+"""
+
+import os.path
+from typing import List
+
+from mypy import build
+from mypy.test.config import test_temp_dir
+from mypy.test.data import DataDrivenTestCase
+from mypy.errors import CompileError
+from mypy.options import Options
+
+from mypyc.common import TOP_LEVEL_NAME
+from mypyc.errors import Errors
+from mypyc.ir.module_ir import ModuleIRs
+from mypyc.ir.pprint import format_func
+from mypyc.irbuild.mapper import Mapper
+from mypyc.codegen import emitmodule
+from mypyc.options import CompilerOptions
+from mypyc.test.testutil import (
+    ICODE_GEN_BUILTINS, use_custom_builtins, MypycDataSuite, assert_test_output,
+    remove_comment_lines, replace_native_int
+)
+
+files = [
+    'attrdefined.test'
+]
+
+
+class TestAlwaysDefinedAttrs(MypycDataSuite):
+    files = files
+    base_path = test_temp_dir
+
+    def run_case(self, testcase: DataDrivenTestCase) -> None:
+        """Perform an always defined attribute analysis test case."""
+        with use_custom_builtins(os.path.join(self.data_prefix, ICODE_GEN_BUILTINS), testcase):
+            expected_output = remove_comment_lines(testcase.output)
+            expected_output = replace_native_int(expected_output)
+            try:
+                modules = build_ir_for_modules(testcase)
+            except CompileError as e:
+                actual = e.messages
+            else:
+                actual = []
+                for module in modules.values():
+                    for cl in module.classes:
+                        if cl.is_ext_class:
+                            actual.append('{}: [{}]'.format(
+                                cl.name, ', '.join(sorted(cl.always_defined_attrs))))
+                for module in modules.values():
+                    for fn in module.functions:
+                        if fn.name != TOP_LEVEL_NAME and fn.class_name is None:
+                            actual.extend(format_func(fn))
+
+            assert_test_output(testcase, actual, 'Invalid source code output',
+                               expected_output)
+
+
+def build_ir_for_modules(testcase: DataDrivenTestCase) -> ModuleIRs:
+    """Compile the main module and any other modules in a test case together."""
+    options = Options()
+    options.show_traceback = True
+    options.use_builtins_fixtures = True
+    options.strict_optional = True
+    options.python_version = (3, 6)
+    options.export_types = True
+    options.preserve_asts = True
+
+    sources = [build.BuildSource('main', '__main__', '\n'.join(testcase.input))]
+    for path, _ in testcase.files:
+        name = os.path.relpath(path, test_temp_dir)
+        if name.startswith('other') and name.endswith('.py'):
+            sources.append(build.BuildSource(path, name[:-3], None))
+    for source in sources:
+        options.per_module_options[source.module] = {'mypyc': True}
+
+    compiler_options = CompilerOptions(capi_version=(3, 5))
+    # Put each module in a separate group so that the modules are compiled as
+    # separate SCCs. A class can then have subclasses in SCCs compiled later.
+    groups = [([source], None) for source in sources]  # type: emitmodule.Groups
+    result = emitmodule.parse_and_typecheck(sources, options, compiler_options, groups,
+                                            alt_lib_path=test_temp_dir)
+    errors = Errors()
+    mapper = Mapper({source.module: None for source in sources})
+    modules = emitmodule.compile_modules_to_ir(result, mapper, compiler_options, errors)
+    if errors.num_errors:
+        errors.flush_errors()
+        assert False, 'Errors while building IR'
+    # Report modules in the order they were given.
+    names = [source.module for source in sources]  # type: List[str]
+    return {name: modules[name] for name in names}
@@ -11,7 +11,7 @@ from mypyc.ir.ops import (
     Environment, BasicBlock, Goto, Return, LoadInt, Assign, IncRef, DecRef, Branch,
     Call, Unbox, Box, TupleGet, GetAttr, RegisterOp,
     SetAttr, Op, Value, CallC, BinaryIntOp, LoadMem, GetElementPtr, LoadAddress, ComparisonOp,
-    SetMem
+    SetMem, ERR_NEVER
 )
 from mypyc.ir.rtypes import (
     RTuple, RInstance, int_rprimitive, bool_rprimitive, list_rprimitive,
@@ -206,6 +206,29 @@ class TestFunctionEmitterVisitor(unittest.TestCase):
                cpy_r_r0 = 1;
             """)
 
+    def test_get_attr_always_defined(self) -> None:
+        op = GetAttr(self.r, 'y', 1)
+        op.error_kind = ERR_NEVER
+        self.assert_emit(
+            op,
+            """cpy_r_r0 = ((mod___AObject *)cpy_r_r)->_y;
+               if (unlikely(((mod___AObject *)cpy_r_r)->_y == CPY_INT_TAG)) {
+                   PyErr_SetString(PyExc_AttributeError, "attribute 'y' of 'A' undefined");
+                   return NULL;
+               }
+               CPyTagged_IncRef(((mod___AObject *)cpy_r_r)->_y);
+            """)
+
+    def test_set_attr_old_value_defined(self) -> None:
+        op = SetAttr(self.r, 'y', self.m, 1)
+        op.old_value_defined = True
+        self.assert_emit(
+            op,
+            """CPyTagged_XDecRef(((mod___AObject *)cpy_r_r)->_y);
+               ((mod___AObject *)cpy_r_r)->_y = cpy_r_m;
+               cpy_r_r0 = 1;
+            """)
+
     def test_dict_get_item(self) -> None:
         self.assert_emit(CallC(dict_get_item_op.c_function_name, [self.d, self.o2],
                                dict_get_item_op.return_type, dict_get_item_op.steals,
@@ -316,7 +339,8 @@ class TestFunctionEmitterVisitor(unittest.TestCase):
         declarations.fragments = []
 
         const_int_regs = {}  # type: Dict[LoadInt, int]
-        visitor = FunctionEmitterVisitor(emitter, declarations, 'prog.py', 'prog', const_int_regs)
+        visitor = FunctionEmitterVisitor(emitter, declarations, 'prog.py', 'prog', const_int_regs,
+                                         object_rprimitive)
 
         op.accept(visitor)
         frags = declarations.fragments + emitter.fragments
@@ -1,11 +1,18 @@
 import unittest
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+from mypy.nodes import ARG_OPT
 from mypy.test.helpers import assert_string_arrays_equal
 
 from mypyc.codegen.emit import Emitter, EmitterContext
-from mypyc.codegen.emitwrapper import generate_arg_check
-from mypyc.ir.rtypes import list_rprimitive, int_rprimitive
+from mypyc.codegen.emitwrapper import (
+    generate_arg_check, generate_wrapper_function, generate_legacy_wrapper_function,
+    generate_call_wrapper, use_fastcall_wrapper
+)
+from mypyc.ir.ops import Environment
+from mypyc.ir.rtypes import list_rprimitive, int_rprimitive, object_rprimitive, RInstance
+from mypyc.ir.func_ir import FuncIR, FuncDecl, FuncSignature, RuntimeArg
+from mypyc.ir.class_ir import ClassIR
 from mypyc.namegen import NameGenerator
 
 
@@ -55,3 +62,89 @@ class TestArgCheck(unittest.TestCase):
     def assert_lines(self, expected: List[str], actual: List[str]) -> None:
         actual = [line.rstrip('\n') for line in actual]
         assert_string_arrays_equal(expected, actual, 'Invalid output')
+
+
+class TestWrapperFunction(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fn = FuncIR(FuncDecl('f', None, 'mod',
+                                  FuncSignature([RuntimeArg('x', object_rprimitive),
+                                                 RuntimeArg('y', object_rprimitive, ARG_OPT)],
+                                                object_rprimitive)),
+                         [], Environment())
+
+    def test_fastcall_wrapper(self) -> None:
+        emitter = Emitter(EmitterContext(NameGenerator([['mod']]), capi_version=(3, 7)))
+        generate_wrapper_function(self.fn, emitter, 'prog.py', 'mod')
+        self.assert_header([
+            'PyObject *CPyPy_f(PyObject *self, PyObject *const *args, size_t nargs, '
+            'PyObject *kwnames) {',
+            '    static char *kwlist[] = {"x", "y", 0};',
+            '    static CPyArg_Parser parser = {"O|O:f", kwlist, 0};',
+            '    PyObject *obj_x;',
+            '    PyObject *obj_y = NULL;',
+            '    if (!CPyArg_ParseStackAndKeywords(args, nargs, kwnames, &parser, '
+            '&obj_x, &obj_y)) {',
+            '        return NULL;',
+            '    }',
+        ], emitter.fragments)
+
+    def test_legacy_wrapper(self) -> None:
+        emitter = Emitter(EmitterContext(NameGenerator([['mod']]), capi_version=(3, 6)))
+        generate_legacy_wrapper_function(self.fn, emitter, 'prog.py', 'mod')
+        self.assert_header([
+            'PyObject *CPyPy_f(PyObject *self, PyObject *args, PyObject *kw) {',
+            '    static char *kwlist[] = {"x", "y", 0};',
+            '    PyObject *obj_x;',
+            '    PyObject *obj_y = NULL;',
+            '    if (!CPyArg_ParseTupleAndKeywords(args, kw, "O|O:f", kwlist, '
+            '&obj_x, &obj_y)) {',
+            '        return NULL;',
+            '    }',
+        ], emitter.fragments)
+
+    def test_use_fastcall_wrapper(self) -> None:
+        cl = ClassIR('A', 'mod')
+        methods = {}  # type: Dict[str, FuncIR]
+        for name in '__init__', '__call__', 'meth':
+            decl = FuncDecl(name, 'A', 'mod',
+                            FuncSignature([RuntimeArg('self', RInstance(cl))], object_rprimitive))
+            cl.method_decls[name] = decl
+            methods[name] = cl.methods[name] = FuncIR(decl, [], Environment())
+        trait = ClassIR('T', 'mod', is_trait=True)
+        trait.methods['__call__'] = methods['__call__']
+
+        def use_fastcall(fn: FuncIR, cl: Optional[ClassIR], capi_version: Tuple[int, int]) -> bool:
+            emitter = Emitter(EmitterContext(NameGenerator([['mod']]),
+                                             capi_version=capi_version))
+            return use_fastcall_wrapper(fn, cl, emitter)
+
+        assert use_fastcall(self.fn, None, (3, 7))
+        assert not use_fastcall(self.fn, None, (3, 6))
+        assert use_fastcall(methods['meth'], cl, (3, 7))
+        assert not use_fastcall(methods['__init__'], cl, (3, 8))
+        assert use_fastcall(methods['__call__'], cl, (3, 8))
+        assert not use_fastcall(methods['__call__'], cl, (3, 7))
+        assert not use_fastcall(methods['__call__'], trait, (3, 8))
+
+    def test_call_wrapper(self) -> None:
+        base = ClassIR('A', 'mod')
+        decl = FuncDecl('__call__', 'A', 'mod',
+                        FuncSignature([RuntimeArg('self', RInstance(base))], object_rprimitive))
+        base.method_decls['__call__'] = decl
+        base.methods['__call__'] = FuncIR(decl, [], Environment())
+        sub = ClassIR('B', 'mod')
+        sub.mro = [sub, base]
+        emitter = Emitter(EmitterContext(NameGenerator([['mod']]), capi_version=(3, 8)))
+        # An inherited __call__ is still run directly, not through the instance.
+        name = generate_call_wrapper(sub, base.methods['__call__'], emitter)
+        assert name == 'CPyDunder___call__B'
+        self.assert_header([
+            'static PyObject *CPyDunder___call__B(PyObject *self, PyObject *args, PyObject *kw) {',
+            '    return CPy_CallVectorcallWrapper((vectorcallfunc)CPyPy_A_____call__, '
+            'self, args, kw);',
+            '}',
+        ], emitter.fragments)
+
+    def assert_header(self, expected: List[str], actual: List[str]) -> None:
+        actual = [line.rstrip('\n') for line in actual][:len(expected)]
+        assert_string_arrays_equal(expected, actual, 'Invalid output')
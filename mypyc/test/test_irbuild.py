@@ -10,9 +10,9 @@ from mypyc.common import TOP_LEVEL_NAME, IS_32_BIT_PLATFORM
 from mypyc.ir.pprint import format_func
 from mypyc.test.testutil import (
     ICODE_GEN_BUILTINS, use_custom_builtins, MypycDataSuite, build_ir_for_single_file,
-    assert_test_output, remove_comment_lines, replace_native_int, replace_word_size
+    assert_test_output, remove_comment_lines, replace_native_int, replace_word_size,
+    infer_ir_build_options_from_test_name
 )
-from mypyc.options import CompilerOptions
 
 files = [
     'irbuild-basic.test',
@@ -30,6 +30,7 @@ files = [
     'irbuild-str.test',
     'irbuild-strip-asserts.test',
     'irbuild-int.test',
+    'irbuild-vectorcall.test',
 ]
 
 
@@ -39,8 +40,7 @@ class TestGenOps(MypycDataSuite):
     optional_out = True
 
     def run_case(self, testcase: DataDrivenTestCase) -> None:
-        # Kind of hacky. Not sure if we need more structure here.
-        options = CompilerOptions(strip_asserts='StripAssert' in testcase.name)
+        options = infer_ir_build_options_from_test_name(testcase.name)
         """Perform a runtime checking transformation test case."""
         with use_custom_builtins(os.path.join(self.data_prefix, ICODE_GEN_BUILTINS), testcase):
             expected_output = remove_comment_lines(testcase.output)
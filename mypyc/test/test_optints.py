@@ -0,0 +1,58 @@
+"""Test runner for the integer range optimization transform test cases.
+
+The transform uses integer range analysis to remove short int checks.
+"""
+
+import os.path
+
+from mypy.test.config import test_temp_dir
+from mypy.test.data import DataDrivenTestCase
+from mypy.errors import CompileError
+
+from mypyc.common import TOP_LEVEL_NAME
+from mypyc.ir.pprint import format_func
+from mypyc.transform.uninit import insert_uninit_checks
+from mypyc.transform.exceptions import insert_exception_handling
+from mypyc.transform.cse import eliminate_common_subexprs
+from mypyc.transform.licm import hoist_loop_invariants
+from mypyc.transform.refcount import insert_ref_count_opcodes
+from mypyc.transform.optints import optimize_integer_types
+from mypyc.test.testutil import (
+    ICODE_GEN_BUILTINS, use_custom_builtins, MypycDataSuite, build_ir_for_single_file,
+    assert_test_output, remove_comment_lines, replace_native_int
+)
+
+files = [
+    'optints.test'
+]
+
+
+class TestOptimizeIntegerTypes(MypycDataSuite):
+    files = files
+    base_path = test_temp_dir
+
+    def run_case(self, testcase: DataDrivenTestCase) -> None:
+        """Perform an integer range optimization test case."""
+        with use_custom_builtins(os.path.join(self.data_prefix, ICODE_GEN_BUILTINS), testcase):
+            expected_output = remove_comment_lines(testcase.output)
+            expected_output = replace_native_int(expected_output)
+            try:
+                ir = build_ir_for_single_file(testcase.input)
+            except CompileError as e:
+                actual = e.messages
+            else:
+                actual = []
+                for fn in ir:
+                    if (fn.name == TOP_LEVEL_NAME
+                            and not testcase.name.endswith('_toplevel')):
+                        continue
+                    insert_uninit_checks(fn)
+                    insert_exception_handling(fn)
+                    eliminate_common_subexprs(fn)
+                    hoist_loop_invariants(fn)
+                    insert_ref_count_opcodes(fn)
+                    optimize_integer_types(fn)
+                    actual.extend(format_func(fn))
+
+            assert_test_output(testcase, actual, 'Invalid source code output',
+                               expected_output)
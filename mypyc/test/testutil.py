@@ -89,7 +89,7 @@ def build_ir_for_single_file(input_lines: List[str],
                              compiler_options: Optional[CompilerOptions] = None) -> List[FuncIR]:
     program_text = '\n'.join(input_lines)
 
-    compiler_options = compiler_options or CompilerOptions()
+    compiler_options = compiler_options or CompilerOptions(capi_version=(3, 5))
     options = Options()
     options.show_traceback = True
     options.use_builtins_fixtures = True
@@ -121,6 +121,21 @@ def build_ir_for_single_file(input_lines: List[str],
     return module.functions
 
 
+def infer_ir_build_options_from_test_name(name: str) -> CompilerOptions:
+    """Look for magic substrings in test case name to set compiler options.
+
+    Return the compiler options to use. The target C API version defaults
+    to Python 3.5, so that the generated IR doesn't depend on the Python
+    version used to run the tests. A test case name can override it with a
+    '_python3_8' style suffix.
+    """
+    options = CompilerOptions(strip_asserts='StripAssert' in name, capi_version=(3, 5))
+    m = re.search(r'_python([3-9]+)_([0-9]+)(_|$)', name)
+    if m:
+        options.capi_version = (int(m.group(1)), int(m.group(2)))
+    return options
+
+
 def update_testcase_output(testcase: DataDrivenTestCase, output: List[str]) -> None:
     # TODO: backport this to mypy
     assert testcase.old_cwd is not None, "test was not properly set up"
@@ -0,0 +1,148 @@
+"""Common subexpression elimination.
+
+Remove ops that compute a value that has already been computed by an
+identical op, and use the earlier result instead. This covers repeated
+type checks (casts and unboxing of the same value), loads of the same
+native attribute and static, and pure integer operations.
+
+The transform uses available expression analysis, and it must be run
+after exception handling has been inserted (so that the CFG has precise
+error edges) but before reference counting ops are inserted. Reusing a
+value just makes it live longer, and the reference counting transform
+takes care of that. Ops that produce values borrowed from other objects
+(such as LoadMem) aren't eliminated, since the borrowed reference might
+not be valid at the later location. Finalizers run when a reference
+count drops to zero are assumed not to modify the attributes that are
+being accessed.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from mypyc.analysis.dataflow import get_cfg, cleanup_cfg, analyze_available_exprs
+from mypyc.ir.func_ir import FuncIR
+from mypyc.ir.ops import (
+    Value, Op, Branch, Goto, LoadInt, Cast, Unbox, Box, TupleGet, GetAttr, LoadGlobal,
+    LoadStatic, LoadAddress, BinaryIntOp, ComparisonOp, Truncate
+)
+from mypyc.ir.rtypes import RTuple
+
+# Attributes of ops that refer to operands (either a value or a list of values)
+OPERAND_ATTRS = ('src', 'obj', 'args', 'items', 'lhs', 'rhs', 'left', 'reg', 'value', 'base',
+                 'dest')
+
+ExprKey = Tuple[object, ...]
+
+
+def eliminate_common_subexprs(ir: FuncIR) -> None:
+    cleanup_cfg(ir.blocks)
+    exprs = set()  # type: Set[Value]
+    memory_exprs = set()  # type: Set[Value]
+    for block in ir.blocks:
+        for op in block.ops:
+            if is_pure_expr(op):
+                exprs.add(op)
+                if isinstance(op, (GetAttr, LoadStatic)):
+                    memory_exprs.add(op)
+    if not exprs:
+        return
+
+    # Expressions that fail aren't available in their error handlers.
+    entry_kills = {}  # type: Dict[Op, Set[Value]]
+    for block in ir.blocks:
+        branch = block.ops[-1]
+        if isinstance(branch, Branch) and is_error_check(branch) and branch.left in exprs:
+            entry_kills.setdefault(branch.true.ops[0], set()).add(branch.left)
+
+    cfg = get_cfg(ir.blocks)
+    available = analyze_available_exprs(ir.blocks, cfg, exprs, memory_exprs, entry_kills)
+
+    replacements = {}  # type: Dict[Value, Value]
+    by_key = {}  # type: Dict[ExprKey, List[Value]]
+    for block in ir.blocks:
+        for i, op in enumerate(block.ops):
+            if op not in exprs:
+                continue
+            key = expr_key(op, replacements)
+            avail = available.before[block, i] - entry_kills.get(op, set())
+            for prev in by_key.get(key, []):
+                if prev in avail:
+                    replacements[op] = prev
+                    break
+            else:
+                by_key.setdefault(key, []).append(op)
+    if not replacements:
+        return
+
+    for block in ir.blocks:
+        # The error check of a removed op is redundant, since the earlier op
+        # has already been checked.
+        branch = block.ops[-1]
+        if isinstance(branch, Branch) and is_error_check(branch) and branch.left in replacements:
+            block.ops[-1] = Goto(branch.false, branch.line)
+        block.ops = [op for op in block.ops if op not in replacements]
+        for op in block.ops:
+            replace_operands(op, replacements)
+    for value in replacements:
+        del ir.env.indexes[value]
+    cleanup_cfg(ir.blocks)
+
+
+def is_pure_expr(op: Op) -> bool:
+    """Can the op be replaced by an identical earlier op?"""
+    if isinstance(op, (Cast, Unbox, TupleGet, LoadGlobal, LoadStatic, BinaryIntOp,
+                       ComparisonOp, Truncate)):
+        return True
+    if isinstance(op, Box):
+        # Boxing a tuple creates a new object.
+        return not isinstance(op.src.type, RTuple)
+    if isinstance(op, LoadAddress):
+        return isinstance(op.src, str)
+    if isinstance(op, GetAttr):
+        # Property getters may have side effects.
+        return not op.class_type.class_ir.get_method(op.attr)
+    return False
+
+
+def is_error_check(branch: Branch) -> bool:
+    return branch.op == Branch.IS_ERROR and not branch.negated
+
+
+def expr_key(op: Op, replacements: Dict[Value, Value]) -> ExprKey:
+    """Return a key that is equal for ops that compute the same value."""
+    operands = []  # type: List[object]
+    for src in op.sources():
+        src = replacements.get(src, src)
+        if isinstance(src, LoadInt):
+            operands.append((src.value, src.type))
+        else:
+            operands.append(src)
+    if isinstance(op, (Cast, Unbox)):
+        details = (op.type,)  # type: Tuple[object, ...]
+    elif isinstance(op, LoadGlobal):
+        details = (op.type, op.identifier)
+    elif isinstance(op, TupleGet):
+        details = (op.index,)
+    elif isinstance(op, GetAttr):
+        details = (op.class_type, op.attr)
+    elif isinstance(op, LoadStatic):
+        details = (op.type, op.namespace, op.module_name, op.identifier)
+    elif isinstance(op, LoadAddress):
+        details = (op.type, op.src)
+    elif isinstance(op, (BinaryIntOp, ComparisonOp)):
+        details = (op.type, op.op)
+    elif isinstance(op, Truncate):
+        details = (op.src_type, op.type)
+    else:
+        details = ()
+    return (type(op),) + details + tuple(operands)
+
+
+def replace_operands(op: Op, replacements: Dict[Value, Value]) -> None:
+    for attr in OPERAND_ATTRS:
+        value = getattr(op, attr, None)
+        if isinstance(value, Value) and value in replacements:
+            setattr(op, attr, replacements[value])
+        elif isinstance(value, list):
+            setattr(op, attr, [replacements.get(item, item) if isinstance(item, Value) else item
+                               for item in value])
+    assert not any(src in replacements for src in op.sources()), op
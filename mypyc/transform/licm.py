@@ -0,0 +1,138 @@
+"""Loop-invariant code motion.
+
+Move ops that compute the same value on every iteration of a loop to a
+new preheader block that is executed once before the loop is entered.
+This covers things like loads of statics (such as module objects and
+literals), integer operations on values that aren't modified in the
+loop, and attribute reads that can't fail from objects that aren't
+modified in the loop.
+
+Only ops that can't fail and don't have side effects are moved, since
+they are executed even if the loop body is never run. Ops that read
+memory are only moved out of loops that don't write to memory.
+
+The transform must be run after exception handling has been inserted
+and before reference counting ops are inserted.
+"""
+
+from typing import List, Set
+
+from mypyc.analysis.dataflow import (
+    get_cfg, cleanup_cfg, get_natural_loops, analyze_must_defined_regs, NON_WRITING_OPS
+)
+from mypyc.ir.func_ir import FuncIR
+from mypyc.ir.ops import (
+    Value, Op, RegisterOp, BasicBlock, Register, Assign, AssignMulti, Goto, Branch, LoadInt,
+    GetAttr, LoadStatic, InitStatic, BinaryIntOp, ERR_NEVER, NAMESPACE_MODULE, NAMESPACE_TYPE
+)
+from mypyc.transform.cse import is_pure_expr
+
+
+def hoist_loop_invariants(ir: FuncIR) -> None:
+    cleanup_cfg(ir.blocks)
+    cfg = get_cfg(ir.blocks)
+    loops = get_natural_loops(ir.blocks, cfg)
+    if not loops:
+        return
+    args = set(reg for reg in ir.env.regs() if ir.env.indexes[reg] < len(ir.args))
+    must_defined = analyze_must_defined_regs(ir.blocks, cfg, args, ir.env.regs())
+
+    # Process inner loops first, so that ops moved to the preheader of an
+    # inner loop can be moved further out of an enclosing loop.
+    for header, body in sorted(loops.items(), key=lambda item: len(item[1])):
+        if header is ir.blocks[0]:
+            continue
+        hoisted = find_loop_invariants(ir.blocks, body, must_defined.before[header, 0])
+        if not hoisted:
+            continue
+        preheader = BasicBlock()
+        hoisted_set = set(hoisted)
+        for block in ir.blocks:
+            if block in body:
+                block.ops = [op for op in block.ops if op not in hoisted_set]
+        preheader.ops = hoisted + [Goto(header)]
+        for pred in cfg.pred[header]:
+            if pred not in body:
+                retarget(pred.ops[-1], header, preheader)
+        ir.blocks.insert(ir.blocks.index(header), preheader)
+        for other in loops.values():
+            if header in other and other is not body:
+                other.add(preheader)
+        cfg = get_cfg(ir.blocks)
+
+
+def find_loop_invariants(blocks: List[BasicBlock],
+                         body: Set[BasicBlock],
+                         defined_at_entry: Set[Value]) -> List[Op]:
+    """Find the ops in a loop that can be moved to a preheader, in evaluation order."""
+    loop_ops = [op for block in blocks if block in body for op in block.ops]
+    defined = set(loop_ops)  # type: Set[Value]
+    for op in loop_ops:
+        if isinstance(op, (Assign, AssignMulti)):
+            defined.add(op.dest)
+    writes_memory = any(not isinstance(op, NON_WRITING_OPS) for op in loop_ops)
+    inits_static = any(isinstance(op, InitStatic) for op in loop_ops)
+
+    def is_invariant(value: Value) -> bool:
+        if value in invariant or isinstance(value, LoadInt):
+            return True
+        if value in defined:
+            return False
+        return not isinstance(value, Register) or value in defined_at_entry
+
+    invariant = set()  # type: Set[Value]
+    changed = True
+    while changed:
+        changed = False
+        for op in loop_ops:
+            if (op not in invariant
+                    and can_hoist(op, writes_memory, inits_static)
+                    and all(is_invariant(src) for src in op.sources())):
+                invariant.add(op)
+                changed = True
+
+    # Integer constants are only moved when needed, since they are
+    # usually emitted inline.
+    hoisted = []  # type: List[Op]
+    added = set()  # type: Set[Value]
+
+    def add(op: Op) -> None:
+        for src in op.sources():
+            if src in invariant and src not in added:
+                assert isinstance(src, Op)
+                add(src)
+        hoisted.append(op)
+        added.add(op)
+
+    for op in loop_ops:
+        if op in invariant and op not in added and not isinstance(op, LoadInt):
+            add(op)
+    return hoisted
+
+
+def can_hoist(op: Op, writes_memory: bool, inits_static: bool) -> bool:
+    """Can an op with invariant operands be evaluated before the loop?"""
+    if isinstance(op, LoadInt):
+        return True
+    if not isinstance(op, RegisterOp) or not is_pure_expr(op) or op.error_kind != ERR_NEVER:
+        return False
+    if isinstance(op, BinaryIntOp) and op.op in (BinaryIntOp.DIV, BinaryIntOp.MOD):
+        # The operands might not be valid if the loop body isn't run.
+        return False
+    if isinstance(op, LoadStatic) and op.namespace in (NAMESPACE_MODULE, NAMESPACE_TYPE):
+        # Modules and types are only initialized once.
+        return not inits_static
+    if isinstance(op, (GetAttr, LoadStatic)):
+        return not writes_memory
+    return True
+
+
+def retarget(op: Op, old: BasicBlock, new: BasicBlock) -> None:
+    if isinstance(op, Goto):
+        if op.label is old:
+            op.label = new
+    elif isinstance(op, Branch):
+        if op.true is old:
+            op.true = new
+        if op.false is old:
+            op.false = new
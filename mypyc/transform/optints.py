@@ -1,11 +1,38 @@
+"""Optimize operations on tagged integers using integer range analysis.
+
+Operations on tagged integers need to check whether the operands are
+short integers, and arithmetic needs to check for overflow to a boxed
+long integer. If the ranges of the operands (and the result) are known
+to fit in a short integer, these checks are redundant:
+
+ * Branches on short int tag checks (and other integer conditions)
+   whose outcome is known are replaced with jumps. This makes the
+   slow path of comparisons unreachable, and it's removed.
+ * Arithmetic that can't overflow uses unchecked C primitives.
+ * Reference counting ops on values that are known to be short
+   integers are no-ops, and they are removed.
+"""
+
+from typing import List, Set, Tuple
+from typing_extensions import Final
 
 from mypyc.analysis.dataflow import (
     get_cfg,
     cleanup_cfg,
-    analyze_integer_ranges
+    IntegerRangeAnalysis,
+    is_short_interval,
+    is_tagged,
 )
 from mypyc.ir.func_ir import FuncIR
-from mypyc.ir.ops import Register
+from mypyc.ir.ops import BasicBlock, Op, Branch, CallC, Goto, IncRef, DecRef
+
+# Unchecked C primitives for tagged integer operations (defined in CPy.h)
+UNCHECKED_SHORT_INT_OPS = {
+    'CPyTagged_Add': 'CPyTagged_ShortAdd',
+    'CPyTagged_Subtract': 'CPyTagged_ShortSubtract',
+    'CPyTagged_Multiply': 'CPyTagged_ShortMultiply',
+    'CPyTagged_Negate': 'CPyTagged_ShortNegate',
+}  # type: Final
 
 
 def optimize_integer_types(ir: FuncIR) -> None:
@@ -17,8 +44,58 @@ def optimize_integer_types(ir: FuncIR) -> None:
 
     for i, block in enumerate(ir.blocks):
         block.label = i
-    int_ranges = analyze_integer_ranges(ir.blocks,
-                                        cfg,
-                                        filter(lambda r: isinstance(r, Register), ir.env.regs()))
+    # Arguments can have any value valid for their type.
+    analysis = IntegerRangeAnalysis(ir.blocks, cfg, {})
+
+    # Collect the changes first, since they affect the analysis results.
+    unchecked = []  # type: List[CallC]
+    folded = []  # type: List[Tuple[BasicBlock, Branch, bool]]
+    no_ops = set()  # type: Set[Op]
+    for block in ir.blocks:
+        if block not in analysis.before:
+            # Unreachable
+            continue
+        for op, state in analysis.op_states(block):
+            if isinstance(op, CallC) and op.function_name in UNCHECKED_SHORT_INT_OPS:
+                args = [analysis.value_range(state, arg) for arg in op.args]
+                result = analysis.evaluate(state, op)
+                if all(is_short_interval(arg) for arg in args) and is_short_interval(result):
+                    unchecked.append(op)
+            elif isinstance(op, (IncRef, DecRef)) and is_tagged(op.src.type):
+                if is_short_interval(analysis.value_range(state, op.src)):
+                    no_ops.add(op)
+            elif isinstance(op, Branch) and op.op == Branch.BOOL:
+                cond = analysis.value_range(state, op.left)
+                if cond[0] == cond[1]:
+                    folded.append((block, op, bool(cond[0]) != op.negated))
+
+    for call in unchecked:
+        call.function_name = UNCHECKED_SHORT_INT_OPS[call.function_name]
+    if no_ops:
+        for block in ir.blocks:
+            block.ops = [op for op in block.ops if op not in no_ops]
+    for block, branch, taken in folded:
+        block.ops[-1] = Goto(branch.true if taken else branch.false, branch.line)
+    if folded and not has_reachable_exit(ir.blocks):
+        # The function can't return (it has an infinite loop), but the CFG
+        # must always have an exit, so keep the branches.
+        for block, branch, _ in folded:
+            block.ops[-1] = branch
+        folded = []
+    if folded or no_ops:
+        cleanup_cfg(ir.blocks)
+
 
-    # TODO: Use int_ranges for optimizations
+def has_reachable_exit(blocks: List[BasicBlock]) -> bool:
+    cfg = get_cfg(blocks)
+    visited = {blocks[0]}
+    stack = [blocks[0]]
+    while stack:
+        block = stack.pop()
+        if block in cfg.exits:
+            return True
+        for succ in cfg.succ[block]:
+            if succ not in visited:
+                visited.add(succ)
+                stack.append(succ)
+    return False
@@ -90,6 +90,8 @@ if USE_MYPYC:
         '__main__.py',
         'sitepkgs.py',
         os.path.join('dmypy', '__main__.py'),
+        os.path.join('bench', '__main__.py'),
+        'cachebundle.py',
 
         # Uses __getattr__/__setattr__
         'split_namespace.py',